@@ -6,6 +6,7 @@
 # Imports
 from data_model.fixed_fee_contract import FixedFeeContract
 from data_model.contract import Contract
+from data_model.fee_schedule import FeeSchedule
 
 
 # Consts
@@ -16,11 +17,14 @@ from data_model.contract import Contract
 class AdvertFeeContract(FixedFeeContract):
     """
     Advert Fee Contract entity class - class variables:
-        __next_id: from base class
+        __id_allocator: from base class
         __ID_PREFIX: from base class
         base_commission: from base class
-        fixed_fee: from base class
+        fixed_fee: fee charged each time the contract is viewed, replacing the fixed fee of the base class, as float,
+                   with public access (see FeeSchedule for changing it)
     """
+    __slots__ = ("__times_viewed",)
+    fixed_fee = 0.1  # Initial value for the advert fee of all advert fee contracts, this can be changed subsequently
 
     def __init__(self, owner, speciality, payment, contractor_allocated=None):
         """
@@ -40,22 +44,53 @@ class AdvertFeeContract(FixedFeeContract):
         :param contractor_allocated: to associated with this contract instance {optional}
         """
         super().__init__(owner, speciality, payment, contractor_allocated)
-        AdvertFeeContract.fixed_fee = 0.1  # Given value for the advert fee class instances, can be changed subsequently
         self.__times_viewed = 0
 
+    @classmethod
+    def restore(cls, ident, owner, speciality, payment, contractor_allocated=None, completed=False, billed_version=None,
+                times_viewed=0):
+        """
+        Alternative initialiser that rebuilds an advert fee contract with an existing identifier and view count, see
+        Contract.restore()
+
+        :param ident: existing identifier of the contract as string
+        :param owner: to associate with this contract instance
+        :param speciality: to associated with this contract instance
+        :param payment: to associated with this contract instance
+        :param contractor_allocated: to associated with this contract instance {optional}
+        :param completed: whether the contract is completed {optional}
+        :param billed_version: fee schedule version a completed contract was billed under {optional}
+        :param times_viewed: number of times the contract has been viewed {optional}
+        :return: rebuilt contract as AdvertFeeContract instance
+        """
+        contract = super().restore(ident, owner, speciality, payment, contractor_allocated, completed, billed_version)
+        contract.__times_viewed = int(times_viewed)
+        contract._invalidate_revenue()
+
+        return contract
+
     @property
     def times_viewed(self):
         return self.__times_viewed
 
-    def make_displayable(self):
+    def make_displayable(self, view_counter=None):
         """
         Provides a string version of an AdvertFeeContract instance that can then be used as displayable data, note
-        that this also increments the times viewed property
+        that this also increments the times viewed property, or records the view in the supplied view counter (to be
+        folded into the contract later, see MainApp.display_contract())
 
+        :param view_counter: counter to record the view in as ViewCounter or None to add the view to this contract
+                             straight away {optional}
         :return: AdvertFeeContract instance as displayable string
         """
-        # Each time an instance of this class is made displayable it also increments its times viewed property
-        self.inc_times_viewed()
+        # Each time an instance of this class is made displayable it also increments its times viewed property, views
+        # recorded in the view counter but not yet folded in are shown as though they had been
+        pending = 0
+        if view_counter is None:
+            self.inc_times_viewed()
+        elif not self.completed:
+            view_counter.record(self)
+            pending = view_counter.pending(self)
 
         s = "Id: {0}\n".format(self.id)
         s += "Owner: {0} ({1})\n".format(self.owner.id, self.owner.name)
@@ -63,29 +98,52 @@ class AdvertFeeContract(FixedFeeContract):
         s += "Contractor Allocated: {0}{1}\n".format(self.contractor_allocated.id if self.contractor_allocated else
                                                      "None", " (" + self.contractor_allocated.name + ")" if
                                                      self.contractor_allocated else "")
-        s += "Base Commission: {0}%\n".format(Contract.base_commission)
-        s += "Fixed Fee Per View: £{0:.2f}\n".format(AdvertFeeContract.fixed_fee)
-        s += "Times Viewed: {0}\n".format(self.times_viewed)
+        fees = self.billing_fees()
+        s += "Base Commission: {0}%\n".format(fees["base_commission"])
+        s += "Fixed Fee Per View: £{0:.2f}\n".format(fees["advert_fee"])
+        s += "Times Viewed: {0}\n".format(self.times_viewed + pending)
         s += "Payment: £{0:.2f}\n".format(self.payment)
         s += "Completed: {0}\n".format(self.completed)
         if self.completed:  # If the contract is completed, then show how much revenue it contributed
             s += "Revenue Contributed: £{0:.2f}\n".format(self.calculate_revenue())
         else:  # Show how much potential revenue will be contributed if contract is completed
-            s += "Revenue Potential: £{0:.2f}".format(self.calculate_revenue())
+            s += "Revenue Potential: £{0:.2f}".format(self.calculate_revenue() + pending * fees["advert_fee"])
         # In format placeholders, ":.2f" means always show two decimals, for instance 1.2 would show as 1.20
 
         return s
 
     def inc_times_viewed(self):
-        if not self.completed:  # Only increment times viewed if contract is not completed
-            self.__times_viewed += 1
+        self.add_views(1)
 
-    def calculate_revenue(self):
+    def add_views(self, count):
         """
-        Uses the base commission property to calculate the revenue from the payment made on completion of the contract:
+        Add the supplied number of views to the times viewed property in one step, observers are notified once with
+        the old and new counts, used by ViewCounter to fold in the views it has recorded
 
-            revenue = (base_commission / 100.0) * payment
+        :param count: number of views as integer
+        :return: number of views added as integer, 0 if the contract is completed
+        """
+        if self.completed or count <= 0:  # Only increment times viewed if contract is not completed
+            return 0
+
+        old_times_viewed = self.__times_viewed
+        self.__times_viewed += count
+        self._invalidate_revenue()
+        self._notify_observers("times_viewed", old_times_viewed, self.__times_viewed)
+
+        return count
+
+    def _calculate_revenue_under(self, fees):
+        """
+        Uses the base commission to calculate the revenue from the payment made on completion of the contract plus the
+        advert fee for each time the contract was viewed, the fixed fee of the base class is not charged:
+
+            revenue = ((base_commission / 100.0) * payment) + (times_viewed * advert_fee)
 
+        :param fees: fees to use as map of fee name to fee, see FeeSchedule.fees()
         :return: revenue as float
         """
-        return Contract.calculate_revenue(self) + (self.__times_viewed * AdvertFeeContract.fixed_fee)
+        return Contract._calculate_revenue_under(self, fees) + (self.__times_viewed * fees["advert_fee"])
+
+
+FeeSchedule.track("advert_fee", AdvertFeeContract, "fixed_fee")
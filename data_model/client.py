@@ -16,9 +16,10 @@ from data_model.named_entity import NamedEntity
 class Client(IdentifiedEntity, NamedEntity):
     """
     Client entity class - class variables:
-        __next_id: from base class
+        __id_allocator: from base class
         __ID_PREFIX: two letter prefix for each unique identifier, as string, with private access
     """
+    __slots__ = ("_NamedEntity__name",)
     __ID_PREFIX = "CL"
 
     def __init__(self, name):
@@ -32,6 +33,22 @@ class Client(IdentifiedEntity, NamedEntity):
         IdentifiedEntity.__init__(self, Client.__ID_PREFIX)
         NamedEntity.__init__(self, name)
 
+    @classmethod
+    def restore(cls, ident, name):
+        """
+        Alternative initialiser that rebuilds a client with an existing identifier, this does not consume a new
+        identifier so is used when materialising a client held in another form (for instance a snapshot)
+
+        :param ident: existing identifier of the client as string
+        :param name: to associate with this client instance
+        :return: rebuilt client as Client instance
+        """
+        client = cls.__new__(cls)
+        client._restore_identity(ident)
+        NamedEntity.__init__(client, name)
+
+        return client
+
     def __str__(self):
         """
         To string method
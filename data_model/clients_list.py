@@ -17,12 +17,17 @@ class ClientsList(IdentifiedEntitiesList):
     Container for Client class instances
     """
 
-    def __init__(self):
+    def __init__(self, lazy_removal=False, compaction_threshold=0.5):
         """
  -      Initialiser - instance variables:
             data: from base class
+            lazy_removal: from base class
+            compaction_threshold: from base class
+
+        :param lazy_removal: whether removal leaves a tombstone {optional}
+        :param compaction_threshold: fraction of the list that may be tombstones before it is compacted {optional}
         """
-        super().__init__()
+        super().__init__(lazy_removal, compaction_threshold)
 
     def __str__(self):
         """
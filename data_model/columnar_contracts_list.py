@@ -0,0 +1,544 @@
+# File: columnar_contracts_list.py
+# Description: Prototype implementation of Game Developer Contract Matcher (GDCMatcher) case study
+# Author: Chris Knowles
+
+
+# Imports
+from array import array
+from itertools import compress
+from data_model.contract import Contract
+from data_model.fixed_fee_contract import FixedFeeContract
+from data_model.advert_fee_contract import AdvertFeeContract
+from data_model.revenue_calculator import RevenueCalculator
+from data_model.fee_schedule import FeeSchedule
+from data_model.speciality_registry import SpecialityRegistry
+
+
+# Consts
+# Globals
+
+
+# Classes
+class ColumnarContractsList:
+    """
+    Alternative container to ContractsList for analytics over very large numbers of contracts, rather than holding a
+    Contract instance per contract it holds one row per contract spread across contiguous typed arrays (columns) for the
+    identifier number, payment, completed flag, fee schedule version billed under, contract type, speciality code, owner
+    index, contractor index and times viewed, the owners and contractors are each held once in small dimension tables
+    that the columns index into and the speciality column holds SpecialityRegistry codes
+
+    As with a Contract instance a completed contract is billed under the fee schedule version it was completed under
+    (see FeeSchedule), the billed version column holds this version for each completed contract (and -1 for the others)
+    so later fee changes do not change the revenue of completed contracts
+
+    Contract instances are only materialised on demand (for instance when find_by_id() is called so make_displayable()
+    can be used), these are copies so changes made to them are not seen by this container, changes must be made through
+    the set_XXXXXX() methods instead, note - the columns are standard library arrays so they can be wrapped without
+    copying by other libraries that accept the buffer protocol (e.g. numpy.frombuffer(store.column("payment")))
+
+    ColumnarContractsList class - class variables:
+        __CONTRACT_TYPES: contract classes in order of their type code, as tuple, with private access
+        __NO_CONTRACTOR: contractor index used for a contract with no allocated contractor, as integer, with private
+                         access
+        __NOT_BILLED: billed version used for a contract that is not completed, as integer, with private access
+    """
+    __CONTRACT_TYPES = (Contract, FixedFeeContract, AdvertFeeContract)
+    __NO_CONTRACTOR = -1
+    __NOT_BILLED = -1
+
+    def __init__(self):
+        """
+ -      Initialiser - instance variables:
+            id_prefix: prefix shared by the identifiers of all contained contracts, as string, with private access
+            columns: map of column name to the typed array holding that column, as dictionary, with private access
+            rows: map of identifier number to row in the columns, as dictionary, with private access
+            rows_valid: flag to indicate if the rows map is up to date with the columns, as boolean, with private access
+            owners: owner of each owner index, as list, with private access
+            owner_indexes: map of owner identifier to owner index, as dictionary, with private access
+            contractors: contractor of each contractor index, as list, with private access
+            contractor_indexes: map of contractor identifier to contractor index, as dictionary, with private access
+        """
+        self.__id_prefix = None
+        self.__columns = {"id": array("q"),
+                          "payment": array("d"),
+                          "completed": array("b"),
+                          "billed_version": array("i"),
+                          "type": array("b"),
+                          "speciality": array("i"),
+                          "owner": array("i"),
+                          "contractor": array("i"),
+                          "times_viewed": array("q")}
+        self.__rows = {}
+        self.__rows_valid = True
+        self.__owners = []
+        self.__owner_indexes = {}
+        self.__contractors = []
+        self.__contractor_indexes = {}
+
+    @property
+    def data(self):
+        """
+        All the contained contracts materialised as Contract instances, note - this builds every instance so should only
+        be used where the complete list is really needed
+
+        :return: all contracts as list
+        """
+        return [self.materialise(row) for row in range(self.count())]
+
+    def __str__(self):
+        """
+        To string method
+
+        :return: string representation of this columnar contract list instance
+        """
+        return "{0}:{1}".format(ColumnarContractsList.__name__, self.count())
+
+    @classmethod
+    def from_contracts(cls, contracts):
+        """
+        Build a columnar contracts list holding the supplied contracts
+
+        :param contracts: contracts to hold as iterable of Contract instances (e.g. the data of a ContractsList)
+        :return: new ColumnarContractsList instance
+        """
+        store = cls()
+        for contract in contracts:
+            store.add(contract)
+
+        return store
+
+    def column(self, name):
+        """
+        Return a read-only view of the named column, the names are "id", "payment", "completed", "billed_version",
+        "type", "speciality", "owner", "contractor" and "times_viewed"
+
+        :param name: name of the column as string
+        :return: read-only view of the column as memoryview
+        """
+        return memoryview(self.__columns[name]).toreadonly()
+
+    def type_code(self, contract_class):
+        """
+        Return the code used in the type column for the supplied contract class
+
+        :param contract_class: Contract, FixedFeeContract or AdvertFeeContract
+        :return: type code as integer
+        """
+        return ColumnarContractsList.__CONTRACT_TYPES.index(contract_class)
+
+    def speciality_code(self, speciality):
+        """
+        Return the code used in the speciality column for the supplied speciality or -1 if the speciality is not known
+
+        :param speciality: speciality as string
+        :return: speciality code as integer
+        """
+        code = SpecialityRegistry.find_code(speciality)
+
+        return -1 if code is None else code
+
+    def count(self):
+        """
+        Return the number of contracts contained in this container
+
+        :return: number of contracts contained as integer
+        """
+        return len(self.__columns["id"])
+
+    def add(self, contract):
+        """
+        Add supplied contract to the container as a new row, but only if a contract with the given identifier does not
+        already exist in the container, return True if added successfully and False if not
+
+        :param contract: contract to add to the container as Contract instance
+        :return: True if added successfully, False if not
+        """
+        prefix, number = ColumnarContractsList.__split_id(contract.id)
+
+        # All contracts share the same identifier prefix, which is recorded from the first contract added
+        if self.__id_prefix is None:
+            self.__id_prefix = prefix
+        elif prefix != self.__id_prefix:
+            raise ValueError("Contract identifier {0} does not have prefix {1}".format(contract.id, self.__id_prefix))
+
+        if self.has(contract.id):
+            return False  # Exists so abort and return False
+
+        columns = self.__columns
+        if self.__rows_valid:
+            self.__rows[number] = len(columns["id"])
+        columns["id"].append(number)
+        columns["payment"].append(contract.payment)
+        columns["completed"].append(1 if contract.completed else 0)
+        columns["billed_version"].append(contract.billed_version if contract.completed else
+                                         ColumnarContractsList.__NOT_BILLED)
+        columns["type"].append(ColumnarContractsList.__CONTRACT_TYPES.index(type(contract)))
+        columns["speciality"].append(contract.speciality_code)
+        columns["owner"].append(self.__intern_owner(contract.owner))
+        columns["contractor"].append(self.__intern_contractor(contract.contractor_allocated))
+        columns["times_viewed"].append(getattr(contract, "times_viewed", 0))
+
+        return True  # Successful
+
+    def remove(self, contract):
+        """
+        Remove supplied contract from the container, return True if removed successfully and False if not
+
+        :param contract: contract to remove from the container as Contract instance
+        :return: True if removed successfully, False if not
+        """
+        return self.remove_by_id(contract.id)
+
+    def remove_by_id(self, ident):
+        """
+        Remove the row of the contract with supplied identifier from the container, return True if removed successfully
+        and False if not, note - later rows shift down so use remove_many() or remove_matching() to remove many rows
+
+        :param ident: identifier of the contract to be removed as string
+        :return: True if removed successfully, False if not
+        """
+        row = self.index_by_id(ident)
+
+        if row < 0:  # Does not exist so abort and return False
+            return False
+
+        # Remove the row from every column, later rows shift down by one so the rows map is rebuilt lazily
+        for column in self.__columns.values():
+            del column[row]
+        del self.__rows[ColumnarContractsList.__split_id(ident)[1]]
+        if row < self.count():
+            self.__rows_valid = False
+
+        return True  # Successful
+
+    def remove_many(self, idents):
+        """
+        Remove the rows of each of the contracts with the supplied identifiers from the container in a single step, each
+        column is rebuilt once (at the speed of itertools.compress()) rather than shifted once per row
+
+        :param idents: identifiers of the contracts to be removed as iterable of strings
+        :return: tuple with first entry the identifiers of the removed contracts as list and the second entry the
+                 identifiers that did not exist in the container as list
+        """
+        rows = {}
+        missing = []
+        for ident in idents:
+            row = self.index_by_id(ident)
+            if row >= 0:
+                rows.setdefault(row, ident)
+            elif ident not in missing:
+                missing.append(ident)
+
+        self.__remove_rows(rows)
+
+        return list(rows.values()), missing
+
+    def remove_matching(self, name, value):
+        """
+        Remove every row where the named column holds the supplied value in a single step (for instance the completed
+        contracts with remove_matching("completed", 1)), the rows are found with rows_matching()
+
+        :param name: name of the column as string
+        :param value: value to match (a code or index for the coded columns)
+        :return: number of rows removed as integer
+        """
+        rows = self.rows_matching(name, value)
+        self.__remove_rows(rows)
+
+        return len(rows)
+
+    def has(self, ident):
+        """
+        Check for the contract with the supplied identifier in the container
+
+        :param ident: identifier of the contract to check for in the container
+        :return: True if contract exists, False if not
+        """
+        return self.index_by_id(ident) >= 0
+
+    def index_by_id(self, ident):
+        """
+        Return the row of the contract with the supplied identifier or -1 if it does not exist in the container
+
+        :param ident: identifier of the contract for which the row is to be found as string
+        :return: row of contract if it exists or -1 if not as integer
+        """
+        try:
+            prefix, number = ColumnarContractsList.__split_id(ident)
+        except ValueError:
+            return -1  # Not a well formed contract identifier so cannot exist
+
+        if prefix != self.__id_prefix:
+            return -1
+
+        if not self.__rows_valid:
+            self.__rows = {number: row for row, number in enumerate(self.__columns["id"])}
+            self.__rows_valid = True
+
+        return self.__rows.get(number, -1)
+
+    def index_of(self, contract):
+        """
+        Return the row of the supplied contract or -1 if it does not exist in the container
+
+        :param contract: contract for which row is to be found as Contract instance
+        :return: row of contract if it exists or -1 if not as integer
+        """
+        return self.index_by_id(contract.id)
+
+    def find_by_id(self, ident):
+        """
+        Return the contract with the supplied identifier materialised as a Contract instance or None if it does not
+        exist in the container
+
+        :param ident: identifier of the contract to be found as string
+        :return: contract instance if it exists or None if not
+        """
+        row = self.index_by_id(ident)
+
+        return self.materialise(row) if row >= 0 else None
+
+    def materialise(self, row):
+        """
+        Build a Contract instance (of the correct contract class) from the supplied row
+
+        :param row: row of the contract to build as integer
+        :return: contract as Contract instance
+        """
+        columns = self.__columns
+        contract_class = ColumnarContractsList.__CONTRACT_TYPES[columns["type"][row]]
+        contractor_index = columns["contractor"][row]
+        arguments = [self.__id_prefix + str(columns["id"][row]),
+                     self.__owners[columns["owner"][row]],
+                     SpecialityRegistry.name_of(columns["speciality"][row]),
+                     columns["payment"][row],
+                     self.__contractors[contractor_index] if contractor_index != ColumnarContractsList.__NO_CONTRACTOR
+                     else None,
+                     bool(columns["completed"][row]),
+                     columns["billed_version"][row] if columns["completed"][row] else None]
+        if contract_class is AdvertFeeContract:
+            return contract_class.restore(*arguments, times_viewed=columns["times_viewed"][row])
+
+        return contract_class.restore(*arguments)
+
+    def set_contractor_allocated(self, ident, contractor):
+        """
+        Change the allocated contractor of the contract with the supplied identifier
+
+        :param ident: identifier of the contract as string
+        :param contractor: contractor to allocate as Contractor instance or None
+        :return: True if changed successfully, False if the contract does not exist
+        """
+        return self.__set(ident, "contractor", self.__intern_contractor(contractor))
+
+    def set_completed(self, ident, completed):
+        """
+        Change the completed flag of the contract with the supplied identifier, a contract that is completed is billed
+        under the current fee schedule version from then on, as Contract.completed does
+
+        :param ident: identifier of the contract as string
+        :param completed: new completed flag as boolean
+        :return: True if changed successfully, False if the contract does not exist
+        """
+        row = self.index_by_id(ident)
+        if row < 0:
+            return False
+
+        columns = self.__columns
+        if not completed:
+            columns["billed_version"][row] = ColumnarContractsList.__NOT_BILLED
+        elif not columns["completed"][row]:  # Freeze the fee schedule version this contract is billed under
+            columns["billed_version"][row] = FeeSchedule.epoch()
+        columns["completed"][row] = 1 if completed else 0
+
+        return True
+
+    def set_times_viewed(self, ident, times_viewed):
+        """
+        Change the times viewed count of the contract with the supplied identifier
+
+        :param ident: identifier of the contract as string
+        :param times_viewed: new times viewed count as integer
+        :return: True if changed successfully, False if the contract does not exist
+        """
+        return self.__set(ident, "times_viewed", int(times_viewed))
+
+    def get_with_owner(self, owner):
+        """
+        Provides a list of all the contained contracts that have the supplied owner, materialised as Contract instances
+
+        :param owner: this is the owner to match with contracts as Client instance
+        :return: All contracts with supplied owner as list
+        """
+        return self.__materialise_matching("owner", self.__owner_indexes.get(owner.id))
+
+    def get_with_speciality(self, speciality):
+        """
+        Provides a list of all the contained contracts that have the supplied speciality, materialised as Contract
+        instances
+
+        :param speciality: this is the speciality to match with contracts as string
+        :return: All contracts with supplied speciality as list
+        """
+        return self.__materialise_matching("speciality", SpecialityRegistry.find_code(speciality))
+
+    def get_all_unallocated(self):
+        """
+        Provides a list of all the contained contracts that have not as yet been allocated to a contractor, materialised
+        as Contract instances
+
+        :return: All contracts not as yet allocated as list
+        """
+        return self.__materialise_matching("contractor", ColumnarContractsList.__NO_CONTRACTOR)
+
+    def get_with_contractor(self, contractor):
+        """
+        Provides a list of all the contained contracts that have been allocated to the supplied contractor, materialised
+        as Contract instances
+
+        :param contractor: this is the contractor to match with contracts as Contractor instance
+        :return: All contracts allocated to supplied contractor as list
+        """
+        return self.__materialise_matching("contractor", self.__contractor_indexes.get(contractor.id))
+
+    def calculate_revenue(self):
+        """
+        Calculate the realised revenue (from completed contracts, each under the fee schedule version it was billed
+        under) and potential revenue (from contracts not yet completed) of all the contained contracts directly from the
+        columns
+
+        :return: tuple of realised revenue as float and potential revenue as float
+        """
+        columns = self.__columns
+
+        return RevenueCalculator.calculate_for_columns(columns["payment"], columns["completed"], columns["type"],
+                                                       columns["times_viewed"], self.type_code(FixedFeeContract),
+                                                       self.type_code(AdvertFeeContract), columns["billed_version"])
+
+    def rows_matching(self, name, value):
+        """
+        Return the rows where the named column holds the supplied value, this scans the column without materialising
+        any contracts or visiting each row from Python code, the value is encoded as the bytes of one cell and searched
+        for in the bytes of the column with bytes.find(), which runs at the speed of memory, so only the matching rows
+        are visited (a match that does not start on a cell boundary is skipped), note - the payment column is compared
+        with == by a C level map() instead since -0.0 and 0.0 are equal but have different bytes
+
+        :param name: name of the column as string
+        :param value: value to match (a code or index for the coded columns)
+        :return: matching rows as list of integers
+        """
+        column = self.__columns[name]
+        if column.typecode == "d":
+            return list(compress(range(len(column)), map(float(value).__eq__, column)))
+
+        try:
+            cell = array(column.typecode, [value]).tobytes()
+        except OverflowError:
+            return []  # Outside the range of the column so no cell can hold it
+
+        cells = column.tobytes()
+        size = column.itemsize
+        rows = []
+        position = cells.find(cell)
+        while position >= 0:
+            offset = position % size
+            if offset:
+                position = cells.find(cell, position + size - offset)  # Carry on from the next cell boundary
+            else:
+                rows.append(position // size)
+                position = cells.find(cell, position + size)
+
+        return rows
+
+    def __materialise_matching(self, name, value):
+        """
+        Materialise the contracts in the rows where the named column holds the supplied value
+
+        :param name: name of the column as string
+        :param value: value to match or None if nothing can match
+        :return: matching contracts as list
+        """
+        if value is None:
+            return []
+
+        return [self.materialise(row) for row in self.rows_matching(name, value)]
+
+    def __remove_rows(self, rows):
+        """
+        Remove the supplied rows from every column, each column is replaced by a new array of the rows kept so that
+        views returned by column() before the removal are left unchanged, the rows map is rebuilt when next used
+
+        :param rows: rows to remove as iterable of integers
+        :return: None
+        """
+        keep = bytearray(b"\x01") * self.count()
+        for row in rows:
+            keep[row] = 0
+        if keep.count(0) == 0:
+            return
+
+        for name, column in self.__columns.items():
+            self.__columns[name] = array(column.typecode, compress(column, keep))
+        self.__rows_valid = False
+
+    def __set(self, ident, name, value):
+        """
+        Set the named column of the row of the contract with the supplied identifier
+
+        :param ident: identifier of the contract as string
+        :param name: name of the column as string
+        :param value: value to store in the column
+        :return: True if changed successfully, False if the contract does not exist
+        """
+        row = self.index_by_id(ident)
+        if row < 0:
+            return False
+
+        self.__columns[name][row] = value
+
+        return True
+
+    def __intern_owner(self, owner):
+        """
+        Return the index of the supplied owner, adding it to the owners dimension table if it is new
+
+        :param owner: owner as Client instance
+        :return: owner index as integer
+        """
+        index = self.__owner_indexes.get(owner.id)
+        if index is None:
+            index = len(self.__owners)
+            self.__owners.append(owner)
+            self.__owner_indexes[owner.id] = index
+
+        return index
+
+    def __intern_contractor(self, contractor):
+        """
+        Return the index of the supplied contractor, adding it to the contractors dimension table if it is new
+
+        :param contractor: contractor as Contractor instance or None
+        :return: contractor index as integer or -1 for None
+        """
+        if not contractor:
+            return ColumnarContractsList.__NO_CONTRACTOR
+
+        index = self.__contractor_indexes.get(contractor.id)
+        if index is None:
+            index = len(self.__contractors)
+            self.__contractors.append(contractor)
+            self.__contractor_indexes[contractor.id] = index
+
+        return index
+
+    @staticmethod
+    def __split_id(ident):
+        """
+        Split a contract identifier into its letter prefix and its number
+
+        :param ident: contract identifier as string
+        :return: tuple of prefix as string and number as integer
+        """
+        ident = str(ident)
+
+        return ident[:2], int(ident[2:])
@@ -5,6 +5,8 @@
 
 # Imports
 from data_model.identified_entity import IdentifiedEntity
+from data_model.speciality_registry import SpecialityRegistry
+from data_model.fee_schedule import FeeSchedule
 
 
 # Consts
@@ -15,11 +17,12 @@ from data_model.identified_entity import IdentifiedEntity
 class Contract(IdentifiedEntity):
     """
     Contract entity class - class variables:
-        __next_id: from base class
+        __id_allocator: from base class
         __ID_PREFIX: two letter prefix for each unique identifier, as string, with private access
         base_commission: percentage of payment paid as commission on completion of contract, as float, with public
-                         access
+                         access (see FeeSchedule for changing it)
     """
+    __slots__ = ("__owner", "__speciality_code", "__contractor_allocated", "__payment", "__completed", "__billing")
     __ID_PREFIX = "CT"
     base_commission = 10.0  # Initial value for base commission of all contracts, this can be changed subsequently
 
@@ -29,10 +32,14 @@ class Contract(IdentifiedEntity):
             id: from base class
             owner: instance of the owner of this contract, as Client instance, property with read-only access
             speciality: speciality associated with this contract instance, as string, property with read-only access
+                        (held as its SpecialityRegistry code, which is available through the speciality_code property)
             contractor_allocated: instance of the contractor allocated to this contract, as Contractor instance,
                                   property with read/write access
             payment: payment t0 be made on completion of this contract, as float, property with read-only access
             completed: flag to indicate if the contract is completed or not, as boolean, property with read/write access
+            billing: fee schedule version the revenue is worked out under and the revenue under it (or None if not yet
+                     worked out), or None if nothing is cached, as tuple, with private access, note - the version is
+                     frozen once the contract is completed, see calculate_revenue()
 
         :param owner: to associate with this contract instance
         :param speciality: to associated with this contract instance
@@ -41,10 +48,42 @@ class Contract(IdentifiedEntity):
         """
         IdentifiedEntity.__init__(self, Contract.__ID_PREFIX)
         self.__owner = owner
-        self.__speciality = str(speciality)
+        self.__speciality_code = SpecialityRegistry.intern(speciality)
         self.__contractor_allocated = contractor_allocated
         self.__payment = float(payment)
         self.__completed = False
+        self.__billing = None
+
+    @classmethod
+    def restore(cls, ident, owner, speciality, payment, contractor_allocated=None, completed=False,
+                billed_version=None):
+        """
+        Alternative initialiser that rebuilds a contract with an existing identifier, this does not consume a new
+        identifier so is used when materialising a contract held in another form, note - works for the subclasses too
+
+        :param ident: existing identifier of the contract as string
+        :param owner: to associate with this contract instance
+        :param speciality: to associated with this contract instance
+        :param payment: to associated with this contract instance
+        :param contractor_allocated: to associated with this contract instance {optional}
+        :param completed: whether the contract is completed {optional}
+        :param billed_version: fee schedule version a completed contract was billed under or None for the current
+                               version {optional}
+        :return: rebuilt contract as instance of the class this is called on
+        """
+        contract = cls.__new__(cls)
+        contract._restore_identity(ident)
+        contract.__owner = owner
+        contract.__speciality_code = SpecialityRegistry.intern(speciality)
+        contract.__contractor_allocated = contractor_allocated
+        contract.__payment = float(payment)
+        contract.__completed = bool(completed)
+        if contract.__completed:
+            contract.__billing = (FeeSchedule.epoch() if billed_version is None else int(billed_version), None)
+        else:
+            contract.__billing = None
+
+        return contract
 
     @property
     def owner(self):
@@ -52,7 +91,11 @@ class Contract(IdentifiedEntity):
 
     @property
     def speciality(self):
-        return self.__speciality
+        return SpecialityRegistry.name_of(self.__speciality_code)
+
+    @property
+    def speciality_code(self):
+        return self.__speciality_code
 
     @property
     def contractor_allocated(self):
@@ -60,7 +103,9 @@ class Contract(IdentifiedEntity):
 
     @contractor_allocated.setter
     def contractor_allocated(self, contractor_allocated):
+        old_contractor_allocated = self.__contractor_allocated
         self.__contractor_allocated = contractor_allocated
+        self._notify_observers("contractor_allocated", old_contractor_allocated, contractor_allocated)
 
     @property
     def payment(self):
@@ -72,7 +117,15 @@ class Contract(IdentifiedEntity):
 
     @completed.setter
     def completed(self, completed):
+        old_completed = self.__completed
         self.__completed = completed
+        if completed and not old_completed:  # Freeze the fee schedule version this contract is billed under
+            epoch = FeeSchedule.epoch()
+            billing = self.__billing
+            self.__billing = billing if billing is not None and billing[0] == epoch else (epoch, None)
+        elif not completed:
+            self.__billing = None
+        self._notify_observers("completed", old_completed, completed)
 
     def __str__(self):
         """
@@ -97,7 +150,7 @@ class Contract(IdentifiedEntity):
         s += "Contractor Allocated: {0}{1}\n".format(self.contractor_allocated.id if self.contractor_allocated else
                                                      "None", " (" + self.contractor_allocated.name + ")" if
                                                      self.contractor_allocated else "")
-        s += "Base Commission: {0}%\n".format(Contract.base_commission)
+        s += "Base Commission: {0}%\n".format(self.billing_fees()["base_commission"])
         s += "Payment: £{0:.2f}\n".format(self.payment)
         s += "Completed: {0}\n".format(self.completed)
         if self.completed:  # If the contract is completed, then show how much revenue it contributed
@@ -108,12 +161,68 @@ class Contract(IdentifiedEntity):
 
         return s
 
+    @property
+    def billed_version(self):
+        """
+        Version of the fee schedule this contract was billed under
+
+        :return: version as integer or None if the contract is not completed
+        """
+        return self.__billing[0] if self.__completed and self.__billing is not None else None
+
+    def billing_fees(self):
+        """
+        Provides the fees the revenue of this contract is worked out under, these are the fees of the version it was
+        billed under if it is completed or the current fees if not
+
+        :return: map of fee name to fee as dictionary
+        """
+        return FeeSchedule.fees(self.billed_version)
+
     def calculate_revenue(self):
         """
-        Uses the base commission property to calculate the revenue from the payment made on completion of the contract:
+        Calculate the revenue from this contract under the fees of the current fee schedule version or, if the contract
+        is completed, under the version it was billed under (see FeeSchedule), the result is cached until the fees (or
+        anything else the revenue depends on) change
+
+        :return: revenue as float
+        """
+        billing = self.__billing
+        if self.__completed:
+            if billing is None:
+                billing = (FeeSchedule.epoch(), None)
+            version = billing[0]
+        else:
+            version = FeeSchedule.epoch()
+
+        if billing is not None and billing[0] == version and billing[1] is not None:
+            return billing[1]
+
+        revenue = self._calculate_revenue_under(FeeSchedule.fees(version))
+        self.__billing = (version, revenue)
+
+        return revenue
+
+    def _calculate_revenue_under(self, fees):
+        """
+        Uses the base commission to calculate the revenue from the payment made on completion of the contract:
 
             revenue = (base_commission / 100.0) * payment
 
+        :param fees: fees to use as map of fee name to fee, see FeeSchedule.fees()
         :return: revenue as float
         """
-        return (Contract.base_commission / 100.0) * self.__payment
+        return (fees["base_commission"] / 100.0) * self.__payment
+
+    def _invalidate_revenue(self):
+        """
+        Drop the cached revenue, keeping the version billed under if completed, used by subclasses when something
+        their revenue depends on changes
+
+        :return: None
+        """
+        if self.__billing is not None:
+            self.__billing = (self.__billing[0], None) if self.__completed else None
+
+
+FeeSchedule.track("base_commission", Contract, "base_commission")
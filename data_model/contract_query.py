@@ -0,0 +1,302 @@
+# File: contract_query.py
+# Description: Prototype implementation of Game Developer Contract Matcher (GDCMatcher) case study
+# Author: Chris Knowles
+
+
+# Imports
+from bisect import bisect_right
+from itertools import islice
+from data_model.identified_entities_list import IdentifiedEntitiesList
+from data_model.contract import Contract
+from data_model.fixed_fee_contract import FixedFeeContract
+from data_model.advert_fee_contract import AdvertFeeContract
+from data_model.speciality_registry import SpecialityRegistry
+
+
+# Consts
+# Globals
+
+
+# Classes
+class ContractQuery:
+    """
+    Query over the contracts held in a ContractsList that combines any of the predicates owner, speciality, allocated
+    contractor (or unallocated), completed, contract type and payment range, each predicate method returns the query
+    itself so predicates can be chained, for instance:
+
+        contracts_list.query().owner(client).speciality("C++").unallocated().payment_between(1000.0)
+
+    When the query is run the planner picks, from the predicates that have an index in the contracts list (owner,
+    speciality, contractor and unallocated), the one whose index entry holds the fewest contracts, only those contracts
+    are visited and the remaining predicates are checked against each of them as the results are produced lazily, if
+    none of the indexed predicates are used every contract is visited
+
+    ContractQuery class - class variables:
+        __CONTRACT_TYPES: map of contract type (as used by MainApp.add_contract()) to contract class, as dictionary,
+                          with private access
+    """
+    __CONTRACT_TYPES = {"b": Contract, "base": Contract,
+                        "f": FixedFeeContract, "fixed": FixedFeeContract,
+                        "a": AdvertFeeContract, "advert": AdvertFeeContract}
+
+    def __init__(self, contracts_list):
+        """
+ -      Initialiser - instance variables:
+            contracts_list: contracts list this query runs over, as ContractsList, with private access
+            owner_id: identifier of the owner to match or None for any, as string, with private access
+            speciality_code: code of the speciality to match or None for any, as integer, with private access
+            speciality_unknown: flag to indicate the speciality to match is not known so nothing can match, as boolean,
+                                with private access
+            contractor_id: identifier of the allocated contractor to match or None for any, as string, with private
+                           access
+            unallocated: flag to indicate only contracts with no allocated contractor match, as boolean, with private
+                         access
+            completed: completed flag to match or None for any, as boolean, with private access
+            contract_classes: contract classes to match or None for any, as tuple, with private access
+            minimum_payment: lowest payment to match or None for no lower limit, as float, with private access
+            maximum_payment: highest payment to match or None for no upper limit, as float, with private access
+
+        :param contracts_list: contracts list to run the query over
+        """
+        self.__contracts_list = contracts_list
+        self.__owner_id = None
+        self.__speciality_code = None
+        self.__speciality_unknown = False
+        self.__contractor_id = None
+        self.__unallocated = False
+        self.__completed = None
+        self.__contract_classes = None
+        self.__minimum_payment = None
+        self.__maximum_payment = None
+
+    def __str__(self):
+        """
+        To string method
+
+        :return: string representation of this query instance, showing the plan chosen for it
+        """
+        index, candidates = self.plan()
+
+        return "{0}:{1}:{2}".format(ContractQuery.__name__, index, "all" if candidates is None else len(candidates))
+
+    def __iter__(self):
+        """
+        Iterate over the matching contracts, see execute()
+
+        :return: iterator over the matching contracts
+        """
+        return self.execute()
+
+    def owner(self, owner):
+        """
+        Match only contracts with the supplied owner
+
+        :param owner: owner to match as Client instance
+        :return: this query
+        """
+        self.__owner_id = owner.id
+
+        return self
+
+    def speciality(self, speciality):
+        """
+        Match only contracts with the supplied speciality
+
+        :param speciality: speciality to match as string
+        :return: this query
+        """
+        self.__speciality_code = SpecialityRegistry.find_code(speciality)
+        self.__speciality_unknown = self.__speciality_code is None
+
+        return self
+
+    def contractor(self, contractor):
+        """
+        Match only contracts allocated to the supplied contractor
+
+        :param contractor: contractor to match as Contractor instance
+        :return: this query
+        """
+        self.__contractor_id = contractor.id
+
+        return self
+
+    def unallocated(self):
+        """
+        Match only contracts with no allocated contractor
+
+        :return: this query
+        """
+        self.__unallocated = True
+
+        return self
+
+    def completed(self, completed=True):
+        """
+        Match only contracts with the supplied completed flag
+
+        :param completed: completed flag to match as boolean {optional}
+        :return: this query
+        """
+        self.__completed = bool(completed)
+
+        return self
+
+    def contract_type(self, *contract_types):
+        """
+        Match only contracts of the supplied types, each type is either a contract type as used by
+        MainApp.add_contract() (e.g. "b" or "base") or a contract class, note - a contract only matches a class it is
+        an instance of exactly so "base" does not match fixed fee or advert fee contracts
+
+        :param contract_types: types to match
+        :return: this query
+        """
+        self.__contract_classes = tuple(ContractQuery.__CONTRACT_TYPES.get(contract_type, contract_type)
+                                        for contract_type in contract_types)
+
+        return self
+
+    def payment_between(self, minimum=None, maximum=None):
+        """
+        Match only contracts with a payment in the supplied range, the limits are inclusive and either can be None for
+        no limit
+
+        :param minimum: lowest payment to match as float {optional}
+        :param maximum: highest payment to match as float {optional}
+        :return: this query
+        """
+        self.__minimum_payment = None if minimum is None else float(minimum)
+        self.__maximum_payment = None if maximum is None else float(maximum)
+
+        return self
+
+    def plan(self):
+        """
+        Choose the index to run this query from, this is the index entry holding the fewest contracts among those for
+        the indexed predicates that have been used
+
+        :return: tuple with first entry the name of the chosen index (or "scan" if every contract has to be visited)
+                 and the second entry the candidate contracts from that index entry (or None when scanning)
+        """
+        # Find the index entry for each indexed predicate in use, these are live so their sizes are known at no cost
+        entries = []
+        if self.__owner_id is not None:
+            entries.append(("owner", self.__contracts_list.index_entry("owner", self.__owner_id)))
+        if self.__speciality_code is not None:
+            entries.append(("speciality", self.__contracts_list.index_entry("speciality", self.__speciality_code)))
+        if self.__contractor_id is not None:
+            entries.append(("contractor", self.__contracts_list.index_entry("contractor", self.__contractor_id)))
+        if self.__unallocated:
+            entries.append(("unallocated", self.__contracts_list.index_entry("unallocated")))
+
+        if not entries:
+            return "scan", None
+
+        index, entry = min(entries, key=lambda named_entry: len(named_entry[1]))
+
+        return index, entry
+
+    def execute(self):
+        """
+        Run the query, producing the matching contracts lazily in the order they are held by the chosen index
+
+        :return: generator of the matching contracts
+        """
+        # Predicates that cannot be satisfied match nothing without visiting any contracts
+        if self.__speciality_unknown or (self.__unallocated and self.__contractor_id is not None):
+            return
+
+        index, candidates = self.plan()
+        if candidates is None:
+            source = self.__contracts_list
+        else:
+            # Only the identifiers are copied so that contracts can safely be changed (e.g. allocated) while results are
+            # used, each contract is read from the live entry as it is reached and skipped if it has left the entry
+            source = (candidates.get(ident) for ident in tuple(candidates))
+
+        for contract in source:
+            if contract is not None and self.__matches(contract):
+                yield contract
+
+    def page(self, page_size, token=None):
+        """
+        Run the query for just the next page of matching contracts following the contract the supplied token came from
+        (or the first page if no token is supplied), pages are in the order the contracts were added to the contracts
+        list (which may differ from the order of execute()) so the token stays valid while contracts are changed between
+        pages, note - when an index is used its entry is already in that order so the start of the page is found with a
+        binary search
+
+        :param page_size: largest number of contracts on the page as integer
+        :param token: resume token returned with the previous page {optional}
+        :return: tuple with first entry the matching contracts on the page as list and the second entry the resume
+                 token for the next page or None if there are no more matching contracts
+        """
+        if self.__speciality_unknown or (self.__unallocated and self.__contractor_id is not None):
+            return [], None
+
+        index, candidates = self.plan()
+        sequence_of = self.__contracts_list.sequence_of
+
+        if candidates is None:
+            source = self.__contracts_list.iter_after(token)
+        else:
+            ordered = list(candidates.values())
+            start = 0 if token is None else bisect_right(ordered, token, key=lambda contract: sequence_of(contract.id))
+            source = islice(ordered, start, None)
+
+        contracts = list(islice((contract for contract in source if self.__matches(contract)), int(page_size) + 1))
+
+        return IdentifiedEntitiesList.paginate(contracts, page_size, lambda contract: sequence_of(contract.id))
+
+    def to_list(self):
+        """
+        Run the query and collect every matching contract
+
+        :return: matching contracts as list
+        """
+        return list(self.execute())
+
+    def first(self):
+        """
+        Run the query until the first matching contract is found
+
+        :return: first matching contract or None if no contracts match
+        """
+        return next(self.execute(), None)
+
+    def count(self):
+        """
+        Run the query and count the matching contracts
+
+        :return: number of matching contracts as integer
+        """
+        return sum(1 for contract in self.execute())
+
+    def __matches(self, contract):
+        """
+        Check the supplied contract against every predicate of this query
+
+        :param contract: contract to check as Contract instance
+        :return: True if the contract matches, False if not
+        """
+        if self.__owner_id is not None and contract.owner.id != self.__owner_id:
+            return False
+        if self.__speciality_code is not None and contract.speciality_code != self.__speciality_code:
+            return False
+
+        contractor = contract.contractor_allocated
+        if self.__contractor_id is not None and (not contractor or contractor.id != self.__contractor_id):
+            return False
+        if self.__unallocated and contractor:
+            return False
+
+        if self.__completed is not None and contract.completed != self.__completed:
+            return False
+        if self.__contract_classes is not None and type(contract) not in self.__contract_classes:
+            return False
+        if self.__minimum_payment is not None and contract.payment < self.__minimum_payment:
+            return False
+        if self.__maximum_payment is not None and contract.payment > self.__maximum_payment:
+            return False
+
+        return True
@@ -6,6 +6,7 @@
 # Imports
 from data_model.identified_entity import IdentifiedEntity
 from data_model.named_entity import NamedEntity
+from data_model.speciality_registry import SpecialityRegistry
 
 
 # Consts
@@ -16,9 +17,10 @@ from data_model.named_entity import NamedEntity
 class Contractor(IdentifiedEntity, NamedEntity):
     """
     Contractor entity class - class variables:
-        __next_id: from base class
+        __id_allocator: from base class
         __ID_PREFIX: two letter prefix for each unique identifier, as string, with private access
     """
+    __slots__ = ("_NamedEntity__name", "__speciality_code")
     __ID_PREFIX = "CR"
 
     def __init__(self, name, speciality):
@@ -27,21 +29,46 @@ class Contractor(IdentifiedEntity, NamedEntity):
             id: from base class
             name: from base class
             speciality: speciality associated with this contractor instance, as string, property with read/write access
+                        (held as its SpecialityRegistry code, which is available through the speciality_code property)
 
         :param name: to associate with this contractor instance
         :param speciality: to associated with this contractor instance
         """
         IdentifiedEntity.__init__(self, Contractor.__ID_PREFIX)
         NamedEntity.__init__(self, name)
-        self.__speciality = str(speciality)
+        self.__speciality_code = SpecialityRegistry.intern(speciality)
+
+    @classmethod
+    def restore(cls, ident, name, speciality):
+        """
+        Alternative initialiser that rebuilds a contractor with an existing identifier, this does not consume a new
+        identifier so is used when materialising a contractor held in another form (for instance a snapshot)
+
+        :param ident: existing identifier of the contractor as string
+        :param name: to associate with this contractor instance
+        :param speciality: to associated with this contractor instance
+        :return: rebuilt contractor as Contractor instance
+        """
+        contractor = cls.__new__(cls)
+        contractor._restore_identity(ident)
+        NamedEntity.__init__(contractor, name)
+        contractor.__speciality_code = SpecialityRegistry.intern(speciality)
+
+        return contractor
 
     @property
     def speciality(self):
-        return self.__speciality
+        return SpecialityRegistry.name_of(self.__speciality_code)
 
     @speciality.setter
     def speciality(self, speciality):
-        self.__speciality = str(speciality)
+        old_speciality_code = self.__speciality_code
+        self.__speciality_code = SpecialityRegistry.intern(speciality)
+        self._notify_observers("speciality_code", old_speciality_code, self.__speciality_code)
+
+    @property
+    def speciality_code(self):
+        return self.__speciality_code
 
     def __str__(self):
         """
@@ -5,6 +5,7 @@
 
 # Imports
 from data_model.identified_entities_list import IdentifiedEntitiesList
+from data_model.speciality_registry import SpecialityRegistry
 
 
 # Consts
@@ -15,15 +16,29 @@ from data_model.identified_entities_list import IdentifiedEntitiesList
 class ContractorsList(IdentifiedEntitiesList):
     """
     Container for Contractor class instances, adds a method that returns a list of all Contractor instances held in
-    this container that have a supplied speciality
+    this container that have a supplied speciality and a method that returns how many Contractor instances held in
+    this container have a supplied speciality
+
+    Both are answered from an inverted index of speciality code (see SpecialityRegistry) to contractors that is kept up
+    to date as contractors are added and removed and as the speciality of a contained contractor is changed (this
+    container observes each contractor it holds), note - each index entry is a dictionary of contractor identifier to
+    contractor which is used as an insertion ordered set
     """
 
-    def __init__(self):
+    def __init__(self, lazy_removal=False, compaction_threshold=0.5):
         """
  -      Initialiser - instance variables:
             data: from base class
+            lazy_removal: from base class
+            compaction_threshold: from base class
+            by_speciality: map of speciality code to the contractors with that speciality, as dictionary, with private
+                           access
+
+        :param lazy_removal: whether removal leaves a tombstone {optional}
+        :param compaction_threshold: fraction of the list that may be tombstones before it is compacted {optional}
         """
-        super().__init__()
+        self.__by_speciality = {}
+        super().__init__(lazy_removal, compaction_threshold)
 
     def __str__(self):
         """
@@ -41,9 +56,106 @@ class ContractorsList(IdentifiedEntitiesList):
         :param speciality: this is the speciality to match with Contractor instances as string
         :return: All Contractor instances with supplied speciality as list
         """
+        self._entities()  # Ensure the index reflects any direct changes to the data list
+
+        return list(self.__by_speciality.get(SpecialityRegistry.find_code(speciality), {}).values())
+
+    def get_with_similar_speciality(self, speciality, threshold=None):
+        """
+        Provides a list of all the contained Contractor instances that have a speciality similar to the supplied
+        speciality (see SpecialityRegistry.similar_codes()), those with the most similar speciality first
+
+        :param speciality: this is the speciality to match with Contractor instances as string
+        :param threshold: lowest similarity to match (0.0 to 1.0) or None for the registry default {optional}
+        :return: All Contractor instances with a similar speciality as list
+        """
+        self._entities()
+
         contractors = []
-        for contractor in self.data:
-            if contractor.speciality == speciality:
-                contractors.append(contractor)
+        for code in SpecialityRegistry.similar_codes(speciality, threshold):
+            contractors.extend(self.__by_speciality.get(code, {}).values())
 
         return contractors
+
+    def count_with_speciality(self, speciality):
+        """
+        Provides the number of contained Contractor instances that have the supplied speciality
+
+        :param speciality: this is the speciality to match with Contractor instances as string
+        :return: number of Contractor instances with supplied speciality as integer
+        """
+        self._entities()
+
+        return len(self.__by_speciality.get(SpecialityRegistry.find_code(speciality), {}))
+
+    def get_speciality_counts(self):
+        """
+        Provides the number of contained Contractor instances for every speciality held by at least one of them
+
+        :return: map of speciality to number of Contractor instances as dictionary
+        """
+        self._entities()
+
+        return {SpecialityRegistry.name_of(code): len(contractors)
+                for code, contractors in self.__by_speciality.items()}
+
+    def entity_changed(self, entity, attribute, old_value, new_value):
+        """
+        Observer method called by a contained contractor when one of its watched properties changes, used to move the
+        contractor between entries of the speciality index when its speciality changes
+
+        :param entity: contractor that has changed as Contractor instance
+        :param attribute: name of the property that has changed as string
+        :param old_value: value of the property before the change
+        :param new_value: value of the property after the change
+        :return: None
+        """
+        # Ignore changes to contractors that are no longer held by this container
+        if attribute != "speciality_code" or self._entities().get(entity.id) is not entity:
+            return
+
+        self.__unindex_speciality(entity, old_value)
+        self.__by_speciality.setdefault(new_value, {})[entity.id] = entity
+
+    def _entity_added(self, entity):
+        """
+        Add the supplied contractor to the speciality index and start observing it for changes
+
+        :param entity: contractor that has been added as Contractor instance
+        :return: None
+        """
+        self.__by_speciality.setdefault(entity.speciality_code, {})[entity.id] = entity
+        entity.add_observer(self)
+
+    def _entity_removed(self, entity):
+        """
+        Remove the supplied contractor from the speciality index and stop observing it for changes
+
+        :param entity: contractor that has been removed as Contractor instance
+        :return: None
+        """
+        entity.remove_observer(self)
+        self.__unindex_speciality(entity, entity.speciality_code)
+
+    def _entities_reset(self):
+        """
+        Clear the speciality index ready for it to be rebuilt
+
+        :return: None
+        """
+        self.__by_speciality = {}
+
+    def __unindex_speciality(self, contractor, speciality_code):
+        """
+        Remove the supplied contractor from the speciality index entry for the supplied speciality code, removing the
+        entry itself once it is empty
+
+        :param contractor: contractor to remove from the index as Contractor instance
+        :param speciality_code: code of the speciality the contractor is indexed under as integer
+        :return: None
+        """
+        entry = self.__by_speciality.get(speciality_code)
+        if entry is not None:
+            entry.pop(contractor.id, None)
+            if not entry:
+                del self.__by_speciality[speciality_code]
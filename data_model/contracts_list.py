@@ -4,7 +4,10 @@
 
 
 # Imports
+from bisect import bisect_right
 from data_model.identified_entities_list import IdentifiedEntitiesList
+from data_model.speciality_registry import SpecialityRegistry
+from data_model.contract_query import ContractQuery
 
 
 # Consts
@@ -19,14 +22,35 @@ class ContractsList(IdentifiedEntitiesList):
     have a supplied owner, return a list of all Contract instances held in this container that have not yet been
     allocated a Contractor instance and return a list of all Contract instances held in this container that are
     allocated to a supplied Contractor instance
+
+    Each of these queries is answered from an index that is kept up to date as contracts are added and removed and as
+    the contractor allocated to a contained contract is changed (this container observes each contract it holds), so the
+    cost of a query depends only on the size of its result, note - each index entry is a dictionary of contract
+    identifier to contract which is used as an ordered set, kept in the order of the contracts' sequence numbers (the
+    order they were added) so a query can page through an entry without sorting it
     """
 
-    def __init__(self):
+    def __init__(self, lazy_removal=False, compaction_threshold=0.5):
         """
  -      Initialiser - instance variables:
             data: from base class
+            lazy_removal: from base class
+            compaction_threshold: from base class
+            by_owner: map of owner identifier to the contracts with that owner, as dictionary, with private access
+            by_speciality: map of speciality code (see SpecialityRegistry) to the contracts with that speciality, as
+                           dictionary, with private access
+            by_contractor: map of contractor identifier to the contracts allocated to that contractor, as dictionary,
+                           with private access
+            unallocated: contracts with no allocated contractor, as dictionary, with private access
+
+        :param lazy_removal: whether removal leaves a tombstone {optional}
+        :param compaction_threshold: fraction of the list that may be tombstones before it is compacted {optional}
         """
-        super().__init__()
+        self.__by_owner = {}
+        self.__by_speciality = {}
+        self.__by_contractor = {}
+        self.__unallocated = {}
+        super().__init__(lazy_removal, compaction_threshold)
 
     def __str__(self):
         """
@@ -44,12 +68,9 @@ class ContractsList(IdentifiedEntitiesList):
         :param owner: this is the owner to match with Contract instances as Client instance
         :return: All Contract instances with supplied owner identifier as list
         """
-        contracts = []
-        for contract in self.data:
-            if contract.owner.id == owner.id:
-                contracts.append(contract)
+        self._entities()  # Ensure the indexes reflect any direct changes to the data list
 
-        return contracts
+        return list(self.__by_owner.get(owner.id, {}).values())
 
     def get_with_speciality(self, speciality):
         """
@@ -59,12 +80,9 @@ class ContractsList(IdentifiedEntitiesList):
         :param speciality: this is the speciality to match with Contract instances as string
         :return: All Contract instances with supplied speciality as list
         """
-        contracts = []
-        for contract in self.data:
-            if contract.speciality == speciality:
-                contracts.append(contract)
+        self._entities()
 
-        return contracts
+        return list(self.__by_speciality.get(SpecialityRegistry.find_code(speciality), {}).values())
 
     def get_all_unallocated(self):
         """
@@ -73,12 +91,9 @@ class ContractsList(IdentifiedEntitiesList):
 
         :return: All Contract instances not as yet allocated as list
         """
-        contracts = []
-        for contract in self.data:
-            if not contract.contractor_allocated:
-                contracts.append(contract)
+        self._entities()
 
-        return contracts
+        return list(self.__unallocated.values())
 
     def get_with_contractor(self, contractor):
         """
@@ -88,10 +103,172 @@ class ContractsList(IdentifiedEntitiesList):
         :param contractor: this is the contractor to match with Contract instances as Contractor instance
         :return: All Contract instances with supplied speciality as list
         """
-        contracts = []
-        for contract in self.data:
-            # Must check that Contractor instance is not None, if it is then cannot be a match
-            if contract.contractor_allocated and contract.contractor_allocated.id == contractor.id:
-                contracts.append(contract)
+        self._entities()
+
+        return list(self.__by_contractor.get(contractor.id, {}).values())
+
+    def has_with_owner(self, owner):
+        """
+        Check if any of the contained Contract instances have the supplied owner
+
+        :param owner: this is the owner to match with Contract instances as Client instance
+        :return: True if at least one Contract instance has the supplied owner, False if not
+        """
+        self._entities()
+
+        return owner.id in self.__by_owner
+
+    def has_with_contractor(self, contractor):
+        """
+        Check if any of the contained Contract instances have been allocated to the supplied Contractor instance
+
+        :param contractor: this is the contractor to match with Contract instances as Contractor instance
+        :return: True if at least one Contract instance is allocated to the supplied contractor, False if not
+        """
+        self._entities()
+
+        return contractor.id in self.__by_contractor
+
+    def query(self):
+        """
+        Start a query over the contained Contract instances that can combine several predicates, see ContractQuery
+
+        :return: new query as ContractQuery instance
+        """
+        return ContractQuery(self)
+
+    def index_entry(self, name, key=None):
+        """
+        Provides the live entry of the named index for the supplied key, used by ContractQuery to size and read the
+        candidates for a query, note - the entry must not be changed and is empty if no contracts are indexed under key
+
+        :param name: name of the index, one of "owner", "speciality", "contractor" or "unallocated"
+        :param key: owner identifier, speciality code or contractor identifier (not used for "unallocated")
+        :return: map of contract identifier to contract for the index entry as dictionary
+        """
+        self._entities()
+
+        if name == "unallocated":
+            return self.__unallocated
+
+        index = {"owner": self.__by_owner, "speciality": self.__by_speciality, "contractor": self.__by_contractor}[name]
+
+        return index.get(key, {})
+
+    def entity_changed(self, entity, attribute, old_value, new_value):
+        """
+        Observer method called by a contained contract when one of its watched properties changes, used to move the
+        contract between the contractor and unallocated indexes when its allocated contractor changes
+
+        :param entity: contract that has changed as Contract instance
+        :param attribute: name of the property that has changed as string
+        :param old_value: value of the property before the change
+        :param new_value: value of the property after the change
+        :return: None
+        """
+        # Ignore changes to contracts that are no longer held by this container
+        if attribute != "contractor_allocated" or self._entities().get(entity.id) is not entity:
+            return
 
-        return contracts
+        self.__unindex_contractor(entity, old_value)
+        self.__index_contractor(entity, new_value)
+
+    def _entity_added(self, entity):
+        """
+        Add the supplied contract to each of the indexes and start observing it for changes
+
+        :param entity: contract that has been added as Contract instance
+        :return: None
+        """
+        self.__insert(self.__by_owner.setdefault(entity.owner.id, {}), entity)
+        self.__insert(self.__by_speciality.setdefault(entity.speciality_code, {}), entity)
+        self.__index_contractor(entity, entity.contractor_allocated)
+        entity.add_observer(self)
+
+    def _entity_removed(self, entity):
+        """
+        Remove the supplied contract from each of the indexes and stop observing it for changes
+
+        :param entity: contract that has been removed as Contract instance
+        :return: None
+        """
+        entity.remove_observer(self)
+        ContractsList.__discard(self.__by_owner, entity.owner.id, entity)
+        ContractsList.__discard(self.__by_speciality, entity.speciality_code, entity)
+        self.__unindex_contractor(entity, entity.contractor_allocated)
+
+    def _entities_reset(self):
+        """
+        Clear each of the indexes ready for them to be rebuilt
+
+        :return: None
+        """
+        self.__by_owner = {}
+        self.__by_speciality = {}
+        self.__by_contractor = {}
+        self.__unallocated = {}
+
+    def __index_contractor(self, contract, contractor):
+        """
+        Record the supplied contract against the supplied contractor, or as unallocated if there is no contractor
+
+        :param contract: contract to index as Contract instance
+        :param contractor: contractor allocated to the contract as Contractor instance or None
+        :return: None
+        """
+        if contractor:
+            self.__insert(self.__by_contractor.setdefault(contractor.id, {}), contract)
+        else:
+            self.__insert(self.__unallocated, contract)
+
+    def __unindex_contractor(self, contract, contractor):
+        """
+        Remove the record of the supplied contract against the supplied contractor, or as unallocated if there is no
+        contractor
+
+        :param contract: contract to remove from the index as Contract instance
+        :param contractor: contractor allocated to the contract as Contractor instance or None
+        :return: None
+        """
+        if contractor:
+            ContractsList.__discard(self.__by_contractor, contractor.id, contract)
+        else:
+            self.__unallocated.pop(contract.id, None)
+
+    def __insert(self, entry, contract):
+        """
+        Add the supplied contract to an index entry in sequence order, a contract added to the container always goes on
+        the end, only one moved into the entry (for instance an older contract allocated to a contractor) has to be
+        put in place, which rebuilds the entry in place so it stays the same dictionary object
+
+        :param entry: index entry as dictionary
+        :param contract: contract to add as Contract instance
+        :return: None
+        """
+        sequences = self._sequences()
+        sequence = sequences[contract.id]
+        if not entry or sequences[next(reversed(entry))] < sequence:
+            entry[contract.id] = contract
+            return
+
+        items = list(entry.items())
+        items.insert(bisect_right(items, sequence, key=lambda item: sequences[item[0]]), (contract.id, contract))
+        entry.clear()
+        entry.update(items)
+
+    @staticmethod
+    def __discard(index, key, contract):
+        """
+        Remove the supplied contract from the entry of the supplied index with the supplied key, removing the entry
+        itself once it is empty so that existence checks on the index stay accurate
+
+        :param index: index to remove the contract from as dictionary
+        :param key: key of the index entry holding the contract
+        :param contract: contract to remove as Contract instance
+        :return: None
+        """
+        entry = index.get(key)
+        if entry is not None:
+            entry.pop(contract.id, None)
+            if not entry:
+                del index[key]
@@ -0,0 +1,154 @@
+# File: fee_schedule.py
+# Description: Prototype implementation of Game Developer Contract Matcher (GDCMatcher) case study
+# Author: Chris Knowles
+
+
+# Imports
+import threading
+
+
+# Consts
+# Globals
+
+
+# Classes
+class FeeSchedule:
+    """
+    Versioned schedule of the fees used to calculate contract revenue, every change of any fee adds a new version and
+    the epoch (the number of the current version, starting at 0) goes up by one, so a revenue worked out under one
+    epoch can be cached and is known to be out of date as soon as the epoch moves on, and a completed contract can keep
+    the version it was billed under and always be billed the same amount
+
+    The fees are still held in the public class variables Contract.base_commission, FixedFeeContract.fixed_fee and
+    AdvertFeeContract.fixed_fee, each contract class registers its fee here with track() when its module is imported,
+    change fees with set_fees(), which writes the class variables too, but a direct assignment to a class variable is
+    also noticed the next time the epoch is read and a new version added for it
+
+    FeeSchedule class - class variables:
+        __versions: fees of each version by fee name, as list of dictionaries, with private access
+        __sources: class variable holding each fee, as list of (fee name, class, attribute name) tuples, with private
+                   access
+        __lock: lock held while a new version is added, as threading.Lock, with private access
+    """
+    __versions = [{}]
+    __sources = []
+    __lock = threading.Lock()
+
+    @classmethod
+    def track(cls, name, owner, attribute):
+        """
+        Register the class variable holding a fee, its current value becomes the value of the fee in the current
+        version, called as each contract module is imported
+
+        :param name: name of the fee as string (e.g. "base_commission")
+        :param owner: class holding the fee
+        :param attribute: name of the class variable holding the fee as string
+        :return: None
+        """
+        with cls.__lock:
+            cls.__sources.append((name, owner, attribute))
+            cls.__versions[-1][name] = getattr(owner, attribute)
+
+    @classmethod
+    def epoch(cls):
+        """
+        Return the number of the current version, first adding a new version if a fee class variable has been assigned
+        directly since the current version was made
+
+        :return: epoch as integer
+        """
+        current = cls.__versions[-1]
+        for name, owner, attribute in cls.__sources:
+            if getattr(owner, attribute) != current[name]:
+                return cls.__add_version({})
+
+        return len(cls.__versions) - 1
+
+    @classmethod
+    def fees(cls, version=None):
+        """
+        Return the fees of the supplied version
+
+        :param version: number of the version or None for the current version {optional}
+        :return: map of fee name to fee as dictionary, this must not be changed
+        """
+        return cls.__versions[cls.epoch() if version is None else version]
+
+    @classmethod
+    def set_fees(cls, **fees):
+        """
+        Change one or more fees (base_commission, fixed_fee or advert_fee) in a single new version
+
+        :param fees: new value of each fee to change by fee name
+        :return: epoch of the new version as integer
+        """
+        known = {name for name, owner, attribute in cls.__sources}
+        for name in fees:
+            if name not in known:
+                raise ValueError("Unknown fee {0}, expected one of {1}".format(name, sorted(known)))
+
+        return cls.__add_version({name: float(fee) for name, fee in fees.items()})
+
+    @classmethod
+    def version_count(cls):
+        """
+        Return the number of versions in the schedule
+
+        :return: number of versions as integer
+        """
+        return len(cls.__versions)
+
+    @classmethod
+    def versions(cls):
+        """
+        Return the fees of every version in the schedule, for saving them (for instance in a snapshot)
+
+        :return: fees of each version by fee name as list of dictionaries, these are copies
+        """
+        cls.epoch()  # Pick up any direct assignment to a fee class variable first
+
+        return [dict(version) for version in cls.__versions]
+
+    @classmethod
+    def restore_versions(cls, versions):
+        """
+        Replace every version in the schedule with the supplied versions, as saved by versions(), and write the fees
+        of the last of them back to the fee class variables so it becomes the current version
+
+        :param versions: fees of each version by fee name as list of dictionaries
+        :return: epoch of the current version as integer
+        """
+        if not versions:
+            raise ValueError("A fee schedule must have at least one version")
+
+        with cls.__lock:
+            cls.__versions = [dict(version) for version in versions]
+            for name, owner, attribute in cls.__sources:
+                if name in cls.__versions[-1]:
+                    setattr(owner, attribute, cls.__versions[-1][name])
+                for version in cls.__versions:  # A fee added since the versions were saved keeps its current value
+                    version.setdefault(name, getattr(owner, attribute))
+
+            return len(cls.__versions) - 1
+
+    @classmethod
+    def __add_version(cls, changes):
+        """
+        Add a new version made from the class variables with the supplied changes applied (and written back to the
+        class variables)
+
+        :param changes: new value of each changed fee by fee name as dictionary
+        :return: epoch of the new version as integer
+        """
+        with cls.__lock:
+            version = {}
+            for name, owner, attribute in cls.__sources:
+                if name in changes:
+                    setattr(owner, attribute, changes[name])
+                version[name] = getattr(owner, attribute)
+
+            # Another thread may have just added the same version, if so there is nothing to add
+            if version != cls.__versions[-1]:
+                cls.__versions.append(version)
+
+            return len(cls.__versions) - 1
@@ -5,6 +5,7 @@
 
 # Imports
 from data_model.contract import Contract
+from data_model.fee_schedule import FeeSchedule
 
 
 # Consts
@@ -15,11 +16,13 @@ from data_model.contract import Contract
 class FixedFeeContract(Contract):
     """
     Fixed Fee Contract entity class - class variables:
-        __next_id: from base class
+        __id_allocator: from base class
         __ID_PREFIX: from base class
         base_commission: from base class
-        fixed_fee: fixed fee added to the final base commission element of revenue, as float, with public access
+        fixed_fee: fixed fee added to the final base commission element of revenue, as float, with public access (see
+                   FeeSchedule for changing it)
     """
+    __slots__ = ()
     fixed_fee = 50.0  # Initial value for fixed fee of all contracts, this can be changed subsequently
 
     def __init__(self, owner, speciality, payment, contractor_allocated=None):
@@ -51,8 +54,9 @@ class FixedFeeContract(Contract):
         s += "Contractor Allocated: {0}{1}\n".format(self.contractor_allocated.id if self.contractor_allocated else
                                                      "None", " (" + self.contractor_allocated.name + ")" if
                                                      self.contractor_allocated else "")
-        s += "Base Commission: {0}%\n".format(Contract.base_commission)
-        s += "Fixed Fee: £{0:.2f}\n".format(FixedFeeContract.fixed_fee)
+        fees = self.billing_fees()
+        s += "Base Commission: {0}%\n".format(fees["base_commission"])
+        s += "Fixed Fee: £{0:.2f}\n".format(fees["fixed_fee"])
         s += "Payment: £{0:.2f}\n".format(self.payment)
         s += "Completed: {0}\n".format(self.completed)
         if self.completed:  # If the contract is completed, then show how much revenue it contributed
@@ -63,13 +67,17 @@ class FixedFeeContract(Contract):
 
         return s
 
-    def calculate_revenue(self):
+    def _calculate_revenue_under(self, fees):
         """
-        Uses the base commission property to calculate the revenue from the payment made on completion of the contract
-        plus the fixed fee:
+        Uses the base commission to calculate the revenue from the payment made on completion of the contract plus the
+        fixed fee:
 
             revenue = ((base_commission / 100.0) * payment) + fixed_fee
 
+        :param fees: fees to use as map of fee name to fee, see FeeSchedule.fees()
         :return: revenue as float
         """
-        return super().calculate_revenue() + FixedFeeContract.fixed_fee
+        return super()._calculate_revenue_under(fees) + fees["fixed_fee"]
+
+
+FeeSchedule.track("fixed_fee", FixedFeeContract, "fixed_fee")
@@ -0,0 +1,133 @@
+# File: id_allocator.py
+# Description: Prototype implementation of Game Developer Contract Matcher (GDCMatcher) case study
+# Author: Chris Knowles
+
+
+# Imports
+import threading
+
+
+# Consts
+# Globals
+
+
+# Classes
+class IdAllocator:
+    """
+    Hands out the number element of unique identifiers, every method that reads and moves the next number does so while
+    holding a lock so concurrent creators can never be given the same number
+
+    Numbers can also be handed out a block at a time, a block is a (start, stop) tuple that can be sent to a worker
+    process which then builds its own allocator over just that block with IdAllocator.for_block(), so the worker can
+    create entities without any further coordination per identifier, note - an allocator built for a block refuses to
+    go past the end of the block rather than risk a clash
+    """
+
+    def __init__(self, start=1000, stop=None):
+        """
+ -      Initialiser - instance variables:
+            start: number handed out first and after a reset, as integer, property with read-only access
+            stop: number at which the allocator is exhausted or None if unbounded, as integer, property with read-only
+                  access
+            next: number to hand out next, as integer, with private access
+            lock: lock held while the next number is read and moved on, as threading.Lock, with private access
+
+        :param start: number to hand out first {optional}
+        :param stop: number at which the allocator is exhausted {optional}
+        """
+        self.__start = int(start)
+        self.__stop = None if stop is None else int(stop)
+        self.__next = self.__start
+        self.__lock = threading.Lock()
+
+    @property
+    def start(self):
+        return self.__start
+
+    @property
+    def stop(self):
+        return self.__stop
+
+    @classmethod
+    def for_block(cls, block):
+        """
+        Build an allocator that hands out only the numbers in the supplied block
+
+        :param block: block of numbers as (start, stop) tuple, as returned by allocate_block()
+        :return: new IdAllocator instance
+        """
+        return cls(block[0], block[1])
+
+    def __str__(self):
+        """
+        To string method
+
+        :return: string representation of this identifier allocator instance
+        """
+        return "{0}:{1}..{2}".format(IdAllocator.__name__, self.peek(), "" if self.__stop is None else self.__stop)
+
+    def next_id(self):
+        """
+        Hand out the next number
+
+        :return: number as integer
+        """
+        with self.__lock:
+            if self.__stop is not None and self.__next >= self.__stop:
+                raise RuntimeError("Identifier block {0} to {1} is exhausted".format(self.__start, self.__stop))
+            number = self.__next
+            self.__next += 1
+
+        return number
+
+    def allocate_block(self, size):
+        """
+        Hand out a block of consecutive numbers in one step
+
+        :param size: number of numbers in the block as integer
+        :return: block of numbers as (start, stop) tuple where stop is one past the last number
+        """
+        size = int(size)
+        if size < 0:
+            raise ValueError("Identifier block size cannot be negative")
+
+        with self.__lock:
+            if self.__stop is not None and self.__next + size > self.__stop:
+                raise RuntimeError("Identifier block {0} to {1} cannot supply {2} more".format(self.__start,
+                                                                                                self.__stop, size))
+            block = (self.__next, self.__next + size)
+            self.__next += size
+
+        return block
+
+    def peek(self):
+        """
+        Return the number that will be handed out next without handing it out
+
+        :return: number as integer
+        """
+        with self.__lock:
+            return self.__next
+
+    def advance_to(self, number):
+        """
+        Move the next number on to at least the supplied number, used after entities with existing identifiers have
+        been restored so that new identifiers cannot clash with them
+
+        :param number: lowest number that may be handed out next as integer
+        :return: None
+        """
+        with self.__lock:
+            self.__next = max(self.__next, int(number))
+
+    def reset(self, start=None):
+        """
+        Reset the allocator so that it hands out numbers from the supplied number (or from its original start) again
+
+        :param start: number to hand out next {optional}
+        :return: None
+        """
+        with self.__lock:
+            if start is not None:
+                self.__start = int(start)
+            self.__next = self.__start
@@ -4,6 +4,10 @@
 
 
 # Imports
+from bisect import bisect_right
+from itertools import islice
+
+
 # Consts
 # Globals
 
@@ -15,19 +19,110 @@ class IdentifiedEntitiesList:
     provides methods to add entity instances to the container, remove entity instances from the container, return a
     an entity instance that is searched for by its identifier, return the number of entities held in the container and
     return whether an entity exists in the container or not (using the entity identifier)
+
+    Alongside the encapsulated list two dictionaries are maintained, one mapping each identifier to its entity and one
+    mapping each identifier to its position in the list, these give constant time lookup, membership and removal
+    checks, note - the data list is still exposed for existing callers and if entities are appended to it or removed
+    from it directly (rather than through add() and remove()) the dictionaries are rebuilt the next time they are
+    used, this is detected from the size of the list alone so an entity must never be replaced in place (data[i] =
+    other), which would leave the dictionaries out of date, hand out a copy of the list to any caller that may change it
+
+    Subclasses that keep further indexes of their own override the _entity_added(), _entity_removed() and
+    _entities_reset() hook methods, which are called as entities enter and leave the container
+
+    A removed entity's slot in the list is overwritten with a tombstone marker rather than deleted, so removal takes
+    constant time and does not shift the rest of the list, the tombstones are compacted away in one pass as soon as
+    they make up more than the compaction threshold of the list or when the data property or an index into the
+    container is next used, without lazy removal they are also compacted away when the container is next iterated,
+    with lazy removal switched on iteration skips them instead, note - this means a reference to the data list kept
+    from before a removal can still hold a tombstone, so callers should fetch the data property again rather than keep
+    the list
+
+    Each entity is also given a sequence number as it is added, these only ever increase along the list so they are
+    used as stable resume tokens for paging through the container, a token stays valid however many entities are added
+    or removed (including the entity the token came from) between pages
+
+    IdentifiedEntitiesList class - class variables:
+        __TOMBSTONE: marker held in the slot of a removed entity, as object, with private access
     """
+    __TOMBSTONE = object()
 
-    def __init__(self):
+    def __init__(self, lazy_removal=False, compaction_threshold=0.5):
         """
  -      Initialiser - instance variables:
             data: container for the added identified entities, as list, property with read-only access
+            lazy_removal: flag to indicate if iteration skips tombstones rather than compacting them away, as
+                          boolean, property with read/write access
+            compaction_threshold: fraction of the list that may be tombstones before it is compacted, as float,
+                                  property with read/write access
+            entities: map of identifier to entity for every contained entity, as dictionary, with private access
+            positions: map of identifier to index in data for every contained entity, as dictionary, with private access
+            positions_valid: flag to indicate if the positions map is up to date with data, as boolean, with private
+                             access
+            tombstones: number of tombstones currently in the list, as integer, with private access
+            sequences: map of identifier to sequence number for every contained entity, as dictionary, with private
+                       access
+            next_sequence: sequence number to give the next added entity, as integer, with private access
+
+        :param lazy_removal: whether iteration skips tombstones rather than compacting them away {optional}
+        :param compaction_threshold: fraction of the list that may be tombstones before it is compacted {optional}
         """
         self.__data = []  # The data property is a list of the contained identified entities
+        self.__lazy_removal = bool(lazy_removal)
+        self.__compaction_threshold = float(compaction_threshold)
+        self.__entities = {}
+        self.__positions = {}
+        self.__positions_valid = True
+        self.__tombstones = 0
+        self.__sequences = {}
+        self.__next_sequence = 0
 
     @property
     def data(self):
+        if self.__tombstones:
+            self.compact()
         return self.__data
 
+    @property
+    def lazy_removal(self):
+        return self.__lazy_removal
+
+    @lazy_removal.setter
+    def lazy_removal(self, lazy_removal):
+        self.__lazy_removal = bool(lazy_removal)
+        if not self.__lazy_removal:
+            self.compact()
+
+    @property
+    def compaction_threshold(self):
+        return self.__compaction_threshold
+
+    @compaction_threshold.setter
+    def compaction_threshold(self, compaction_threshold):
+        self.__compaction_threshold = float(compaction_threshold)
+
+    def __iter__(self):
+        """
+        Iterate over the contained entities in order, with lazy removal tombstones are skipped so no compaction is
+        needed, otherwise they are compacted away first
+
+        :return: iterator over the contained entities
+        """
+        self._entities()
+        if self.__tombstones and not self.__lazy_removal:
+            self.compact()
+        tombstone = IdentifiedEntitiesList.__TOMBSTONE
+        return (entity for entity in self.__data if entity is not tombstone)
+
+    def __getitem__(self, index):
+        """
+        Return the contained entity at the supplied index, as data[index] would
+
+        :param index: index of the entity as integer
+        :return: entity at the index as IdentifiedEntity
+        """
+        return self.data[index]
+
     def __str__(self):
         """
         To string method
@@ -42,7 +137,7 @@ class IdentifiedEntitiesList:
 
         :return: number of entities contained as integer
         """
-        return len(self.data)
+        return len(self.__data) - self.__tombstones
 
     def add(self, entity):
         """
@@ -56,11 +151,50 @@ class IdentifiedEntitiesList:
         if self.has(entity.id):
             return False  # Exists so abort and return False
 
-        # Append entity to container
-        self.data.append(entity)
+        # Append entity to container and record it in the identifier maps, the new position is always the last one so
+        # the positions map can only be updated if it is currently valid
+        if self.__positions_valid:
+            self.__positions[entity.id] = len(self.__data)
+        self.__data.append(entity)
+        self.__entities[entity.id] = entity
+        self.__sequences[entity.id] = self.__next_sequence
+        self.__next_sequence += 1
+        self._entity_added(entity)
 
         return True  # Successful
 
+    def add_many(self, entities):
+        """
+        Add each of the supplied entities to the container in a single step, an entity is rejected if an entity with the
+        same identifier already exists in the container or appears earlier in the supplied entities, the duplicate check
+        is made against the identifier map and the data list is extended once
+
+        :param entities: entities to add to the container as iterable of IdentifiedEntity
+        :return: tuple of the added entities as list and the rejected entities as list
+        """
+        existing = self._entities()
+        added = []
+        rejected = []
+        for entity in entities:
+            if entity.id in existing:
+                rejected.append(entity)
+            else:
+                existing[entity.id] = entity
+                added.append(entity)
+
+        # Record the positions of the added entities, which follow on from the current end of the data list
+        if self.__positions_valid:
+            first_index = len(self.__data)
+            for offset, entity in enumerate(added):
+                self.__positions[entity.id] = first_index + offset
+        self.__data.extend(added)
+        for entity in added:
+            self.__sequences[entity.id] = self.__next_sequence
+            self.__next_sequence += 1
+            self._entity_added(entity)
+
+        return added, rejected
+
     def remove(self, entity):
         """
         Remove supplied entity from the container, but only if an entity with the a given identifier does exist in the
@@ -79,18 +213,61 @@ class IdentifiedEntitiesList:
         :param ident: identifier of the entity to be removed as string
         :return: True if added successfully, False if not
         """
-        # Check if entity exists in the container by finding its index, index returned of -1 means it does not exist in
-        # the container
-        entity_index = self.index_by_id(ident)
+        # Check if entity exists in the container by finding its position in the list, position returned of -1 means it
+        # does not exist in the container
+        entity_index = self.__position(ident)
 
         if entity_index < 0:  # Does not exist so abort and return False
             return False
 
-        # Found so remove entity from container
-        del self.data[entity_index]
+        # The entity's slot becomes a tombstone so no other entity moves and every position in the positions map stays
+        # correct, the list is compacted only once the tombstones make up too much of it (or when data or an index into
+        # the container is next used) so removal takes constant time
+        self.__data[entity_index] = IdentifiedEntitiesList.__TOMBSTONE
+        self.__tombstones += 1
+        entity = self.__entities.pop(ident)
+        del self.__positions[ident]
+        del self.__sequences[ident]
+        if self.__tombstones > self.__compaction_threshold * len(self.__data):
+            self.compact()
+        self._entity_removed(entity)
 
         return True  # Successful
 
+    def remove_many(self, idents):
+        """
+        Remove each of the entities with the supplied identifiers from the container in a single step, the data list is
+        compacted once rather than once per entity
+
+        :param idents: identifiers of the entities to be removed as iterable of strings
+        :return: tuple of the removed entities as list and the identifiers that did not exist in the container as list
+        """
+        existing = self._entities()
+        removed = {}
+        missing = []
+        for ident in idents:
+            if ident in existing and ident not in removed:
+                removed[ident] = existing[ident]
+            elif ident not in removed:
+                missing.append(ident)
+
+        self.__remove_all(removed)
+
+        return list(removed.values()), missing
+
+    def remove_where(self, predicate):
+        """
+        Remove every entity for which the supplied predicate returns True from the container in a single step
+
+        :param predicate: function taking an entity and returning True if it is to be removed
+        :return: removed entities as list
+        """
+        removed = {entity.id: entity for entity in self._entities().values() if predicate(entity)}
+
+        self.__remove_all(removed)
+
+        return list(removed.values())
+
     def find_by_id(self, ident):
         """
         Return the entity with the supplied identifier or None if no entity with supplied identifier exists in container
@@ -98,12 +275,8 @@ class IdentifiedEntitiesList:
         :param ident: identifier of the entity to be found as string
         :return: entity instance if it exists or None if not
         """
-        # Find entity with supplied identifier in the container
-        for entity in self.data:
-            if entity.id == ident:
-                return entity  # Found so return this entity
-
-        return None  # Not found so return None
+        # Find entity with supplied identifier in the identifier map
+        return self._entities().get(ident)
 
     def index_by_id(self, ident):
         """
@@ -113,14 +286,11 @@ class IdentifiedEntitiesList:
         :param ident: identifier of the entity for which index is to be found as string
         :return: index in container of entity instance if it exists or -1 if not as integer
         """
-        # Find entity with supplied identifier in the container, recording index as this progresses
-        index = 0
-        for entity in self.data:
-            if entity.id == ident:
-                return index  # Found so return the index
-            index += 1  # increment the index counter
+        # Any tombstones must be compacted away first so the index is the same as the entity's index in data
+        if self.__tombstones:
+            self.compact()
 
-        return -1  # Not found so return -1
+        return self.__position(ident)
 
     def index_of(self, entity):
         """
@@ -140,9 +310,193 @@ class IdentifiedEntitiesList:
         :param ident: identifier of the entity to check for in the container
         :return: True if entity exists, False if not
         """
-        # Find entity with supplied identifier in the container
-        for entity in self.data:
-            if entity.id == ident:
-                return True  # Found so return True
+        # Check for entity with supplied identifier in the identifier map
+        return ident in self._entities()
+
+    def sequence_of(self, ident):
+        """
+        Return the sequence number of the entity with the supplied identifier, this is used as the resume token when
+        paging and only ever increases along the container
 
-        return False  # Not found so return False
+        :param ident: identifier of the entity as string
+        :return: sequence number as integer or None if no entity with supplied identifier exists in container
+        """
+        return self.__sequences.get(ident) if ident in self._entities() else None
+
+    def iter_after(self, token=None):
+        """
+        Iterate lazily over the contained entities that follow the entity the supplied token came from (or over every
+        entity if no token is supplied), the start is found with a binary search on the sequence numbers, note - if the
+        container is changed while this is being iterated some entities can be missed, use page() for a position that
+        is safe to resume from later
+
+        :param token: resume token returned by page() or sequence_of() {optional}
+        :return: generator of entities
+        """
+        self._entities()  # Make sure every entity has a sequence number if the data list was changed directly
+        data = self.data  # Compact any tombstones so the binary search sees only entities
+        start = 0 if token is None else bisect_right(data, token, key=lambda entity: self.__sequences[entity.id])
+        tombstone = IdentifiedEntitiesList.__TOMBSTONE
+
+        return (entity for entity in islice(data, start, None) if entity is not tombstone)
+
+    def page(self, page_size, token=None):
+        """
+        Return the next page of contained entities following the entity the supplied token came from (or the first
+        page if no token is supplied), together with the token to resume from for the page after, only the entities on
+        the page are visited
+
+        :param page_size: largest number of entities on the page as integer
+        :param token: resume token returned with the previous page {optional}
+        :return: tuple with first entry the entities on the page as list and the second entry the resume token for the
+                 next page or None if there are no more entities
+        """
+        entities = list(islice(self.iter_after(token), int(page_size) + 1))
+
+        return IdentifiedEntitiesList.paginate(entities, page_size, lambda entity: self.__sequences[entity.id])
+
+    @staticmethod
+    def paginate(entities, page_size, token_of):
+        """
+        Split a page from up to one more than page size entities, the extra entity (if present) shows there are more
+        entities to come so a resume token is given for the last entity on the page
+
+        :param entities: up to page_size + 1 entities as list
+        :param page_size: largest number of entities on the page as integer
+        :param token_of: function returning the resume token of an entity
+        :return: tuple with first entry the entities on the page as list and the second entry the resume token for the
+                 next page or None if there are no more entities
+        """
+        if len(entities) <= page_size:
+            return entities, None
+
+        entities = entities[:page_size]
+
+        return entities, token_of(entities[-1]) if entities else None
+
+    def compact(self):
+        """
+        Remove every tombstone from the list in a single pass, note - the list is changed in place so it remains the
+        same list object as returned by the data property
+
+        :return: None
+        """
+        if not self.__tombstones:
+            return
+
+        tombstone = IdentifiedEntitiesList.__TOMBSTONE
+        self.__data[:] = [entity for entity in self.__data if entity is not tombstone]
+        self.__tombstones = 0
+        self.__positions_valid = False
+
+    def __position(self, ident):
+        """
+        Return the position in the list (which may include tombstones) of the entity with the supplied identifier or -1
+        if no entity with supplied identifier exists in container, rebuilding the positions map first if the list has
+        been shifted since it was last built
+
+        :param ident: identifier of the entity for which position is to be found as string
+        :return: position in list of entity instance if it exists or -1 if not as integer
+        """
+        self._entities()
+        if not self.__positions_valid:
+            tombstone = IdentifiedEntitiesList.__TOMBSTONE
+            self.__positions = {}
+            for index, entity in enumerate(self.__data):
+                if entity is not tombstone:
+                    self.__positions.setdefault(entity.id, index)
+            self.__positions_valid = True
+
+        return self.__positions.get(ident, -1)
+
+    def _entities(self):
+        """
+        Return the identifier to entity map, rebuilding it (and the positions map) first if entities have been
+        appended to or removed from the data list directly rather than through the methods of this container, note -
+        the check for this only compares sizes so it costs nothing in the normal case but cannot see an entity
+        replaced in place
+
+        :return: identifier to entity map as dictionary
+        """
+        if len(self.__entities) != len(self.__data) - self.__tombstones:
+            self.compact()
+            old_sequences = self.__sequences
+            self.__entities = {}
+            self.__sequences = {}
+            self._entities_reset()
+            last_sequence = -1
+            for entity in self.__data:
+                # Keep the first entity with a given identifier, which matches what a scan of the data list would find
+                if entity.id not in self.__entities:
+                    self.__entities[entity.id] = entity
+                    # Keep an entity's sequence number while they still increase along the list so that tokens already
+                    # handed out stay valid, otherwise (e.g. an entity inserted directly mid-list) give it a new one
+                    sequence = old_sequences.get(entity.id, -1)
+                    if sequence <= last_sequence:
+                        sequence = self.__next_sequence
+                        self.__next_sequence += 1
+                    self.__sequences[entity.id] = sequence
+                    last_sequence = sequence
+                    self._entity_added(entity)
+            self.__positions_valid = False
+
+        return self.__entities
+
+    def _sequences(self):
+        """
+        Return the identifier to sequence number map as it stands, without the check for direct changes to the data
+        list made by _entities(), so it can be used from the hook methods while the maps are being rebuilt, for
+        instance by subclasses that keep their index entries in sequence order
+
+        :return: identifier to sequence number map as dictionary
+        """
+        return self.__sequences
+
+    def __remove_all(self, removed):
+        """
+        Remove the supplied entities from the data list and the identifier maps, compacting the data list once
+
+        :param removed: map of identifier to entity for the entities to remove as dictionary
+        :return: None
+        """
+        if not removed:
+            return
+
+        tombstone = IdentifiedEntitiesList.__TOMBSTONE
+        self.__data[:] = [entity for entity in self.__data if entity is not tombstone and entity.id not in removed]
+        self.__tombstones = 0
+        for ident, entity in removed.items():
+            del self.__entities[ident]
+            self.__positions.pop(ident, None)
+            del self.__sequences[ident]
+            self._entity_removed(entity)
+        self.__positions_valid = False
+
+    def _entity_added(self, entity):
+        """
+        Hook called after an entity has been added to the container, does nothing here but is overridden by subclasses
+        that keep further indexes
+
+        :param entity: entity that has been added as IdentifiedEntity
+        :return: None
+        """
+        pass
+
+    def _entity_removed(self, entity):
+        """
+        Hook called after an entity has been removed from the container, does nothing here but is overridden by
+        subclasses that keep further indexes
+
+        :param entity: entity that has been removed as IdentifiedEntity
+        :return: None
+        """
+        pass
+
+    def _entities_reset(self):
+        """
+        Hook called before the identifier maps are rebuilt from the data list, does nothing here but is overridden by
+        subclasses that keep further indexes, these should be cleared as _entity_added() is then called for every entity
+
+        :return: None
+        """
+        pass
@@ -11,8 +11,11 @@
 # Classes
 class NamedEntity:
     """
-    Named entity base class
+    Named entity base class, note - this is used as a mixin alongside IdentifiedEntity and only one base class of a
+    slotted class may declare non-empty __slots__, so the slot for the name is declared by each concrete subclass as
+    "_NamedEntity__name" rather than here
     """
+    __slots__ = ()
 
     def __init__(self, name):
         """
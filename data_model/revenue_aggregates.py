@@ -0,0 +1,277 @@
+# File: revenue_aggregates.py
+# Description: Prototype implementation of Game Developer Contract Matcher (GDCMatcher) case study
+# Author: Chris Knowles
+
+
+# Imports
+from data_model.fixed_fee_contract import FixedFeeContract
+from data_model.advert_fee_contract import AdvertFeeContract
+from data_model.revenue_calculator import RevenueCalculator
+from data_model.speciality_registry import SpecialityRegistry
+
+
+# Consts
+# Globals
+
+
+# Classes
+class RevenueAggregates:
+    """
+    Running revenue totals of a set of contracts, kept along each of the dimensions client (owner identifier),
+    speciality, contractor (allocated contractor identifier or None for unallocated) and contract type (class name) as
+    well as over all the contracts, each change to a contract changes a fixed number of totals so every update and
+    every query costs O(1) rather than a pass over the contracts
+
+    For each key of each dimension the totals held are:
+
+        open: count, payment total, number of fixed fee contracts and total advert views of contracts not completed
+        completed: count, payment total and realised revenue of completed contracts
+
+    potential revenue is calculated from the open totals when it is asked for (see
+    RevenueCalculator.calculate_from_totals()) so it always reflects the current fees and view counts, while the
+    revenue of a contract is added to the realised revenue when it is completed and is not changed after that, as
+    with MainApp.revenue
+
+    Contracts are added and removed by calling contract_added() and contract_removed(), every other change is picked
+    up by observing each contract (see IdentifiedEntity.add_observer()), note - removing a completed contract takes its
+    realised revenue out of these totals, unlike MainApp.revenue which keeps all the money made
+
+    RevenueAggregates class - class variables:
+        DIMENSIONS: names of the dimensions that can be queried, as tuple, with public access
+        __OPEN_COUNT, __OPEN_PAYMENT, __OPEN_FIXED, __OPEN_VIEWS, __COMPLETED_COUNT, __COMPLETED_PAYMENT, __REALISED:
+            position of each total in the list of totals for a key, as integer, with private access
+    """
+    DIMENSIONS = ("all", "client", "speciality", "contractor", "contract_type")
+    __OPEN_COUNT, __OPEN_PAYMENT, __OPEN_FIXED, __OPEN_VIEWS, __COMPLETED_COUNT, __COMPLETED_PAYMENT, __REALISED = \
+        range(7)
+
+    def __init__(self):
+        """
+ -      Initialiser - instance variables:
+            totals: map of dimension name to map of key to list of totals, as dictionary, with private access
+            realised: realised revenue of each completed contract by contract identifier, so that it can be taken out
+                      again if the contract is removed, as dictionary, with private access
+        """
+        self.__totals = {dimension: {} for dimension in RevenueAggregates.DIMENSIONS}
+        self.__realised = {}
+
+    def __str__(self):
+        """
+        To string method
+
+        :return: string representation of this revenue aggregates instance
+        """
+        realised, potential = self.revenue_totals()
+
+        return "{0}:realised {1:.2f} potential {2:.2f}".format(RevenueAggregates.__name__, realised, potential)
+
+    def contract_added(self, contract):
+        """
+        Add the supplied contract to the totals and start observing it for changes
+
+        :param contract: contract that has been added as Contract instance
+        :return: None
+        """
+        if contract.completed:
+            self.__realised[contract.id] = contract.calculate_revenue()
+            self.__complete(contract, contract.contractor_allocated, 1)
+        else:
+            self.__open(contract, contract.contractor_allocated, 1)
+        contract.add_observer(self)
+
+    def contract_removed(self, contract):
+        """
+        Take the supplied contract out of the totals and stop observing it
+
+        :param contract: contract that has been removed as Contract instance
+        :return: None
+        """
+        contract.remove_observer(self)
+        if contract.completed:
+            self.__complete(contract, contract.contractor_allocated, -1)
+            del self.__realised[contract.id]
+        else:
+            self.__open(contract, contract.contractor_allocated, -1)
+
+    def entity_changed(self, entity, attribute, old_value, new_value):
+        """
+        Observer method called by an added contract when one of its watched properties changes, used to move the
+        contract between the totals of its old and new contractor, from the open to the completed totals when it is
+        completed and to add new advert views
+
+        :param entity: contract that has changed as Contract instance
+        :param attribute: name of the property that has changed as string
+        :param old_value: value of the property before the change
+        :param new_value: value of the property after the change
+        :return: None
+        """
+        if attribute == "contractor_allocated":
+            if entity.completed:
+                self.__complete(entity, old_value, -1)
+                self.__complete(entity, new_value, 1)
+            else:
+                self.__open(entity, old_value, -1)
+                self.__open(entity, new_value, 1)
+
+        elif attribute == "completed" and bool(old_value) != bool(new_value):
+            if new_value:  # The revenue is realised now and kept at this amount from now on
+                self.__open(entity, entity.contractor_allocated, -1)
+                self.__realised[entity.id] = entity.calculate_revenue()
+                self.__complete(entity, entity.contractor_allocated, 1)
+            else:
+                self.__complete(entity, entity.contractor_allocated, -1)
+                del self.__realised[entity.id]
+                self.__open(entity, entity.contractor_allocated, 1)
+
+        elif attribute == "times_viewed" and not entity.completed:
+            for totals in self.__totals_of(entity, entity.contractor_allocated):
+                totals[RevenueAggregates.__OPEN_VIEWS] += new_value - old_value
+
+    def revenue_totals(self, dimension="all", key=None):
+        """
+        Return the realised and potential revenue of the contracts with the supplied key in the supplied dimension
+
+        :param dimension: name of the dimension, one of DIMENSIONS {optional}
+        :param key: key within the dimension, a client or contractor identifier, a speciality, a contract class name
+                    or None for the all dimension or for unallocated contracts in the contractor dimension {optional}
+        :return: tuple of realised revenue as float and potential revenue as float
+        """
+        totals = self.__find(dimension, key)
+        if totals is None:
+            return 0.0, 0.0
+
+        return totals[RevenueAggregates.__REALISED], self.__potential(totals)
+
+    def summary(self, dimension="all", key=None):
+        """
+        Return every total of the contracts with the supplied key in the supplied dimension
+
+        :param dimension: name of the dimension, one of DIMENSIONS {optional}
+        :param key: key within the dimension, see revenue_totals() {optional}
+        :return: map with entries open_count, completed_count, open_payment_total, completed_payment_total, realised and
+                 potential as dictionary
+        """
+        return RevenueAggregates.__summarise(self.__find(dimension, key) or [0, 0.0, 0, 0, 0, 0.0, 0.0])
+
+    def breakdown(self, dimension):
+        """
+        Return the summary (see summary()) of every key in the supplied dimension that has contracts
+
+        :param dimension: name of the dimension, one of DIMENSIONS
+        :return: map of key to summary as dictionary, specialities are given by name
+        """
+        breakdown = {}
+        for key, totals in self.__dimension(dimension).items():
+            if not totals[RevenueAggregates.__OPEN_COUNT] and not totals[RevenueAggregates.__COMPLETED_COUNT]:
+                continue  # Every contract with this key has been removed
+            if dimension == "speciality":
+                key = SpecialityRegistry.name_of(key)
+            breakdown[key] = RevenueAggregates.__summarise(totals)
+
+        return breakdown
+
+    def __open(self, contract, contractor, sign):
+        """
+        Add (or take away) the supplied contract to (or from) the open totals, filed under the supplied contractor
+
+        :param contract: contract as Contract instance
+        :param contractor: contractor the contract is filed under as Contractor instance or None
+        :param sign: 1 to add or -1 to take away as integer
+        :return: None
+        """
+        # AdvertFeeContract is a subclass of FixedFeeContract but does not pay the fixed fee so check it first
+        advert = isinstance(contract, AdvertFeeContract)
+        fixed = 0 if advert else (sign if isinstance(contract, FixedFeeContract) else 0)
+        views = sign * contract.times_viewed if advert else 0
+        payment = sign * contract.payment
+
+        for totals in self.__totals_of(contract, contractor):
+            totals[RevenueAggregates.__OPEN_COUNT] += sign
+            totals[RevenueAggregates.__OPEN_PAYMENT] += payment
+            totals[RevenueAggregates.__OPEN_FIXED] += fixed
+            totals[RevenueAggregates.__OPEN_VIEWS] += views
+
+    def __complete(self, contract, contractor, sign):
+        """
+        Add (or take away) the supplied contract to (or from) the completed totals, filed under the supplied
+        contractor, using the realised revenue recorded for it when it was completed
+
+        :param contract: contract as Contract instance
+        :param contractor: contractor the contract is filed under as Contractor instance or None
+        :param sign: 1 to add or -1 to take away as integer
+        :return: None
+        """
+        revenue = sign * self.__realised[contract.id]
+        payment = sign * contract.payment
+
+        for totals in self.__totals_of(contract, contractor):
+            totals[RevenueAggregates.__COMPLETED_COUNT] += sign
+            totals[RevenueAggregates.__COMPLETED_PAYMENT] += payment
+            totals[RevenueAggregates.__REALISED] += revenue
+
+    def __totals_of(self, contract, contractor):
+        """
+        Return the totals the supplied contract is counted in, one for each dimension, creating any that do not exist
+
+        :param contract: contract as Contract instance
+        :param contractor: contractor the contract is filed under as Contractor instance or None
+        :return: totals as list of lists
+        """
+        keys = (None, contract.owner.id, contract.speciality_code, contractor.id if contractor else None,
+                type(contract).__name__)
+
+        return [self.__totals[dimension].setdefault(key, [0, 0.0, 0, 0, 0, 0.0, 0.0])
+                for dimension, key in zip(RevenueAggregates.DIMENSIONS, keys)]
+
+    def __find(self, dimension, key):
+        """
+        Return the totals with the supplied key in the supplied dimension
+
+        :param dimension: name of the dimension
+        :param key: key within the dimension
+        :return: totals as list or None if there are none
+        """
+        if dimension == "speciality" and key is not None:
+            key = SpecialityRegistry.find_code(key)
+
+        return self.__dimension(dimension).get(key)
+
+    def __dimension(self, dimension):
+        """
+        Return the map of key to totals of the supplied dimension
+
+        :param dimension: name of the dimension
+        :return: map of key to totals as dictionary
+        """
+        if dimension not in self.__totals:
+            raise ValueError("Unknown revenue dimension {0}, expected one of {1}".format(dimension,
+                                                                                      RevenueAggregates.DIMENSIONS))
+
+        return self.__totals[dimension]
+
+    @staticmethod
+    def __potential(totals):
+        """
+        Calculate the potential revenue from the supplied open totals using the current fees
+
+        :param totals: totals as list
+        :return: potential revenue as float
+        """
+        return RevenueCalculator.calculate_from_totals(totals[RevenueAggregates.__OPEN_PAYMENT],
+                                                       totals[RevenueAggregates.__OPEN_FIXED],
+                                                       totals[RevenueAggregates.__OPEN_VIEWS])
+
+    @staticmethod
+    def __summarise(totals):
+        """
+        Build the summary of the supplied totals
+
+        :param totals: totals as list
+        :return: summary as dictionary, see summary()
+        """
+        return {"open_count": totals[RevenueAggregates.__OPEN_COUNT],
+                "completed_count": totals[RevenueAggregates.__COMPLETED_COUNT],
+                "open_payment_total": totals[RevenueAggregates.__OPEN_PAYMENT],
+                "completed_payment_total": totals[RevenueAggregates.__COMPLETED_PAYMENT],
+                "realised": totals[RevenueAggregates.__REALISED],
+                "potential": RevenueAggregates.__potential(totals)}
@@ -0,0 +1,139 @@
+# File: revenue_calculator.py
+# Description: Prototype implementation of Game Developer Contract Matcher (GDCMatcher) case study
+# Author: Chris Knowles
+
+
+# Imports
+from itertools import compress
+from data_model.fee_schedule import FeeSchedule
+from data_model.fixed_fee_contract import FixedFeeContract
+from data_model.advert_fee_contract import AdvertFeeContract
+
+
+# Consts
+# Globals
+
+
+# Classes
+class RevenueCalculator:
+    """
+    Calculates the realised revenue (from completed contracts) and potential revenue (from contracts not yet completed)
+    of a whole set of contracts at once, rather than calling calculate_revenue() on each contract, it relies on the
+    revenue of every contract class being linear in its inputs:
+
+        Contract:          (base_commission / 100.0) * payment
+        FixedFeeContract:  (base_commission / 100.0) * payment + FixedFeeContract.fixed_fee
+        AdvertFeeContract: (base_commission / 100.0) * payment + times_viewed * AdvertFeeContract.fixed_fee
+
+    so the revenue of a set is found from just three totals (payments, fixed fee contracts and advert views), which are
+    themselves found in a single pass, note - the fees are read once per call from the current FeeSchedule version so
+    a call sees one consistent set of fees
+
+    RevenueCalculator class - class variables:
+        __INVERT: translation table that swaps 0 and 1 bytes, as bytes, with private access
+    """
+    __INVERT = bytes([1, 0]) + bytes(254)
+
+    @staticmethod
+    def calculate_for_contracts(contracts):
+        """
+        Calculate the realised and potential revenue of the supplied contracts in a single pass, completed contracts are
+        each billed under the fee schedule version they were completed under so their (cached) revenue is added as it
+        is, the potential revenue is found from the totals of the other contracts
+
+        :param contracts: contracts to calculate revenue for as iterable of Contract instances
+        :return: tuple of realised revenue as float and potential revenue as float
+        """
+        realised = 0.0
+        payments = 0.0
+        fixed_count = 0
+        advert_views = 0
+
+        for contract in contracts:
+            if contract.completed:
+                realised += contract.calculate_revenue()
+                continue
+
+            payments += contract.payment
+            # AdvertFeeContract is a subclass of FixedFeeContract but does not pay the fixed fee so check it first
+            if isinstance(contract, AdvertFeeContract):
+                advert_views += contract.times_viewed
+            elif isinstance(contract, FixedFeeContract):
+                fixed_count += 1
+
+        return realised, RevenueCalculator.calculate_from_totals(payments, fixed_count, advert_views)
+
+    @staticmethod
+    def calculate_for_columns(payments, completed, types, times_viewed, fixed_type, advert_type, billed_versions=None):
+        """
+        Calculate the realised and potential revenue of contracts held as columns (see ColumnarContractsList), this
+        never visits a row from Python code, the masks are built and combined as bytes and big integers and the totals
+        are taken with sum() over itertools.compress(), so it runs at the speed of the C loops underneath, the completed
+        contracts are split by the fee schedule version they were billed under (there are only ever a few versions) and
+        the totals of each version are priced under its own fees
+
+        :param payments: payment of each contract as buffer of floats
+        :param completed: completed flag (0 or 1) of each contract as buffer of bytes
+        :param types: type code of each contract as buffer of bytes
+        :param times_viewed: times viewed of each contract as buffer of integers
+        :param fixed_type: type code of FixedFeeContract as integer
+        :param advert_type: type code of AdvertFeeContract as integer
+        :param billed_versions: fee schedule version each completed contract was billed under as buffer of integers or
+                                None to price completed contracts under the current fees {optional}
+        :return: tuple of realised revenue as float and potential revenue as float
+        """
+        completed = bytes(completed)
+        not_completed = completed.translate(RevenueCalculator.__INVERT)
+        types = bytes(types)
+
+        # Masks holding a 1 byte for each row of the given type, as big integers they can be combined with another mask
+        # using & and counted with bit_count() since every byte is either 0 or 1
+        fixed_mask = int.from_bytes(types.translate(RevenueCalculator.__type_table(fixed_type)), "little")
+        advert_mask = int.from_bytes(types.translate(RevenueCalculator.__type_table(advert_type)), "little")
+
+        def priced(mask, version=None):
+            mask_value = int.from_bytes(mask, "little")
+            fixed_count = (fixed_mask & mask_value).bit_count()
+            advert_views = sum(compress(times_viewed, (advert_mask & mask_value).to_bytes(len(mask), "little")))
+
+            return RevenueCalculator.calculate_from_totals(sum(compress(payments, mask)), fixed_count, advert_views,
+                                                           version)
+
+        if billed_versions is None:
+            realised = priced(completed)
+        else:
+            # A mask for each version billed under, built by a C level map() of the version's == over the column
+            realised = 0.0
+            for version in set(compress(billed_versions, completed)):
+                realised += priced(bytes(map(version.__eq__, billed_versions)), version)
+
+        return realised, priced(not_completed)
+
+    @staticmethod
+    def calculate_from_totals(payment_total, fixed_count, advert_views, version=None):
+        """
+        Calculate the revenue of a set of contracts from its totals using the fees of the supplied fee schedule version
+
+        :param payment_total: total payment of the contracts as float
+        :param fixed_count: number of FixedFeeContract instances in the set as integer
+        :param advert_views: total times viewed of the AdvertFeeContract instances in the set as integer
+        :param version: fee schedule version or None for the current version {optional}
+        :return: revenue as float
+        """
+        fees = FeeSchedule.fees(version)
+
+        return ((fees["base_commission"] / 100.0) * payment_total + fees["fixed_fee"] * fixed_count +
+                fees["advert_fee"] * advert_views)
+
+    @staticmethod
+    def __type_table(type_code):
+        """
+        Build a translation table that maps the supplied type code byte to 1 and every other byte to 0
+
+        :param type_code: type code as integer
+        :return: translation table as bytes
+        """
+        table = bytearray(256)
+        table[type_code] = 1
+
+        return bytes(table)
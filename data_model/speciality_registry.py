@@ -0,0 +1,194 @@
+# File: speciality_registry.py
+# Description: Prototype implementation of Game Developer Contract Matcher (GDCMatcher) case study
+# Author: Chris Knowles
+
+
+# Imports
+import re
+import sys
+import threading
+from collections import Counter, OrderedDict
+from itertools import chain
+
+
+# Consts
+# Globals
+
+
+# Classes
+class SpecialityRegistry:
+    """
+    Registry of every speciality known to the application, each speciality is interned once and given a small integer
+    code (in order of first use, starting at 0) so that entities, indexes and matching can hold and compare codes
+    rather than strings, note - the registry is at class scope as there is only one set of specialities and codes are
+    never reused or removed so a code stays valid for the life of the application
+
+    So that specialities written differently (e.g. "C++", "c++", "Cpp" and "C++ programming") can be found as similar,
+    each speciality is also broken into character trigrams when it is added and these are held in an inverted index of
+    trigram to codes, the trigrams are taken after normalising the speciality (lower case, "++" as "pp", "#" as
+    "sharp" and any other run of non alphanumeric characters as a space) and two specialities are scored by the overlap
+    coefficient of their trigrams:
+
+        similarity = shared trigrams / trigrams of the speciality with fewer trigrams
+
+    a lookup only visits the codes that share at least one trigram with the speciality looked for and its result is
+    cached until another speciality is added, the specialities looked for need not be known (they can come from
+    queries or user input) so the cache is bounded, holding the results of the most recently used similar_cache_size
+    lookups
+
+    SpecialityRegistry class - class variables:
+        similarity_threshold: lowest similarity (0.0 to 1.0) for two specialities to be similar when no threshold is
+                              supplied, as float, with public access
+        similar_cache_size: most lookups whose results are cached, as integer, with public access
+        __names: speciality of each code, as list, with private access
+        __codes: map of speciality to code, as dictionary, with private access
+        __lock: lock held while a new speciality is added, as threading.Lock, with private access
+        __grams: trigrams of each code, as list of frozensets, with private access
+        __postings: map of trigram to the codes of specialities that have it, as dictionary, with private access
+        __similar: cache of similar codes by normalised speciality and threshold, least recently used first, as
+                   OrderedDict, with private access
+        __similar_lock: lock held while the cache is used, as threading.Lock, with private access
+    """
+    similarity_threshold = 0.8
+    similar_cache_size = 1024
+    __names = []
+    __codes = {}
+    __lock = threading.Lock()
+    __grams = []
+    __postings = {}
+    __similar = OrderedDict()
+    __similar_lock = threading.Lock()
+    __SEPARATORS = re.compile(r"[^0-9a-z]+")
+
+    @classmethod
+    def intern(cls, speciality):
+        """
+        Return the code of the supplied speciality, adding the speciality to the registry if it is not already known
+
+        :param speciality: speciality as string
+        :return: code of the speciality as integer
+        """
+        speciality = str(speciality)
+        code = cls.__codes.get(speciality)
+        if code is None:
+            with cls.__lock:
+                # Check again now the lock is held in case another thread has just added the same speciality
+                code = cls.__codes.get(speciality)
+                if code is None:
+                    code = len(cls.__names)
+                    grams = cls.__trigrams(speciality)
+                    for gram in grams:
+                        cls.__postings.setdefault(gram, []).append(code)
+                    cls.__grams.append(grams)
+                    cls.__names.append(sys.intern(speciality))
+                    cls.__codes[cls.__names[code]] = code
+                    with cls.__similar_lock:
+                        cls.__similar.clear()  # The new speciality may be similar to ones already looked up
+
+        return code
+
+    @classmethod
+    def find_code(cls, speciality):
+        """
+        Return the code of the supplied speciality without adding it to the registry, used by queries so that looking
+        for an unknown speciality does not grow the registry
+
+        :param speciality: speciality as string
+        :return: code of the speciality as integer or None if the speciality is not known
+        """
+        return cls.__codes.get(str(speciality))
+
+    @classmethod
+    def name_of(cls, code):
+        """
+        Return the speciality with the supplied code
+
+        :param code: code of the speciality as integer
+        :return: speciality as string
+        """
+        return cls.__names[code]
+
+    @classmethod
+    def count(cls):
+        """
+        Return the number of specialities known to the registry
+
+        :return: number of specialities as integer
+        """
+        return len(cls.__names)
+
+    @classmethod
+    def names(cls):
+        """
+        Return every speciality known to the registry in code order
+
+        :return: specialities as list
+        """
+        return list(cls.__names)
+
+    @classmethod
+    def similar_codes(cls, speciality, threshold=None):
+        """
+        Return the codes of every known speciality similar to the supplied speciality (which need not be known itself),
+        most similar first, a known speciality is always similar to itself
+
+        :param speciality: speciality as string
+        :param threshold: lowest similarity to include (0.0 to 1.0) or None for similarity_threshold {optional}
+        :return: codes of the similar specialities as tuple
+        """
+        threshold = cls.similarity_threshold if threshold is None else float(threshold)
+        grams = cls.__trigrams(speciality)
+        key = (grams, threshold)
+
+        with cls.__similar_lock:
+            similar = cls.__similar.get(key)
+            if similar is not None:
+                cls.__similar.move_to_end(key)
+
+        if similar is None:
+            known = len(cls.__names)
+
+            # Count the trigrams each code shares with the speciality, only codes sharing at least one are visited
+            shared = Counter(chain.from_iterable(cls.__postings.get(gram, ()) for gram in grams))
+
+            scored = [(count / min(len(grams), len(cls.__grams[code])), code) for code, count in shared.items()]
+            similar = tuple(code for score, code in sorted(scored, key=lambda entry: (-entry[0], entry[1]))
+                            if score >= threshold)
+            with cls.__similar_lock:
+                if len(cls.__names) == known:  # Not cached if a speciality was added while this was worked out
+                    cls.__similar[key] = similar
+                while len(cls.__similar) > max(0, int(cls.similar_cache_size)):
+                    cls.__similar.popitem(last=False)  # Drop the least recently used lookup
+
+        return similar
+
+    @classmethod
+    def similarity(cls, speciality_1, speciality_2):
+        """
+        Score how similar the two supplied specialities are
+
+        :param speciality_1: first speciality as string
+        :param speciality_2: second speciality as string
+        :return: similarity from 0.0 (no trigrams shared) to 1.0 as float
+        """
+        grams_1 = cls.__trigrams(speciality_1)
+        grams_2 = cls.__trigrams(speciality_2)
+        if not grams_1 or not grams_2:
+            return 0.0
+
+        return len(grams_1 & grams_2) / min(len(grams_1), len(grams_2))
+
+    @classmethod
+    def __trigrams(cls, speciality):
+        """
+        Normalise the supplied speciality and break it into character trigrams, each word is padded with a space at
+        either end so short words and word boundaries also give trigrams
+
+        :param speciality: speciality as string
+        :return: trigrams as frozenset of strings
+        """
+        normalised = str(speciality).lower().replace("++", "pp").replace("#", "sharp")
+        normalised = " {0} ".format(cls.__SEPARATORS.sub(" ", normalised).strip())
+
+        return frozenset(normalised[index:index + 3] for index in range(len(normalised) - 2)
+                         if normalised[index:index + 3] != "   ")
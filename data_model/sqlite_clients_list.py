@@ -0,0 +1,49 @@
+# File: sqlite_clients_list.py
+# Description: Prototype implementation of Game Developer Contract Matcher (GDCMatcher) case study
+# Author: Chris Knowles
+
+
+# Imports
+from data_model.client import Client
+from data_model.sqlite_entities_list import SqliteEntitiesList
+
+
+# Consts
+# Globals
+
+
+# Classes
+class SqliteClientsList(SqliteEntitiesList):
+    """
+    Container for Client class instances kept in the clients table of a SqliteStore, an alternative to ClientsList,
+    note - a client has no watched properties so nothing is written back once it has been added
+    """
+
+    def __init__(self, store, cache_size=10000):
+        """
+ -      Initialiser - instance variables:
+            store: from base class
+            cache_size: from base class
+
+        :param store: database to keep the clients in as SqliteStore
+        :param cache_size: number of recently materialised clients kept when unreferenced {optional}
+        """
+        super().__init__(store, "clients", ("id", "name"), cache_size)
+
+    def _restore(self, row):
+        """
+        Build a client from its row
+
+        :param row: row of the id and name columns followed by the seq column as tuple
+        :return: client as Client instance
+        """
+        return Client.restore(row[0], row[1])
+
+    def _row(self, entity):
+        """
+        Build the row of a client to insert
+
+        :param entity: client as Client instance
+        :return: values of the id and name columns as tuple
+        """
+        return entity.id, entity.name
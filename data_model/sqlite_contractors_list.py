@@ -0,0 +1,113 @@
+# File: sqlite_contractors_list.py
+# Description: Prototype implementation of Game Developer Contract Matcher (GDCMatcher) case study
+# Author: Chris Knowles
+
+
+# Imports
+from data_model.contractor import Contractor
+from data_model.speciality_registry import SpecialityRegistry
+from data_model.sqlite_entities_list import SqliteEntitiesList
+
+
+# Consts
+# Globals
+
+
+# Classes
+class SqliteContractorsList(SqliteEntitiesList):
+    """
+    Container for Contractor class instances kept in the contractors table of a SqliteStore, an alternative to
+    ContractorsList, the speciality queries are answered from the index on the speciality column and a change to the
+    speciality of a held contractor is written back to its row
+
+    The speciality is stored by name as SpecialityRegistry codes are only meaningful in the process that interned them,
+    every speciality already in the table is interned as the container is created so similar speciality queries (see
+    SpecialityRegistry.similar_codes()) can find them
+    """
+
+    def __init__(self, store, cache_size=10000):
+        """
+ -      Initialiser - instance variables:
+            store: from base class
+            cache_size: from base class
+
+        :param store: database to keep the contractors in as SqliteStore
+        :param cache_size: number of recently materialised contractors kept when unreferenced {optional}
+        """
+        super().__init__(store, "contractors", ("id", "name", "speciality"), cache_size)
+        for row in store.read("SELECT DISTINCT speciality FROM contractors"):
+            SpecialityRegistry.intern(row[0])
+
+    def get_with_speciality(self, speciality):
+        """
+        Provides a list of all the contained Contractor instances that have the supplied speciality, note this will be
+        an empty list if no Contractors have the supplied speciality
+
+        :param speciality: this is the speciality to match with Contractor instances as string
+        :return: All Contractor instances with supplied speciality as list
+        """
+        return self._select("WHERE speciality = ? ORDER BY seq", (speciality,))
+
+    def get_with_similar_speciality(self, speciality, threshold=None):
+        """
+        Provides a list of all the contained Contractor instances that have a speciality similar to the supplied
+        speciality (see SpecialityRegistry.similar_codes()), those with the most similar speciality first
+
+        :param speciality: this is the speciality to match with Contractor instances as string
+        :param threshold: lowest similarity to match (0.0 to 1.0) or None for the registry default {optional}
+        :return: All Contractor instances with a similar speciality as list
+        """
+        contractors = []
+        for code in SpecialityRegistry.similar_codes(speciality, threshold):
+            contractors.extend(self.get_with_speciality(SpecialityRegistry.name_of(code)))
+
+        return contractors
+
+    def count_with_speciality(self, speciality):
+        """
+        Provides the number of contained Contractor instances that have the supplied speciality
+
+        :param speciality: this is the speciality to match with Contractor instances as string
+        :return: number of Contractor instances with supplied speciality as integer
+        """
+        return self._count_where("WHERE speciality = ?", (speciality,))
+
+    def get_speciality_counts(self):
+        """
+        Provides the number of contained Contractor instances for every speciality held by at least one of them
+
+        :return: map of speciality to number of Contractor instances as dictionary
+        """
+        return dict(self.store.read("SELECT speciality, COUNT(*) FROM contractors GROUP BY speciality"))
+
+    def entity_changed(self, entity, attribute, old_value, new_value):
+        """
+        Observer method called by a held contractor when one of its watched properties changes, used to write a new
+        speciality back to its row
+
+        :param entity: contractor that has changed as Contractor instance
+        :param attribute: name of the property that has changed as string
+        :param old_value: value of the property before the change
+        :param new_value: value of the property after the change
+        :return: None
+        """
+        if attribute == "speciality_code" and self._holds(entity):
+            self._update("speciality = ?", (SpecialityRegistry.name_of(new_value),), entity.id)
+
+    def _restore(self, row):
+        """
+        Build a contractor from its row
+
+        :param row: row of the id, name and speciality columns followed by the seq column as tuple
+        :return: contractor as Contractor instance
+        """
+        return Contractor.restore(row[0], row[1], row[2])
+
+    def _row(self, entity):
+        """
+        Build the row of a contractor to insert
+
+        :param entity: contractor as Contractor instance
+        :return: values of the id, name and speciality columns as tuple
+        """
+        return entity.id, entity.name, entity.speciality
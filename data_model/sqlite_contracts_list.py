@@ -0,0 +1,220 @@
+# File: sqlite_contracts_list.py
+# Description: Prototype implementation of Game Developer Contract Matcher (GDCMatcher) case study
+# Author: Chris Knowles
+
+
+# Imports
+from data_model.contract import Contract
+from data_model.fixed_fee_contract import FixedFeeContract
+from data_model.advert_fee_contract import AdvertFeeContract
+from data_model.speciality_registry import SpecialityRegistry
+from data_model.contract_query import ContractQuery
+from data_model.sqlite_entities_list import SqliteEntitiesList
+from data_model.sqlite_index_entry import SqliteIndexEntry
+
+
+# Consts
+# Globals
+
+
+# Classes
+class SqliteContractsList(SqliteEntitiesList):
+    """
+    Container for Contract class instances kept in the contracts table of a SqliteStore, an alternative to
+    ContractsList, the owner, speciality, contractor and unallocated queries are answered from the indexes on the
+    owner_id, speciality and contractor_id columns, and changes to the allocated contractor, completed flag and times
+    viewed of a held contract are written back to its row
+
+    The owner and allocated contractor of a contract are looked up in the clients and contractors lists (so they are the
+    instances those lists hold), for every contract read by a query in one step, the speciality is stored by name, see
+    SqliteContractorsList
+
+    SqliteContractsList class - class variables:
+        __CONTRACT_CLASSES: contract class for each class name stored in the class column, as dictionary, with private
+                            access
+    """
+    __CONTRACT_CLASSES = {contract_class.__name__: contract_class
+                          for contract_class in (Contract, FixedFeeContract, AdvertFeeContract)}
+
+    def __init__(self, store, clients_list, contractors_list, cache_size=10000):
+        """
+ -      Initialiser - instance variables:
+            store: from base class
+            cache_size: from base class
+            clients_list: clients the owners are looked up in, as SqliteClientsList, with private access
+            contractors_list: contractors the allocated contractors are looked up in, as SqliteContractorsList, with
+                              private access
+
+        :param store: database to keep the contracts in as SqliteStore
+        :param clients_list: clients list to look owners up in
+        :param contractors_list: contractors list to look allocated contractors up in
+        :param cache_size: number of recently materialised contracts kept when unreferenced {optional}
+        """
+        super().__init__(store, "contracts", ("id", "class", "owner_id", "speciality", "payment", "contractor_id",
+                                              "completed", "billed_version", "times_viewed"), cache_size)
+        self.__clients_list = clients_list
+        self.__contractors_list = contractors_list
+        for row in store.read("SELECT DISTINCT speciality FROM contracts"):
+            SpecialityRegistry.intern(row[0])
+
+    def get_with_owner(self, owner):
+        """
+        Provides a list of all the contained Contract instances that have the supplied owner, note this will be an empty
+        list if no Contracts have the supplied owner
+
+        :param owner: this is the owner to match with Contract instances as Client instance
+        :return: All Contract instances with supplied owner identifier as list
+        """
+        return self.index_entry("owner", owner.id).values()
+
+    def get_with_speciality(self, speciality):
+        """
+        Provides a list of all the contained Contract instances that have the supplied speciality, note this will be
+        an empty list if no Contracts have the supplied speciality
+
+        :param speciality: this is the speciality to match with Contract instances as string
+        :return: All Contract instances with supplied speciality as list
+        """
+        return self._select("WHERE speciality = ? ORDER BY seq", (speciality,))
+
+    def get_all_unallocated(self):
+        """
+        Provides a list of all the contained Contract instances that have not as yet been allocated to a Contractor
+        instance
+
+        :return: All Contract instances not as yet allocated as list
+        """
+        return self.index_entry("unallocated").values()
+
+    def get_with_contractor(self, contractor):
+        """
+        Provides a list of all the contained Contract instances that have been allocated to the supplied Contractor
+        instance, note will be an empty list if no Contracts have been allocated to the supplied Contractor instance
+
+        :param contractor: this is the contractor to match with Contract instances as Contractor instance
+        :return: All Contract instances with supplied speciality as list
+        """
+        return self.index_entry("contractor", contractor.id).values()
+
+    def has_with_owner(self, owner):
+        """
+        Check if any of the contained Contract instances have the supplied owner
+
+        :param owner: this is the owner to match with Contract instances as Client instance
+        :return: True if at least one Contract instance has the supplied owner, False if not
+        """
+        return bool(self._select_ids("WHERE owner_id = ? LIMIT 1", (owner.id,)))
+
+    def has_with_contractor(self, contractor):
+        """
+        Check if any of the contained Contract instances have been allocated to the supplied Contractor instance
+
+        :param contractor: this is the contractor to match with Contract instances as Contractor instance
+        :return: True if at least one Contract instance is allocated to the supplied contractor, False if not
+        """
+        return bool(self._select_ids("WHERE contractor_id = ? LIMIT 1", (contractor.id,)))
+
+    def query(self):
+        """
+        Start a query over the contained Contract instances that can combine several predicates, see ContractQuery
+
+        :return: new query as ContractQuery instance
+        """
+        return ContractQuery(self)
+
+    def index_entry(self, name, key=None):
+        """
+        Provides the live entry of the named index for the supplied key, used by ContractQuery to size and read the
+        candidates for a query, see SqliteIndexEntry
+
+        :param name: name of the index, one of "owner", "speciality", "contractor" or "unallocated"
+        :param key: owner identifier, speciality code or contractor identifier (not used for "unallocated")
+        :return: index entry as SqliteIndexEntry
+        """
+        if name == "unallocated":
+            return SqliteIndexEntry(self, "WHERE contractor_id IS NULL")
+        if name == "speciality":
+            return SqliteIndexEntry(self, "WHERE speciality = ?", (SpecialityRegistry.name_of(key),))
+
+        column = {"owner": "owner_id", "contractor": "contractor_id"}[name]
+
+        return SqliteIndexEntry(self, "WHERE {0} = ?".format(column), (key,))
+
+    def entity_changed(self, entity, attribute, old_value, new_value):
+        """
+        Observer method called by a held contract when one of its watched properties changes, used to write the new
+        allocated contractor, completed flag (with the fee schedule version it is billed under) or times viewed back to
+        its row
+
+        :param entity: contract that has changed as Contract instance
+        :param attribute: name of the property that has changed as string
+        :param old_value: value of the property before the change
+        :param new_value: value of the property after the change
+        :return: None
+        """
+        if not self._holds(entity):
+            return
+
+        if attribute == "contractor_allocated":
+            self._update("contractor_id = ?", (new_value.id if new_value else None,), entity.id)
+        elif attribute == "completed":
+            self._update("completed = ?, billed_version = ?", (1 if new_value else 0, entity.billed_version), entity.id)
+        elif attribute == "times_viewed":
+            self._update("times_viewed = ?", (new_value,), entity.id)
+
+    def _materialise(self, rows, restore=None):
+        """
+        Look up the owners and allocated contractors of the supplied rows in one step each and then return the contract
+        of each row, see SqliteEntitiesList._materialise()
+
+        :param rows: rows of the contract columns followed by the seq column as list of tuples
+        :param restore: not used, the contracts are built with the owners and contractors looked up {optional}
+        :return: contracts as list
+        """
+        owners = self.__clients_list.find_many({row[2] for row in rows})
+        contractors = self.__contractors_list.find_many({row[5] for row in rows if row[5]})
+
+        return super()._materialise(rows, lambda row: SqliteContractsList.__restore(row, owners, contractors))
+
+    def _restore(self, row):
+        """
+        Build a contract from its row, looking up its owner and allocated contractor
+
+        :param row: row of the contract columns followed by the seq column as tuple
+        :return: contract as instance of the class in its row
+        """
+        return SqliteContractsList.__restore(row, self.__clients_list.find_many([row[2]]),
+                                             self.__contractors_list.find_many([row[5]] if row[5] else []))
+
+    def _row(self, entity):
+        """
+        Build the row of a contract to insert
+
+        :param entity: contract as Contract instance
+        :return: values of the contract columns as tuple
+        """
+        contractor = entity.contractor_allocated
+
+        return (entity.id, type(entity).__name__, entity.owner.id, entity.speciality, entity.payment,
+                contractor.id if contractor else None, 1 if entity.completed else 0, entity.billed_version,
+                getattr(entity, "times_viewed", 0))
+
+    @staticmethod
+    def __restore(row, owners, contractors):
+        """
+        Build a contract from its row with its owner and allocated contractor taken from those looked up
+
+        :param row: row of the contract columns followed by the seq column as tuple
+        :param owners: map of client identifier to client as dictionary
+        :param contractors: map of contractor identifier to contractor as dictionary
+        :return: contract as instance of the class in its row
+        """
+        ident, class_name, owner_id, speciality, payment, contractor_id, completed, billed_version, times_viewed, \
+            sequence = row
+        contract_class = SqliteContractsList.__CONTRACT_CLASSES[class_name]
+        arguments = (ident, owners.get(owner_id), speciality, payment,
+                     contractors.get(contractor_id) if contractor_id else None, bool(completed), billed_version)
+        if contract_class is AdvertFeeContract:
+            return contract_class.restore(*arguments, times_viewed=times_viewed)
+
+        return contract_class.restore(*arguments)
@@ -0,0 +1,561 @@
+# File: sqlite_entities_list.py
+# Description: Prototype implementation of Game Developer Contract Matcher (GDCMatcher) case study
+# Author: Chris Knowles
+
+
+# Imports
+import threading
+import weakref
+from collections import OrderedDict
+from data_model.identified_entities_list import IdentifiedEntitiesList
+
+
+# Consts
+# Globals
+
+
+# Classes
+class SqliteEntitiesList:
+    """
+    Base class for the SQLite identified entity list classes, alternatives to the IdentifiedEntitiesList classes that
+    keep their entities in a table of a SqliteStore rather than in memory, they provide the same methods so MainApp can
+    use either (see MainApp.use_storage()), the position of an entity is the sequence number (the seq column) it was
+    given as it was added, which only ever increases so it is also the resume token when paging
+
+    Entities are materialised from their rows on demand and held in a weak identity cache so the same instance is
+    returned for an entity for as long as anything refers to it, changes made to a held entity through its watched
+    properties are written back to its row as they are made (this container observes each entity it has materialised),
+    only the cache_size most recently materialised entities are also referred to by this container so memory depends
+    on the entities in use rather than on the size of the data set
+
+    Subclasses give the table and its columns, build an entity from a row with _restore() and a row from an entity with
+    _row(), and override entity_changed() to write back the watched properties they store
+
+    SqliteEntitiesList class - class variables:
+        __CHUNK_SIZE: number of rows read at a time when iterating and number of identifiers looked up at a time, as
+                      integer, with private access
+    """
+    __CHUNK_SIZE = 500
+
+    def __init__(self, store, table, columns, cache_size=10000):
+        """
+ -      Initialiser - instance variables:
+            store: database the entities are kept in, as SqliteStore, property with read-only access
+            table: name of the table holding the entities, as string, with private access
+            columns: names of the columns an entity is built from, the identifier first, as tuple, with private access
+            select: start of the query reading those columns and the seq column, as string, with private access
+            cache_size: number of the most recently materialised entities kept even when nothing else refers to them,
+                        as integer, property with read/write access
+            cache: map of identifier to entity for every materialised entity still referred to, as
+                   weakref.WeakValueDictionary, with private access
+            recent: map of identifier to entity for the most recently materialised entities in the order they were
+                    used, as OrderedDict, with private access
+            sequences: map of identifier to sequence number for every recent entity, as dictionary, with private access
+            count: number of entities in the table, as integer, with private access
+            entity_observers: observers added to every entity as it is materialised, as list, with private access
+            lock: lock held while entities are looked up in and added to the cache, so two threads materialising the
+                  same row get the same instance, as threading.Lock, with private access
+
+        :param store: database to keep the entities in as SqliteStore
+        :param table: name of the table as string
+        :param columns: names of the columns an entity is built from, the identifier first, as tuple
+        :param cache_size: number of recently materialised entities kept when unreferenced {optional}
+        """
+        self.__store = store
+        self.__table = table
+        self.__columns = tuple(columns)
+        self.__select = "SELECT {0}, seq FROM {1}".format(", ".join(self.__columns), self.__table)
+        self.__cache_size = int(cache_size)
+        self.__cache = weakref.WeakValueDictionary()
+        self.__recent = OrderedDict()
+        self.__sequences = {}
+        self.__count = None
+        self.__entity_observers = []
+        self.__lock = threading.Lock()
+        store.add_reset_listener(self._reset)
+
+    @property
+    def store(self):
+        return self.__store
+
+    @property
+    def cache_size(self):
+        return self.__cache_size
+
+    @cache_size.setter
+    def cache_size(self, cache_size):
+        with self.__lock:
+            self.__cache_size = int(cache_size)
+            self.__trim()
+
+    @property
+    def data(self):
+        """
+        All the contained entities in order, note - this materialises every entity so should only be used where the
+        complete list is really needed, index the container itself to read a single entity
+
+        :return: all entities as list
+        """
+        return list(self)
+
+    def __iter__(self):
+        """
+        Iterate over the contained entities in order, the rows are read a chunk at a time
+
+        :return: iterator over the contained entities
+        """
+        return self.iter_after()
+
+    def __getitem__(self, index):
+        """
+        Return the contained entity at the supplied index, as data[index] would, only the row at the index is read
+
+        :param index: index of the entity as integer, negative indexes count back from the end
+        :return: entity at the index as IdentifiedEntity
+        """
+        count = self.count()
+        position = index + count if index < 0 else index
+        if not 0 <= position < count:
+            raise IndexError("{0} index out of range".format(type(self).__name__))
+
+        return self._select("ORDER BY seq LIMIT 1 OFFSET ?", (position,))[0]
+
+    def __str__(self):
+        """
+        To string method
+
+        :return: string representation of this SQLite entity list instance
+        """
+        return "{0}:{1}".format(type(self).__name__, self.count())
+
+    def count(self):
+        """
+        Return the number of entities contained in this container, counted once and then kept up to date
+
+        :return: number of entities contained as integer
+        """
+        if self.__count is None:
+            self.__count = self.__store.read_one("SELECT COUNT(*) FROM {0}".format(self.__table))[0]
+
+        return self.__count
+
+    def add(self, entity):
+        """
+        Add supplied entity to the container, but only if an entity with the a given identifier does not already
+        exist in the container, return True if added successfully and False if not
+
+        :param entity: entity to add to the container as IdentifiedEntity
+        :return: True if added successfully, False if not
+        """
+        return bool(self.add_many([entity])[0])
+
+    def add_many(self, entities):
+        """
+        Add each of the supplied entities to the container in a single step, an entity is rejected if an entity with the
+        same identifier already exists in the container or appears earlier in the supplied entities, the rows are
+        inserted in one batch
+
+        :param entities: entities to add to the container as iterable of IdentifiedEntity
+        :return: tuple of the added entities as list and the rejected entities as list
+        """
+        entities = list(entities)
+        existing = self.__existing([entity.id for entity in entities])
+        added = []
+        rejected = []
+        for entity in entities:
+            if entity.id in existing:
+                rejected.append(entity)
+            else:
+                existing.add(entity.id)
+                added.append(entity)
+
+        if added:
+            count = self.count()
+            with self.__store.batch():
+                self.__store.write_many("INSERT INTO {0} ({1}) VALUES ({2})".format(
+                    self.__table, ", ".join(self.__columns), ", ".join("?" * len(self.__columns))),
+                    [self._row(entity) for entity in added])
+                with self.__lock:
+                    for entity in added:
+                        self.__hold(entity, None)
+                    self.__trim()
+                self.__count = count + len(added)
+
+        return added, rejected
+
+    def remove(self, entity):
+        """
+        Remove supplied entity from the container, but only if an entity with the a given identifier does exist in the
+        container, return True if removed successfully and False if not
+
+        :param entity: entity to remove from the container as IdentifiedEntity
+        :return: True if added successfully, False if not
+        """
+        return self.remove_by_id(entity.id)
+
+    def remove_by_id(self, ident):
+        """
+        Remove entity with supplied identifier from the container, but only if an entity with the given identifier
+        exists in the container, return True if removed successfully and False if not
+
+        :param ident: identifier of the entity to be removed as string
+        :return: True if added successfully, False if not
+        """
+        return bool(self.remove_many([ident])[0])
+
+    def remove_many(self, idents):
+        """
+        Remove each of the entities with the supplied identifiers from the container in a single step, the rows are
+        deleted in one batch
+
+        :param idents: identifiers of the entities to be removed as iterable of strings
+        :return: tuple of the removed entities as list and the identifiers that did not exist in the container as list
+        """
+        idents = list(idents)
+        found = self.find_many(idents)
+        removed = {}
+        missing = []
+        for ident in idents:
+            if ident in found and ident not in removed:
+                removed[ident] = found[ident]
+            elif ident not in removed:
+                missing.append(ident)
+
+        self.__remove_all(removed)
+
+        return list(removed.values()), missing
+
+    def remove_where(self, predicate):
+        """
+        Remove every entity for which the supplied predicate returns True from the container in a single step, note -
+        every entity has to be materialised to be checked
+
+        :param predicate: function taking an entity and returning True if it is to be removed
+        :return: removed entities as list
+        """
+        removed = {entity.id: entity for entity in self if predicate(entity)}
+
+        self.__remove_all(removed)
+
+        return list(removed.values())
+
+    def find_by_id(self, ident):
+        """
+        Return the entity with the supplied identifier or None if no entity with supplied identifier exists in container
+
+        :param ident: identifier of the entity to be found as string
+        :return: entity instance if it exists or None if not
+        """
+        entity = self.__cache.get(ident)
+        if entity is None:
+            entity = self.find_many([ident]).get(ident)
+
+        return entity
+
+    def find_many(self, idents):
+        """
+        Return the entities with the supplied identifiers, those not held in the cache are read a chunk of identifiers
+        at a time
+
+        :param idents: identifiers of the entities to be found as iterable of strings
+        :return: map of identifier to entity for those that exist in the container as dictionary
+        """
+        found = {}
+        missing = []
+        for ident in idents:
+            entity = self.__cache.get(ident)
+            if entity is not None:
+                found[ident] = entity
+            elif ident not in found:
+                missing.append(ident)
+
+        for start in range(0, len(missing), SqliteEntitiesList.__CHUNK_SIZE):
+            chunk = missing[start:start + SqliteEntitiesList.__CHUNK_SIZE]
+            for entity in self._select("WHERE id IN ({0})".format(", ".join("?" * len(chunk))), chunk):
+                found[entity.id] = entity
+
+        return found
+
+    def has(self, ident):
+        """
+        Check for the entity with the supplied identifier in the container, if it exists then return True, if not then
+        return False
+
+        :param ident: identifier of the entity to check for in the container
+        :return: True if entity exists, False if not
+        """
+        return ident in self.__cache or bool(self._count_where("WHERE id = ?", (ident,)))
+
+    def sequence_of(self, ident):
+        """
+        Return the sequence number of the entity with the supplied identifier, this is used as the resume token when
+        paging and only ever increases along the container
+
+        :param ident: identifier of the entity as string
+        :return: sequence number as integer or None if no entity with supplied identifier exists in container
+        """
+        sequence = self.__sequences.get(ident)
+        if sequence is None:
+            row = self.__store.read_one("SELECT seq FROM {0} WHERE id = ?".format(self.__table), (ident,))
+            sequence = row[0] if row else None
+
+        return sequence
+
+    def iter_after(self, token=None):
+        """
+        Iterate lazily over the contained entities that follow the entity the supplied token came from (or over every
+        entity if no token is supplied), the rows are read a chunk at a time from the primary key so each chunk starts
+        where the last one ended
+
+        :param token: resume token returned by page() or sequence_of() {optional}
+        :return: generator of entities
+        """
+        sequence = -1 if token is None else int(token)
+        while True:
+            entities = self._select("WHERE seq > ? ORDER BY seq LIMIT ?",
+                                    (sequence, SqliteEntitiesList.__CHUNK_SIZE))
+            if not entities:
+                return
+            sequence = self.sequence_of(entities[-1].id)
+            yield from entities
+
+    def page(self, page_size, token=None):
+        """
+        Return the next page of contained entities following the entity the supplied token came from (or the first
+        page if no token is supplied), together with the token to resume from for the page after, only the rows on
+        the page are read
+
+        :param page_size: largest number of entities on the page as integer
+        :param token: resume token returned with the previous page {optional}
+        :return: tuple with first entry the entities on the page as list and the second entry the resume token for the
+                 next page or None if there are no more entities
+        """
+        entities = self._select("WHERE seq > ? ORDER BY seq LIMIT ?",
+                                (-1 if token is None else int(token), int(page_size) + 1))
+
+        return IdentifiedEntitiesList.paginate(entities, page_size, lambda entity: self.sequence_of(entity.id))
+
+    def add_entity_observer(self, observer):
+        """
+        Add an observer to every entity materialised from now on as well as to every entity held, for instance so
+        running totals follow an entity that is dropped from the cache and materialised again, see
+        IdentifiedEntity.add_observer()
+
+        :param observer: object to be told of changes to the entities
+        :return: None
+        """
+        if observer not in self.__entity_observers:
+            self.__entity_observers.append(observer)
+        for entity in list(self.__cache.values()):
+            entity.add_observer(observer)
+
+    def remove_entity_observer(self, observer):
+        """
+        Stop adding an observer to the entities materialised and remove it from every entity held
+
+        :param observer: object to no longer be told of changes to the entities
+        :return: None
+        """
+        if observer in self.__entity_observers:
+            self.__entity_observers.remove(observer)
+        for entity in list(self.__cache.values()):
+            entity.remove_observer(observer)
+
+    def entity_changed(self, entity, attribute, old_value, new_value):
+        """
+        Observer method called by a held entity when one of its watched properties changes, does nothing here but is
+        overridden by subclasses that store watched properties
+
+        :param entity: entity that has changed as IdentifiedEntity
+        :param attribute: name of the property that has changed as string
+        :param old_value: value of the property before the change
+        :param new_value: value of the property after the change
+        :return: None
+        """
+        pass
+
+    def _holds(self, entity):
+        """
+        Check the supplied entity is the instance held for its identifier, changes to any other instance (for instance
+        one that has been removed) are not written back
+
+        :param entity: entity to check as IdentifiedEntity
+        :return: True if the entity is held, False if not
+        """
+        return self.__cache.get(entity.id) is entity
+
+    def _update(self, assignments, parameters, ident):
+        """
+        Write changed columns back to the row of the entity with the supplied identifier
+
+        :param assignments: column assignments as string, for instance "completed = ?"
+        :param parameters: values of the assignment placeholders as sequence
+        :param ident: identifier of the entity as string
+        :return: None
+        """
+        self.__store.write("UPDATE {0} SET {1} WHERE id = ?".format(self.__table, assignments),
+                           tuple(parameters) + (ident,))
+
+    def _select(self, condition, parameters=()):
+        """
+        Read the rows matching a condition and materialise their entities, reusing those already held
+
+        :param condition: WHERE (and ORDER BY or LIMIT) clause as string
+        :param parameters: values of the clause placeholders as sequence {optional}
+        :return: entities in the order of the rows as list
+        """
+        rows = self.__store.read("{0} {1}".format(self.__select, condition), parameters)
+
+        return self._materialise(rows)
+
+    def _select_ids(self, condition, parameters=()):
+        """
+        Read the identifiers of the rows matching a condition without materialising their entities
+
+        :param condition: WHERE (and ORDER BY or LIMIT) clause as string
+        :param parameters: values of the clause placeholders as sequence {optional}
+        :return: identifiers in the order of the rows as list
+        """
+        return [row[0] for row in self.__store.read("SELECT id FROM {0} {1}".format(self.__table, condition),
+                                                    parameters)]
+
+    def _count_where(self, condition, parameters=()):
+        """
+        Count the rows matching a condition
+
+        :param condition: WHERE clause as string
+        :param parameters: values of the clause placeholders as sequence {optional}
+        :return: number of matching rows as integer
+        """
+        return self.__store.read_one("SELECT COUNT(*) FROM {0} {1}".format(self.__table, condition), parameters)[0]
+
+    def _materialise(self, rows, restore=None):
+        """
+        Return the entity of each of the supplied rows, the held instance if there is one or else a new instance which
+        is then held, overridden by subclasses that look up entities the rows refer to in one step first
+
+        :param rows: rows of the entity columns followed by the seq column as list of tuples
+        :param restore: function building an entity from a row or None for _restore() {optional}
+        :return: entities as list
+        """
+        restore = self._restore if restore is None else restore
+        entities = []
+        with self.__lock:
+            for row in rows:
+                entity = self.__cache.get(row[0])
+                if entity is None:
+                    entity = restore(row)
+                    self.__hold(entity, row[-1])
+                else:
+                    self.__keep(entity, row[-1])
+                entities.append(entity)
+            self.__trim()
+
+        return entities
+
+    def _restore(self, row):
+        """
+        Build an entity from its row, overridden by every subclass
+
+        :param row: row of the entity columns followed by the seq column as tuple
+        :return: entity as IdentifiedEntity
+        """
+        raise NotImplementedError
+
+    def _row(self, entity):
+        """
+        Build the row of an entity to insert, overridden by every subclass
+
+        :param entity: entity as IdentifiedEntity
+        :return: values of the entity columns as tuple
+        """
+        raise NotImplementedError
+
+    def _reset(self):
+        """
+        Reset listener of the store, drops every held entity (and stops observing it) and the count as they may no
+        longer match the database
+
+        :return: None
+        """
+        for entity in list(self.__cache.values()):
+            entity.remove_observer(self)
+        self.__cache = weakref.WeakValueDictionary()
+        self.__recent = OrderedDict()
+        self.__sequences = {}
+        self.__count = None
+
+    def __hold(self, entity, sequence):
+        """
+        Hold the supplied entity in the cache and start observing it for changes
+
+        :param entity: entity as IdentifiedEntity
+        :param sequence: sequence number of the entity or None if it has just been inserted
+        :return: None
+        """
+        self.__cache[entity.id] = entity
+        self.__keep(entity, sequence)
+        entity.add_observer(self)
+        for observer in self.__entity_observers:
+            entity.add_observer(observer)
+
+    def __keep(self, entity, sequence):
+        """
+        Make the supplied entity the most recently used, called holding the cache lock
+
+        :param entity: entity as IdentifiedEntity
+        :param sequence: sequence number of the entity or None if it is not known
+        :return: None
+        """
+        self.__recent[entity.id] = entity
+        self.__recent.move_to_end(entity.id)
+        if sequence is not None:
+            self.__sequences[entity.id] = sequence
+
+    def __trim(self):
+        """
+        Stop referring to the least recently used entities above the cache size, each stays in the cache for as long as
+        anything else refers to it, called holding the cache lock
+
+        :return: None
+        """
+        while len(self.__recent) > max(0, self.__cache_size):
+            ident = self.__recent.popitem(last=False)[0]
+            self.__sequences.pop(ident, None)
+
+    def __existing(self, idents):
+        """
+        Find which of the supplied identifiers belong to entities in the container, a chunk of identifiers at a time
+
+        :param idents: identifiers to check as list of strings
+        :return: identifiers in the container as set
+        """
+        existing = {ident for ident in idents if ident in self.__cache}
+        missing = [ident for ident in idents if ident not in existing]
+        for start in range(0, len(missing), SqliteEntitiesList.__CHUNK_SIZE):
+            chunk = missing[start:start + SqliteEntitiesList.__CHUNK_SIZE]
+            existing.update(self._select_ids("WHERE id IN ({0})".format(", ".join("?" * len(chunk))), chunk))
+
+        return existing
+
+    def __remove_all(self, removed):
+        """
+        Delete the rows of the supplied entities in one batch, drop them from the cache and stop observing them
+
+        :param removed: map of identifier to entity for the entities to remove as dictionary
+        :return: None
+        """
+        if not removed:
+            return
+
+        count = self.count()
+        with self.__store.batch():
+            self.__store.write_many("DELETE FROM {0} WHERE id = ?".format(self.__table),
+                                    [(ident,) for ident in removed])
+            self.__count = count - len(removed)
+        with self.__lock:
+            for ident, entity in removed.items():
+                self.__cache.pop(ident, None)
+                self.__recent.pop(ident, None)
+                self.__sequences.pop(ident, None)
+                entity.remove_observer(self)
@@ -0,0 +1,91 @@
+# File: sqlite_index_entry.py
+# Description: Prototype implementation of Game Developer Contract Matcher (GDCMatcher) case study
+# Author: Chris Knowles
+
+
+# Imports
+from collections.abc import Mapping
+
+
+# Consts
+# Globals
+
+
+# Classes
+class SqliteIndexEntry(Mapping):
+    """
+    Live entry of an index of a SqliteContractsList, the map of contract identifier to contract for the contracts
+    matching a condition on an indexed column, returned by SqliteContractsList.index_entry() in place of the dictionary
+    returned by ContractsList.index_entry() so ContractQuery, ContractMatcher and ContractorRecommender work over either
+
+    Nothing is read until the entry is used, its length is counted from the index without materialising any contracts
+    (so a query plan can compare entries cheaply) and values() reads every matching contract in one query, note - the
+    entry is read again each time it is used so it always reflects the contracts as they are now
+    """
+
+    def __init__(self, contracts_list, condition, parameters=()):
+        """
+ -      Initialiser - instance variables:
+            contracts_list: contracts list the entry is of, as SqliteContractsList, with private access
+            condition: WHERE clause selecting the contracts in the entry, as string, with private access
+            parameters: values of the clause placeholders, as tuple, with private access
+
+        :param contracts_list: contracts list the entry is of
+        :param condition: WHERE clause selecting the contracts in the entry as string
+        :param parameters: values of the clause placeholders as sequence {optional}
+        """
+        self.__contracts_list = contracts_list
+        self.__condition = condition
+        self.__parameters = tuple(parameters)
+
+    def __str__(self):
+        """
+        To string method
+
+        :return: string representation of this index entry instance
+        """
+        return "{0}:{1}".format(SqliteIndexEntry.__name__, self.__condition)
+
+    def __len__(self):
+        """
+        Count the contracts in the entry
+
+        :return: number of contracts as integer
+        """
+        return self.__contracts_list._count_where(self.__condition, self.__parameters)
+
+    def __iter__(self):
+        """
+        Iterate over the identifiers of the contracts in the entry in the order they were added
+
+        :return: iterator over contract identifiers
+        """
+        return iter(self.__contracts_list._select_ids(self.__condition + " ORDER BY seq", self.__parameters))
+
+    def __getitem__(self, ident):
+        """
+        Return the contract in the entry with the supplied identifier
+
+        :param ident: identifier of the contract as string
+        :return: contract as Contract instance
+        """
+        if not self.__contracts_list._count_where(self.__condition + " AND id = ?", self.__parameters + (ident,)):
+            raise KeyError(ident)
+
+        return self.__contracts_list.find_by_id(ident)
+
+    def values(self):
+        """
+        Read every contract in the entry in one query, in the order they were added
+
+        :return: contracts as list
+        """
+        return self.__contracts_list._select(self.__condition + " ORDER BY seq", self.__parameters)
+
+    def items(self):
+        """
+        Read every contract in the entry in one query together with its identifier
+
+        :return: (identifier, contract) tuples as list
+        """
+        return [(contract.id, contract) for contract in self.values()]
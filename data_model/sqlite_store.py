@@ -0,0 +1,341 @@
+# File: sqlite_store.py
+# Description: Prototype implementation of Game Developer Contract Matcher (GDCMatcher) case study
+# Author: Chris Knowles
+
+
+# Imports
+import json
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+# Consts
+# Globals
+
+
+# Classes
+class SqliteStore:
+    """
+    Local SQLite database the SQLite entity lists (see SqliteEntitiesList) keep their entities in, so the data set is
+    held on disk rather than in memory and each query is answered from an index of the database, there is a table each
+    for clients, contractors and contracts plus a state table of named values (for instance the revenue and next
+    identifier number, see MainApp.use_storage())
+
+    Every change is made through a single writer connection and changes are batched, they are made inside an open
+    transaction which is only committed once batch_size changes are waiting (when the next change arrives) or when
+    flush() is called, batch() groups changes into one transaction that is committed (or rolled back if an exception is
+    raised) as a whole, a commit listener can add changes of its own to each transaction just before it is committed
+
+    Reads are made on a pool of reader connections so several threads can read at once, the database is in WAL journal
+    mode so readers are not blocked by the writer, note - a reader connection only sees committed changes so while
+    changes are waiting to be committed reads are made on the writer connection instead, so every change is seen by
+    every read as soon as it is made
+
+    SqliteStore class - class variables:
+        __SCHEMA: statements creating the tables and indexes if they do not already exist, as tuple, with private
+                  access
+        __TABLES: names of the tables emptied by clear(), as tuple, with private access
+    """
+    __SCHEMA = ("CREATE TABLE IF NOT EXISTS clients (seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE, "
+                "name TEXT NOT NULL)",
+                "CREATE TABLE IF NOT EXISTS contractors (seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "id TEXT NOT NULL UNIQUE, name TEXT NOT NULL, speciality TEXT NOT NULL)",
+                "CREATE INDEX IF NOT EXISTS contractors_speciality ON contractors (speciality)",
+                "CREATE TABLE IF NOT EXISTS contracts (seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE, "
+                "class TEXT NOT NULL, owner_id TEXT NOT NULL, speciality TEXT NOT NULL, payment REAL NOT NULL, "
+                "contractor_id TEXT, completed INTEGER NOT NULL DEFAULT 0, billed_version INTEGER, "
+                "times_viewed INTEGER NOT NULL DEFAULT 0)",
+                "CREATE INDEX IF NOT EXISTS contracts_owner ON contracts (owner_id)",
+                "CREATE INDEX IF NOT EXISTS contracts_speciality ON contracts (speciality)",
+                "CREATE INDEX IF NOT EXISTS contracts_contractor ON contracts (contractor_id)",
+                "CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    __TABLES = ("clients", "contractors", "contracts", "state")
+
+    def __init__(self, file_path, pool_size=4, batch_size=1000):
+        """
+ -      Initialiser - instance variables:
+            file_path: path to the database file, as string, property with read-only access
+            pool_size: number of reader connections, as integer, property with read-only access
+            batch_size: number of changes made before they are committed, as integer, property with read/write access
+            writer: connection every change is made through, as sqlite3.Connection, with private access
+            readers: reader connections not currently in use, as queue.Queue, with private access
+            lock: lock held while the writer connection is used, as threading.RLock, with private access
+            pending: number of changes made since the last commit, as integer, with private access
+            batch_depth: number of batch() blocks currently open, as integer, with private access
+            commit_count: number of commits made, as integer, property with read-only access
+            commit_listener: function called (with the writer lock held) just before each commit, or None, as
+                             function, property with read/write access
+            reset_listeners: functions called after the database is emptied or changes are rolled back, as list, with
+                             private access
+            closed: whether close() has been called, as boolean, with private access
+
+        :param file_path: path to the database file as string, created if it does not exist
+        :param pool_size: number of reader connections {optional}
+        :param batch_size: number of changes made before they are committed {optional}
+        """
+        self.__file_path = str(file_path)
+        self.__pool_size = max(1, int(pool_size))
+        self.__batch_size = max(1, int(batch_size))
+        self.__lock = threading.RLock()
+        self.__pending = 0
+        self.__batch_depth = 0
+        self.__commit_count = 0
+        self.__commit_listener = None
+        self.__reset_listeners = []
+        self.__closed = False
+
+        # Transactions are begun and committed explicitly rather than by the sqlite3 module
+        self.__writer = sqlite3.connect(self.__file_path, isolation_level=None, check_same_thread=False)
+        self.__writer.execute("PRAGMA journal_mode=WAL")
+        self.__writer.execute("PRAGMA synchronous=NORMAL")
+        for statement in SqliteStore.__SCHEMA:
+            self.__writer.execute(statement)
+
+        self.__readers = queue.Queue()
+        for _ in range(self.__pool_size):
+            reader = sqlite3.connect(self.__file_path, isolation_level=None, check_same_thread=False)
+            reader.execute("PRAGMA query_only=1")
+            self.__readers.put(reader)
+
+    @property
+    def file_path(self):
+        return self.__file_path
+
+    @property
+    def pool_size(self):
+        return self.__pool_size
+
+    @property
+    def batch_size(self):
+        return self.__batch_size
+
+    @batch_size.setter
+    def batch_size(self, batch_size):
+        self.__batch_size = max(1, int(batch_size))
+
+    @property
+    def commit_count(self):
+        return self.__commit_count
+
+    @property
+    def commit_listener(self):
+        return self.__commit_listener
+
+    @commit_listener.setter
+    def commit_listener(self, commit_listener):
+        self.__commit_listener = commit_listener
+
+    def __str__(self):
+        """
+        To string method
+
+        :return: string representation of this SQLite store instance
+        """
+        return "{0}:{1} {2} commits".format(SqliteStore.__name__, self.__file_path, self.__commit_count)
+
+    def read(self, sql, parameters=()):
+        """
+        Run a query and return every row of its result, on a pooled reader connection unless changes are waiting to be
+        committed
+
+        :param sql: query as string
+        :param parameters: values of the query placeholders as sequence {optional}
+        :return: rows as list of tuples
+        """
+        with self.__lock:
+            self.__check_open()
+            if self.__pending:
+                return self.__writer.execute(sql, parameters).fetchall()
+
+        reader = self.__readers.get()
+        try:
+            return reader.execute(sql, parameters).fetchall()
+        finally:
+            self.__readers.put(reader)
+
+    def read_one(self, sql, parameters=()):
+        """
+        Run a query and return the first row of its result
+
+        :param sql: query as string
+        :param parameters: values of the query placeholders as sequence {optional}
+        :return: first row as tuple or None if there are no rows
+        """
+        rows = self.read(sql, parameters)
+
+        return rows[0] if rows else None
+
+    def write(self, sql, parameters=()):
+        """
+        Make a change, it is committed with the rest of its batch
+
+        :param sql: statement making the change as string
+        :param parameters: values of the statement placeholders as sequence {optional}
+        :return: number of rows changed as integer
+        """
+        return self.write_many(sql, (parameters,))
+
+    def write_many(self, sql, parameter_rows):
+        """
+        Make the same change once for each of the supplied rows of values in one step, the rows count as one change
+        each towards the batch size
+
+        :param sql: statement making the change as string
+        :param parameter_rows: values of the statement placeholders for each change as iterable of sequences
+        :return: number of rows changed as integer
+        """
+        with self.__lock:
+            self.__check_open()
+
+            # Changes are only committed between calls, and never inside a batch() block, so a call is never split
+            if self.__pending >= self.__batch_size and not self.__batch_depth:
+                self.__commit()
+            if not self.__writer.in_transaction:
+                self.__writer.execute("BEGIN")
+            cursor = self.__writer.executemany(sql, parameter_rows)
+            self.__pending += max(1, cursor.rowcount)
+
+            return cursor.rowcount
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager grouping the changes made inside it into one transaction, committed when the outermost block
+        ends (if batch_size changes are then waiting) or rolled back if an exception is raised, other threads cannot
+        make changes while the block is open
+
+        :return: generator for the with statement
+        """
+        with self.__lock:
+            self.__check_open()
+            self.__batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self.__batch_depth -= 1
+                self.__rollback()
+                raise
+            self.__batch_depth -= 1
+            if not self.__batch_depth and self.__pending >= self.__batch_size:
+                self.__commit()
+
+    def flush(self):
+        """
+        Commit every change waiting to be committed
+
+        :return: None
+        """
+        with self.__lock:
+            self.__check_open()
+            if self.__writer.in_transaction:
+                self.__commit()
+
+    def get_state(self, key, default=None):
+        """
+        Return a named value from the state table
+
+        :param key: name of the value as string
+        :param default: value returned if there is no value with the name {optional}
+        :return: value as decoded from JSON or default
+        """
+        row = self.read_one("SELECT value FROM state WHERE key = ?", (key,))
+
+        return json.loads(row[0]) if row else default
+
+    def set_state(self, **values):
+        """
+        Set named values in the state table, committed with the rest of their batch
+
+        :param values: values by name, these must be JSON serialisable
+        :return: None
+        """
+        self.write_many("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+                        [(key, json.dumps(value)) for key, value in values.items()])
+
+    def clear(self):
+        """
+        Empty every table and commit, the reset listeners are then called
+
+        :return: None
+        """
+        with self.__lock:
+            for table in SqliteStore.__TABLES:
+                self.write("DELETE FROM {0}".format(table))
+            self.__commit()
+        self.__reset()
+
+    def add_reset_listener(self, listener):
+        """
+        Add a function to be called after the database is emptied or changes are rolled back, used by the entity lists
+        to drop entities they hold in memory that may no longer match the database
+
+        :param listener: function taking no arguments
+        :return: None
+        """
+        self.__reset_listeners.append(listener)
+
+    def close(self):
+        """
+        Commit every change waiting to be committed and close every connection
+
+        :return: None
+        """
+        with self.__lock:
+            if self.__closed:
+                return
+            if self.__writer.in_transaction:
+                self.__commit()
+            self.__closed = True
+            self.__writer.close()
+
+        for _ in range(self.__pool_size):
+            self.__readers.get().close()
+
+    def __commit(self):
+        """
+        Commit the open transaction, after the commit listener has added its changes, called holding the writer lock
+
+        :return: None
+        """
+        if self.__commit_listener is not None:
+            self.__batch_depth += 1  # Changes made by the listener must not start a commit of their own
+            try:
+                self.__commit_listener()
+            finally:
+                self.__batch_depth -= 1
+        if self.__writer.in_transaction:
+            self.__writer.execute("COMMIT")
+            self.__commit_count += 1
+        self.__pending = 0
+
+    def __rollback(self):
+        """
+        Roll back the open transaction, every change waiting to be committed is lost, then call the reset listeners,
+        called holding the writer lock
+
+        :return: None
+        """
+        if self.__writer.in_transaction:
+            self.__writer.execute("ROLLBACK")
+        self.__pending = 0
+        self.__reset()
+
+    def __reset(self):
+        """
+        Call every reset listener
+
+        :return: None
+        """
+        for listener in self.__reset_listeners:
+            listener()
+
+    def __check_open(self):
+        """
+        Raise an error if the store is closed
+
+        :return: None
+        """
+        if self.__closed:
+            raise ValueError("SQLite store {0} is closed".format(self.__file_path))
@@ -0,0 +1,206 @@
+# File: view_counter.py
+# Description: Prototype implementation of Game Developer Contract Matcher (GDCMatcher) case study
+# Author: Chris Knowles
+
+
+# Imports
+import threading
+from data_model.advert_fee_contract import AdvertFeeContract
+
+
+# Consts
+# Globals
+
+
+# Classes
+class ViewCounter:
+    """
+    Counts views of advert fee contracts from any number of threads without them contending on the contracts, each
+    thread records its views into its own shard (a map of contract to views not yet folded, guarded by a lock that only
+    that thread and a fold ever take) and the views are folded into the contracts, with
+    AdvertFeeContract.add_views(), in one step per contract:
+
+        - whenever a shard has recorded fold_threshold views since it was last folded
+        - whenever fold() is called, for instance before revenue totals are read
+        - for a single contract when flush() is called, which MainApp does before a contract is completed so that its
+          revenue is worked out from every view recorded up to then
+
+    Folds are made one at a time (under a fold lock) so add_views() is never called for the same contract from two
+    threads at once, note - the shard of a thread that has finished is dropped once it has been folded
+
+    A fold listener (for instance to log the views, see MainApp.start_logging()) is called after each fold with the
+    number of views actually added to each contract, views of a completed contract are not added
+    """
+
+    def __init__(self, fold_threshold=1024):
+        """
+ -      Initialiser - instance variables:
+            fold_threshold: number of views a shard records before it is folded, as integer, property with read/write
+                            access
+            local: thread local holding the shard of each thread, as threading.local, with private access
+            shards: shard of every thread, each as a [lock, views by contract, views recorded, thread] list, as list,
+                    with private access
+            shards_lock: lock held while the list of shards is changed, as threading.Lock, with private access
+            fold_lock: lock held while views are folded into contracts, as threading.Lock, with private access
+            fold_listener: function called after each fold with a map of contract to views added (only if any were
+                           added), or None, as function, property with read/write access
+
+        :param fold_threshold: number of views a shard records before it is folded {optional}
+        """
+        self.__fold_threshold = int(fold_threshold)
+        self.__local = threading.local()
+        self.__shards = []
+        self.__shards_lock = threading.Lock()
+        self.__fold_lock = threading.Lock()
+        self.__fold_listener = None
+
+    @property
+    def fold_threshold(self):
+        return self.__fold_threshold
+
+    @fold_threshold.setter
+    def fold_threshold(self, fold_threshold):
+        self.__fold_threshold = int(fold_threshold)
+
+    @property
+    def fold_listener(self):
+        return self.__fold_listener
+
+    @fold_listener.setter
+    def fold_listener(self, fold_listener):
+        self.__fold_listener = fold_listener
+
+    def __str__(self):
+        """
+        To string method
+
+        :return: string representation of this view counter instance
+        """
+        return "{0}:{1} shards".format(ViewCounter.__name__, len(self.__shards))
+
+    def record(self, contract, count=1):
+        """
+        Record views of the supplied contract
+
+        :param contract: contract viewed as AdvertFeeContract instance
+        :param count: number of views as integer {optional}
+        :return: None
+        """
+        shard = self.__shard()
+        with shard[0]:
+            views = shard[1]
+            views[contract] = views.get(contract, 0) + count
+            shard[2] += count
+            full = shard[2] >= self.__fold_threshold
+
+        if full:
+            self.fold()
+
+    def record_many(self, contracts, count=1):
+        """
+        Record views of each of the supplied contracts in one step, for instance for every contract on a listing page,
+        contracts that are not advert fee contracts are ignored
+
+        :param contracts: contracts viewed as iterable of Contract instances
+        :param count: number of views of each contract as integer {optional}
+        :return: None
+        """
+        shard = self.__shard()
+        with shard[0]:
+            views = shard[1]
+            for contract in contracts:
+                if isinstance(contract, AdvertFeeContract):
+                    views[contract] = views.get(contract, 0) + count
+                    shard[2] += count
+            full = shard[2] >= self.__fold_threshold
+
+        if full:
+            self.fold()
+
+    def pending(self, contract):
+        """
+        Return the number of views of the supplied contract recorded but not yet folded into it, note - this does not
+        stop other threads recording so it is a snapshot
+
+        :param contract: contract as AdvertFeeContract instance
+        :return: number of views as integer
+        """
+        return sum(shard[1].get(contract, 0) for shard in tuple(self.__shards))
+
+    def fold(self):
+        """
+        Fold every recorded view into its contract
+
+        :return: number of contracts folded into as integer
+        """
+        with self.__fold_lock:
+            with self.__shards_lock:
+                shards = tuple(self.__shards)
+
+            # Take the views out of each shard, holding each shard lock only long enough to swap in an empty map
+            totals = {}
+            for shard in shards:
+                with shard[0]:
+                    views = shard[1]
+                    shard[1] = {}
+                    shard[2] = 0
+                for contract, count in views.items():
+                    totals[contract] = totals.get(contract, 0) + count
+
+            self.__apply(totals)
+
+            # Drop the shards of threads that have finished, they have just been folded so nothing is lost
+            with self.__shards_lock:
+                self.__shards = [shard for shard in self.__shards if shard[3].is_alive() or shard[1]]
+
+        return len(totals)
+
+    def flush(self, contract):
+        """
+        Fold every recorded view of the supplied contract into it, so its view count is exact
+
+        :param contract: contract as Contract instance
+        :return: number of views folded as integer
+        """
+        with self.__fold_lock:
+            count = 0
+            for shard in tuple(self.__shards):
+                with shard[0]:
+                    views = shard[1].pop(contract, 0)
+                    shard[2] -= views
+                count += views
+
+            if count:
+                self.__apply({contract: count})
+
+        return count
+
+    def __apply(self, totals):
+        """
+        Add the supplied views to their contracts and tell the fold listener, called holding the fold lock
+
+        :param totals: map of contract to number of views as dictionary
+        :return: None
+        """
+        added = {}
+        for contract, count in totals.items():
+            if contract.add_views(count):
+                added[contract] = count
+
+        if added and self.__fold_listener is not None:
+            self.__fold_listener(added)
+
+    def __shard(self):
+        """
+        Return the shard of the calling thread, creating it the first time the thread records a view
+
+        :return: shard as list
+        """
+        shard = getattr(self.__local, "shard", None)
+        if shard is None:
+            shard = [threading.Lock(), {}, 0, threading.current_thread()]
+            self.__local.shard = shard
+            with self.__shards_lock:
+                self.__shards.append(shard)
+
+        return shard
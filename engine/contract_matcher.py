@@ -0,0 +1,397 @@
+# File: contract_matcher.py
+# Description: Prototype implementation of Game Developer Contract Matcher (GDCMatcher) case study
+# Author: Chris Knowles
+
+
+# Imports
+import heapq
+import os
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from data_model.speciality_registry import SpecialityRegistry
+
+
+# Consts
+# Globals
+
+
+# Classes
+class ContractMatcher:
+    """
+    Computes an allocation of the unallocated contracts to contractors in one go, a contract can only be allocated to a
+    contractor with the same speciality and no contractor may be given more than the workload cap of contracts that are
+    not yet completed (counting the contracts already allocated to it), within these rules the allocation gives the
+    greatest total expected revenue
+
+    The contracts of different specialities never compete for the same contractors so each speciality is solved on its
+    own, and within a speciality every contractor is interchangeable as the revenue of a contract does not depend on
+    who does it, so the problem is just to choose which contracts fill the spare capacity of the speciality:
+
+        spare capacity = sum over contractors of (workload cap - current workload)
+
+    taking the highest revenue contracts first up to the spare capacity is optimal (the choice of contracts is a
+    uniform matroid so greedy is exact), which gives the same result a min cost flow or assignment solver would but in
+    O(n log n) rather than needing a full network, each chosen contract then goes to the contractor with the lowest
+    workload so the work is spread evenly
+
+    When similar specialities match the specialities are no longer independent, each contract can only go to a
+    contractor whose speciality is similar to its own and similarity is not transitive, so the specialities joined by
+    a chain of similar ones are solved together over the candidate pairs of contract and contractor specialities (see
+    solve_similar()) rather than as one speciality
+
+    The solver itself works on plain tuples and does not touch any entities so it can also be run in another process,
+    this is used by match() to solve the specialities across a process pool, each speciality is sent to a worker as
+    compact (revenue, position) and (workload, position) records rather than as pickled entities and the positions in
+    the results are turned back into entities in this process
+
+    ContractMatcher class - class variables:
+        __BUNDLES_PER_WORKER: number of bundles of specialities made for each worker so that a worker given a large
+                              bundle does not hold up the others for long, as integer, with private access
+    """
+    __BUNDLES_PER_WORKER = 4
+
+    def __init__(self, contracts_list, contractors_list, max_workload=None, similar_specialities=False):
+        """
+ -      Initialiser - instance variables:
+            contracts_list: contracts to allocate and current workloads are taken from, as ContractsList, with private
+                            access
+            contractors_list: contractors to allocate to, as ContractorsList, with private access
+            max_workload: most contracts not yet completed a contractor can have or None for no cap, as integer,
+                          property with read/write access
+            similar_specialities: flag to indicate a contract can go to a contractor with a similar speciality rather
+                                  than only the same one, as boolean, property with read/write access
+
+        :param contracts_list: contracts list to take contracts from
+        :param contractors_list: contractors list to take contractors from
+        :param max_workload: workload cap {optional}
+        :param similar_specialities: whether similar specialities match {optional}
+        """
+        self.__contracts_list = contracts_list
+        self.__contractors_list = contractors_list
+        self.__max_workload = None if max_workload is None else int(max_workload)
+        self.__similar_specialities = bool(similar_specialities)
+
+    @property
+    def max_workload(self):
+        return self.__max_workload
+
+    @max_workload.setter
+    def max_workload(self, max_workload):
+        self.__max_workload = None if max_workload is None else int(max_workload)
+
+    @property
+    def similar_specialities(self):
+        return self.__similar_specialities
+
+    @similar_specialities.setter
+    def similar_specialities(self, similar_specialities):
+        self.__similar_specialities = bool(similar_specialities)
+
+    def __str__(self):
+        """
+        To string method
+
+        :return: string representation of this contract matcher instance
+        """
+        return "{0}:{1}".format(ContractMatcher.__name__,
+                                "uncapped" if self.__max_workload is None else self.__max_workload)
+
+    def workload_of(self, contractor):
+        """
+        Return the current workload of the supplied contractor, this is the number of contracts allocated to it that
+        are not yet completed
+
+        :param contractor: contractor as Contractor instance
+        :return: workload as integer
+        """
+        allocated = self.__contracts_list.index_entry("contractor", contractor.id)
+
+        return sum(1 for contract in allocated.values() if not contract.completed)
+
+    def match(self, workers=1):
+        """
+        Compute the allocation of every unallocated contract that can be allocated, nothing is changed by this, see
+        MainApp.auto_allocate_contractors() for applying the allocation, with more than one worker the specialities are
+        solved across a process pool, the result is the same either way
+
+        :param workers: number of worker processes, 1 to solve in this process or None for one per CPU {optional}
+        :return: allocations as list of (contract, contractor) tuples, highest revenue contract first within each
+                 speciality
+        """
+        # Group the unallocated contracts (that are not completed) by speciality as (revenue, contract) records
+        contracts = defaultdict(list)
+        for contract in tuple(self.__contracts_list.index_entry("unallocated").values()):
+            if not contract.completed:
+                contracts[contract.speciality_code].append((contract.calculate_revenue(), contract))
+
+        partitions = []
+        for codes, records in self.__group_specialities(contracts):
+            specialities = [SpecialityRegistry.name_of(code) for code in codes]
+            contractors = [(self.workload_of(contractor), contractor) for speciality in specialities
+                           for contractor in self.__contractors_list.get_with_speciality(speciality)]
+            if not contractors:  # Contracts with no contractor of their speciality cannot be allocated
+                continue
+            if not self.__similar_specialities:
+                partitions.append((records, contractors, None))
+                continue
+
+            # Each contract speciality can only go to the contractor specialities similar to it, most similar first
+            contractor_codes = {contractor.speciality_code for workload, contractor in contractors}
+            similar = {code: tuple(similar_code for similar_code in SpecialityRegistry.similar_codes(speciality)
+                                   if similar_code in contractor_codes)
+                       for code, speciality in zip(codes, specialities) if code in contracts}
+            partitions.append(([(revenue, contract.speciality_code, contract) for revenue, contract in records],
+                               [(workload, contractor.speciality_code, contractor)
+                                for workload, contractor in contractors], similar))
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or len(partitions) <= 1:
+            return [allocation for partition in ContractMatcher.solve_all(partitions, self.__max_workload)
+                    for allocation in partition]
+
+        return self.__match_in_pool(partitions, workers)
+
+    def __group_specialities(self, contracts):
+        """
+        Group the specialities that are solved together, normally each speciality is a group on its own but when
+        similar specialities match each speciality is joined (with a union find) to every speciality similar to it, so
+        a group holds every speciality linked to another in the group by a chain of similar specialities, note - this
+        only decides what is solved together, a contract in the group can still only go to a contractor whose
+        speciality is similar to its own
+
+        :param contracts: map of speciality code to the records of the contracts with that speciality as dictionary
+        :return: groups as list of (speciality codes, contract records) tuples
+        """
+        if not self.__similar_specialities:
+            return [((code, ), records) for code, records in contracts.items()]
+
+        parents = {}
+
+        def find(code):
+            parents.setdefault(code, code)
+            while parents[code] != code:
+                parents[code] = parents[parents[code]]  # Halve the path as it is followed
+                code = parents[code]
+
+            return code
+
+        for code in contracts:
+            for similar in SpecialityRegistry.similar_codes(SpecialityRegistry.name_of(code)):
+                parents[find(similar)] = find(code)
+
+        groups = {}
+        for code in parents:
+            groups.setdefault(find(code), []).append(code)
+
+        return [(tuple(codes), [record for code in codes for record in contracts.get(code, ())])
+                for codes in groups.values() if any(code in contracts for code in codes)]
+
+    def __match_in_pool(self, partitions, workers):
+        """
+        Solve the supplied partitions across a process pool, the partitions are shared between bundles (largest first,
+        each to the bundle with the fewest contracts so far) and each bundle is solved by one call in a worker
+
+        :param partitions: specialities to solve as list of (contract records, contractor records, similar
+                           specialities or None) tuples, see solve_all()
+        :param workers: number of worker processes as integer
+        :return: allocations as list of (contract, contractor) tuples in the order of the partitions
+        """
+        # Share the partitions between the bundles, tracked as a heap of (contracts so far, bundle number)
+        bundle_count = min(len(partitions), workers * ContractMatcher.__BUNDLES_PER_WORKER)
+        bundles = [[] for bundle in range(bundle_count)]
+        sizes = [(0, bundle) for bundle in range(bundle_count)]
+        for number in sorted(range(len(partitions)), key=lambda number: len(partitions[number][0]), reverse=True):
+            size, bundle = sizes[0]
+            bundles[bundle].append(number)
+            heapq.heapreplace(sizes, (size + len(partitions[number][0]), bundle))
+
+        # Records sent to the workers hold only revenues, workloads, speciality codes and positions within the
+        # partition, the entity is always the last entry of a record so it is swapped for its position
+        jobs = [[([record[:-1] + (position, ) for position, record in enumerate(partitions[number][0])],
+                  [record[:-1] + (position, ) for position, record in enumerate(partitions[number][1])],
+                  partitions[number][2])
+                 for number in bundle]
+                for bundle in bundles]
+
+        solved = [None] * len(partitions)
+        with ProcessPoolExecutor(max_workers=min(workers, bundle_count)) as executor:
+            for bundle, results in zip(bundles, executor.map(ContractMatcher.solve_all, jobs,
+                                                             repeat(self.__max_workload))):
+                for number, result in zip(bundle, results):
+                    solved[number] = result
+
+        # Turn the positions in the results back into the contracts and contractors of each partition
+        allocations = []
+        for (records, contractors, similar), result in zip(partitions, solved):
+            allocations.extend((records[contract][-1], contractors[contractor][-1]) for contract, contractor in result)
+
+        return allocations
+
+    @staticmethod
+    def solve_all(partitions, max_workload=None):
+        """
+        Solve the allocation for each of the supplied specialities (or groups of similar specialities), used to solve a
+        bundle of specialities in a worker process
+
+        :param partitions: specialities to solve as list of (contracts, contractors, similar) tuples, similar is None
+                           for a single speciality (see solve()) or the similar specialities map for a group of similar
+                           specialities (see solve_similar())
+        :param max_workload: most contracts not yet completed a contractor can have or None for no cap {optional}
+        :return: allocations of each speciality as list of lists of (contract, contractor) tuples
+        """
+        return [ContractMatcher.solve(contracts, contractors, max_workload) if similar is None else
+                ContractMatcher.solve_similar(contracts, contractors, similar, max_workload)
+                for contracts, contractors, similar in partitions]
+
+    @staticmethod
+    def solve(contracts, contractors, max_workload=None):
+        """
+        Solve the allocation for a single speciality, the contracts and contractors can be any objects (e.g.
+        identifiers) as only the revenues and workloads are used
+
+        :param contracts: contracts to allocate as list of (revenue, contract) tuples
+        :param contractors: contractors to allocate to as list of (workload, contractor) tuples
+        :param max_workload: most contracts not yet completed a contractor can have or None for no cap {optional}
+        :return: allocations as list of (contract, contractor) tuples, highest revenue contract first
+        """
+        # Heap of contractors that have spare capacity, ordered by workload then by position so ties are broken in the
+        # order the contractors were supplied
+        available = [(workload, position, contractor) for position, (workload, contractor) in enumerate(contractors)
+                     if max_workload is None or workload < max_workload]
+        if not available or not contracts:
+            return []
+
+        heapq.heapify(available)
+        if max_workload is None:
+            capacity = len(contracts)
+        else:
+            capacity = sum(max_workload - workload for workload, position, contractor in available)
+
+        # Only the contracts that fit in the spare capacity are needed, nlargest() is stable so contracts with equal
+        # revenue keep the order they were supplied in
+        if capacity < len(contracts):
+            chosen = heapq.nlargest(capacity, contracts, key=lambda record: record[0])
+        else:
+            chosen = sorted(contracts, key=lambda record: record[0], reverse=True)
+
+        allocations = []
+        for revenue, contract in chosen:
+            workload, position, contractor = available[0]
+            allocations.append((contract, contractor))
+            workload += 1
+            if max_workload is None or workload < max_workload:
+                heapq.heapreplace(available, (workload, position, contractor))
+            else:
+                heapq.heappop(available)
+
+        return allocations
+
+    @staticmethod
+    def solve_similar(contracts, contractors, similar, max_workload=None):
+        """
+        Solve the allocation for a group of similar specialities, where each contract can only go to a contractor with
+        one of the specialities similar to its own, the contracts and contractors can be any objects (e.g. identifiers)
+        as only the revenues, speciality codes and workloads are used
+
+        The contractors of one speciality are interchangeable so the problem is which contracts to take and how many of
+        each contract speciality go to each contractor speciality, the contracts that can all be allocated at once form
+        a transversal matroid so taking them greedily, highest revenue first, is exact as long as each contract is
+        only turned down when no allocation of the contracts already taken leaves room for it, this is checked by
+        searching (breadth first) for an augmenting path over the contractor specialities, which can move contracts
+        already taken to other specialities similar to their own to make room, each chosen contract then goes to the
+        contractor with the lowest workload in the speciality the counts give it
+
+        :param contracts: contracts to allocate as list of (revenue, speciality code, contract) tuples
+        :param contractors: contractors to allocate to as list of (workload, speciality code, contractor) tuples
+        :param similar: map of each contract speciality code to the contractor speciality codes it can go to, most
+                        similar first, as dictionary
+        :param max_workload: most contracts not yet completed a contractor can have or None for no cap {optional}
+        :return: allocations as list of (contract, contractor) tuples, highest revenue contract first
+        """
+        # Heap of contractors that have spare capacity for each contractor speciality, as in solve()
+        available = {}
+        for position, (workload, code, contractor) in enumerate(contractors):
+            if max_workload is None or workload < max_workload:
+                available.setdefault(code, []).append((workload, position, contractor))
+        if not available or not contracts:
+            return []
+
+        spare = {}
+        for code, heap in available.items():
+            heapq.heapify(heap)
+            spare[code] = len(contracts) if max_workload is None else sum(max_workload - workload
+                                                                          for workload, position, contractor in heap)
+
+        # Number of the chosen contracts of each contract speciality given to each contractor speciality
+        counts = {code: {} for code in available}
+        chosen = []
+        blocked = set()  # A contract speciality that has been turned down once has no room for any later contract
+        for revenue, code, contract in sorted(contracts, key=lambda record: record[0], reverse=True):
+            if code in blocked:
+                continue
+            if not ContractMatcher.__augment(code, similar, spare, counts):
+                blocked.add(code)
+                continue
+            chosen.append((code, contract))
+
+        allocations = []
+        for code, contract in chosen:
+            target = next(target for target in similar[code] if counts.get(target, {}).get(code))
+            counts[target][code] -= 1
+            heap = available[target]
+            workload, position, contractor = heap[0]
+            allocations.append((contract, contractor))
+            workload += 1
+            if max_workload is None or workload < max_workload:
+                heapq.heapreplace(heap, (workload, position, contractor))
+            else:
+                heapq.heappop(heap)
+
+        return allocations
+
+    @staticmethod
+    def __augment(code, similar, spare, counts):
+        """
+        Make room for one more contract of the supplied speciality by finding an augmenting path from it to a contractor
+        speciality with spare capacity, each step of the path moves a contract already taken from one contractor
+        speciality to another similar to its own, and apply it to the counts
+
+        :param code: contract speciality code as integer
+        :param similar: map of contract speciality code to contractor speciality codes, see solve_similar()
+        :param spare: spare capacity of each contractor speciality as dictionary, updated by this
+        :param counts: chosen contracts of each contract speciality given to each contractor speciality as dictionary of
+                       dictionaries, updated by this
+        :return: True if room was made, False if there is no room for the contract
+        """
+        # Breadth first over the contractor specialities, each reached from the previous one by the contract speciality
+        # moved between them, so the most similar contractor specialities with spare capacity are found first
+        parents = {}
+        queue = deque()
+        for target in similar.get(code, ()):
+            if target in spare and target not in parents:
+                parents[target] = (None, code)
+                queue.append(target)
+
+        while queue:
+            target = queue.popleft()
+            if spare[target] > 0:
+                spare[target] -= 1
+                while target is not None:
+                    previous, moved = parents[target]
+                    counts[target][moved] = counts[target].get(moved, 0) + 1
+                    if previous is not None:
+                        counts[previous][moved] -= 1
+                    target = previous
+
+                return True
+
+            for moved, count in counts[target].items():
+                if count:
+                    for other in similar[moved]:
+                        if other in spare and other not in parents:
+                            parents[other] = (target, moved)
+                            queue.append(other)
+
+        return False
@@ -0,0 +1,138 @@
+# File: contractor_recommender.py
+# Description: Prototype implementation of Game Developer Contract Matcher (GDCMatcher) case study
+# Author: Chris Knowles
+
+
+# Imports
+import heapq
+from data_model.speciality_registry import SpecialityRegistry
+
+
+# Consts
+# Globals
+
+
+# Classes
+class ContractorRecommender:
+    """
+    Recommends the contractors best suited to a contract, only contractors with the same or a similar speciality (see
+    SpecialityRegistry.similar_codes()) are considered and each is given a score from 0.0 to 1.0:
+
+        score = SPECIALITY_WEIGHT * speciality similarity
+              + HISTORY_WEIGHT * completed / (completed + 1)
+              + WORKLOAD_WEIGHT / (workload + 1)
+
+    where completed is the number of contracts the contractor has completed and workload is the number allocated to
+    it that are not yet completed, so an exact speciality match counts for most, then a history of completed contracts
+    and then having little work on
+
+    The part of the score that depends only on the contractor is cached for each contractor and the cache entry is
+    only dropped (see invalidate()) when the allocations of that contractor change, the similarity of each pair of
+    specialities is also cached as it never changes, so a recommendation costs one pass over the candidates and a
+    top k selection with heapq.nlargest()
+
+    ContractorRecommender class - class variables:
+        SPECIALITY_WEIGHT: weight of the speciality similarity in the score, as float, with public access
+        HISTORY_WEIGHT: weight of the completion history in the score, as float, with public access
+        WORKLOAD_WEIGHT: weight of the current workload in the score, as float, with public access
+    """
+    SPECIALITY_WEIGHT = 0.6
+    HISTORY_WEIGHT = 0.25
+    WORKLOAD_WEIGHT = 0.15
+
+    def __init__(self, contracts_list, contractors_list):
+        """
+ -      Initialiser - instance variables:
+            contracts_list: contracts the workloads and completion histories are taken from, as ContractsList, with
+                            private access
+            contractors_list: contractors to recommend from, as ContractorsList, with private access
+            contractor_scores: cache of the part of the score that depends only on the contractor, by contractor
+                               identifier, as dictionary, with private access
+            similarities: cache of speciality similarity by pair of speciality codes, as dictionary, with private
+                          access
+
+        :param contracts_list: contracts list to take workloads and histories from
+        :param contractors_list: contractors list to recommend from
+        """
+        self.__contracts_list = contracts_list
+        self.__contractors_list = contractors_list
+        self.__contractor_scores = {}
+        self.__similarities = {}
+
+    def __str__(self):
+        """
+        To string method
+
+        :return: string representation of this contractor recommender instance
+        """
+        return "{0}:{1} cached".format(ContractorRecommender.__name__, len(self.__contractor_scores))
+
+    def recommend(self, contract, k=3):
+        """
+        Return the k contractors best suited to the supplied contract, best first
+
+        :param contract: contract to recommend contractors for as Contract instance
+        :param k: most contractors to return as integer {optional}
+        :return: recommendations as list of (score, contractor) tuples
+        """
+        code = contract.speciality_code
+        candidates = self.__contractors_list.get_with_similar_speciality(contract.speciality)
+
+        scored = ((ContractorRecommender.SPECIALITY_WEIGHT * self.__similarity(code, contractor.speciality_code) +
+                   self.__contractor_score(contractor), contractor) for contractor in candidates)
+
+        return heapq.nlargest(k, scored, key=lambda recommendation: recommendation[0])
+
+    def invalidate(self, contractor):
+        """
+        Drop the cached score of the supplied contractor, called whenever its allocations change (a contract is
+        allocated to or taken from it, or one of its contracts is completed or removed)
+
+        :param contractor: contractor as Contractor instance or None
+        :return: None
+        """
+        if contractor:
+            self.__contractor_scores.pop(contractor.id, None)
+
+    def __contractor_score(self, contractor):
+        """
+        Return the part of the score of the supplied contractor that depends only on the contractor, from the cache if
+        it is there
+
+        :param contractor: contractor as Contractor instance
+        :return: score as float
+        """
+        score = self.__contractor_scores.get(contractor.id)
+        if score is None:
+            completed = 0
+            workload = 0
+            for contract in self.__contracts_list.index_entry("contractor", contractor.id).values():
+                if contract.completed:
+                    completed += 1
+                else:
+                    workload += 1
+
+            score = (ContractorRecommender.HISTORY_WEIGHT * completed / (completed + 1) +
+                     ContractorRecommender.WORKLOAD_WEIGHT / (workload + 1))
+            self.__contractor_scores[contractor.id] = score
+
+        return score
+
+    def __similarity(self, code_1, code_2):
+        """
+        Return the similarity of the specialities with the two supplied codes, from the cache if it is there
+
+        :param code_1: first speciality code as integer
+        :param code_2: second speciality code as integer
+        :return: similarity as float
+        """
+        if code_1 == code_2:
+            return 1.0
+
+        similarity = self.__similarities.get((code_1, code_2))
+        if similarity is None:
+            similarity = SpecialityRegistry.similarity(SpecialityRegistry.name_of(code_1),
+                                                       SpecialityRegistry.name_of(code_2))
+            self.__similarities[(code_1, code_2)] = similarity
+
+        return similarity
@@ -0,0 +1,402 @@
+# File: incremental_matcher.py
+# Description: Prototype implementation of Game Developer Contract Matcher (GDCMatcher) case study
+# Author: Chris Knowles
+
+
+# Imports
+import heapq
+from itertools import count
+
+
+# Consts
+# Globals
+
+
+# Classes
+class IncrementalMatcher:
+    """
+    Keeps the live queue of contracts matched as it changes, rather than running ContractMatcher over everything again,
+    for each speciality there is a heap of the open contracts (not allocated and not completed) ranked by potential
+    revenue, highest first, and a heap of the contractors with spare capacity ranked by workload, lowest first
+
+    The main application tells the matcher about each change (a contract or contractor added or removed, a contract
+    allocated or completed) and after each one the matcher pairs the top of the two heaps of the speciality affected
+    for as long as both have an entry, so a change costs O(log n) for each allocation it leads to, the allocations are
+    made by calling back to the supplied allocate function (normally MainApp.allocate_contractor()) which in turn tells
+    the matcher about them through contract_allocated() like any other allocation
+
+    Entries are never removed from the middle of a heap, instead each entry is checked when it reaches the top and
+    dropped if it is out of date (lazy invalidation), a contract entry is out of date once the contract is no longer
+    open and a contractor entry is out of date once a newer entry has been pushed for the contractor (its workload or
+    speciality changed) or once the contractor has been removed, so that out of date entries that never reach the top
+    cannot build up a heap is compacted (rebuilt from its current entries) as soon as its out of date entries outnumber
+    its current ones, note - contracts are ranked by their potential revenue when they were added to the matcher
+
+    The matcher observes each contractor it knows (see IdentifiedEntity.add_observer()) so a change of speciality
+    moves the contractor to the heap of its new speciality and matches it there, see contractor_changed(), stop() must
+    be called once the matcher is no longer used so the contractors stop telling it about changes
+    """
+
+    def __init__(self, allocate, max_workload=None):
+        """
+ -      Initialiser - instance variables:
+            allocate: function called with a contract and a contractor to make an allocation, with private access
+            max_workload: most contracts not yet completed a contractor can have or None for no cap, as integer,
+                          property with read-only access
+            contracts: map of speciality code to heap of open contract entries, as dictionary, with private access
+            contractors: map of speciality code to heap of contractor entries, as dictionary, with private access
+            open: map of contract identifier to each open contract, as dictionary, with private access
+            open_counts: map of speciality code to the number of open contracts with that speciality, as dictionary,
+                         with private access
+            known: map of contractor identifier to each contractor known to the matcher, as dictionary, with private
+                   access
+            workloads: map of contractor identifier to its workload, as dictionary, with private access
+            versions: map of contractor identifier to the sequence of its current heap entry, as dictionary, with
+                      private access
+            entry_codes: map of contractor identifier to the speciality code of the heap its current entry is in, for
+                         contractors with a current entry, as dictionary, with private access
+            entry_counts: map of speciality code to the number of current entries in its contractor heap, as
+                          dictionary, with private access
+            sequence: source of sequence numbers that keep heap entries in the order they were pushed when tied, as
+                      itertools.count, with private access
+            matching: flag to indicate allocations are being made so no further matching is started, as boolean, with
+                      private access
+
+        :param allocate: function to make an allocation
+        :param max_workload: workload cap {optional}
+        """
+        self.__allocate = allocate
+        self.__max_workload = None if max_workload is None else int(max_workload)
+        self.__contracts = {}
+        self.__contractors = {}
+        self.__open = {}
+        self.__open_counts = {}
+        self.__known = {}
+        self.__workloads = {}
+        self.__versions = {}
+        self.__entry_codes = {}
+        self.__entry_counts = {}
+        self.__sequence = count()
+        self.__matching = False
+
+    @property
+    def max_workload(self):
+        return self.__max_workload
+
+    def __str__(self):
+        """
+        To string method
+
+        :return: string representation of this incremental matcher instance
+        """
+        return "{0}:{1} open:{2} contractors".format(IncrementalMatcher.__name__, len(self.__open),
+                                                     len(self.__workloads))
+
+    def load(self, contractors, contracts):
+        """
+        Seed the matcher with the existing contractors and contracts and match everything that can be matched
+
+        :param contractors: existing contractors as iterable of Contractor instances
+        :param contracts: existing contracts as iterable of Contract instances
+        :return: None
+        """
+        contracts = tuple(contracts)
+        workloads = {}
+        for contract in contracts:
+            if contract.contractor_allocated and not contract.completed:
+                ident = contract.contractor_allocated.id
+                workloads[ident] = workloads.get(ident, 0) + 1
+
+        for contractor in contractors:
+            self.__push_contractor(contractor, workloads.get(contractor.id, 0))
+        for contract in contracts:
+            self.__push_contract(contract)
+
+        for code in tuple(self.__contracts):
+            self.__match(code)
+
+    def contract_added(self, contract):
+        """
+        Tell the matcher a contract has been added, it is allocated straight away if a contractor is available
+
+        :param contract: contract added as Contract instance
+        :return: None
+        """
+        if contract.contractor_allocated and not contract.completed:
+            self.__change_workload(contract.contractor_allocated, 1)
+        elif self.__push_contract(contract):
+            self.__match(contract.speciality_code)
+
+    def contract_removed(self, contract):
+        """
+        Tell the matcher a contract has been removed
+
+        :param contract: contract removed as Contract instance
+        :return: None
+        """
+        if not self.__close(contract) and contract.contractor_allocated and not contract.completed:
+            self.__change_workload(contract.contractor_allocated, -1)
+
+    def contract_allocated(self, contract, previous_contractor):
+        """
+        Tell the matcher a contract has been allocated, either by the matcher itself or by hand
+
+        :param contract: contract allocated as Contract instance
+        :param previous_contractor: contractor the contract was allocated to before or None
+        :return: None
+        """
+        self.__close(contract)
+        if contract.completed:
+            return
+
+        if previous_contractor:
+            self.__change_workload(previous_contractor, -1)
+        if contract.contractor_allocated:
+            self.__change_workload(contract.contractor_allocated, 1)
+        elif self.__push_contract(contract):  # Allocation taken away so the contract is open again
+            self.__match(contract.speciality_code)
+
+    def contract_completed(self, contract):
+        """
+        Tell the matcher a contract has been completed, freeing capacity on its contractor
+
+        :param contract: contract completed as Contract instance
+        :return: None
+        """
+        self.__close(contract)
+        if contract.contractor_allocated:
+            self.__change_workload(contract.contractor_allocated, -1)
+
+    def contractor_added(self, contractor):
+        """
+        Tell the matcher a contractor has been added, open contracts are allocated to it straight away
+
+        :param contractor: contractor added as Contractor instance
+        :return: None
+        """
+        self.__push_contractor(contractor, 0)
+        self.__match(contractor.speciality_code)
+
+    def contractor_removed(self, contractor):
+        """
+        Tell the matcher a contractor has been removed
+
+        :param contractor: contractor removed as Contractor instance
+        :return: None
+        """
+        self.__drop_entry(contractor.id)
+        self.__workloads.pop(contractor.id, None)
+        self.__versions.pop(contractor.id, None)
+        if self.__known.pop(contractor.id, None) is not None:
+            contractor.remove_observer(self)
+
+    def contractor_changed(self, contractor):
+        """
+        Tell the matcher the speciality of a contractor has changed, an entry is pushed to the heap of its new
+        speciality (which makes the entry in the heap of its old speciality out of date) and the new speciality is
+        matched, called when a contractor known to the matcher tells it about the change
+
+        :param contractor: contractor changed as Contractor instance
+        :return: None
+        """
+        if contractor.id not in self.__workloads:
+            return
+
+        self.__push_contractor(contractor, self.__workloads[contractor.id])
+        self.__match(contractor.speciality_code)
+
+    def entity_changed(self, entity, attribute, old_value, new_value):
+        """
+        Observer method called by a known contractor when one of its watched properties changes, a change of speciality
+        is passed on to contractor_changed()
+
+        :param entity: contractor that has changed as Contractor instance
+        :param attribute: name of the property that has changed as string
+        :param old_value: value of the property before the change
+        :param new_value: value of the property after the change
+        :return: None
+        """
+        if attribute == "speciality_code" and self.__known.get(entity.id) is entity:
+            self.contractor_changed(entity)
+
+    def stop(self):
+        """
+        Stop observing the known contractors, called once the matcher is no longer used
+
+        :return: None
+        """
+        for contractor in self.__known.values():
+            contractor.remove_observer(self)
+        self.__known = {}
+
+    def workload_of(self, contractor):
+        """
+        Return the workload of the supplied contractor as known to the matcher
+
+        :param contractor: contractor as Contractor instance
+        :return: number of contracts allocated to the contractor that are not yet completed as integer or None if the
+                 contractor is not known to the matcher
+        """
+        return self.__workloads.get(contractor.id)
+
+    def __change_workload(self, contractor, change):
+        """
+        Change the workload of the supplied contractor and push an entry with the new workload, which makes any earlier
+        entry for it out of date, and if capacity was freed match its speciality
+
+        :param contractor: contractor as Contractor instance
+        :param change: change to the workload as integer
+        :return: None
+        """
+        if contractor.id not in self.__workloads:
+            return
+
+        self.__push_contractor(contractor, self.__workloads[contractor.id] + change)
+        if change < 0:
+            self.__match(contractor.speciality_code)
+
+    def __push_contract(self, contract):
+        """
+        Push an entry for the supplied contract if it is open
+
+        :param contract: contract as Contract instance
+        :return: True if the contract is open, False if not
+        """
+        if contract.contractor_allocated or contract.completed:
+            return False
+
+        code = contract.speciality_code
+        if self.__open.get(contract.id) is not contract:
+            self.__close(contract)
+            self.__open[contract.id] = contract
+            self.__open_counts[code] = self.__open_counts.get(code, 0) + 1
+        contracts = self.__contracts.setdefault(code, [])
+        heapq.heappush(contracts, (-contract.calculate_revenue(), next(self.__sequence), contract))
+        if len(contracts) > 2 * self.__open_counts[code]:
+            self.__compact_contracts(code)
+
+        return True
+
+    def __close(self, contract):
+        """
+        Record the supplied contract as no longer open, which makes its heap entry out of date
+
+        :param contract: contract as Contract instance
+        :return: True if the contract was open, False if not
+        """
+        if self.__open.pop(contract.id, None) is None:
+            return False
+
+        self.__open_counts[contract.speciality_code] -= 1
+
+        return True
+
+    def __push_contractor(self, contractor, workload):
+        """
+        Record the workload of the supplied contractor and push an entry for it if it has spare capacity
+
+        :param contractor: contractor as Contractor instance
+        :param workload: current workload of the contractor as integer
+        :return: None
+        """
+        sequence = next(self.__sequence)
+        self.__drop_entry(contractor.id)
+        self.__workloads[contractor.id] = workload
+        self.__versions[contractor.id] = sequence
+        if self.__known.get(contractor.id) is not contractor:
+            self.__known[contractor.id] = contractor
+            contractor.add_observer(self)
+        if self.__max_workload is None or workload < self.__max_workload:
+            code = contractor.speciality_code
+            contractors = self.__contractors.setdefault(code, [])
+            heapq.heappush(contractors, (workload, sequence, code, contractor))
+            self.__entry_codes[contractor.id] = code
+            self.__entry_counts[code] = self.__entry_counts.get(code, 0) + 1
+            if len(contractors) > 2 * self.__entry_counts[code]:
+                self.__compact_contractors(code)
+
+    def __drop_entry(self, ident):
+        """
+        Record the current heap entry (if any) of the contractor with the supplied identifier as out of date
+
+        :param ident: identifier of the contractor as string
+        :return: None
+        """
+        code = self.__entry_codes.pop(ident, None)
+        if code is not None:
+            self.__entry_counts[code] -= 1
+
+    def __is_current(self, entry):
+        """
+        Check if a contractor heap entry is current
+
+        :param entry: contractor heap entry as tuple
+        :return: True if the entry is the current one for its contractor, False if it is out of date
+        """
+        workload, sequence, pushed_code, contractor = entry
+
+        return self.__versions.get(contractor.id) == sequence and contractor.speciality_code == pushed_code
+
+    def __compact_contracts(self, code):
+        """
+        Rebuild the contract heap of the supplied speciality from its current entries, in place as __match() may be
+        working through the heap
+
+        :param code: speciality code as integer
+        :return: None
+        """
+        contracts = self.__contracts[code]
+        contracts[:] = [entry for entry in contracts if self.__open.get(entry[2].id) is entry[2]]
+        heapq.heapify(contracts)
+
+    def __compact_contractors(self, code):
+        """
+        Rebuild the contractor heap of the supplied speciality from its current entries, in place as __match() may be
+        working through the heap
+
+        :param code: speciality code as integer
+        :return: None
+        """
+        contractors = self.__contractors[code]
+        contractors[:] = [entry for entry in contractors if self.__is_current(entry)]
+        heapq.heapify(contractors)
+
+    def __match(self, code):
+        """
+        Allocate the best open contracts of the supplied speciality to the least loaded contractors of the speciality
+        until one of the heaps is empty, each allocation is made through the allocate function which tells this
+        matcher about it so the heaps are kept up to date as this runs
+
+        :param code: speciality code as integer
+        :return: None
+        """
+        if self.__matching:
+            return
+
+        contracts = self.__contracts.get(code)
+        contractors = self.__contractors.get(code)
+        self.__matching = True
+        try:
+            while contracts and contractors:
+                # Drop out of date entries from the top of each heap
+                revenue, sequence, contract = contracts[0]
+                if self.__open.get(contract.id) is not contract:
+                    heapq.heappop(contracts)
+                    continue
+
+                contractor = contractors[0][3]
+                if not self.__is_current(contractors[0]):
+                    heapq.heappop(contractors)
+                    continue
+
+                # Both entries are current so pair them, the allocation pushes the new entry for the contractor
+                heapq.heappop(contracts)
+                heapq.heappop(contractors)
+                self.__drop_entry(contractor.id)
+                self.__allocate(contract, contractor)
+
+                # In case the allocate function did not tell this matcher about the allocation
+                if self.__open.get(contract.id) is contract:
+                    self.contract_allocated(contract, None)
+        finally:
+            self.__matching = False
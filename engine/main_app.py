@@ -4,6 +4,9 @@
 
 
 # Imports
+from contextlib import contextmanager
+from data_model.identified_entity import IdentifiedEntity
+from data_model.id_allocator import IdAllocator
 from data_model.client import Client
 from data_model.contractor import Contractor
 from data_model.contract import Contract
@@ -12,6 +15,19 @@ from data_model.advert_fee_contract import AdvertFeeContract
 from data_model.clients_list import ClientsList
 from data_model.contractors_list import ContractorsList
 from data_model.contracts_list import ContractsList
+from data_model.revenue_aggregates import RevenueAggregates
+from data_model.fee_schedule import FeeSchedule
+from data_model.view_counter import ViewCounter
+from data_model.sqlite_store import SqliteStore
+from data_model.sqlite_clients_list import SqliteClientsList
+from data_model.sqlite_contractors_list import SqliteContractorsList
+from data_model.sqlite_contracts_list import SqliteContractsList
+from engine.contract_matcher import ContractMatcher
+from engine.incremental_matcher import IncrementalMatcher
+from engine.contractor_recommender import ContractorRecommender
+from engine.preload_reader import PreloadReader
+from engine.snapshot import Snapshot
+from engine.write_ahead_log import WriteAheadLog
 
 
 # Consts
@@ -27,13 +43,46 @@ class MainApp:
     at class scope as there is only one of each required
 
     Main application class - class variables
-        __clients: clients list, as ClientsList, with private access
-        __contractors: contractors list, as ContractorsList, with private access
-        __contracts: contracts list, as ContractsList, with private access
+        __clients: clients list, as ClientsList (or SqliteClientsList), with private access
+        __contractors: contractors list, as ContractorsList (or SqliteContractorsList), with private access
+        __contracts: contracts list, as ContractsList (or SqliteContractsList), with private access
+        __store: database the lists are kept in or None if they are kept in memory, as SqliteStore, with private
+                 access (see use_storage())
+        __matcher: matcher keeping the contracts allocated as they change or None if not in use, as IncrementalMatcher,
+                   with private access
+        __recommender: recommender of contractors for a contract, as ContractorRecommender, with private access
+        __aggregates: running revenue totals of the contracts, as RevenueAggregates, with private access
+        __view_counter: counter the views of advert fee contracts displayed through display_contract() are recorded in,
+                        as ViewCounter, with private access
+        __log: write ahead log every change is appended to or None if not logging, as WriteAheadLog, with private
+               access
+        __bulk_depth: number of bulk steps (preloading, replaying a log or auto allocating) in progress, the changes
+                      they make are committed to the database in batches rather than one at a time, as integer, with
+                      private access
+        __CONTRACT_TYPES: contract type passed to add_contract() for each contract class name in preload data and log
+                          records, as dictionary, with private access
+        STORAGE: storage engine used by execute(), "memory" or "sqlite", as string, with public access
+        PRELOAD_PATH: path to the preload data file, as string, with public access
+        SNAPSHOT_PATH: path to the snapshot of the store, as string, with public access
+        LOG_PATH: path to the write ahead log of the changes made since the snapshot, as string, with public access
+        DATABASE_PATH: path to the database used by the "sqlite" storage engine, as string, with public access
     """
     __clients = ClientsList()
     __contractors = ContractorsList()
-    __contracts = ContractsList()
+    __contracts = ContractsList(lazy_removal=True)  # Contracts are archived in bulk so removal leaves tombstones
+    __store = None
+    __matcher = None
+    __recommender = ContractorRecommender(__contracts, __contractors)
+    __aggregates = RevenueAggregates()
+    __view_counter = ViewCounter()
+    __log = None
+    __bulk_depth = 0
+    __CONTRACT_TYPES = {"Contract": "base", "FixedFeeContract": "fixed", "AdvertFeeContract": "advert"}
+    STORAGE = "memory"
+    PRELOAD_PATH = "data/preload.dat"
+    SNAPSHOT_PATH = "data/store.snap"
+    LOG_PATH = "data/store.wal"
+    DATABASE_PATH = "data/store.db"
 
     def __init__(self, name, ui):
         """
@@ -76,13 +125,16 @@ class MainApp:
 
         return "{0} - Current Revenue £{1}".format(self.name, self.revenue)
 
-    def preload(self, file_path):
+    def preload(self, file_path, workers=1):
         """
         This method is purely available to preload a known set of data to aid in testing the application and can be
-        removed before distributing the final production version of the application
+        removed before distributing the final production version of the application, the file is read one line at a
+        time or, with more than one worker, parsed in byte ranges by a pool of worker processes, see PreloadReader,
+        either way the records are applied one at a time in file order so identifiers come out the same
 
         :param file_path: path to the file from which to preload data as string
-        :return: None
+        :param workers: number of worker processes parsing the file, 1 to parse it in this process {optional}
+        :return: reader used, for its counts and throughput, as PreloadReader or None if the file was not found
         """
         # We will use part of the os module to check for file existance
         import os.path
@@ -90,87 +142,322 @@ class MainApp:
         # If the file does not exist (or it is a directory rather than a file), then display an error message and abort
         if not os.path.exists(file_path) or not os.path.isfile(file_path):
             print("\nError: preload data file on path '{0}' not found".format(file_path))
-            return
-
-        # Open data file
-        data_file = open(file_path, "r")
-
-        # Read all lines from data file into an array
-        entries = data_file.readlines()
-
-        # Process each entry
-        for entry in entries:
-            # First check to see if the entry is a comment, if so then ignore this and check next entry
-            if entry[0] == "#":
-                continue
-
-            # Process each entry by converting the string to a dictionary representation using eval()
-            entry_as_dict = eval(entry)
-
-            # If the entry does not evaluate to a dictionary then assign cls None else assign cls the name of the class
-            # to be instantiated assuming the preload data is correctly formed
-            cls = None
-            if type(entry_as_dict) is dict and "class" in entry_as_dict:
-                # Find the class this entry is using the "class" key from entry as dictionary
-                cls = entry_as_dict["class"]
-
-            # Do class specific instantiation and adding to the correct container by using the relevant add_XXXXXX()
-            # method, note special care needs to be made when setting up the preload data to ensure that the correct
-            # client identifiers are associated with the correct client owners of the contract data
-            if cls == "Client":
-                self.add_client(entry_as_dict["name"])  # Add a new client
-
-            elif cls == "Contractor":
-                self.add_contractor(entry_as_dict["name"], entry_as_dict["speciality"])  # Add a new contractor
-
-            elif cls == "Contract":
-                # Add new contract of type "base"
-                success, contract = self.add_contract("base", self.get_client(entry_as_dict["owner_id"]),
-                                                      entry_as_dict["speciality"], entry_as_dict["payment"])
-
-                # Check if this contract has a contractor allocated
-                if entry_as_dict["contractor_allocated_id"]:
-                    # Yes so allocate to this contractor
-                    self.allocate_contractor(contract, self.get_contractor(entry_as_dict["contractor_allocated_id"]))
-
-                # Check if this contract is completed
-                if entry_as_dict["completed"]:
-                    # Yes so complete this contract
-                    self.complete_contract(contract)
-
-            elif cls == "FixedFeeContract":
-                # Add new contract of type fixed fee
-                success, contract = self.add_contract("fixed", self.get_client(entry_as_dict["owner_id"]),
-                                                      entry_as_dict["speciality"], entry_as_dict["payment"])
-
-                # Check if this contract has a contractor allocated
-                if entry_as_dict["contractor_allocated_id"]:
-                    # Yes so allocate to this contractor
-                    self.allocate_contractor(contract, self.get_contractor(entry_as_dict["contractor_allocated_id"]))
-
-                # Check if this contract is completed
-                if entry_as_dict["completed"]:
-                    # Yes so complete this contract
-                    self.complete_contract(contract)
-
-            elif cls == "AdvertFeeContract":
-                # Add new contract of type advert fee
-                success, contract = self.add_contract("advert", self.get_client(entry_as_dict["owner_id"]),
-                                                      entry_as_dict["speciality"], entry_as_dict["payment"])
-
-                # Check if this contract has a contractor allocated
-                if entry_as_dict["contractor_allocated_id"]:
-                    # Yes so allocate to this contractor
-                    self.allocate_contractor(contract, self.get_contractor(entry_as_dict["contractor_allocated_id"]))
-
-                # Check if this contract is completed
-                if entry_as_dict["completed"]:
-                    # Yes so complete this contract
-                    self.complete_contract(contract)
-
-            # Note - if the class key is any other value than those in the if .. elif then it is ignored
-
-        print("\nData from file on path '{0}' successfully loaded".format(file_path))
+            return None
+
+        # Process each entry as it is read
+        reader = PreloadReader(file_path)
+        with MainApp.__bulk():
+            for entry in (reader.read_parallel(workers) if workers > 1 else reader):
+                self.apply_preload_record(entry)
+
+        print("\nData from file on path '{0}' successfully loaded, {1} records at {2:.0f} records/s".
+              format(file_path, reader.records_read, reader.records_per_second))
+
+        return reader
+
+    def use_storage(self, engine, file_path=None, reset=False, pool_size=4, batch_size=1000, cache_size=10000):
+        """
+        Switch the storage engine the clients, contractors and contracts lists are kept in, "memory" keeps them in
+        memory (the ClientsList, ContractorsList and ContractsList classes) and "sqlite" keeps them in a local SQLite
+        database (the SqliteClientsList, SqliteContractorsList and SqliteContractsList classes, see SqliteStore) so the
+        data set can be larger than memory, the lists start empty for "memory" and hold what is in the database for
+        "sqlite", note - the entities of the storage switched from are not carried over
+
+        With "sqlite" the database is durable in itself so no snapshot or write ahead log is needed, each change is
+        committed before the method making it returns (only preloading, replaying a log and auto allocating commit in
+        batches of batch_size) and the next identifier number, revenue and fee schedule are committed with it, so
+        opening an existing database carries on from its last commit, the running revenue totals are rebuilt by reading
+        every contract once and the incremental matcher (if started) is restarted over the new lists, identifiers start
+        again from the first number whenever the storage switched to is empty
+
+        :param engine: "memory" or "sqlite"
+        :param file_path: path to the database file or None for DATABASE_PATH {optional}
+        :param reset: whether to empty the database rather than carry on from it {optional}
+        :param pool_size: number of database connections used for reading {optional}
+        :param batch_size: number of changes committed together by bulk steps {optional}
+        :param cache_size: number of recently used entities of each list held in memory even when unused {optional}
+        :return: database as SqliteStore for "sqlite" or None for "memory"
+        """
+        if engine not in ("memory", "sqlite"):
+            raise ValueError("Unknown storage engine {0}".format(engine))
+
+        # Views recorded so far belong to the contracts of the storage being switched from
+        MainApp.__view_counter.fold()
+        if MainApp.__store:
+            MainApp.__store.close()
+            MainApp.__store = None
+
+        aggregates = RevenueAggregates()
+        store = None
+        if engine == "sqlite":
+            store = SqliteStore(file_path if file_path else MainApp.DATABASE_PATH, pool_size, batch_size)
+            if reset:
+                store.clear()
+            clients = SqliteClientsList(store, cache_size)
+            contractors = SqliteContractorsList(store, cache_size)
+            contracts = SqliteContractsList(store, clients, contractors, cache_size)
+
+            # A contract dropped from memory and read again must still be followed by the running revenue totals
+            contracts.add_entity_observer(aggregates)
+
+            fee_versions = store.get_state("fee_versions")
+            if fee_versions:
+                FeeSchedule.restore_versions(fee_versions)
+            id_next = store.get_state("id_next")
+            self.__revenue = store.get_state("revenue", self.__revenue)
+            store.commit_listener = self.__save_store_state
+        else:
+            clients = ClientsList()
+            contractors = ContractorsList()
+            contracts = ContractsList(lazy_removal=True)
+            id_next = None
+
+        # Identifiers carry on from those already in the storage, or start again if it is empty
+        if id_next is not None:
+            IdentifiedEntity.id_allocator().advance_to(id_next)
+        elif not (clients.count() or contractors.count() or contracts.count()):
+            IdentifiedEntity.use_id_allocator(IdAllocator())
+
+        MainApp.__clients = clients
+        MainApp.__contractors = contractors
+        MainApp.__contracts = contracts
+        MainApp.__store = store
+        MainApp.__recommender = ContractorRecommender(contracts, contractors)
+        MainApp.__aggregates = aggregates
+        for contract in contracts:
+            aggregates.contract_added(contract)
+        if MainApp.__matcher:
+            self.start_incremental_matching(MainApp.__matcher.max_workload)
+
+        return store
+
+    def save_snapshot(self, file_path):
+        """
+        Write a binary snapshot of every client, contractor and contract instance together with the revenue, the next
+        identifier number, the fee schedule and the LSN of the last change logged, any views still held in the view
+        counter are folded in first, see Snapshot
+
+        :param file_path: path to write the snapshot file to as string
+        :return: number of bytes written as integer
+        """
+        MainApp.__view_counter.fold()
+        lsn = MainApp.__log.next_lsn - 1 if MainApp.__log else 0
+
+        return Snapshot.write(file_path, MainApp.__clients, MainApp.__contractors, MainApp.__contracts, self.__revenue,
+                              IdentifiedEntity.id_allocator().peek(), lsn=lsn)
+
+    def load_snapshot(self, file_path):
+        """
+        Load the client, contractor and contract instances held in a binary snapshot, the snapshot file is mapped into
+        memory and the instances are materialised straight into the containers in bulk, with no add, allocate or
+        complete being replayed, the fee schedule is replaced by the one in the snapshot and the revenue in the snapshot
+        is added to the revenue
+
+        :param file_path: path to the snapshot file as string
+        :return: tuple with the number of clients, contractors and contracts added and the LSN of the last change
+                 logged before the snapshot was taken as integers
+        """
+        with Snapshot(file_path) as snapshot:
+            FeeSchedule.restore_versions(snapshot.fee_versions())
+            clients, rejected = MainApp.__clients.add_many(snapshot.clients())
+            contractors, rejected = MainApp.__contractors.add_many(snapshot.contractors())
+            contracts, rejected = MainApp.__contracts.add_many(snapshot.contracts())
+
+            # New identifiers must carry on from the last one handed out before the snapshot was taken
+            IdentifiedEntity.id_allocator().advance_to(snapshot.id_next)
+            self.__revenue += snapshot.revenue
+            lsn = snapshot.lsn
+
+        # The contracts were added in bulk without telling the recommender, so the scores it has cached are out of date
+        MainApp.__recommender = ContractorRecommender(MainApp.__contracts, MainApp.__contractors)
+        for contract in contracts:
+            MainApp.__aggregates.contract_added(contract)
+        if MainApp.__matcher:
+            MainApp.__matcher.load(MainApp.__contractors, MainApp.__contracts)
+
+        return len(clients), len(contractors), len(contracts), lsn
+
+    def start_logging(self, file_path, next_lsn=1, synchronous=True, commit_interval=0.0):
+        """
+        Start appending every change made (adds, removes, allocations, completions, fee changes and folded views) to a
+        write ahead log, see WriteAheadLog
+
+        :param file_path: path to the log file as string
+        :param next_lsn: lowest LSN to give the next record {optional}
+        :param synchronous: whether each change waits until its record is durable {optional}
+        :param commit_interval: seconds the log waits for more records before each write {optional}
+        :return: log as WriteAheadLog
+        """
+        self.stop_logging()
+        MainApp.__log = WriteAheadLog(file_path, next_lsn, synchronous, commit_interval)
+        MainApp.__view_counter.fold_listener = MainApp.__log_views
+
+        return MainApp.__log
+
+    def stop_logging(self):
+        """
+        Stop appending changes to the write ahead log, views still held in the view counter are folded (and logged)
+        first and every record is made durable before the log is closed
+
+        :return: None
+        """
+        if MainApp.__log:
+            MainApp.__view_counter.fold()
+            MainApp.__view_counter.fold_listener = None
+            MainApp.__log.close()
+            MainApp.__log = None
+
+    def is_logging(self):
+        """
+        Check if changes are being appended to a write ahead log
+
+        :return: True if logging has been started, False if not
+        """
+        return MainApp.__log is not None
+
+    def checkpoint(self, file_path):
+        """
+        Write a snapshot holding every change logged so far and then empty the log, so recovery only has to replay
+        what changes after this, if more changes are logged while the snapshot is written the log is kept (the records
+        the snapshot already holds are skipped on recovery)
+
+        :param file_path: path to write the snapshot file to as string
+        :return: True if the log was emptied, False if not
+        """
+        self.save_snapshot(file_path)
+        if not MainApp.__log:
+            return False
+
+        with Snapshot(file_path) as snapshot:
+            lsn = snapshot.lsn
+
+        return MainApp.__log.truncate(lsn)
+
+    def recover(self, snapshot_path, log_path):
+        """
+        Rebuild the store from a snapshot (if there is one) and the changes logged after it was taken, then carry on
+        logging to the same log, the incremental matcher (if started) is paused while the log is replayed as the
+        allocations it made are in the log
+
+        :param snapshot_path: path to the snapshot file as string
+        :param log_path: path to the log file as string
+        :return: number of log records replayed as integer
+        """
+        import os.path
+
+        matcher = MainApp.__matcher
+        MainApp.__matcher = None
+        lsn = self.load_snapshot(snapshot_path)[3] if os.path.isfile(snapshot_path) else 0
+
+        replayed = 0
+        with MainApp.__bulk():
+            for record in WriteAheadLog.read(log_path, lsn):
+                self.apply_log_record(record)
+                replayed += 1
+
+        MainApp.__matcher = matcher
+        if matcher:
+            matcher.load(MainApp.__contractors, MainApp.__contracts)
+        self.start_logging(log_path, lsn + 1)
+
+        return replayed
+
+    def apply_log_record(self, record):
+        """
+        Make the change described by the supplied write ahead log record again, entities are created with the same
+        identifiers they were given when the change was first made
+
+        :param record: log record with an "op" key and the fields of the change, as dictionary
+        :return: None
+        """
+        op = record["op"]
+
+        if op == "add_client":
+            MainApp.__replay_identifier(record["id"])
+            MainApp.__check_replayed(record, self.add_client(record["name"]))
+
+        elif op == "add_contractor":
+            MainApp.__replay_identifier(record["id"])
+            MainApp.__check_replayed(record, self.add_contractor(record["name"], record["speciality"]))
+
+        elif op == "add_contract":
+            MainApp.__replay_identifier(record["id"])
+            MainApp.__check_replayed(record, self.add_contract(MainApp.__CONTRACT_TYPES.get(record["class"]),
+                                                               self.get_client(record["owner_id"]),
+                                                               record["speciality"], record["payment"]))
+
+        elif op == "remove_client":
+            self.remove_client(record["id"])
+
+        elif op == "remove_contractor":
+            self.remove_contractor(record["id"])
+
+        elif op == "remove_contract":
+            self.remove_contract(record["id"])
+
+        elif op == "allocate_contractor":
+            contractor_id = record["contractor_id"]
+            self.allocate_contractor(self.get_contract(record["contract_id"]),
+                                     self.get_contractor(contractor_id) if contractor_id else None)
+
+        elif op == "complete_contract":
+            self.complete_contract(self.get_contract(record["contract_id"]))
+
+        elif op == "set_fees":
+            self.set_fees(**record["fees"])
+
+        elif op == "views":
+            for ident, count in record["views"].items():
+                contract = self.get_contract(ident)
+                if contract:
+                    contract.add_views(count)
+
+        else:
+            raise ValueError("Log record {0} has unknown op {1}".format(record.get("lsn"), op))
+
+    def apply_preload_record(self, entry):
+        """
+        Create the entity described by the supplied preload record and add it to the correct container using the
+        relevant add_XXXXXX() method, note special care needs to be made when setting up the preload data to ensure that
+        the correct client identifiers are associated with the correct client owners of the contract data
+
+        :param entry: record with a "class" key of "Client", "Contractor", "Contract", "FixedFeeContract" or
+                      "AdvertFeeContract" and the fields of that class, as dictionary
+        :return: entity added or None if the class is not known or the entity could not be added
+        """
+        # Find the class this entry is using the "class" key, if the class key is any other value than those below then
+        # the entry is ignored
+        cls = entry.get("class")
+
+        if cls == "Client":
+            success, client = self.add_client(entry["name"])  # Add a new client
+            return client if success else None
+
+        if cls == "Contractor":
+            success, contractor = self.add_contractor(entry["name"], entry["speciality"])  # Add a new contractor
+            return contractor if success else None
+
+        contract_type = MainApp.__CONTRACT_TYPES.get(cls)
+        if contract_type is None:
+            return None
+
+        # Add new contract of the type for this class
+        success, contract = self.add_contract(contract_type, self.get_client(entry["owner_id"]), entry["speciality"],
+                                              entry["payment"])
+        if not success:
+            return None
+
+        # Check if this contract has a contractor allocated
+        if entry["contractor_allocated_id"]:
+            # Yes so allocate to this contractor
+            self.allocate_contractor(contract, self.get_contractor(entry["contractor_allocated_id"]))
+
+        # Check if this contract is completed
+        if entry["completed"]:
+            # Yes so complete this contract
+            self.complete_contract(contract)
+
+        return contract
 
     def execute(self):
         """
@@ -180,8 +467,33 @@ class MainApp:
         """
         # Preload the main application with data from the "data/preload.dat" file, we will use this to help with testing
         # so a set of known data is always available when the application starts, we can remove this once ready to
-        # distribute the production version of the application
-        self.preload("data/preload.dat")
+        # distribute the production version of the application, the store is then kept in a snapshot and a write ahead
+        # log of the changes made since, which are recovered instead for as long as the snapshot is newer than the
+        # preload data file, with the "sqlite" storage engine the store is kept in the database instead
+        import os.path
+
+        if MainApp.STORAGE == "sqlite":
+            # The database is the store, it is used as it is for as long as it is newer than the preload data file
+            current = os.path.isfile(MainApp.DATABASE_PATH) and (not os.path.isfile(MainApp.PRELOAD_PATH) or
+                                                               os.path.getmtime(MainApp.DATABASE_PATH) >=
+                                                               os.path.getmtime(MainApp.PRELOAD_PATH))
+            store = self.use_storage("sqlite", MainApp.DATABASE_PATH, reset=not current)
+            if store.get_state("id_next") is None:  # Emptied, or a preload into it was never committed
+                if current:
+                    store = self.use_storage("sqlite", MainApp.DATABASE_PATH, reset=True)
+                self.preload(MainApp.PRELOAD_PATH)
+                store.flush()
+        elif os.path.isfile(MainApp.SNAPSHOT_PATH) and (not os.path.isfile(MainApp.PRELOAD_PATH) or
+                                                        os.path.getmtime(MainApp.SNAPSHOT_PATH) >=
+                                                        os.path.getmtime(MainApp.PRELOAD_PATH)):
+            self.recover(MainApp.SNAPSHOT_PATH, MainApp.LOG_PATH)
+        else:
+            # Starting again from the preload data so any log of changes to an older store no longer applies
+            if os.path.isfile(MainApp.LOG_PATH):
+                os.remove(MainApp.LOG_PATH)
+            self.preload(MainApp.PRELOAD_PATH)
+            self.save_snapshot(MainApp.SNAPSHOT_PATH)
+            self.start_logging(MainApp.LOG_PATH)
 
         # Inject this main application instance into the UI as a dependency, this allows the UI to navigate to the main
         # application instance and call the necessary methods to operate the application functionality
@@ -190,6 +502,14 @@ class MainApp:
         # Run the UI
         self.ui.run()
 
+        # Fold everything logged into the snapshot ready for the next start, or commit the last batch of changes
+        if MainApp.__store:
+            MainApp.__view_counter.fold()
+            MainApp.__store.close()
+        else:
+            self.checkpoint(MainApp.SNAPSHOT_PATH)
+            self.stop_logging()
+
     def add_client(self, name):
         """
         Add new client instance with the supplied name
@@ -202,6 +522,8 @@ class MainApp:
 
         if not MainApp.__clients.add(client):  # Unsuccessful so return error message
             return False, "Error: new client was not added, reason not known"
+        MainApp.__logged("add_client", id=client.id, name=client.name)
+        MainApp.__committed()
 
         return True, client  # Successful so return newly added client instance
 
@@ -213,25 +535,52 @@ class MainApp:
         :return: tuple with first entry a success indicator as boolean and the second entry either the details of the
                  removed client (if successful) or an error message (if unsuccessful)
         """
-        # Find client instance
-        client = MainApp.__clients.find_by_id(ident)
-
-        # Check if client instance exists, if not return unsuccessful flag and error message
-        if not client:
-            return False, "Error: cannot remove client with Id: {0}, it does not exist".format(ident)
-
-        # Check if any contracts owned by this client, if so then return unsuccessful flag and error message
-        if MainApp.__contracts.get_with_owner(client):
-            return False, "Error: cannot remove client with Id: {0}, it is a contract owner".format(ident)
+        # Find client instance and check it can be removed, if not return unsuccessful flag and error message
+        client, error = self.__check_remove_client(ident)
+        if error:
+            return False, error
 
         # Store client details as string
         details = client
 
         # Now able to remove client instance
         MainApp.__clients.remove(client)
+        MainApp.__logged("remove_client", id=client.id)
+        MainApp.__committed()
 
         return True, details  # Successful so return True and the removed client details
 
+    def add_clients(self, names):
+        """
+        Add new client instances with each of the supplied names in a single step
+
+        :param names: names of the new clients as iterable of strings
+        :return: tuple with first entry the newly added clients as list and the second entry an error message for each
+                 client that was not added as list
+        """
+        added, rejected = MainApp.__clients.add_many([Client(name) for name in names])
+        MainApp.__logged_many(("add_client", {"id": client.id, "name": client.name}) for client in added)
+        MainApp.__committed()
+
+        return added, ["Error: new client {0} was not added, reason not known".format(client.name)
+                       for client in rejected]
+
+    def remove_clients(self, idents):
+        """
+        Remove client instances by each of the supplied identifiers in a single step, each client is checked in the same
+        way as by remove_client() and only those that pass are removed
+
+        :param idents: identifiers of the client instances to remove as iterable of strings
+        :return: tuple with first entry the removed clients as list and the second entry an error message for each
+                 client that was not removed as list
+        """
+        removable, errors = MainApp.__check_all(idents, self.__check_remove_client)
+        removed, missing = MainApp.__clients.remove_many(removable)
+        MainApp.__logged_many(("remove_client", {"id": client.id}) for client in removed)
+        MainApp.__committed()
+
+        return removed, errors
+
     def get_client(self, ident):
         """
         Return the client instance with the supplied identifier
@@ -243,11 +592,40 @@ class MainApp:
 
     def get_all_clients(self):
         """
-        Return all the client instances as a list
+        Return all the client instances as a new list, changing the list does not change the clients held
 
         :return: all client instances
         """
-        return MainApp.__clients.data
+        return list(MainApp.__clients)
+
+    def get_client_at(self, index):
+        """
+        Return the client instance at the supplied position in the order the clients were added, only that client
+        is read when the clients are kept in a database
+
+        :param index: position of the client as integer
+        :return: client instance
+        """
+        return MainApp.__clients[index]
+
+    def iter_clients(self):
+        """
+        Iterate lazily over all the client instances without copying or exposing the clients list
+
+        :return: generator of client instances
+        """
+        return MainApp.__clients.iter_after()
+
+    def get_clients_page(self, page_size, token=None):
+        """
+        Return the next page of client instances, following on from the page that returned the supplied token
+
+        :param page_size: largest number of clients on the page as integer
+        :param token: resume token returned with the previous page or None for the first page {optional}
+        :return: tuple with first entry the clients on the page as list and the second entry the resume token for the
+                 next page or None if there are no more clients
+        """
+        return MainApp.__clients.page(page_size, token)
 
     def add_contractor(self, name, speciality):
         """
@@ -262,6 +640,11 @@ class MainApp:
 
         if not MainApp.__contractors.add(contractor):  # Unsuccessful so return error message
             return False, "Error: new contractor was not added, reason not known"
+        MainApp.__logged("add_contractor", id=contractor.id, name=contractor.name, speciality=contractor.speciality)
+
+        if MainApp.__matcher:  # Give any open contracts to the new contractor
+            MainApp.__matcher.contractor_added(contractor)
+        MainApp.__committed()
 
         return True, contractor  # Successful so return newly added contractor instance
 
@@ -273,25 +656,63 @@ class MainApp:
         :return: tuple with first entry a success indicator as boolean and the second entry either the details of the
                  removed contractor (if successful) or an error message (if unsuccessful)
         """
-        # Find contractor instance
-        contractor = MainApp.__contractors.find_by_id(ident)
-
-        # Check if contractor instance exists, if not return unsuccessful flag and error message
-        if not contractor:
-            return False, "Error: cannot remove contractor with Id: {0}, it does not exist".format(ident)
-
-        # Check if any contracts are allocated to this contractor, if so then return unsuccessful flag and error message
-        if MainApp.__contracts.get_with_contractor(contractor):
-            return False, "Error: cannot remove contractor with Id: {0}, it is allocated to a contract".format(ident)
+        # Find contractor instance and check it can be removed, if not return unsuccessful flag and error message
+        contractor, error = self.__check_remove_contractor(ident)
+        if error:
+            return False, error
 
         # Store contractor details as string
         details = contractor
 
         # Now able to remove contractor instance
         MainApp.__contractors.remove(contractor)
+        MainApp.__logged("remove_contractor", id=contractor.id)
+        MainApp.__recommender.invalidate(contractor)
+        if MainApp.__matcher:
+            MainApp.__matcher.contractor_removed(contractor)
+        MainApp.__committed()
 
         return True, details  # Successful so return True and the removed contractor details
 
+    def add_contractors(self, details):
+        """
+        Add new contractor instances with each of the supplied names and specialities in a single step
+
+        :param details: name and speciality of each new contractor as iterable of (name, speciality) tuples
+        :return: tuple with first entry the newly added contractors as list and the second entry an error message for
+                 each contractor that was not added as list
+        """
+        added, rejected = MainApp.__contractors.add_many([Contractor(name, speciality) for name, speciality in details])
+        MainApp.__logged_many(("add_contractor", {"id": contractor.id, "name": contractor.name,
+                                                  "speciality": contractor.speciality}) for contractor in added)
+        if MainApp.__matcher:
+            for contractor in added:
+                MainApp.__matcher.contractor_added(contractor)
+        MainApp.__committed()
+
+        return added, ["Error: new contractor {0} was not added, reason not known".format(contractor.name)
+                       for contractor in rejected]
+
+    def remove_contractors(self, idents):
+        """
+        Remove contractor instances by each of the supplied identifiers in a single step, each contractor is checked in
+        the same way as by remove_contractor() and only those that pass are removed
+
+        :param idents: identifiers of the contractor instances to remove as iterable of strings
+        :return: tuple with first entry the removed contractors as list and the second entry an error message for each
+                 contractor that was not removed as list
+        """
+        removable, errors = MainApp.__check_all(idents, self.__check_remove_contractor)
+        removed, missing = MainApp.__contractors.remove_many(removable)
+        MainApp.__logged_many(("remove_contractor", {"id": contractor.id}) for contractor in removed)
+        for contractor in removed:
+            MainApp.__recommender.invalidate(contractor)
+            if MainApp.__matcher:
+                MainApp.__matcher.contractor_removed(contractor)
+        MainApp.__committed()
+
+        return removed, errors
+
     def get_contractor(self, ident):
         """
         Return the contractor instance with the supplied identifier
@@ -301,22 +722,65 @@ class MainApp:
         """
         return MainApp.__contractors.find_by_id(ident)
 
-    def get_contractors_with_speciality(self, speciality):
+    def get_contractors_with_speciality(self, speciality, similar=False):
         """
-        Return all the contractor instances that match the supplied speciality as a list
+        Return all the contractor instances that match the supplied speciality as a list, optionally also matching
+        contractors whose speciality is similar (e.g. "Cpp" for "C++"), see SpecialityRegistry.similar_codes()
 
         :param speciality: speciality to match with contractors as string
+        :param similar: whether contractors with a similar speciality also match {optional}
         :return: all matching contractor instances
         """
+        if similar:
+            return MainApp.__contractors.get_with_similar_speciality(speciality)
+
         return MainApp.__contractors.get_with_speciality(speciality)
 
+    def count_contractors_with_speciality(self, speciality):
+        """
+        Return the number of contractor instances that match the supplied speciality
+
+        :param speciality: speciality to match with contractors as string
+        :return: number of matching contractor instances as integer
+        """
+        return MainApp.__contractors.count_with_speciality(speciality)
+
     def get_all_contractors(self):
         """
-        Return all the contractor instances as a list
+        Return all the contractor instances as a new list, changing the list does not change the contractors held
 
         :return: all contractor instances
         """
-        return MainApp.__contractors.data
+        return list(MainApp.__contractors)
+
+    def get_contractor_at(self, index):
+        """
+        Return the contractor instance at the supplied position in the order the contractors were added, only that
+        contractor is read when the contractors are kept in a database
+
+        :param index: position of the contractor as integer
+        :return: contractor instance
+        """
+        return MainApp.__contractors[index]
+
+    def iter_contractors(self):
+        """
+        Iterate lazily over all the contractor instances without copying or exposing the contractors list
+
+        :return: generator of contractor instances
+        """
+        return MainApp.__contractors.iter_after()
+
+    def get_contractors_page(self, page_size, token=None):
+        """
+        Return the next page of contractor instances, following on from the page that returned the supplied token
+
+        :param page_size: largest number of contractors on the page as integer
+        :param token: resume token returned with the previous page or None for the first page {optional}
+        :return: tuple with first entry the contractors on the page as list and the second entry the resume token for
+                 the next page or None if there are no more contractors
+        """
+        return MainApp.__contractors.page(page_size, token)
 
     def add_contract(self, contract_type, owner, speciality, payment):
         """
@@ -330,17 +794,18 @@ class MainApp:
                  contract (if successful) or an error message (if unsuccessful)
         """
         # Instantiate the correct contract class depending on the supplied contract type
-        if contract_type == "b" or contract_type == "base":
-            contract = Contract(owner, speciality, payment)
-        elif contract_type == "f" or contract_type == "fixed":
-            contract = FixedFeeContract(owner, speciality, payment)
-        elif contract_type == "a" or contract_type == "advert":
-            contract = AdvertFeeContract(owner, speciality, payment)
-        else:  # Not a valid contract type so return as unsuccessful with an error message
+        contract = MainApp.__create_contract(contract_type, owner, speciality, payment)
+        if not contract:  # Not a valid contract type so return as unsuccessful with an error message
             return False, "Error: new contract was not added, invalid contract type"
 
         if not MainApp.__contracts.add(contract):  # Unsuccessful so return error message
             return False, "Error: new contract was not added, reason not known"
+        MainApp.__logged("add_contract", **MainApp.__contract_fields(contract))
+
+        MainApp.__aggregates.contract_added(contract)
+        if MainApp.__matcher:  # Allocate the new contract straight away if a contractor is available
+            MainApp.__matcher.contract_added(contract)
+        MainApp.__committed()
 
         return True, contract  # Successful so return newly added contract instance
 
@@ -352,27 +817,99 @@ class MainApp:
         :return: tuple with first entry a success indicator as boolean and the second entry either the details of the
                  removed contract (if successful) or an error message (if unsuccessful)
         """
-        # Find contract instance
-        contract = MainApp.__contracts.find_by_id(ident)
-
-        # Check if contract instance exists, if not return unsuccessful flag and error message
-        if not contract:
-            return False, "Error: cannot remove contract with Id: {0}, it does not exist".format(ident)
-
-        # Check if this contract is completed, if not then check if it has an allocated contractor, if a contractor is
-        # allocated then return unsuccessful flag and error message
-        if not contract.completed and contract.contractor_allocated:
-            return False, "Error: cannot remove contract with Id: {0}, " \
-                          "it is not completed and has an allocated contractor".format(ident)
+        # Find contract instance and check it can be removed, if not return unsuccessful flag and error message
+        contract, error = self.__check_remove_contract(ident)
+        if error:
+            return False, error
 
         # Store contract details as string
         details = contract
 
         # Now able to remove contract instance
         MainApp.__contracts.remove(contract)
+        MainApp.__logged("remove_contract", id=contract.id)
+        MainApp.__aggregates.contract_removed(contract)
+        MainApp.__recommender.invalidate(contract.contractor_allocated)
+        if MainApp.__matcher:
+            MainApp.__matcher.contract_removed(contract)
+        MainApp.__committed()
 
         return True, details  # Successful so return True and the removed contract details
 
+    def add_contracts(self, details):
+        """
+        Add new contract instances with each of the supplied contract types, owners, specialities and payments in a
+        single step
+
+        :param details: contract type, owner, speciality and payment of each new contract as iterable of
+                        (contract_type, owner, speciality, payment) tuples
+        :return: tuple with first entry the newly added contracts as list and the second entry an error message for
+                 each contract that was not added as list
+        """
+        contracts = []
+        errors = []
+        for contract_type, owner, speciality, payment in details:
+            contract = MainApp.__create_contract(contract_type, owner, speciality, payment)
+            if contract:
+                contracts.append(contract)
+            else:
+                errors.append("Error: new contract was not added, invalid contract type {0}".format(contract_type))
+
+        added, rejected = MainApp.__contracts.add_many(contracts)
+        MainApp.__logged_many(("add_contract", MainApp.__contract_fields(contract)) for contract in added)
+        for contract in added:
+            MainApp.__aggregates.contract_added(contract)
+            if MainApp.__matcher:
+                MainApp.__matcher.contract_added(contract)
+        errors.extend("Error: new contract {0} was not added, reason not known".format(contract.id)
+                      for contract in rejected)
+        MainApp.__committed()
+
+        return added, errors
+
+    def remove_contracts(self, idents):
+        """
+        Remove contract instances by each of the supplied identifiers in a single step, each contract is checked in the
+        same way as by remove_contract() and only those that pass are removed
+
+        :param idents: identifiers of the contract instances to remove as iterable of strings
+        :return: tuple with first entry the removed contracts as list and the second entry an error message for each
+                 contract that was not removed as list
+        """
+        removable, errors = MainApp.__check_all(idents, self.__check_remove_contract)
+        removed, missing = MainApp.__contracts.remove_many(removable)
+        MainApp.__logged_many(("remove_contract", {"id": contract.id}) for contract in removed)
+        for contract in removed:
+            MainApp.__aggregates.contract_removed(contract)
+            MainApp.__recommender.invalidate(contract.contractor_allocated)
+            if MainApp.__matcher:
+                MainApp.__matcher.contract_removed(contract)
+        MainApp.__committed()
+
+        return removed, errors
+
+    def remove_contracts_where(self, predicate):
+        """
+        Remove every contract instance for which the supplied predicate returns True in a single step (for instance to
+        archive all completed contracts), contracts that are not completed but have an allocated contractor are never
+        removed, as with remove_contract()
+
+        :param predicate: function taking a contract instance and returning True if it is to be removed
+        :return: removed contracts as list
+        """
+        removed = MainApp.__contracts.remove_where(lambda contract: (contract.completed or
+                                                                     not contract.contractor_allocated) and
+                                                   predicate(contract))
+        MainApp.__logged_many(("remove_contract", {"id": contract.id}) for contract in removed)
+        for contract in removed:
+            MainApp.__aggregates.contract_removed(contract)
+            MainApp.__recommender.invalidate(contract.contractor_allocated)
+            if MainApp.__matcher:
+                MainApp.__matcher.contract_removed(contract)
+        MainApp.__committed()
+
+        return removed
+
     def allocate_contractor(self, contract, contractor):
         """
         Change the allocated contractor on the supplied contract instance to the supplied contractor instance
@@ -381,7 +918,79 @@ class MainApp:
         :param contractor: contractor as Contractor instance
         :return: None
         """
+        previous_contractor = contract.contractor_allocated
         contract.contractor_allocated = contractor
+        MainApp.__logged("allocate_contractor", contract_id=contract.id,
+                         contractor_id=contractor.id if contractor else None)
+        MainApp.__recommender.invalidate(previous_contractor)
+        MainApp.__recommender.invalidate(contractor)
+        if MainApp.__matcher:
+            MainApp.__matcher.contract_allocated(contract, previous_contractor)
+        MainApp.__committed()
+
+    def auto_allocate_contractors(self, max_workload=None, workers=1, similar_specialities=False):
+        """
+        Allocate as many of the unallocated contract instances as possible to contractor instances with the same
+        speciality, choosing the allocation that gives the greatest total potential revenue without any contractor
+        having more than the supplied number of contracts not yet completed, see ContractMatcher
+
+        :param max_workload: most contracts not yet completed a contractor can have or None for no cap {optional}
+        :param workers: number of worker processes to solve the specialities across, 1 to solve in this process or
+                        None for one per CPU {optional}
+        :param similar_specialities: whether a contract can go to a contractor with a similar speciality {optional}
+        :return: allocations made as list of (contract, contractor) tuples
+        """
+        matcher = ContractMatcher(MainApp.__contracts, MainApp.__contractors, max_workload, similar_specialities)
+        allocations = matcher.match(workers)
+        with MainApp.__bulk():
+            for contract, contractor in allocations:
+                self.allocate_contractor(contract, contractor)
+
+        return allocations
+
+    def recommend_contractors(self, contract, k=3):
+        """
+        Return the contractor instances best suited to the supplied contract, considering contractors with the same or
+        a similar speciality, their completed contracts and their current workload, see ContractorRecommender
+
+        :param contract: contract to recommend contractors for as Contract instance
+        :param k: most contractors to return as integer {optional}
+        :return: recommendations, best first, as list of (score, contractor) tuples
+        """
+        return MainApp.__recommender.recommend(contract, k)
+
+    def start_incremental_matching(self, max_workload=None):
+        """
+        Start keeping the contract instances allocated as they change, every open contract that can be allocated is
+        allocated straight away and from then on each add, remove, allocation or completion allocates any contracts it
+        makes possible, see IncrementalMatcher
+
+        :param max_workload: most contracts not yet completed a contractor can have or None for no cap {optional}
+        :return: None
+        """
+        if MainApp.__matcher:
+            MainApp.__matcher.stop()
+        matcher = IncrementalMatcher(self.allocate_contractor, max_workload)
+        MainApp.__matcher = matcher
+        matcher.load(MainApp.__contractors, MainApp.__contracts)
+
+    def stop_incremental_matching(self):
+        """
+        Stop keeping the contract instances allocated as they change, allocations already made are kept
+
+        :return: None
+        """
+        if MainApp.__matcher:
+            MainApp.__matcher.stop()
+        MainApp.__matcher = None
+
+    def is_matching_incrementally(self):
+        """
+        Check if the contract instances are being kept allocated as they change
+
+        :return: True if incremental matching has been started, False if not
+        """
+        return MainApp.__matcher is not None
 
     def complete_contract(self, contract):
         """
@@ -390,8 +999,92 @@ class MainApp:
         :param contract: contract as Contract instance
         :return: None
         """
+        # Every view recorded up to now must be in the contract before its revenue is worked out and fixed
+        MainApp.__view_counter.flush(contract)
         contract.completed = True
+        MainApp.__logged("complete_contract", contract_id=contract.id)
         self.__revenue += contract.calculate_revenue()
+        MainApp.__recommender.invalidate(contract.contractor_allocated)
+        if MainApp.__matcher:  # The contractor has capacity for another contract
+            MainApp.__matcher.contract_completed(contract)
+        MainApp.__committed()
+
+    def calculate_revenue_totals(self, dimension="all", key=None):
+        """
+        Return the realised revenue (from completed contracts) and potential revenue (from contracts not yet completed)
+        over all the contract instances, or over those with the supplied key in the supplied dimension, these are read
+        from running totals so no contracts are visited, see RevenueAggregates
+
+        :param dimension: "all", "client", "speciality", "contractor" or "contract_type" {optional}
+        :param key: client identifier, speciality, contractor identifier (or None for unallocated contracts) or
+                    contract class name within the dimension {optional}
+        :return: tuple of realised revenue as float and potential revenue as float
+        """
+        MainApp.__view_counter.fold()
+
+        return MainApp.__aggregates.revenue_totals(dimension, key)
+
+    def set_fees(self, base_commission=None, fixed_fee=None, advert_fee=None):
+        """
+        Change any of the fees used to calculate contract revenue in a single new fee schedule version, contracts that
+        are already completed keep being billed under the version they were completed under, see FeeSchedule
+
+        :param base_commission: new base commission percentage or None to leave unchanged {optional}
+        :param fixed_fee: new fixed fee of fixed fee contracts or None to leave unchanged {optional}
+        :param advert_fee: new fee per view of advert fee contracts or None to leave unchanged {optional}
+        :return: epoch of the new fee schedule version as integer
+        """
+        fees = {name: fee for name, fee in (("base_commission", base_commission), ("fixed_fee", fixed_fee),
+                                            ("advert_fee", advert_fee)) if fee is not None}
+        epoch = FeeSchedule.set_fees(**fees)
+        MainApp.__logged("set_fees", fees=fees)
+        MainApp.__committed()
+
+        return epoch
+
+    def get_revenue_breakdown(self, dimension):
+        """
+        Return the revenue totals of the contract instances broken down by the supplied dimension
+
+        :param dimension: "all", "client", "speciality", "contractor" or "contract_type"
+        :return: map of each key in the dimension to its totals (open_count, completed_count, open_payment_total,
+                 completed_payment_total, realised and potential) as dictionary
+        """
+        MainApp.__view_counter.fold()
+
+        return MainApp.__aggregates.breakdown(dimension)
+
+    def record_contract_views(self, contracts, count=1):
+        """
+        Record views of each of the supplied contract instances in one step, for instance for every contract on a
+        listing page, only advert fee contracts are counted and the views are folded into them later, see ViewCounter
+
+        :param contracts: contracts viewed as iterable of Contract instances
+        :param count: number of views of each contract as integer {optional}
+        :return: None
+        """
+        MainApp.__view_counter.record_many(contracts, count)
+
+    def fold_contract_views(self):
+        """
+        Fold every view recorded in the view counter into its contract instance
+
+        :return: number of contracts folded into as integer
+        """
+        return MainApp.__view_counter.fold()
+
+    def display_contract(self, contract):
+        """
+        Provides the displayable string of the supplied contract instance, the view of an advert fee contract is
+        recorded in the view counter to be folded into the contract later rather than being added to it straight away
+
+        :param contract: contract to display as Contract instance
+        :return: contract as displayable string
+        """
+        if isinstance(contract, AdvertFeeContract):
+            return contract.make_displayable(MainApp.__view_counter)
+
+        return contract.make_displayable()
 
     def get_contract(self, ident):
         """
@@ -437,10 +1130,300 @@ class MainApp:
         """
         return MainApp.__contracts.get_with_contractor(contractor)
 
+    def query_contracts(self):
+        """
+        Start a query over all the contract instances that can combine owner, speciality, contractor, unallocated,
+        completed, contract type and payment range predicates, for instance:
+
+            main_app.query_contracts().speciality("C++").unallocated().payment_between(1000.0).to_list()
+
+        :return: new query as ContractQuery instance
+        """
+        return MainApp.__contracts.query()
+
+    def iter_contracts_for_owner(self, owner):
+        """
+        Iterate lazily over the contract instances that match the supplied owner
+
+        :param owner: owner to match with contracts as Client instance
+        :return: generator of matching contract instances
+        """
+        return self.query_contracts().owner(owner).execute()
+
+    def iter_contracts_for_speciality(self, speciality):
+        """
+        Iterate lazily over the contract instances that match the supplied speciality
+
+        :param speciality: speciality to match with contracts as string
+        :return: generator of matching contract instances
+        """
+        return self.query_contracts().speciality(speciality).execute()
+
+    def iter_unallocated_contracts(self):
+        """
+        Iterate lazily over the contract instances that have no contractor allocated
+
+        :return: generator of matching contract instances
+        """
+        return self.query_contracts().unallocated().execute()
+
+    def iter_contracts_allocated_to_contractor(self, contractor):
+        """
+        Iterate lazily over the contract instances that are allocated to the supplied contractor
+
+        :param contractor: contractor to match with allocated contracts as Contractor instance
+        :return: generator of matching contract instances
+        """
+        return self.query_contracts().contractor(contractor).execute()
+
+    def iter_contracts(self):
+        """
+        Iterate lazily over all the contract instances without copying or exposing the contracts list
+
+        :return: generator of contract instances
+        """
+        return MainApp.__contracts.iter_after()
+
+    def get_contracts_page(self, page_size, token=None):
+        """
+        Return the next page of contract instances, following on from the page that returned the supplied token, note -
+        for a page of the contracts matching a query use query_contracts() and the page() method of the query
+
+        :param page_size: largest number of contracts on the page as integer
+        :param token: resume token returned with the previous page or None for the first page {optional}
+        :return: tuple with first entry the contracts on the page as list and the second entry the resume token for the
+                 next page or None if there are no more contracts
+        """
+        return MainApp.__contracts.page(page_size, token)
+
     def get_all_contracts(self):
         """
-        Return all the contract instances as a list
+        Return all the contract instances as a new list, changing the list does not change the contracts held
 
         :return: all contract instances
         """
-        return MainApp.__contracts.data
+        return list(MainApp.__contracts)
+
+    def get_contract_at(self, index):
+        """
+        Return the contract instance at the supplied position in the order the contracts were added, only that contract
+        is read when the contracts are kept in a database
+
+        :param index: position of the contract as integer
+        :return: contract instance
+        """
+        return MainApp.__contracts[index]
+
+    def __check_remove_client(self, ident):
+        """
+        Check that the client instance with the supplied identifier can be removed, it must exist and must not be the
+        owner of any contracts
+
+        :param ident: identifier of the client instance to check
+        :return: tuple with first entry the client instance (or None if it does not exist) and the second entry an
+                 error message (if it cannot be removed) or None
+        """
+        client = MainApp.__clients.find_by_id(ident)
+
+        # Check if client instance exists
+        if not client:
+            return None, "Error: cannot remove client with Id: {0}, it does not exist".format(ident)
+
+        # Check if any contracts owned by this client
+        if MainApp.__contracts.has_with_owner(client):
+            return client, "Error: cannot remove client with Id: {0}, it is a contract owner".format(ident)
+
+        return client, None
+
+    def __check_remove_contractor(self, ident):
+        """
+        Check that the contractor instance with the supplied identifier can be removed, it must exist and must not be
+        allocated to any contracts
+
+        :param ident: identifier of the contractor instance to check
+        :return: tuple with first entry the contractor instance (or None if it does not exist) and the second entry an
+                 error message (if it cannot be removed) or None
+        """
+        contractor = MainApp.__contractors.find_by_id(ident)
+
+        # Check if contractor instance exists
+        if not contractor:
+            return None, "Error: cannot remove contractor with Id: {0}, it does not exist".format(ident)
+
+        # Check if any contracts are allocated to this contractor
+        if MainApp.__contracts.has_with_contractor(contractor):
+            return contractor, "Error: cannot remove contractor with Id: {0}, it is allocated to a contract".format(
+                ident)
+
+        return contractor, None
+
+    def __check_remove_contract(self, ident):
+        """
+        Check that the contract instance with the supplied identifier can be removed, it must exist and must either be
+        completed or have no allocated contractor
+
+        :param ident: identifier of the contract instance to check
+        :return: tuple with first entry the contract instance (or None if it does not exist) and the second entry an
+                 error message (if it cannot be removed) or None
+        """
+        contract = MainApp.__contracts.find_by_id(ident)
+
+        # Check if contract instance exists
+        if not contract:
+            return None, "Error: cannot remove contract with Id: {0}, it does not exist".format(ident)
+
+        # Check if this contract is completed, if not then check if it has an allocated contractor
+        if not contract.completed and contract.contractor_allocated:
+            return contract, "Error: cannot remove contract with Id: {0}, " \
+                             "it is not completed and has an allocated contractor".format(ident)
+
+        return contract, None
+
+    def __save_store_state(self):
+        """
+        Commit listener of the database, adds the next identifier number, the revenue and the fee schedule to each
+        batch of changes so they are committed together
+
+        :return: None
+        """
+        MainApp.__store.set_state(id_next=IdentifiedEntity.id_allocator().peek(), revenue=self.__revenue,
+                                  fee_versions=FeeSchedule.versions())
+
+    @staticmethod
+    def __committed():
+        """
+        Commit the changes just made to the database, if the lists are kept in one and no bulk step is in progress, so
+        a change is durable once the method making it has returned
+
+        :return: None
+        """
+        if MainApp.__store and not MainApp.__bulk_depth:
+            MainApp.__store.flush()
+
+    @staticmethod
+    @contextmanager
+    def __bulk():
+        """
+        Context manager for a bulk step, the changes made inside it are committed to the database in batches of the
+        batch size and the rest are committed when the outermost bulk step ends
+
+        :return: generator for the with statement
+        """
+        MainApp.__bulk_depth += 1
+        try:
+            yield
+        finally:
+            MainApp.__bulk_depth -= 1
+            MainApp.__committed()
+
+    @staticmethod
+    def __logged(op, **fields):
+        """
+        Append a record of a change to the write ahead log, if logging has been started
+
+        :param op: name of the change as string
+        :param fields: fields of the change
+        :return: None
+        """
+        if MainApp.__log:
+            MainApp.__log.append(op, **fields)
+
+    @staticmethod
+    def __logged_many(records):
+        """
+        Append records of several changes made in a single step to the write ahead log in one go, if logging has been
+        started
+
+        :param records: name and fields of each change as iterable of (op, fields dictionary) tuples
+        :return: None
+        """
+        if MainApp.__log:
+            MainApp.__log.append_many(list(records))
+
+    @staticmethod
+    def __log_views(views):
+        """
+        Fold listener of the view counter, appends the views folded into contracts to the write ahead log
+
+        :param views: map of contract to views added as dictionary
+        :return: None
+        """
+        MainApp.__logged("views", views={contract.id: count for contract, count in views.items()})
+
+    @staticmethod
+    def __contract_fields(contract):
+        """
+        Build the fields of the log record of an added contract
+
+        :param contract: contract as Contract instance
+        :return: fields as dictionary
+        """
+        return {"id": contract.id, "class": type(contract).__name__, "owner_id": contract.owner.id,
+                "speciality": contract.speciality, "payment": contract.payment}
+
+    @staticmethod
+    def __replay_identifier(ident):
+        """
+        Move the identifier allocator on so the next entity created is given the supplied identifier, as it was when
+        the change being replayed was first made
+
+        :param ident: identifier as string, a two letter prefix followed by the number
+        :return: None
+        """
+        IdentifiedEntity.id_allocator().advance_to(int(ident[2:]))
+
+    @staticmethod
+    def __check_replayed(record, result):
+        """
+        Check a replayed add gave the entity the identifier in its log record, otherwise the records that follow would
+        refer to the wrong entities
+
+        :param record: log record replayed as dictionary
+        :param result: tuple returned by the add_XXXXXX() method
+        :return: None
+        """
+        success, entity = result
+        if not success or entity.id != record["id"]:
+            raise ValueError("Log record {0} could not be replayed as {1}: {2}".format(
+                record["lsn"], record["id"], entity.id if success else entity))
+
+    @staticmethod
+    def __check_all(idents, check):
+        """
+        Apply the supplied removal check to each of the supplied identifiers
+
+        :param idents: identifiers to check as iterable of strings
+        :param check: removal check method returning an (entity, error message) tuple
+        :return: tuple with first entry the identifiers that passed as list and the second entry the error messages of
+                 those that did not as list
+        """
+        removable = []
+        errors = []
+        for ident in idents:
+            entity, error = check(ident)
+            if error:
+                errors.append(error)
+            else:
+                removable.append(ident)
+
+        return removable, errors
+
+    @staticmethod
+    def __create_contract(contract_type, owner, speciality, payment):
+        """
+        Instantiate the correct contract class depending on the supplied contract type
+
+        :param contract_type: type (base, fixed or advert) of the new contract as string
+        :param owner: owner of the new contract as Client instance
+        :param speciality: speciality of the new contractor as string
+        :param payment: payment amount of the new contract as float
+        :return: new contract instance or None if the contract type is not valid
+        """
+        if contract_type == "b" or contract_type == "base":
+            return Contract(owner, speciality, payment)
+        elif contract_type == "f" or contract_type == "fixed":
+            return FixedFeeContract(owner, speciality, payment)
+        elif contract_type == "a" or contract_type == "advert":
+            return AdvertFeeContract(owner, speciality, payment)
+
+        return None  # Not a valid contract type
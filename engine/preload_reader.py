@@ -0,0 +1,280 @@
+# File: preload_reader.py
+# Description: Prototype implementation of Game Developer Contract Matcher (GDCMatcher) case study
+# Author: Chris Knowles
+
+
+# Imports
+import ast
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+try:  # orjson is optional, it parses several times faster than the json module when it is installed
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Consts
+# Globals
+
+
+# Classes
+class PreloadReader:
+    """
+    Streaming reader of a preload data file in JSON lines format, that is one JSON object per line, blank lines and
+    lines starting with # (comments) are skipped, the file is read one line at a time so memory use does not grow with
+    the size of the file, iterate over an instance to get each record as a dictionary
+
+    Lines are parsed with orjson if it is installed and with the json module if not, a line that is not valid JSON is
+    then given to a compatibility shim that accepts Python literal syntax (for instance True and False rather than true
+    and false, as used by the original data/preload.dat) using ast.literal_eval(), which unlike eval() cannot run code,
+    the shim is turned off by passing strict=True
+
+    For very large files read_parallel() splits the file into byte ranges that start and end on line boundaries (see
+    chunk_ranges()) and parses them in a pool of worker processes, the records are still given back in file order so
+    that identifiers allocated as they are applied, and the references to them from later records, come out exactly as
+    they do from a sequential read
+
+    PreloadReader class - class variables:
+        BACKENDS: names of the JSON backends that can be asked for, as tuple, with public access
+        CHUNK_SIZE: target size in bytes of each byte range parsed by a worker process, as integer, with public access
+    """
+    BACKENDS = ("orjson", "json")
+    CHUNK_SIZE = 16 * 1024 * 1024
+
+    def __init__(self, file_path, backend=None, strict=False):
+        """
+ -      Initialiser - instance variables:
+            file_path: path to the preload data file, as string, property with read-only access
+            backend: name of the JSON backend used, one of BACKENDS, as string, property with read-only access
+            strict: whether lines that are not valid JSON are rejected rather than given to the compatibility shim, as
+                    boolean, property with read-only access
+            loads: function parsing a line with the backend, as function, with private access
+            records_read: number of records read so far, as integer, property with read-only access
+            compat_records: number of those records that needed the compatibility shim, as integer, property with
+                            read-only access
+            elapsed: seconds spent reading, as float, property with read-only access
+
+        :param file_path: path to the preload data file as string
+        :param backend: "orjson", "json" or None for orjson if it is installed and json if not {optional}
+        :param strict: True to reject lines that are not valid JSON {optional}
+        """
+        if backend is None:
+            backend = "orjson" if orjson is not None else "json"
+        if backend not in PreloadReader.BACKENDS:
+            raise ValueError("Unknown JSON backend {0}, expected one of {1}".format(backend, PreloadReader.BACKENDS))
+        if backend == "orjson" and orjson is None:
+            raise ValueError("JSON backend orjson is not installed")
+
+        self.__file_path = str(file_path)
+        self.__backend = backend
+        self.__strict = bool(strict)
+        self.__loads = orjson.loads if backend == "orjson" else json.loads
+        self.__records_read = 0
+        self.__compat_records = 0
+        self.__elapsed = 0.0
+
+    @property
+    def file_path(self):
+        return self.__file_path
+
+    @property
+    def backend(self):
+        return self.__backend
+
+    @property
+    def strict(self):
+        return self.__strict
+
+    @property
+    def records_read(self):
+        return self.__records_read
+
+    @property
+    def compat_records(self):
+        return self.__compat_records
+
+    @property
+    def elapsed(self):
+        return self.__elapsed
+
+    @property
+    def records_per_second(self):
+        """
+        Throughput of the last read
+
+        :return: records read per second as float, 0.0 if nothing has been read
+        """
+        return self.__records_read / self.__elapsed if self.__elapsed > 0.0 else 0.0
+
+    def __str__(self):
+        """
+        To string method
+
+        :return: string representation of this preload reader instance
+        """
+        return "{0}:{1} ({2}) {3} records at {4:.0f} records/s".format(PreloadReader.__name__, self.__file_path,
+                                                                        self.__backend, self.__records_read,
+                                                                        self.records_per_second)
+
+    def __iter__(self):
+        """
+        Read the file one line at a time, the counts and timings are reset each time the file is read
+
+        :return: generator of records as dictionaries
+        """
+        self.__reset()
+        started = time.perf_counter()
+
+        # Lines end only at "\n", as in parse_range(), so both ways of reading see the same lines
+        with open(self.__file_path, "r", encoding="utf-8", newline="\n") as data_file:
+            for line_number, line in enumerate(data_file, 1):
+                record = self.parse_line(line, line_number)
+                if record is None:
+                    continue
+
+                self.__records_read += 1
+                # Time spent by the caller applying the record is not counted as reading time
+                self.__elapsed += time.perf_counter() - started
+                yield record
+                started = time.perf_counter()
+
+        self.__elapsed += time.perf_counter() - started
+
+    def read_parallel(self, workers=None, chunk_size=None):
+        """
+        Read the file in byte ranges parsed by a pool of worker processes, the counts and timings are reset each time
+        the file is read, at most two ranges per worker are parsed ahead of the caller so memory use is bounded by the
+        chunk size rather than the file size
+
+        :param workers: number of worker processes or None for one per CPU {optional}
+        :param chunk_size: target size in bytes of each range or None for CHUNK_SIZE {optional}
+        :return: generator of records as dictionaries, in file order
+        """
+        self.__reset()
+        started = time.perf_counter()
+
+        workers = workers or os.cpu_count() or 1
+        ranges = PreloadReader.chunk_ranges(self.__file_path, chunk_size or PreloadReader.CHUNK_SIZE)
+        jobs = iter((self.__file_path, start, end, self.__backend, self.__strict) for start, end in ranges)
+
+        with ProcessPoolExecutor(workers) as executor:
+            pending = deque(executor.submit(PreloadReader.parse_range, job) for job in islice(jobs, 2 * workers))
+            while pending:
+                records, compat_records = pending.popleft().result()
+                job = next(jobs, None)
+                if job is not None:  # Keep the pool busy with the next range while this one is applied
+                    pending.append(executor.submit(PreloadReader.parse_range, job))
+
+                self.__compat_records += compat_records
+                self.__records_read += len(records)
+                self.__elapsed += time.perf_counter() - started
+                yield from records
+                started = time.perf_counter()
+
+        self.__elapsed += time.perf_counter() - started
+
+    @staticmethod
+    def chunk_ranges(file_path, chunk_size):
+        """
+        Split the supplied file into byte ranges of about the supplied size, each range ends just after a newline (or
+        at the end of the file) so no line is split between two ranges
+
+        :param file_path: path to the file as string
+        :param chunk_size: target size in bytes of each range as integer
+        :return: ranges as list of (start, end) tuples of byte offsets
+        """
+        ranges = []
+        size = os.path.getsize(file_path)
+        with open(file_path, "rb") as data_file:
+            start = 0
+            while start < size:
+                data_file.seek(min(start + max(int(chunk_size), 1), size))
+                data_file.readline()  # Move on to the end of the line the target offset falls in
+                end = min(data_file.tell(), size)
+                ranges.append((start, end))
+                start = end
+
+        return ranges
+
+    @staticmethod
+    def parse_range(job):
+        """
+        Parse the lines of one byte range of a file, run in a worker process by read_parallel()
+
+        :param job: file path, start offset, end offset, backend name and strict flag as tuple
+        :return: tuple of the records parsed as list of dictionaries and the number that needed the compatibility shim
+                 as integer
+        """
+        file_path, start, end, backend, strict = job
+        with open(file_path, "rb") as data_file:
+            data_file.seek(start)
+            # Split the raw bytes at "\n" only, str.splitlines() would also split at characters such as U+2028 that
+            # can appear inside a JSON string
+            lines = data_file.read(end - start).split(b"\n")
+
+        reader = PreloadReader(file_path, backend, strict)
+        records = []
+        for line_number, line in enumerate(lines, 1):
+            try:
+                record = reader.parse_line(line.decode("utf-8"), line_number)
+            except ValueError as error:  # Line numbers are only known within the range so give its offset too
+                raise ValueError("{0} of the range starting at byte {1}".format(error, start))
+            if record is not None:
+                records.append(record)
+
+        return records, reader.compat_records
+
+    def parse_line(self, line, line_number=0):
+        """
+        Parse a single line of a preload data file
+
+        :param line: line as string
+        :param line_number: number of the line in the file, used in error messages {optional}
+        :return: record as dictionary or None if the line is blank or a comment
+        """
+        line = line.strip()
+        if not line or line[0] == "#":
+            return None
+
+        try:
+            record = self.__loads(line)
+        except ValueError:  # Both json.JSONDecodeError and orjson.JSONDecodeError are subclasses of ValueError
+            if self.__strict:
+                raise ValueError("Line {0} of {1} is not valid JSON".format(line_number, self.__file_path))
+            record = PreloadReader.__parse_compat(line, line_number, self.__file_path)
+            self.__compat_records += 1
+
+        if type(record) is not dict:
+            raise ValueError("Line {0} of {1} is not an object".format(line_number, self.__file_path))
+
+        return record
+
+    def __reset(self):
+        """
+        Reset the counts and timings before the file is read
+
+        :return: None
+        """
+        self.__records_read = 0
+        self.__compat_records = 0
+        self.__elapsed = 0.0
+
+    @staticmethod
+    def __parse_compat(line, line_number, file_path):
+        """
+        Compatibility shim parsing a line written in Python literal syntax
+
+        :param line: line as string
+        :param line_number: number of the line in the file
+        :param file_path: path to the file
+        :return: record parsed
+        """
+        try:
+            return ast.literal_eval(line)
+        except (ValueError, SyntaxError):
+            raise ValueError("Line {0} of {1} is neither JSON nor a Python literal".format(line_number, file_path))
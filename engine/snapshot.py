@@ -0,0 +1,464 @@
+# File: snapshot.py
+# Description: Prototype implementation of Game Developer Contract Matcher (GDCMatcher) case study
+# Author: Chris Knowles
+
+
+# Imports
+import mmap
+import os
+import struct
+from data_model.client import Client
+from data_model.contractor import Contractor
+from data_model.contract import Contract
+from data_model.fixed_fee_contract import FixedFeeContract
+from data_model.advert_fee_contract import AdvertFeeContract
+from data_model.fee_schedule import FeeSchedule
+
+
+# Consts
+# Globals
+
+
+# Classes
+class Snapshot:
+    """
+    Compact binary snapshot of the whole store (clients, contractors and contracts together with the money made, the
+    view counts, the next identifier number, every fee schedule version and the LSN of the last write ahead log record
+    it includes), written with write() and opened with
+    Snapshot(file_path), the file is laid out as:
+
+        header: magic, format version, counts, next identifier number, revenue, LSN and the offset of each section
+        string table: offset of each string into a blob of UTF-8 text, every identifier, name and speciality is held
+                      once in the table and referred to by its index
+        clients: one fixed width record per client (identifier, name)
+        contractors: one fixed width record per contractor (identifier, name, speciality)
+        contracts: one fixed width record per contract (identifier, type, completed flag, owner row, contractor row or
+                   -1, speciality, payment, times viewed, billed fee schedule version or -1)
+        fees: the fee names followed by the value of each fee in each fee schedule version
+
+    Opening a snapshot maps the file into memory with mmap and reads only the header, so it takes the same time however
+    big the store is, entities are then materialised (with the restore() alternative initialisers) only as they are
+    asked for and each is materialised once, so a contract and its owner's other contracts share the same Client
+    instance, note - the file must stay open (see close()) while entities are being materialised
+
+    Snapshot class - class variables:
+        MAGIC: bytes that start every snapshot file, as bytes, with public access
+        FORMAT_VERSION: version of the file layout written, as integer, with public access
+        __HEADER: layout of the header, as struct.Struct, with private access
+        __STRING_OFFSET: layout of an entry of the string table, as struct.Struct, with private access
+        __CLIENT, __CONTRACTOR, __CONTRACT: layout of each kind of record, as struct.Struct, with private access
+        __FEE_NAME, __FEE: layout of a fee name and a fee value, as struct.Struct, with private access
+        __CONTRACT_TYPES: contract classes in order of their type code, as tuple, with private access
+        __NONE: row or version written in place of None, as integer, with private access
+    """
+    MAGIC = b"GDCSNAP\x00"
+    FORMAT_VERSION = 2
+    __HEADER = struct.Struct("<8sI7qdq6q")
+    __STRING_OFFSET = struct.Struct("<q")
+    __CLIENT = struct.Struct("<II")
+    __CONTRACTOR = struct.Struct("<III")
+    __CONTRACT = struct.Struct("<IBBiiIdqi")
+    __FEE_NAME = struct.Struct("<I")
+    __FEE = struct.Struct("<d")
+    __CONTRACT_TYPES = (Contract, FixedFeeContract, AdvertFeeContract)
+    __NONE = -1
+
+    def __init__(self, file_path):
+        """
+ -      Initialiser - instance variables:
+            file_path: path to the snapshot file, as string, property with read-only access
+            file: the open snapshot file, as file object, with private access
+            map: the snapshot file mapped into memory, as mmap.mmap, with private access
+            client_count, contractor_count, contract_count: number of each kind of entity, as integer, property with
+                                                            read-only access
+            id_next: next identifier number to hand out, as integer, property with read-only access
+            revenue: money made as contracts were completed, as float, property with read-only access
+            lsn: LSN of the last write ahead log record included, 0 if none, as integer, property with read-only access
+            offsets: offset of the string table, string blob, clients, contractors, contracts and fees sections, as
+                     tuple, with private access
+            string_count, fee_version_count, fee_name_count: number of strings, fee schedule versions and fee names,
+                                                             as integer, with private access
+            strings, clients, contractors, contracts: entities (and strings) materialised so far by row, as
+                                                      dictionary, with private access
+            contract_rows: map of contract identifier to row, built the first time a contract is found by identifier,
+                           as dictionary, with private access
+
+        :param file_path: path to the snapshot file as string
+        """
+        self.__file_path = str(file_path)
+        self.__file = open(self.__file_path, "rb")
+        try:
+            self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+            header = Snapshot.__HEADER.unpack_from(self.__map, 0) if len(self.__map) >= Snapshot.__HEADER.size \
+                else (b"",)
+            if header[0] != Snapshot.MAGIC:
+                raise ValueError("{0} is not a snapshot file".format(self.__file_path))
+            if header[1] != Snapshot.FORMAT_VERSION:
+                raise ValueError("Snapshot {0} has format version {1}, expected {2}".format(self.__file_path, header[1],
+                                                                                         Snapshot.FORMAT_VERSION))
+        except (ValueError, OSError):
+            self.close()
+            raise
+
+        (self.__client_count, self.__contractor_count, self.__contract_count, self.__string_count,
+         self.__fee_version_count, self.__fee_name_count, self.__id_next) = header[2:9]
+        self.__revenue = header[9]
+        self.__lsn = header[10]
+        self.__offsets = header[11:]
+        self.__strings = {}
+        self.__clients = {}
+        self.__contractors = {}
+        self.__contracts = {}
+        self.__contract_rows = None
+
+    @property
+    def file_path(self):
+        return self.__file_path
+
+    @property
+    def client_count(self):
+        return self.__client_count
+
+    @property
+    def contractor_count(self):
+        return self.__contractor_count
+
+    @property
+    def contract_count(self):
+        return self.__contract_count
+
+    @property
+    def id_next(self):
+        return self.__id_next
+
+    @property
+    def revenue(self):
+        return self.__revenue
+
+    @property
+    def lsn(self):
+        return self.__lsn
+
+    def __str__(self):
+        """
+        To string method
+
+        :return: string representation of this snapshot instance
+        """
+        return "{0}:{1} ({2} clients, {3} contractors, {4} contracts)".format(Snapshot.__name__, self.__file_path,
+                                                                             self.__client_count,
+                                                                             self.__contractor_count,
+                                                                             self.__contract_count)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Unmap and close the snapshot file, entities already materialised can still be used
+
+        :return: None
+        """
+        if getattr(self, "_Snapshot__map", None) is not None:
+            self.__map.close()
+            self.__map = None
+        self.__file.close()
+
+    @staticmethod
+    def write(file_path, clients, contractors, contracts, revenue=0.0, id_next=0, fee_versions=None, lsn=0):
+        """
+        Write a snapshot of the supplied entities, the file is written alongside and then renamed over the supplied
+        path so a reader never sees a part written snapshot
+
+        :param file_path: path to write the snapshot file to as string
+        :param clients: clients as iterable of Client instances
+        :param contractors: contractors as iterable of Contractor instances
+        :param contracts: contracts as iterable of Contract instances, their owners and allocated contractors must be
+                          among the supplied clients and contractors
+        :param revenue: money made as contracts were completed as float {optional}
+        :param id_next: next identifier number to hand out as integer {optional}
+        :param fee_versions: fees of each fee schedule version or None for those of FeeSchedule.versions() {optional}
+        :param lsn: LSN of the last write ahead log record included {optional}
+        :return: number of bytes written as integer
+        """
+        strings = {}
+
+        def intern(text):
+            return strings.setdefault(text, len(strings))
+
+        # Clients and contractors are referred to from contracts by their row in the snapshot
+        client_rows = {}
+        client_records = bytearray()
+        for client in clients:
+            client_rows[client.id] = len(client_rows)
+            client_records += Snapshot.__CLIENT.pack(intern(client.id), intern(client.name))
+
+        contractor_rows = {}
+        contractor_records = bytearray()
+        for contractor in contractors:
+            contractor_rows[contractor.id] = len(contractor_rows)
+            contractor_records += Snapshot.__CONTRACTOR.pack(intern(contractor.id), intern(contractor.name),
+                                                             intern(contractor.speciality))
+
+        contract_count = 0
+        contract_records = bytearray()
+        for contract in contracts:
+            contract_count += 1
+            contract_records += Snapshot.__CONTRACT.pack(*Snapshot.__contract_fields(contract, intern, client_rows,
+                                                                                     contractor_rows))
+
+        # The fee names are put in the string table, then the value of every fee in every version follows
+        fee_versions = FeeSchedule.versions() if fee_versions is None else fee_versions
+        fee_names = sorted(fee_versions[-1]) if fee_versions else []
+        fee_records = bytearray()
+        for name in fee_names:
+            fee_records += Snapshot.__FEE_NAME.pack(intern(name))
+        for version in fee_versions:
+            for name in fee_names:
+                fee_records += Snapshot.__FEE.pack(version.get(name, 0.0))
+
+        # Build the string blob and the offset of each string into it, there is one more offset than strings so the
+        # end of string i is the start of string i + 1
+        blob = bytearray()
+        string_offsets = bytearray(Snapshot.__STRING_OFFSET.pack(0))
+        for text in strings:
+            blob += text.encode("utf-8")
+            string_offsets += Snapshot.__STRING_OFFSET.pack(len(blob))
+
+        sections = (string_offsets, blob, client_records, contractor_records, contract_records, fee_records)
+        offsets = []
+        offset = Snapshot.__HEADER.size
+        for section in sections:
+            offsets.append(offset)
+            offset += len(section)
+
+        header = Snapshot.__HEADER.pack(Snapshot.MAGIC, Snapshot.FORMAT_VERSION, len(client_rows),
+                                        len(contractor_rows), contract_count, len(strings), len(fee_versions),
+                                        len(fee_names), int(id_next), float(revenue), int(lsn), *offsets)
+
+        temporary_path = str(file_path) + ".tmp"
+        with open(temporary_path, "wb") as snapshot_file:
+            snapshot_file.write(header)
+            for section in sections:
+                snapshot_file.write(section)
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temporary_path, file_path)
+
+        return offset
+
+    def string(self, index):
+        """
+        Return the string with the supplied index in the string table
+
+        :param index: index of the string as integer
+        :return: string
+        """
+        text = self.__strings.get(index)
+        if text is None:
+            position = self.__offsets[0] + index * Snapshot.__STRING_OFFSET.size
+            start, end = struct.unpack_from("<qq", self.__map, position)
+            blob = self.__offsets[1]
+            text = self.__map[blob + start:blob + end].decode("utf-8")
+            self.__strings[index] = text
+
+        return text
+
+    def client(self, row):
+        """
+        Return the client in the supplied row, materialising it the first time it is asked for
+
+        :param row: row of the client as integer
+        :return: client as Client instance
+        """
+        client = self.__clients.get(row)
+        if client is None:
+            ident, name = Snapshot.__CLIENT.unpack_from(self.__map, self.__record(2, Snapshot.__CLIENT, row,
+                                                                                  self.__client_count))
+            client = Client.restore(self.string(ident), self.string(name))
+            self.__clients[row] = client
+
+        return client
+
+    def contractor(self, row):
+        """
+        Return the contractor in the supplied row, materialising it the first time it is asked for
+
+        :param row: row of the contractor as integer
+        :return: contractor as Contractor instance
+        """
+        contractor = self.__contractors.get(row)
+        if contractor is None:
+            ident, name, speciality = Snapshot.__CONTRACTOR.unpack_from(
+                self.__map, self.__record(3, Snapshot.__CONTRACTOR, row, self.__contractor_count))
+            contractor = Contractor.restore(self.string(ident), self.string(name), self.string(speciality))
+            self.__contractors[row] = contractor
+
+        return contractor
+
+    def contract(self, row):
+        """
+        Return the contract in the supplied row, materialising it (and its owner and allocated contractor if they have
+        not been already) the first time it is asked for
+
+        :param row: row of the contract as integer
+        :return: contract as Contract instance
+        """
+        contract = self.__contracts.get(row)
+        if contract is None:
+            fields = Snapshot.__CONTRACT.unpack_from(self.__map, self.__record(4, Snapshot.__CONTRACT, row,
+                                                                               self.__contract_count))
+            contract = self.__materialise_contract(row, fields)
+
+        return contract
+
+    def clients(self):
+        """
+        Iterate over the clients in the snapshot, materialising each as it is reached
+
+        :return: generator of Client instances
+        """
+        return (self.client(row) for row in range(self.__client_count))
+
+    def contractors(self):
+        """
+        Iterate over the contractors in the snapshot, materialising each as it is reached
+
+        :return: generator of Contractor instances
+        """
+        return (self.contractor(row) for row in range(self.__contractor_count))
+
+    def contracts(self):
+        """
+        Iterate over the contracts in the snapshot, materialising each as it is reached
+
+        :return: generator of Contract instances
+        """
+        # Unpack the records in one pass over the section rather than finding each record in turn
+        records = self.__contract_records()
+        unpacked = Snapshot.__CONTRACT.iter_unpack(records)
+        try:
+            for row, fields in enumerate(unpacked):
+                contract = self.__contracts.get(row)
+                yield contract if contract is not None else self.__materialise_contract(row, fields)
+        finally:
+            del unpacked
+            records.release()  # The map cannot be closed while a view of it is held
+
+    def find_contract(self, ident):
+        """
+        Return the contract with the supplied identifier, only that contract (and its owner and contractor) are
+        materialised, note - the first call reads the identifier of every contract to build a map of them
+
+        :param ident: identifier of the contract as string
+        :return: contract as Contract instance or None if there is no contract with the identifier
+        """
+        if self.__contract_rows is None:
+            records = self.__contract_records()
+            self.__contract_rows = {self.string(fields[0]): row
+                                    for row, fields in enumerate(Snapshot.__CONTRACT.iter_unpack(records))}
+            records.release()
+
+        row = self.__contract_rows.get(ident)
+
+        return self.contract(row) if row is not None else None
+
+    def fee_versions(self):
+        """
+        Return the fees of every fee schedule version saved in the snapshot, see FeeSchedule.restore_versions()
+
+        :return: fees of each version by fee name as list of dictionaries
+        """
+        start = self.__offsets[5]
+        names = [self.string(Snapshot.__FEE_NAME.unpack_from(self.__map, start + index * Snapshot.__FEE_NAME.size)[0])
+                 for index in range(self.__fee_name_count)]
+        start += self.__fee_name_count * Snapshot.__FEE_NAME.size
+
+        versions = []
+        for version in range(self.__fee_version_count):
+            position = start + version * self.__fee_name_count * Snapshot.__FEE.size
+            versions.append({name: Snapshot.__FEE.unpack_from(self.__map, position + index * Snapshot.__FEE.size)[0]
+                             for index, name in enumerate(names)})
+
+        return versions
+
+    def __contract_records(self):
+        """
+        Return a view of the contracts section, release it once finished with so the map can be closed
+
+        :return: contracts section as memoryview
+        """
+        start = self.__offsets[4]
+
+        return memoryview(self.__map)[start:start + self.__contract_count * Snapshot.__CONTRACT.size]
+
+    def __materialise_contract(self, row, fields):
+        """
+        Build the contract in the supplied row from the fields of its record and keep it
+
+        :param row: row of the contract as integer
+        :param fields: fields of the record as tuple
+        :return: contract as Contract instance
+        """
+        (ident, type_code, completed, owner_row, contractor_row, speciality, payment, times_viewed,
+         billed_version) = fields
+        arguments = (self.string(ident), self.client(owner_row), self.string(speciality), payment,
+                     self.contractor(contractor_row) if contractor_row != Snapshot.__NONE else None,
+                     bool(completed), billed_version if billed_version != Snapshot.__NONE else None)
+        contract_class = Snapshot.__CONTRACT_TYPES[type_code]
+        if contract_class is AdvertFeeContract:
+            contract = contract_class.restore(*arguments, times_viewed=times_viewed)
+        else:
+            contract = contract_class.restore(*arguments)
+        self.__contracts[row] = contract
+
+        return contract
+
+    def __record(self, section, layout, row, count):
+        """
+        Return the offset of the record in the supplied row of the supplied section
+
+        :param section: position of the section in the offsets as integer
+        :param layout: layout of the records of the section as struct.Struct
+        :param row: row of the record as integer
+        :param count: number of records in the section as integer
+        :return: offset of the record as integer
+        """
+        if not 0 <= row < count:
+            raise IndexError("Row {0} is out of range, the snapshot holds {1}".format(row, count))
+
+        return self.__offsets[section] + row * layout.size
+
+    @staticmethod
+    def __contract_fields(contract, intern, client_rows, contractor_rows):
+        """
+        Build the fields of the record of the supplied contract
+
+        :param contract: contract as Contract instance
+        :param intern: function returning the string table index of a string
+        :param client_rows: map of client identifier to row as dictionary
+        :param contractor_rows: map of contractor identifier to row as dictionary
+        :return: fields as tuple
+        """
+        if type(contract) not in Snapshot.__CONTRACT_TYPES:
+            raise ValueError("Contract {0} of class {1} cannot be written to a snapshot".format(
+                contract.id, type(contract).__name__))
+        if contract.owner.id not in client_rows:
+            raise ValueError("Owner {0} of contract {1} is not in the snapshot".format(contract.owner.id, contract.id))
+
+        contractor = contract.contractor_allocated
+        if contractor is not None and contractor.id not in contractor_rows:
+            raise ValueError("Contractor {0} of contract {1} is not in the snapshot".format(contractor.id,
+                                                                                            contract.id))
+
+        billed_version = contract.billed_version
+
+        return (intern(contract.id), Snapshot.__CONTRACT_TYPES.index(type(contract)), contract.completed,
+                client_rows[contract.owner.id],
+                contractor_rows[contractor.id] if contractor is not None else Snapshot.__NONE,
+                intern(contract.speciality), contract.payment,
+                contract.times_viewed if isinstance(contract, AdvertFeeContract) else 0,
+                billed_version if billed_version is not None else Snapshot.__NONE)
@@ -0,0 +1,307 @@
+# File: write_ahead_log.py
+# Description: Prototype implementation of Game Developer Contract Matcher (GDCMatcher) case study
+# Author: Chris Knowles
+
+
+# Imports
+import json
+import os
+import threading
+import time
+
+
+# Consts
+# Globals
+
+
+# Classes
+class WriteAheadLog:
+    """
+    Append only log of the changes made to the store, each change is a record (a dictionary with an "op" key naming the
+    change plus the fields needed to make it again) written as one JSON line together with its log sequence number
+    (LSN), the LSNs go up by one with each record so a snapshot can hold the LSN of the last change it includes and only
+    the records after it need to be replayed, see MainApp.recover()
+
+    Records are made durable with group commit, append() only queues the record and a background flusher thread
+    writes every queued record and then calls fsync() once for all of them, so however many records are appended while
+    one fsync() is under way they all share the next one, with synchronous set append() then waits until its record is
+    durable, otherwise it returns straight away and wait_for() can be used later, the flusher can also be made to wait
+    commit_interval seconds before each write so more records join the batch
+
+    A crash can leave the last line part written, it is ignored when the log is read and cut off when the log is next
+    opened for appending
+    """
+
+    def __init__(self, file_path, next_lsn=1, synchronous=True, commit_interval=0.0):
+        """
+ -      Initialiser - instance variables:
+            file_path: path to the log file, as string, property with read-only access
+            synchronous: whether append() waits until the record is durable, as boolean, property with read/write access
+            commit_interval: seconds the flusher waits for more records before each write, as float, property with
+                             read/write access
+            file: the log file opened for appending, as file object, with private access
+            next_lsn: LSN to give the next record, as integer, property with read-only access
+            durable_lsn: LSN of the last record known to be durable, as integer, property with read-only access
+            pending: encoded records queued but not yet written, as list, with private access
+            commit_count: number of fsync() calls made, as integer, property with read-only access
+            error: exception raised by the flusher, which stops the log, or None, as Exception, with private access
+            closed: whether close() has been called, as boolean, with private access
+            condition: condition (with its lock) guarding the queue and LSNs, as threading.Condition, with private
+                       access
+            io_lock: lock held while the file is written, synced or truncated, as threading.Lock, with private access
+            flusher: background thread writing and syncing queued records, as threading.Thread, with private access
+
+        :param file_path: path to the log file as string, created if it does not exist
+        :param next_lsn: lowest LSN to give the next record, raised to follow the last record already in the log
+                         {optional}
+        :param synchronous: whether append() waits until the record is durable {optional}
+        :param commit_interval: seconds the flusher waits for more records before each write {optional}
+        """
+        self.__file_path = str(file_path)
+        self.__synchronous = bool(synchronous)
+        self.__commit_interval = float(commit_interval)
+
+        # Cut off any part written record left by a crash so new records follow on from the last complete one
+        last_lsn, length = WriteAheadLog.__scan(self.__file_path)
+        self.__file = open(self.__file_path, "ab")
+        if self.__file.tell() != length:
+            self.__file.truncate(length)
+
+        self.__next_lsn = max(int(next_lsn), last_lsn + 1)
+        self.__durable_lsn = self.__next_lsn - 1
+        self.__pending = []
+        self.__commit_count = 0
+        self.__error = None
+        self.__closed = False
+        self.__condition = threading.Condition()
+        self.__io_lock = threading.Lock()
+        self.__flusher = threading.Thread(target=self.__flush_loop, name="wal-flusher", daemon=True)
+        self.__flusher.start()
+
+    @property
+    def file_path(self):
+        return self.__file_path
+
+    @property
+    def synchronous(self):
+        return self.__synchronous
+
+    @synchronous.setter
+    def synchronous(self, synchronous):
+        self.__synchronous = bool(synchronous)
+
+    @property
+    def commit_interval(self):
+        return self.__commit_interval
+
+    @commit_interval.setter
+    def commit_interval(self, commit_interval):
+        self.__commit_interval = float(commit_interval)
+
+    @property
+    def next_lsn(self):
+        return self.__next_lsn
+
+    @property
+    def durable_lsn(self):
+        return self.__durable_lsn
+
+    @property
+    def commit_count(self):
+        return self.__commit_count
+
+    def __str__(self):
+        """
+        To string method
+
+        :return: string representation of this write ahead log instance
+        """
+        return "{0}:{1} durable to LSN {2} in {3} commits".format(WriteAheadLog.__name__, self.__file_path,
+                                                                   self.__durable_lsn, self.__commit_count)
+
+    def append(self, op, **fields):
+        """
+        Append a record to the log
+
+        :param op: name of the change as string
+        :param fields: fields of the change, these must be JSON serialisable
+        :return: LSN of the record as integer
+        """
+        return self.append_many([(op, fields)])
+
+    def append_many(self, records):
+        """
+        Append several records to the log in one step, they are given consecutive LSNs and made durable together
+
+        :param records: name and fields of each change as iterable of (op, fields dictionary) tuples
+        :return: LSN of the last record as integer, or of the last record in the log if none were supplied
+        """
+        with self.__condition:
+            self.__check_open()
+            for op, fields in records:
+                record = {"lsn": self.__next_lsn, "op": op}
+                record.update(fields)
+                self.__pending.append(json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n")
+                self.__next_lsn += 1
+            lsn = self.__next_lsn - 1
+            self.__condition.notify_all()
+
+        if self.__synchronous:
+            self.wait_for(lsn)
+
+        return lsn
+
+    def wait_for(self, lsn):
+        """
+        Wait until the record with the supplied LSN (and so every record before it) is durable
+
+        :param lsn: LSN to wait for as integer
+        :return: None
+        """
+        with self.__condition:
+            while self.__durable_lsn < lsn:
+                self.__check_open(allow_closed=True)
+                self.__condition.wait()
+
+    def truncate(self, lsn):
+        """
+        Empty the log if its last record is the one with the supplied LSN, used after a snapshot holding every change
+        up to that LSN has been written, LSNs carry on from where they were
+
+        :param lsn: LSN of the last change held elsewhere as integer
+        :return: True if the log was emptied, False if records have been appended after the supplied LSN
+        """
+        self.wait_for(lsn)
+        with self.__io_lock:
+            with self.__condition:
+                # Nothing can be queued or being written while both locks are held and the log is durable to the LSN
+                if self.__pending or self.__durable_lsn != lsn or self.__next_lsn - 1 != lsn:
+                    return False
+                self.__file.truncate(0)
+                os.fsync(self.__file.fileno())
+
+        return True
+
+    def close(self):
+        """
+        Write every queued record, stop the flusher and close the file
+
+        :return: None
+        """
+        with self.__condition:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__condition.notify_all()
+
+        self.__flusher.join()
+        self.__file.close()
+
+    @staticmethod
+    def read(file_path, after_lsn=0):
+        """
+        Read the records in a log file in order, stopping at a part written last record
+
+        :param file_path: path to the log file as string
+        :param after_lsn: only records with a greater LSN are returned {optional}
+        :return: generator of records as dictionaries
+        """
+        if not os.path.isfile(file_path):
+            return
+
+        with open(file_path, "rb") as log_file:
+            for line in log_file:
+                record = WriteAheadLog.__decode(line)
+                if record is None:
+                    return
+                if record["lsn"] > after_lsn:
+                    yield record
+
+    def __flush_loop(self):
+        """
+        Body of the flusher thread, writes and syncs each batch of queued records until the log is closed
+
+        :return: None
+        """
+        while True:
+            with self.__condition:
+                while not self.__pending and not self.__closed:
+                    self.__condition.wait()
+                if not self.__pending:
+                    return  # Closed and nothing left to write
+
+            if self.__commit_interval > 0.0 and not self.__closed:
+                time.sleep(self.__commit_interval)  # Let more records join this batch
+
+            with self.__io_lock:
+                with self.__condition:
+                    batch = self.__pending
+                    self.__pending = []
+                    lsn = self.__next_lsn - 1
+
+                try:
+                    self.__file.write(b"".join(batch))
+                    self.__file.flush()
+                    os.fsync(self.__file.fileno())
+                except OSError as error:
+                    with self.__condition:
+                        self.__error = error
+                        self.__closed = True
+                        self.__condition.notify_all()
+                    return
+
+            with self.__condition:
+                self.__durable_lsn = lsn
+                self.__commit_count += 1
+                self.__condition.notify_all()
+
+    def __check_open(self, allow_closed=False):
+        """
+        Raise the error that stopped the flusher, or an error if the log is closed, called holding the condition
+
+        :param allow_closed: whether a log closed by close() is allowed, as its queued records are still written
+        :return: None
+        """
+        if self.__error is not None:
+            raise OSError("Write ahead log {0} failed: {1}".format(self.__file_path, self.__error))
+        if self.__closed and not allow_closed:
+            raise ValueError("Write ahead log {0} is closed".format(self.__file_path))
+
+    @staticmethod
+    def __scan(file_path):
+        """
+        Find the last complete record in a log file
+
+        :param file_path: path to the log file as string
+        :return: tuple of the LSN of the last complete record (0 if there are none) and the length in bytes of the
+                 complete records as integers
+        """
+        last_lsn = 0
+        length = 0
+        if os.path.isfile(file_path):
+            with open(file_path, "rb") as log_file:
+                for line in log_file:
+                    record = WriteAheadLog.__decode(line)
+                    if record is None:
+                        break
+                    last_lsn = record["lsn"]
+                    length += len(line)
+
+        return last_lsn, length
+
+    @staticmethod
+    def __decode(line):
+        """
+        Decode one line of a log file
+
+        :param line: line as bytes
+        :return: record as dictionary or None if the line is part written
+        """
+        if not line.endswith(b"\n"):
+            return None
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+
+        return record if type(record) is dict and "lsn" in record else None
@@ -7,6 +7,7 @@
 import unittest
 from data_model.clients_list import ClientsList
 from data_model.identified_entity import IdentifiedEntity
+from data_model.id_allocator import IdAllocator
 from data_model.client import Client
 
 
@@ -28,9 +29,9 @@ class TestClientsList(unittest.TestCase):
         # Create a new clients list before every test case and add some sample clients to it
         self.clients_list = ClientsList()
 
-        # Force the reset of the Client class next identifier counter to 1000, needs to be done through the
-        # IdentifiedEntity class since this counter is in the base class
-        IdentifiedEntity._IdentifiedEntity__next_id = 1000
+        # Give every test case its own identifier allocator starting at 1000, needs to be done through the
+        # IdentifiedEntity class since the allocator is shared by all entity classes from the base class
+        IdentifiedEntity.use_id_allocator(IdAllocator(1000))
 
         # Add 4 instances of clients (with ids of CL1000, CL1001, CL1002, CL1003), note - this is done using the data
         # list accessed directly in clients list instance as we cannot be sure the add() method works yet
@@ -66,9 +67,9 @@ class TestClientsList(unittest.TestCase):
 
         :return: None
         """
-        # Arrange, note - we have to artificially reset the next id counter in the Client class so when using add() it
-        # tries to use an existing identifier
-        IdentifiedEntity._IdentifiedEntity__next_id = 1000  # Force update of private __next_id class property
+        # Arrange, note - we have to artificially reset the identifier allocator so when using add() it tries to use an
+        # existing identifier
+        IdentifiedEntity.id_allocator().reset(1000)
         in_client_name = "New Client"
         ex_clients_count = 4  # Should not add a new client with existing identifier
 
@@ -114,6 +115,188 @@ class TestClientsList(unittest.TestCase):
         self.assertFalse(ac_result,
                         "Test failed, expected result of False")
 
+    def test_remove_by_id_CL1001(self):
+        """
+        Test case to check the remove_by_id() method removes an existing client and that the index of the clients
+        that followed it are updated
+
+        :return: None
+        """
+        # Arrange
+        in_client_id = "CL1001"
+        ex_clients_count = 3
+        ex_index_of_CL1002 = 1
+
+        # Act
+        ac_result = self.clients_list.remove_by_id(in_client_id)
+        ac_clients_count = self.clients_list.count()
+        ac_index_of_CL1002 = self.clients_list.index_by_id("CL1002")
+
+        # Assert
+        self.assertTrue(ac_result,
+                        "Test failed, expected result of True")
+        self.assertEqual(ex_clients_count, ac_clients_count,
+                         "Test failed, expected client count: {0} got clients count: {1}".
+                         format(ex_clients_count, ac_clients_count))
+        self.assertEqual(ex_index_of_CL1002, ac_index_of_CL1002,
+                         "Test failed, expected index: {0} got index: {1}".
+                         format(ex_index_of_CL1002, ac_index_of_CL1002))
+        self.assertIsNone(self.clients_list.find_by_id(in_client_id),
+                          "Test failed, expected removed client not to be found")
+
+    def test_find_by_id_CL1002(self):
+        """
+        Test case to check the find_by_id() method returns the client with the supplied identifier
+
+        :return: None
+        """
+        # Arrange
+        in_client_id = "CL1002"
+        ex_client_name = "Bethesda Softworks LLC"
+
+        # Act
+        ac_client_name = self.clients_list.find_by_id(in_client_id).name
+
+        # Assert
+        self.assertEqual(ex_client_name, ac_client_name,
+                         "Test failed, expected client name: {0} got client name: {1}".
+                         format(ex_client_name, ac_client_name))
+
+    def test_add_many_rejects_duplicates(self):
+        """
+        Test case to check the add_many() method adds new clients and reports the clients whose identifiers clash with
+        an existing client or with an earlier client in the same batch
+
+        :return: None
+        """
+        # Arrange, note - the identifier allocator is reset so the second new client clashes with CL1000
+        in_new_client = Client("New Client")
+        IdentifiedEntity.id_allocator().reset(1000)
+        in_clashing_client = Client("Clashing Client")
+        ex_clients_count = 5
+
+        # Act
+        ac_added, ac_rejected = self.clients_list.add_many([in_new_client, in_clashing_client, in_new_client])
+        ac_clients_count = self.clients_list.count()
+
+        # Assert
+        self.assertEqual([in_new_client], ac_added,
+                         "Test failed, expected only the new client to be added")
+        self.assertEqual([in_clashing_client, in_new_client], ac_rejected,
+                         "Test failed, expected the clashing and repeated clients to be rejected")
+        self.assertEqual(ex_clients_count, ac_clients_count,
+                         "Test failed, expected client count: {0} got clients count: {1}".
+                         format(ex_clients_count, ac_clients_count))
+
+    def test_remove_many_reports_missing(self):
+        """
+        Test case to check the remove_many() method removes existing clients and reports identifiers that do not exist
+
+        :return: None
+        """
+        # Arrange
+        in_client_ids = ["CL1000", "CL9999", "CL1002"]
+        ex_remaining_ids = ["CL1001", "CL1003"]
+
+        # Act
+        ac_removed, ac_missing = self.clients_list.remove_many(in_client_ids)
+        ac_remaining_ids = [client.id for client in self.clients_list.data]
+
+        # Assert
+        self.assertEqual(["CL1000", "CL1002"], [client.id for client in ac_removed],
+                         "Test failed, expected CL1000 and CL1002 to be removed")
+        self.assertEqual(["CL9999"], ac_missing,
+                         "Test failed, expected CL9999 to be reported as missing")
+        self.assertEqual(ex_remaining_ids, ac_remaining_ids,
+                         "Test failed, expected remaining clients: {0} got remaining clients: {1}".
+                         format(ex_remaining_ids, ac_remaining_ids))
+        self.assertEqual(1, self.clients_list.index_by_id("CL1003"),
+                         "Test failed, expected CL1003 to move to index 1")
+
+    def test_lazy_removal_keeps_order(self):
+        """
+        Test case to check that with lazy removal switched on, removed clients are skipped by iteration and count()
+        before compaction, and the data list is compacted in order when it is next used
+
+        :return: None
+        """
+        # Arrange, note - the threshold is set high enough that removing two of four clients does not compact the list
+        self.clients_list.lazy_removal = True
+        self.clients_list.compaction_threshold = 0.9
+        ex_remaining_ids = ["CL1001", "CL1003"]
+
+        # Act
+        self.clients_list.remove_by_id("CL1000")
+        self.clients_list.remove_by_id("CL1002")
+        ac_iterated_ids = [client.id for client in self.clients_list]
+        ac_clients_count = self.clients_list.count()
+        ac_remaining_ids = [client.id for client in self.clients_list.data]
+
+        # Assert
+        self.assertEqual(ex_remaining_ids, ac_iterated_ids,
+                         "Test failed, expected iterated clients: {0} got iterated clients: {1}".
+                         format(ex_remaining_ids, ac_iterated_ids))
+        self.assertEqual(2, ac_clients_count,
+                         "Test failed, expected client count: 2 got clients count: {0}".format(ac_clients_count))
+        self.assertEqual(ex_remaining_ids, ac_remaining_ids,
+                         "Test failed, expected remaining clients: {0} got remaining clients: {1}".
+                         format(ex_remaining_ids, ac_remaining_ids))
+        self.assertEqual("CL1003", self.clients_list[1].id,
+                         "Test failed, expected CL1003 at index 1")
+
+    def test_removal_interleaved_with_lookups(self):
+        """
+        Test case to check that removing clients one at a time without lazy removal, with lookups in between, keeps
+        every remaining client at the right index and in order
+
+        :return: None
+        """
+        # Arrange
+        ex_indexes = {"CL1001": 0, "CL1003": 1}
+        ex_iterated_ids = ["CL1001", "CL1003"]
+
+        # Act
+        self.clients_list.remove_by_id("CL1000")
+        ac_found = self.clients_list.find_by_id("CL1003")
+        self.clients_list.remove_by_id("CL1002")
+        ac_indexes = {ident: self.clients_list.index_by_id(ident) for ident in ex_indexes}
+        ac_iterated_ids = [client.id for client in self.clients_list]
+
+        # Assert
+        self.assertEqual("CL1003", ac_found.id, "Test failed, expected CL1003 to be found")
+        self.assertEqual(ex_indexes, ac_indexes,
+                         "Test failed, expected indexes: {0} got indexes: {1}".format(ex_indexes, ac_indexes))
+        self.assertEqual(ex_iterated_ids, ac_iterated_ids,
+                         "Test failed, expected iterated clients: {0} got iterated clients: {1}".
+                         format(ex_iterated_ids, ac_iterated_ids))
+
+    def test_page_token_survives_removal(self):
+        """
+        Test case to check the page() method returns clients a page at a time and that the token from one page still
+        resumes at the right place after the client it came from has been removed
+
+        :return: None
+        """
+        # Arrange
+        ex_first_ids = ["CL1000", "CL1001"]
+        ex_second_ids = ["CL1003"]
+
+        # Act
+        first_page, token = self.clients_list.page(2)
+        self.clients_list.remove_by_id("CL1001")
+        self.clients_list.remove_by_id("CL1002")
+        second_page, last_token = self.clients_list.page(2, token)
+        ac_first_ids = [client.id for client in first_page]
+        ac_second_ids = [client.id for client in second_page]
+
+        # Assert
+        self.assertEqual(ex_first_ids, ac_first_ids,
+                         "Test failed, expected first page: {0} got first page: {1}".format(ex_first_ids, ac_first_ids))
+        self.assertEqual(ex_second_ids, ac_second_ids,
+                         "Test failed, expected second page: {0} got second page: {1}".
+                         format(ex_second_ids, ac_second_ids))
+        self.assertIsNone(last_token, "Test failed, expected no token after the last page")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,203 @@
+# File: test_columnar_contracts_list.py
+# Description: Automated tests for elements of Game Developer Contract Matcher (GDCMatcher) case study prototype
+# Author: Chris Knowles
+
+
+# Imports
+import unittest
+from data_model.columnar_contracts_list import ColumnarContractsList
+from data_model.identified_entity import IdentifiedEntity
+from data_model.id_allocator import IdAllocator
+from data_model.client import Client
+from data_model.contractor import Contractor
+from data_model.contract import Contract
+from data_model.advert_fee_contract import AdvertFeeContract
+from data_model.fee_schedule import FeeSchedule
+
+
+# Consts
+# Globals
+
+
+# Classes
+class TestColumnarContractsList(unittest.TestCase):
+    """
+    Test fixture to exercise the methods from the columnar contracts list class
+    """
+    def setUp(self):
+        """
+        Set up run before every test case
+
+        :return:
+        """
+        # Create a new columnar contracts list before every test case and add some sample contracts to it
+        self.contracts_list = ColumnarContractsList()
+
+        # Give every test case its own identifier allocator starting at 1000, needs to be done through the
+        # IdentifiedEntity class since the allocator is shared by all entity classes from the base class
+        IdentifiedEntity.use_id_allocator(IdAllocator(1000))
+
+        # Add 1 client (CL1000), 1 contractor (CR1001) and 3 contracts (CT1002, CT1003, CT1004)
+        self.owner = Client("Ubisoft Entertainment")
+        self.contractor = Contractor("Jill Doe", "C++")
+        self.contracts_list.add(Contract(self.owner, "C++", 1500.0))
+        self.contracts_list.add(AdvertFeeContract(self.owner, "Audio", 700.0, self.contractor))
+        self.contracts_list.add(Contract(self.owner, "C++", 280.0))
+
+    def test_find_by_id_materialises_contract(self):
+        """
+        Test case to check the find_by_id() method rebuilds a contract of the correct class with the same data
+
+        :return: None
+        """
+        # Arrange
+        in_contract_id = "CT1003"
+
+        # Act
+        ac_contract = self.contracts_list.find_by_id(in_contract_id)
+
+        # Assert
+        self.assertIsInstance(ac_contract, AdvertFeeContract,
+                              "Test failed, expected an AdvertFeeContract instance")
+        self.assertEqual((in_contract_id, 700.0, "CR1001"),
+                         (ac_contract.id, ac_contract.payment, ac_contract.contractor_allocated.id),
+                         "Test failed, materialised contract data differs")
+
+    def test_remove_by_id_shifts_rows(self):
+        """
+        Test case to check removing a contract removes its row and the following rows can still be found
+
+        :return: None
+        """
+        # Arrange
+        in_contract_id = "CT1002"
+        ex_payments = [700.0, 280.0]
+
+        # Act
+        self.contracts_list.remove_by_id(in_contract_id)
+        ac_payments = list(self.contracts_list.column("payment"))
+
+        # Assert
+        self.assertEqual(ex_payments, ac_payments,
+                         "Test failed, expected payments: {0} got payments: {1}".format(ex_payments, ac_payments))
+        self.assertEqual(1, self.contracts_list.index_by_id("CT1004"),
+                         "Test failed, expected CT1004 to move to row 1")
+
+    def test_remove_many_in_one_pass(self):
+        """
+        Test case to check the remove_many() method removes the rows of the contracts found, reports the identifiers
+        not found, leaves the remaining rows able to be found and leaves a view taken before the removal unchanged
+
+        :return: None
+        """
+        # Arrange
+        in_view = self.contracts_list.column("payment")
+        ex_result = (["CT1002", "CT1004"], ["CT9999"], [700.0], 0, [1500.0, 700.0, 280.0])
+
+        # Act
+        removed, missing = self.contracts_list.remove_many(["CT1002", "CT9999", "CT1004"])
+        ac_result = (removed, missing, list(self.contracts_list.column("payment")),
+                     self.contracts_list.index_by_id("CT1003"), list(in_view))
+
+        # Assert
+        self.assertEqual(ex_result, ac_result,
+                         "Test failed, expected removed, missing, payments, row and view: {0} got: {1}".
+                         format(ex_result, ac_result))
+
+    def test_rows_matching_skips_unaligned(self):
+        """
+        Test case to check the rows_matching() method only reports a match that starts on a cell boundary, 256 holds
+        the bytes of 1 one byte along, and that remove_matching() removes the rows it reports
+
+        :return: None
+        """
+        # Arrange
+        self.contracts_list.set_times_viewed("CT1002", 256)
+        self.contracts_list.set_times_viewed("CT1004", 1)
+        ex_result = ([2], [0, 2], 2, ["CT1003"])
+
+        # Act
+        ac_rows = self.contracts_list.rows_matching("times_viewed", 1)
+        ac_specialities = self.contracts_list.rows_matching("speciality", self.contracts_list.speciality_code("C++"))
+        ac_removed = self.contracts_list.remove_matching("speciality", self.contracts_list.speciality_code("C++"))
+        ac_result = (ac_rows, ac_specialities, ac_removed, [contract.id for contract in self.contracts_list.data])
+
+        # Assert
+        self.assertEqual(ex_result, ac_result,
+                         "Test failed, expected rows, rows, removed and contracts: {0} got: {1}".
+                         format(ex_result, ac_result))
+
+    def test_get_all_unallocated(self):
+        """
+        Test case to check the get_all_unallocated() method returns only contracts with no allocated contractor
+
+        :return: None
+        """
+        # Arrange
+        ex_contract_ids = ["CT1002", "CT1004"]
+
+        # Act
+        ac_contract_ids = [contract.id for contract in self.contracts_list.get_all_unallocated()]
+
+        # Assert
+        self.assertEqual(ex_contract_ids, ac_contract_ids,
+                         "Test failed, expected contracts: {0} got contracts: {1}".
+                         format(ex_contract_ids, ac_contract_ids))
+
+    def test_calculate_revenue_matches_contracts(self):
+        """
+        Test case to check the bulk calculate_revenue() method agrees with calling calculate_revenue() on every contract
+
+        :return: None
+        """
+        # Arrange
+        self.contracts_list.set_completed("CT1002", True)
+        self.contracts_list.set_times_viewed("CT1003", 4)
+        in_contracts = self.contracts_list.data
+        ex_realised = sum(contract.calculate_revenue() for contract in in_contracts if contract.completed)
+        ex_potential = sum(contract.calculate_revenue() for contract in in_contracts if not contract.completed)
+
+        # Act
+        ac_realised, ac_potential = self.contracts_list.calculate_revenue()
+
+        # Assert
+        self.assertAlmostEqual(ex_realised, ac_realised, 6,
+                               "Test failed, expected realised: {0} got realised: {1}".format(ex_realised, ac_realised))
+        self.assertAlmostEqual(ex_potential, ac_potential, 6,
+                               "Test failed, expected potential: {0} got potential: {1}".
+                               format(ex_potential, ac_potential))
+
+    def test_completed_revenue_frozen_after_fee_change(self):
+        """
+        Test case to check that a contract completed before the fees change keeps the revenue it was billed at, both in
+        the bulk calculate_revenue() method and when materialised, while a contract not yet completed follows the fees
+
+        :return: None
+        """
+        # Arrange
+        fees = dict(FeeSchedule.fees())
+        self.contracts_list.set_completed("CT1002", True)
+        ex_realised = self.contracts_list.find_by_id("CT1002").calculate_revenue()
+        ex_potential = 0.5 * 280.0 + 0.5 * 700.0
+
+        # Act
+        try:
+            FeeSchedule.set_fees(base_commission=50.0)
+            ac_realised, ac_potential = self.contracts_list.calculate_revenue()
+            ac_materialised = self.contracts_list.find_by_id("CT1002").calculate_revenue()
+        finally:
+            FeeSchedule.set_fees(**fees)
+
+        # Assert
+        self.assertAlmostEqual(ex_realised, ac_realised, 6,
+                               "Test failed, expected realised: {0} got realised: {1}".format(ex_realised, ac_realised))
+        self.assertAlmostEqual(ex_realised, ac_materialised, 6,
+                               "Test failed, expected revenue: {0} got revenue: {1}".
+                               format(ex_realised, ac_materialised))
+        self.assertAlmostEqual(ex_potential, ac_potential, 6,
+                               "Test failed, expected potential: {0} got potential: {1}".
+                               format(ex_potential, ac_potential))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+# File: test_contract_matcher.py
+# Description: Automated tests for elements of Game Developer Contract Matcher (GDCMatcher) case study prototype
+# Author: Chris Knowles
+
+
+# Imports
+import unittest
+from engine.contract_matcher import ContractMatcher
+from data_model.contracts_list import ContractsList
+from data_model.contractors_list import ContractorsList
+from data_model.identified_entity import IdentifiedEntity
+from data_model.id_allocator import IdAllocator
+from data_model.client import Client
+from data_model.contractor import Contractor
+from data_model.contract import Contract
+
+
+# Consts
+# Globals
+
+
+# Classes
+class TestContractMatcher(unittest.TestCase):
+    """
+    Test fixture to exercise the methods from the contract matcher class
+    """
+    def setUp(self):
+        """
+        Set up run before every test case
+
+        :return:
+        """
+        # Create new contracts and contractors lists before every test case and add some sample entities to them
+        self.contracts_list = ContractsList()
+        self.contractors_list = ContractorsList()
+
+        # Give every test case its own identifier allocator starting at 1000, needs to be done through the
+        # IdentifiedEntity class since the allocator is shared by all entity classes from the base class
+        IdentifiedEntity.use_id_allocator(IdAllocator(1000))
+
+        # Add 1 client (CL1000), 2 contractors (CR1001, CR1002) and 4 contracts (CT1003, CT1004, CT1005, CT1006), the
+        # C++ contractor CR1001 already has the C++ contract CT1004
+        owner = Client("Ubisoft Entertainment")
+        self.contractor_1 = Contractor("Jill Doe", "C++")
+        self.contractor_2 = Contractor("Dave Jones", "C++")
+        self.contractors_list.add(self.contractor_1)
+        self.contractors_list.add(self.contractor_2)
+        self.contracts_list.add(Contract(owner, "C++", 1500.0))
+        self.contracts_list.add(Contract(owner, "C++", 700.0, self.contractor_1))
+        self.contracts_list.add(Contract(owner, "C++", 2500.0))
+        self.contracts_list.add(Contract(owner, "Python", 280.0))
+
+    def test_match_uncapped(self):
+        """
+        Test case to check the match() method allocates every contract that has a contractor with the same speciality,
+        highest revenue first and to the contractor with the lowest workload
+
+        :return: None
+        """
+        # Arrange
+        matcher = ContractMatcher(self.contracts_list, self.contractors_list)
+        ex_allocations = [("CT1005", "CR1002"), ("CT1003", "CR1001")]
+
+        # Act
+        ac_allocations = [(contract.id, contractor.id) for contract, contractor in matcher.match()]
+
+        # Assert
+        self.assertEqual(ex_allocations, ac_allocations,
+                         "Test failed, expected allocations: {0} got allocations: {1}".
+                         format(ex_allocations, ac_allocations))
+
+    def test_match_capped(self):
+        """
+        Test case to check the match() method respects the workload cap, counting contracts already allocated, and
+        keeps the highest revenue contract when there is not enough capacity for all of them
+
+        :return: None
+        """
+        # Arrange
+        matcher = ContractMatcher(self.contracts_list, self.contractors_list, max_workload=1)
+        ex_allocations = [("CT1005", "CR1002")]
+
+        # Act
+        ac_allocations = [(contract.id, contractor.id) for contract, contractor in matcher.match()]
+
+        # Assert
+        self.assertEqual(ex_allocations, ac_allocations,
+                         "Test failed, expected allocations: {0} got allocations: {1}".
+                         format(ex_allocations, ac_allocations))
+
+    def test_match_in_pool_same_as_serial(self):
+        """
+        Test case to check the match() method gives the same allocations when the specialities are solved across a
+        process pool as when they are solved in this process
+
+        :return: None
+        """
+        # Arrange, note - a Python contractor is added so there is more than one speciality to share between workers
+        self.contractors_list.add(Contractor("Ann Smith", "Python"))
+        matcher = ContractMatcher(self.contracts_list, self.contractors_list)
+        ex_allocations = [(contract.id, contractor.id) for contract, contractor in matcher.match()]
+
+        # Act
+        ac_allocations = [(contract.id, contractor.id) for contract, contractor in matcher.match(workers=2)]
+
+        # Assert
+        self.assertEqual(ex_allocations, ac_allocations,
+                         "Test failed, expected allocations: {0} got allocations: {1}".
+                         format(ex_allocations, ac_allocations))
+
+    def test_similarity_is_not_transitive(self):
+        """
+        Test case to check that with similar specialities a contract is only allocated to a contractor whose speciality
+        is similar to its own, "C++" and "programming" are both similar to "C++ programming" but not to each other so
+        the "C++" contracts can only go to the "C++ programming" contractor
+
+        :return: None
+        """
+        # Arrange
+        owner = Client("Electronic Arts Inc")
+        contracts_list = ContractsList()
+        contractors_list = ContractorsList()
+        programmer = Contractor("Ann Smith", "programming")
+        cpp_programmer = Contractor("Bob Brown", "C++ programming")
+        contractors_list.add(programmer)
+        contractors_list.add(cpp_programmer)
+        contract_1 = Contract(owner, "C++", 1000.0)
+        contract_2 = Contract(owner, "C++", 900.0)
+        contract_3 = Contract(owner, "programming", 10.0)
+        for contract in (contract_1, contract_2, contract_3):
+            contracts_list.add(contract)
+        matcher = ContractMatcher(contracts_list, contractors_list, max_workload=2, similar_specialities=True)
+        ex_allocations = [(contract_1.id, cpp_programmer.id), (contract_2.id, cpp_programmer.id),
+                          (contract_3.id, programmer.id)]
+
+        # Act
+        ac_allocations = [(contract.id, contractor.id) for contract, contractor in matcher.match()]
+        ac_pool_allocations = [(contract.id, contractor.id) for contract, contractor in matcher.match(workers=2)]
+
+        # Assert
+        self.assertEqual(ex_allocations, ac_allocations,
+                         "Test failed, expected allocations: {0} got allocations: {1}".
+                         format(ex_allocations, ac_allocations))
+        self.assertEqual(ex_allocations, ac_pool_allocations,
+                         "Test failed, expected allocations: {0} got allocations: {1}".
+                         format(ex_allocations, ac_pool_allocations))
+
+    def test_solve_similar_moves_contracts_to_make_room(self):
+        """
+        Test case to check the solve_similar() method moves a contract already taken to another similar speciality
+        when that makes room for a higher revenue contract, rather than turning the higher revenue contract down
+
+        :return: None
+        """
+        # Arrange, note - contracts of speciality 0 can go to contractors of speciality 0 or 1 but speciality 2 only to
+        # speciality 1, one contractor each with room for one contract
+        in_contracts = [(50.0, 0, "a"), (40.0, 2, "b")]
+        in_contractors = [(0, 1, "x"), (0, 0, "y")]
+        in_similar = {0: (1, 0), 2: (1, )}
+        ex_allocations = [("a", "y"), ("b", "x")]
+
+        # Act
+        ac_allocations = ContractMatcher.solve_similar(in_contracts, in_contractors, in_similar, max_workload=1)
+
+        # Assert
+        self.assertEqual(ex_allocations, ac_allocations,
+                         "Test failed, expected allocations: {0} got allocations: {1}".
+                         format(ex_allocations, ac_allocations))
+
+    def test_solve_spreads_workload(self):
+        """
+        Test case to check the solve() method only takes as many contracts as there is spare capacity for and gives
+        each one to the contractor with the lowest workload at the time
+
+        :return: None
+        """
+        # Arrange
+        in_contracts = [(10.0, "a"), (30.0, "b"), (20.0, "c"), (40.0, "d")]
+        in_contractors = [(1, "x"), (0, "y")]
+        ex_allocations = [("d", "y"), ("b", "x"), ("c", "y")]
+
+        # Act
+        ac_allocations = ContractMatcher.solve(in_contracts, in_contractors, max_workload=2)
+
+        # Assert
+        self.assertEqual(ex_allocations, ac_allocations,
+                         "Test failed, expected allocations: {0} got allocations: {1}".
+                         format(ex_allocations, ac_allocations))
+
+
+if __name__ == "__main__":
+    unittest.main()
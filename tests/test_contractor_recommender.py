@@ -0,0 +1,97 @@
+# File: test_contractor_recommender.py
+# Description: Automated tests for elements of Game Developer Contract Matcher (GDCMatcher) case study prototype
+# Author: Chris Knowles
+
+
+# Imports
+import unittest
+from engine.contractor_recommender import ContractorRecommender
+from data_model.contracts_list import ContractsList
+from data_model.contractors_list import ContractorsList
+from data_model.identified_entity import IdentifiedEntity
+from data_model.id_allocator import IdAllocator
+from data_model.client import Client
+from data_model.contractor import Contractor
+from data_model.contract import Contract
+
+
+# Consts
+# Globals
+
+
+# Classes
+class TestContractorRecommender(unittest.TestCase):
+    """
+    Test fixture to exercise the methods from the contractor recommender class
+    """
+    def setUp(self):
+        """
+        Set up run before every test case
+
+        :return:
+        """
+        # Create new contracts and contractors lists before every test case and add some sample entities to them
+        self.contracts_list = ContractsList()
+        self.contractors_list = ContractorsList()
+
+        # Give every test case its own identifier allocator starting at 1000, needs to be done through the
+        # IdentifiedEntity class since the allocator is shared by all entity classes from the base class
+        IdentifiedEntity.use_id_allocator(IdAllocator(1000))
+
+        # Add 1 client (CL1000), 3 contractors (CR1001, CR1002, CR1003) and 2 contracts (CT1004, CT1005), the C++
+        # contractor CR1001 already has the C++ contract CT1004
+        self.owner = Client("Ubisoft Entertainment")
+        self.contractor_1 = Contractor("Jill Doe", "C++")
+        self.contractor_2 = Contractor("Dave Jones", "C++")
+        self.contractor_3 = Contractor("Ann Smith", "Python")
+        for contractor in (self.contractor_1, self.contractor_2, self.contractor_3):
+            self.contractors_list.add(contractor)
+        self.allocated = Contract(self.owner, "C++", 700.0, self.contractor_1)
+        self.contract = Contract(self.owner, "C++", 1500.0)
+        self.contracts_list.add(self.allocated)
+        self.contracts_list.add(self.contract)
+
+        self.recommender = ContractorRecommender(self.contracts_list, self.contractors_list)
+
+    def test_recommend_prefers_less_workload(self):
+        """
+        Test case to check the recommend() method only recommends contractors with a matching speciality and ranks the
+        one with no work above the one with work
+
+        :return: None
+        """
+        # Arrange
+        ex_contractor_ids = ["CR1002", "CR1001"]
+
+        # Act
+        ac_contractor_ids = [contractor.id for score, contractor in self.recommender.recommend(self.contract, k=5)]
+
+        # Assert
+        self.assertEqual(ex_contractor_ids, ac_contractor_ids,
+                         "Test failed, expected contractors: {0} got contractors: {1}".
+                         format(ex_contractor_ids, ac_contractor_ids))
+
+    def test_invalidate_after_completion(self):
+        """
+        Test case to check that once a contract is completed and the contractor's cached score is invalidated, its
+        completion history lifts it to the top of the recommendations
+
+        :return: None
+        """
+        # Arrange
+        self.recommender.recommend(self.contract)  # Fill the cache
+        self.allocated.completed = True
+        ex_contractor_id = "CR1001"
+
+        # Act
+        self.recommender.invalidate(self.contractor_1)
+        ac_contractor_id = self.recommender.recommend(self.contract, k=1)[0][1].id
+
+        # Assert
+        self.assertEqual(ex_contractor_id, ac_contractor_id,
+                         "Test failed, expected contractor: {0} got contractor: {1}".
+                         format(ex_contractor_id, ac_contractor_id))
+
+
+if __name__ == "__main__":
+    unittest.main()
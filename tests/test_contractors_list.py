@@ -0,0 +1,85 @@
+# File: test_contractors_list.py
+# Description: Automated tests for elements of Game Developer Contract Matcher (GDCMatcher) case study prototype
+# Author: Chris Knowles
+
+
+# Imports
+import unittest
+from data_model.contractors_list import ContractorsList
+from data_model.identified_entity import IdentifiedEntity
+from data_model.id_allocator import IdAllocator
+from data_model.contractor import Contractor
+
+
+# Consts
+# Globals
+
+
+# Classes
+class TestContractorsList(unittest.TestCase):
+    """
+    Test fixture to exercise the methods from the contractors list class
+    """
+    def setUp(self):
+        """
+        Set up run before every test case
+
+        :return:
+        """
+        # Create a new contractors list before every test case and add some sample contractors to it
+        self.contractors_list = ContractorsList()
+
+        # Give every test case its own identifier allocator starting at 1000, needs to be done through the
+        # IdentifiedEntity class since the allocator is shared by all entity classes from the base class
+        IdentifiedEntity.use_id_allocator(IdAllocator(1000))
+
+        # Add 3 instances of contractors (with ids of CR1000, CR1001, CR1002)
+        self.contractors_list.add(Contractor("Jill Doe", "C++"))
+        self.contractors_list.add(Contractor("Sarah Smith", "3D Modelling"))
+        self.contractors_list.add(Contractor("Ali Ashad", "C++"))
+
+    def test_get_with_speciality_cpp(self):
+        """
+        Test case to check the get_with_speciality() method returns only the contractors with the supplied speciality
+
+        :return: None
+        """
+        # Arrange
+        in_speciality = "C++"
+        ex_contractor_ids = ["CR1000", "CR1002"]
+
+        # Act
+        ac_contractor_ids = [contractor.id for contractor in self.contractors_list.get_with_speciality(in_speciality)]
+
+        # Assert
+        self.assertEqual(ex_contractor_ids, ac_contractor_ids,
+                         "Test failed, expected contractors: {0} got contractors: {1}".
+                         format(ex_contractor_ids, ac_contractor_ids))
+
+    def test_speciality_change_updates_index(self):
+        """
+        Test case to check that changing the speciality of a contained contractor moves it to the new speciality in
+        both the matching contractors and the speciality counts
+
+        :return: None
+        """
+        # Arrange
+        in_contractor = self.contractors_list.find_by_id("CR1000")
+        ex_cpp_count = 1
+        ex_audio_ids = ["CR1000"]
+
+        # Act
+        in_contractor.speciality = "Audio"
+        ac_cpp_count = self.contractors_list.count_with_speciality("C++")
+        ac_audio_ids = [contractor.id for contractor in self.contractors_list.get_with_speciality("Audio")]
+
+        # Assert
+        self.assertEqual(ex_cpp_count, ac_cpp_count,
+                         "Test failed, expected C++ count: {0} got C++ count: {1}".format(ex_cpp_count, ac_cpp_count))
+        self.assertEqual(ex_audio_ids, ac_audio_ids,
+                         "Test failed, expected contractors: {0} got contractors: {1}".
+                         format(ex_audio_ids, ac_audio_ids))
+
+
+if __name__ == "__main__":
+    unittest.main()
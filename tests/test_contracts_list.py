@@ -0,0 +1,206 @@
+# File: test_contracts_list.py
+# Description: Automated tests for elements of Game Developer Contract Matcher (GDCMatcher) case study prototype
+# Author: Chris Knowles
+
+
+# Imports
+import unittest
+from data_model.contracts_list import ContractsList
+from data_model.identified_entity import IdentifiedEntity
+from data_model.id_allocator import IdAllocator
+from data_model.client import Client
+from data_model.contractor import Contractor
+from data_model.contract import Contract
+
+
+# Consts
+# Globals
+
+
+# Classes
+class TestContractsList(unittest.TestCase):
+    """
+    Test fixture to exercise the methods from the contracts list class
+    """
+    def setUp(self):
+        """
+        Set up run before every test case
+
+        :return:
+        """
+        # Create a new contracts list before every test case and add some sample contracts to it
+        self.contracts_list = ContractsList()
+
+        # Give every test case its own identifier allocator starting at 1000, needs to be done through the
+        # IdentifiedEntity class since the allocator is shared by all entity classes from the base class
+        IdentifiedEntity.use_id_allocator(IdAllocator(1000))
+
+        # Add 2 clients (CL1000, CL1001), 2 contractors (CR1002, CR1003) and 3 contracts (CT1004, CT1005, CT1006)
+        self.owner_1 = Client("Ubisoft Entertainment")
+        self.owner_2 = Client("Electronic Arts Inc")
+        self.contractor_1 = Contractor("Jill Doe", "C++")
+        self.contractor_2 = Contractor("Dave Jones", "Python")
+        self.contracts_list.add(Contract(self.owner_1, "C++", 1500.0))
+        self.contracts_list.add(Contract(self.owner_2, "C++", 700.0, self.contractor_1))
+        self.contracts_list.add(Contract(self.owner_1, "Python", 280.0))
+
+    def test_get_with_owner_CL1000(self):
+        """
+        Test case to check the get_with_owner() method returns only the contracts owned by the supplied client
+
+        :return: None
+        """
+        # Arrange
+        ex_contract_ids = ["CT1004", "CT1006"]
+
+        # Act
+        ac_contract_ids = [contract.id for contract in self.contracts_list.get_with_owner(self.owner_1)]
+
+        # Assert
+        self.assertEqual(ex_contract_ids, ac_contract_ids,
+                         "Test failed, expected contracts: {0} got contracts: {1}".
+                         format(ex_contract_ids, ac_contract_ids))
+
+    def test_get_with_speciality_cpp(self):
+        """
+        Test case to check the get_with_speciality() method returns only the contracts with the supplied speciality
+
+        :return: None
+        """
+        # Arrange
+        in_speciality = "C++"
+        ex_contract_ids = ["CT1004", "CT1005"]
+
+        # Act
+        ac_contract_ids = [contract.id for contract in self.contracts_list.get_with_speciality(in_speciality)]
+
+        # Assert
+        self.assertEqual(ex_contract_ids, ac_contract_ids,
+                         "Test failed, expected contracts: {0} got contracts: {1}".
+                         format(ex_contract_ids, ac_contract_ids))
+
+    def test_allocate_updates_indexes(self):
+        """
+        Test case to check that allocating a contractor to a contained contract moves it from the unallocated contracts
+        to the contracts allocated to that contractor
+
+        :return: None
+        """
+        # Arrange
+        in_contract = self.contracts_list.find_by_id("CT1006")
+        ex_unallocated_ids = ["CT1004"]
+        ex_allocated_ids = ["CT1006"]
+
+        # Act
+        in_contract.contractor_allocated = self.contractor_2
+        ac_unallocated_ids = [contract.id for contract in self.contracts_list.get_all_unallocated()]
+        ac_allocated_ids = [contract.id for contract in self.contracts_list.get_with_contractor(self.contractor_2)]
+
+        # Assert
+        self.assertEqual(ex_unallocated_ids, ac_unallocated_ids,
+                         "Test failed, expected unallocated contracts: {0} got unallocated contracts: {1}".
+                         format(ex_unallocated_ids, ac_unallocated_ids))
+        self.assertEqual(ex_allocated_ids, ac_allocated_ids,
+                         "Test failed, expected allocated contracts: {0} got allocated contracts: {1}".
+                         format(ex_allocated_ids, ac_allocated_ids))
+
+    def test_remove_clears_indexes(self):
+        """
+        Test case to check that removing the only contract allocated to a contractor means the contractor is no longer
+        reported as having allocated contracts
+
+        :return: None
+        """
+        # Arrange
+        in_contract_id = "CT1005"
+
+        # Act
+        self.contracts_list.remove_by_id(in_contract_id)
+        ac_result = self.contracts_list.has_with_contractor(self.contractor_1)
+
+        # Assert
+        self.assertFalse(ac_result,
+                         "Test failed, expected result of False")
+
+    def test_query_combines_predicates(self):
+        """
+        Test case to check a query combining owner, speciality, unallocated and payment predicates returns only the
+        contracts that match all of them and is planned from the smallest index entry
+
+        :return: None
+        """
+        # Arrange
+        in_query = self.contracts_list.query().owner(self.owner_1).speciality("C++").unallocated().payment_between(1000)
+        ex_contract_ids = ["CT1004"]
+
+        # Act
+        ac_index, ac_candidates = in_query.plan()
+        ac_contract_ids = [contract.id for contract in in_query]
+
+        # Assert
+        self.assertEqual(ex_contract_ids, ac_contract_ids,
+                         "Test failed, expected contracts: {0} got contracts: {1}".
+                         format(ex_contract_ids, ac_contract_ids))
+        self.assertEqual(2, len(ac_candidates),
+                         "Test failed, expected the plan to visit 2 contracts got: {0}".format(len(ac_candidates)))
+
+    def test_query_contract_type_scan(self):
+        """
+        Test case to check a query with no indexed predicates visits every contract
+
+        :return: None
+        """
+        # Arrange
+        in_query = self.contracts_list.query().contract_type("base").payment_between(maximum=700.0)
+        ex_contract_ids = ["CT1005", "CT1006"]
+
+        # Act
+        ac_index, ac_candidates = in_query.plan()
+        ac_contract_ids = [contract.id for contract in in_query]
+
+        # Assert
+        self.assertEqual("scan", ac_index,
+                         "Test failed, expected plan: scan got plan: {0}".format(ac_index))
+        self.assertEqual(ex_contract_ids, ac_contract_ids,
+                         "Test failed, expected contracts: {0} got contracts: {1}".
+                         format(ex_contract_ids, ac_contract_ids))
+
+    def test_query_pages_in_sequence_order(self):
+        """
+        Test case to check that an index entry stays in the order the contracts were added when an older contract is
+        moved into it, so a query pages through the entry in that order, and that contracts can be allocated while the
+        results of a query are being used
+
+        :return: None
+        """
+        # Arrange, CT1005 is already allocated to contractor 1 so CT1004 is moved in after it
+        self.contracts_list.find_by_id("CT1004").contractor_allocated = self.contractor_1
+        self.contracts_list.find_by_id("CT1006").contractor_allocated = None
+        ex_contract_ids = ["CT1004", "CT1005"]
+        ex_allocated_ids = ["CT1006"]
+
+        # Act
+        ac_entry_ids = list(self.contracts_list.index_entry("contractor", self.contractor_1.id))
+        page, token = self.contracts_list.query().contractor(self.contractor_1).page(1)
+        rest, last_token = self.contracts_list.query().contractor(self.contractor_1).page(1, token)
+        ac_contract_ids = [contract.id for contract in page + rest]
+        ac_allocated_ids = []
+        for contract in self.contracts_list.query().unallocated():
+            contract.contractor_allocated = self.contractor_2
+            ac_allocated_ids.append(contract.id)
+
+        # Assert
+        self.assertEqual(ex_contract_ids, ac_entry_ids,
+                         "Test failed, expected index entry: {0} got index entry: {1}".
+                         format(ex_contract_ids, ac_entry_ids))
+        self.assertEqual(ex_contract_ids, ac_contract_ids,
+                         "Test failed, expected contracts: {0} got contracts: {1}".
+                         format(ex_contract_ids, ac_contract_ids))
+        self.assertIsNone(last_token, "Test failed, expected no token after the last page")
+        self.assertEqual(ex_allocated_ids, ac_allocated_ids,
+                         "Test failed, expected allocated contracts: {0} got: {1}".
+                         format(ex_allocated_ids, ac_allocated_ids))
+
+
+if __name__ == "__main__":
+    unittest.main()
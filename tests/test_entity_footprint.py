@@ -0,0 +1,74 @@
+# File: test_entity_footprint.py
+# Description: Automated tests for elements of Game Developer Contract Matcher (GDCMatcher) case study prototype
+# Author: Chris Knowles
+
+
+# Imports
+import sys
+import unittest
+from data_model.client import Client
+from data_model.contractor import Contractor
+from data_model.contract import Contract
+from data_model.fixed_fee_contract import FixedFeeContract
+from data_model.advert_fee_contract import AdvertFeeContract
+
+
+# Consts
+# Globals
+
+
+# Classes
+class TestEntityFootprint(unittest.TestCase):
+    """
+    Test fixture to check the per-instance memory budget of the entity classes documented in IdentifiedEntity
+    """
+    def setUp(self):
+        """
+        Set up run before every test case
+
+        :return:
+        """
+        # Create one instance of each entity class, the budgets are for 64-bit builds where a pointer is 8 bytes, note -
+        # the contract budgets include one field for the cached revenue and fee schedule version it was billed under and
+        # every budget includes the weak reference slot
+        self.owner = Client("Ubisoft Entertainment")
+        self.contractor = Contractor("Jill Doe", "C++")
+        self.entities = [(self.owner, 64),
+                         (self.contractor, 72),
+                         (Contract(self.owner, "C++", 1500.0), 104),
+                         (FixedFeeContract(self.owner, "C++", 1500.0), 104),
+                         (AdvertFeeContract(self.owner, "C++", 1500.0), 112)]
+
+    def test_no_instance_dict(self):
+        """
+        Test case to check that no entity instance carries a per-instance dictionary
+
+        :return: None
+        """
+        for entity, budget in self.entities:
+            # Act
+            ac_result = hasattr(entity, "__dict__")
+
+            # Assert
+            self.assertFalse(ac_result,
+                             "Test failed, expected {0} instance to have no __dict__".format(type(entity).__name__))
+
+    @unittest.skipUnless(sys.maxsize > 2 ** 32, "budgets are for 64-bit builds")
+    def test_size_within_budget(self):
+        """
+        Test case to check that sys.getsizeof() of each entity instance is within its documented budget
+
+        :return: None
+        """
+        for entity, budget in self.entities:
+            # Act
+            ac_size = sys.getsizeof(entity)
+
+            # Assert
+            self.assertLessEqual(ac_size, budget,
+                                 "Test failed, expected {0} size of at most {1} got size: {2}".
+                                 format(type(entity).__name__, budget, ac_size))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+# File: test_fee_schedule.py
+# Description: Automated tests for elements of Game Developer Contract Matcher (GDCMatcher) case study prototype
+# Author: Chris Knowles
+
+
+# Imports
+import unittest
+from data_model.fee_schedule import FeeSchedule
+from data_model.client import Client
+from data_model.contract import Contract
+from data_model.advert_fee_contract import AdvertFeeContract
+
+
+# Consts
+# Globals
+
+
+# Classes
+class TestFeeSchedule(unittest.TestCase):
+    """
+    Test fixture to exercise the methods from the fee schedule class, note - the schedule is at class scope so each
+    test case puts back the fees it changes
+    """
+    def setUp(self):
+        """
+        Set up run before every test case
+
+        :return:
+        """
+        self.fees = dict(FeeSchedule.fees())
+        self.owner = Client("Ubisoft Entertainment")
+
+    def tearDown(self):
+        """
+        Tear down run after every test case
+
+        :return:
+        """
+        FeeSchedule.set_fees(**self.fees)
+
+    def test_set_fees_bumps_epoch_and_revenue(self):
+        """
+        Test case to check that changing a fee moves the epoch on and that the cached revenue of a contract that is not
+        completed follows the new fee
+
+        :return: None
+        """
+        # Arrange
+        contract = Contract(self.owner, "C++", 1000.0)
+        ex_epoch = FeeSchedule.epoch() + 1
+        contract.calculate_revenue()  # Fill the cache under the current fees
+
+        # Act
+        ac_epoch = FeeSchedule.set_fees(base_commission=20.0)
+        ac_revenue = contract.calculate_revenue()
+
+        # Assert
+        self.assertEqual(ex_epoch, ac_epoch, "Test failed, expected epoch: {0} got epoch: {1}".format(ex_epoch,
+                                                                                                     ac_epoch))
+        self.assertEqual(200.0, ac_revenue, "Test failed, expected revenue: 200.0 got revenue: {0}".format(ac_revenue))
+
+    def test_completed_contract_keeps_billed_fees(self):
+        """
+        Test case to check that a completed contract keeps being billed under the version it was completed under, even
+        when a fee class variable is assigned directly afterwards
+
+        :return: None
+        """
+        # Arrange
+        contract = AdvertFeeContract(self.owner, "C++", 1000.0)
+        contract.inc_times_viewed()
+        contract.completed = True
+        ex_revenue = contract.calculate_revenue()
+        ex_version = contract.billed_version
+
+        # Act
+        AdvertFeeContract.fixed_fee = 5.0
+        ac_epoch = FeeSchedule.epoch()
+        ac_revenue = contract.calculate_revenue()
+
+        # Assert
+        self.assertGreater(ac_epoch, ex_version, "Test failed, expected direct assignment to add a version")
+        self.assertEqual(ex_revenue, ac_revenue,
+                         "Test failed, expected revenue: {0} got revenue: {1}".format(ex_revenue, ac_revenue))
+        self.assertEqual(ex_version, contract.billed_version, "Test failed, expected billed version to be unchanged")
+
+
+if __name__ == "__main__":
+    unittest.main()
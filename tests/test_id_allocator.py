@@ -0,0 +1,78 @@
+# File: test_id_allocator.py
+# Description: Automated tests for elements of Game Developer Contract Matcher (GDCMatcher) case study prototype
+# Author: Chris Knowles
+
+
+# Imports
+import threading
+import unittest
+from data_model.id_allocator import IdAllocator
+
+
+# Consts
+# Globals
+
+
+# Classes
+class TestIdAllocator(unittest.TestCase):
+    """
+    Test fixture to exercise the methods from the identifier allocator class
+    """
+    def setUp(self):
+        """
+        Set up run before every test case
+
+        :return:
+        """
+        self.id_allocator = IdAllocator(1000)
+
+    def test_next_id_across_threads_unique(self):
+        """
+        Test case to check that numbers handed out to several threads at once are all different
+
+        :return: None
+        """
+        # Arrange
+        in_threads = 8
+        in_per_thread = 2000
+        ac_numbers = []
+
+        def create():
+            numbers = [self.id_allocator.next_id() for _ in range(in_per_thread)]
+            ac_numbers.extend(numbers)
+
+        # Act
+        threads = [threading.Thread(target=create) for _ in range(in_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        self.assertEqual(in_threads * in_per_thread, len(set(ac_numbers)),
+                         "Test failed, expected every number handed out to be unique")
+
+    def test_block_allocator_bounded(self):
+        """
+        Test case to check that an allocator built for a block hands out only that block and then refuses
+
+        :return: None
+        """
+        # Arrange
+        in_block = self.id_allocator.allocate_block(2)
+        ex_numbers = [1000, 1001]
+
+        # Act
+        block_allocator = IdAllocator.for_block(in_block)
+        ac_numbers = [block_allocator.next_id(), block_allocator.next_id()]
+
+        # Assert
+        self.assertEqual(ex_numbers, ac_numbers,
+                         "Test failed, expected numbers: {0} got numbers: {1}".format(ex_numbers, ac_numbers))
+        self.assertEqual(1002, self.id_allocator.next_id(),
+                         "Test failed, expected the parent allocator to continue after the block")
+        self.assertRaises(RuntimeError, block_allocator.next_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
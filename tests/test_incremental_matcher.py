@@ -0,0 +1,128 @@
+# File: test_incremental_matcher.py
+# Description: Automated tests for elements of Game Developer Contract Matcher (GDCMatcher) case study prototype
+# Author: Chris Knowles
+
+
+# Imports
+import unittest
+from engine.incremental_matcher import IncrementalMatcher
+from data_model.identified_entity import IdentifiedEntity
+from data_model.id_allocator import IdAllocator
+from data_model.client import Client
+from data_model.contractor import Contractor
+from data_model.contract import Contract
+
+
+# Consts
+# Globals
+
+
+# Classes
+class TestIncrementalMatcher(unittest.TestCase):
+    """
+    Test fixture to exercise the methods from the incremental matcher class
+    """
+    def setUp(self):
+        """
+        Set up run before every test case
+
+        :return:
+        """
+        # Give every test case its own identifier allocator starting at 1000, needs to be done through the
+        # IdentifiedEntity class since the allocator is shared by all entity classes from the base class
+        IdentifiedEntity.use_id_allocator(IdAllocator(1000))
+
+        # Create a matcher with a workload cap of 1 that allocates in the same way as MainApp.allocate_contractor()
+        self.matcher = IncrementalMatcher(self.allocate, max_workload=1)
+        self.owner = Client("Ubisoft Entertainment")
+
+    def allocate(self, contract, contractor):
+        """
+        Allocate function used by the matcher, tells the matcher about the allocation
+
+        :param contract: contract as Contract instance
+        :param contractor: contractor as Contractor instance
+        :return: None
+        """
+        previous_contractor = contract.contractor_allocated
+        contract.contractor_allocated = contractor
+        self.matcher.contract_allocated(contract, previous_contractor)
+
+    def test_contractor_added_takes_best_contract(self):
+        """
+        Test case to check a contractor added when there are open contracts is given the highest revenue one
+
+        :return: None
+        """
+        # Arrange
+        contract_1 = Contract(self.owner, "C++", 700.0)
+        contract_2 = Contract(self.owner, "C++", 1500.0)
+        self.matcher.contract_added(contract_1)
+        self.matcher.contract_added(contract_2)
+        contractor = Contractor("Jill Doe", "C++")
+
+        # Act
+        self.matcher.contractor_added(contractor)
+
+        # Assert
+        self.assertIs(contractor, contract_2.contractor_allocated, "Test failed, expected CT1002 to be allocated")
+        self.assertIsNone(contract_1.contractor_allocated, "Test failed, expected CT1001 to stay open")
+
+    def test_contract_completed_frees_capacity(self):
+        """
+        Test case to check that completing a contract lets the contractor take the next open contract of its
+        speciality, and that a contract of another speciality is never given to it
+
+        :return: None
+        """
+        # Arrange
+        contractor = Contractor("Jill Doe", "C++")
+        self.matcher.contractor_added(contractor)
+        contract_1 = Contract(self.owner, "C++", 1500.0)
+        contract_2 = Contract(self.owner, "Python", 900.0)
+        contract_3 = Contract(self.owner, "C++", 700.0)
+        for contract in (contract_1, contract_2, contract_3):
+            self.matcher.contract_added(contract)
+
+        # Act
+        ac_workload_before = self.matcher.workload_of(contractor)
+        allocated_before = contract_3.contractor_allocated
+        contract_1.completed = True
+        self.matcher.contract_completed(contract_1)
+
+        # Assert
+        self.assertEqual(1, ac_workload_before,
+                         "Test failed, expected workload: 1 got workload: {0}".format(ac_workload_before))
+        self.assertIsNone(allocated_before, "Test failed, expected CT1005 to wait for capacity")
+        self.assertIs(contractor, contract_3.contractor_allocated, "Test failed, expected CT1005 to be allocated")
+        self.assertIsNone(contract_2.contractor_allocated, "Test failed, expected CT1004 to stay open")
+
+    def test_speciality_change_rematches_contractor(self):
+        """
+        Test case to check that a contractor whose speciality changes is given an open contract of its new speciality
+        straight away, with no change to its workload needed, and none of its old speciality from then on
+
+        :return: None
+        """
+        # Arrange
+        contractor = Contractor("Jill Doe", "Python")
+        self.matcher.contractor_added(contractor)
+        contract_1 = Contract(self.owner, "C++", 1500.0)
+        self.matcher.contract_added(contract_1)
+
+        # Act
+        allocated_before = contract_1.contractor_allocated
+        contractor.speciality = "C++"
+        contract_1.completed = True
+        self.matcher.contract_completed(contract_1)
+        contract_2 = Contract(self.owner, "Python", 900.0)
+        self.matcher.contract_added(contract_2)
+
+        # Assert
+        self.assertIsNone(allocated_before, "Test failed, expected CT1002 to wait for a C++ contractor")
+        self.assertIs(contractor, contract_1.contractor_allocated, "Test failed, expected CT1002 to be allocated")
+        self.assertIsNone(contract_2.contractor_allocated, "Test failed, expected CT1003 to stay open")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,242 @@
+# File: test_main_app.py
+# Description: Automated tests for elements of Game Developer Contract Matcher (GDCMatcher) case study prototype
+# Author: Chris Knowles
+
+
+# Imports
+import os
+import shutil
+import tempfile
+import unittest
+from engine.main_app import MainApp
+from data_model.identified_entity import IdentifiedEntity
+from data_model.id_allocator import IdAllocator
+from data_model.fee_schedule import FeeSchedule
+from data_model.client import Client
+from data_model.contract import Contract
+from data_model.advert_fee_contract import AdvertFeeContract
+
+
+# Consts
+# Globals
+
+
+# Classes
+class TestMainApp(unittest.TestCase):
+    """
+    Test fixture to exercise the methods from the main application class, note - the containers of the main
+    application are at class scope so each test case starts from empty in memory containers
+    """
+    def setUp(self):
+        """
+        Set up run before every test case
+
+        :return:
+        """
+        # Give every test case its own identifier allocator starting at 1000, needs to be done through the
+        # IdentifiedEntity class since the allocator is shared by all entity classes from the base class
+        IdentifiedEntity.use_id_allocator(IdAllocator(1000))
+
+        self.app = MainApp("GDCMatcher", None)
+        self.app.use_storage("memory")
+        handle, self.file_path = tempfile.mkstemp(suffix=".snap")
+        os.close(handle)
+
+    def tearDown(self):
+        """
+        Tear down run after every test case
+
+        :return:
+        """
+        os.remove(self.file_path)
+
+    def test_load_snapshot_refreshes_recommendations(self):
+        """
+        Test case to check that recommendations made after a snapshot is loaded count the contracts it loaded, rather
+        than using scores cached before the load
+
+        :return: None
+        """
+        # Arrange, note - the snapshot is loaded into emptied containers holding the same client and contractor, so
+        # only its contracts are added
+        success, owner = self.app.add_client("Ubisoft Entertainment")
+        success, contractor = self.app.add_contractor("Jill Doe", "C++")
+        for payment in (1500.0, 700.0):
+            success, contract = self.app.add_contract("base", owner, "C++", payment)
+            self.app.allocate_contractor(contract, contractor)
+        in_contract = Contract(owner, "C++", 900.0)
+        ex_score = self.app.recommend_contractors(in_contract)[0][0]
+        self.app.save_snapshot(self.file_path)
+        self.app.use_storage("memory")
+        IdentifiedEntity.use_id_allocator(IdAllocator(1000))
+        success, owner = self.app.add_client("Ubisoft Entertainment")
+        self.app.add_contractor("Jill Doe", "C++")
+        self.app.recommend_contractors(in_contract)  # Caches the score of the contractor with no contracts allocated
+
+        # Act
+        self.app.load_snapshot(self.file_path)
+        ac_score = self.app.recommend_contractors(in_contract)[0][0]
+
+        # Assert
+        self.assertAlmostEqual(ex_score, ac_score, msg="Test failed, expected score: {0} got score: {1}".
+                               format(ex_score, ac_score))
+
+    def test_views_only_counted_through_display_contract(self):
+        """
+        Test case to check that an advert fee contract made displayable directly adds the view to itself straight away,
+        however many main applications have been created, while one displayed through display_contract() has the view
+        recorded in the view counter until the views are folded
+
+        :return: None
+        """
+        # Arrange
+        MainApp("Another GDCMatcher", None)
+        in_contract = AdvertFeeContract(Client("Ubisoft Entertainment"), "C++", 1500.0)
+        ex_times_viewed = [1, 1, 2]
+
+        # Act
+        in_contract.make_displayable()
+        ac_times_viewed = [in_contract.times_viewed]
+        self.app.display_contract(in_contract)
+        ac_times_viewed.append(in_contract.times_viewed)
+        self.app.fold_contract_views()
+        ac_times_viewed.append(in_contract.times_viewed)
+
+        # Assert
+        self.assertEqual(ex_times_viewed, ac_times_viewed,
+                         "Test failed, expected times viewed: {0} got times viewed: {1}".
+                         format(ex_times_viewed, ac_times_viewed))
+
+    def test_get_all_returns_copy(self):
+        """
+        Test case to check that replacing an entry of the list returned by get_all_clients() does not change the
+        clients held, which could not otherwise be detected
+
+        :return: None
+        """
+        # Arrange
+        success, client = self.app.add_client("Ubisoft Entertainment")
+        in_clients = self.app.get_all_clients()
+        ex_result = (True, ["CL1000"])
+
+        # Act
+        in_clients[0] = Client("Electronic Arts Inc")
+        ac_result = (self.app.get_client(client.id) is client, [client.id for client in self.app.get_all_clients()])
+
+        # Assert
+        self.assertEqual(ex_result, ac_result,
+                         "Test failed, expected client found and clients: {0} got: {1}".format(ex_result, ac_result))
+
+    def test_empty_storage_restarts_identifiers(self):
+        """
+        Test case to check that identifiers start again from the first number whenever the storage switched to is
+        empty, so the owner identifiers in preload data find their clients in each storage engine in turn, and that
+        the contracts are read back unchanged once the database is opened again
+
+        :return: None
+        """
+        # Arrange
+        directory = tempfile.mkdtemp()
+        preload_path = os.path.join(directory, "preload.dat")
+        with open(preload_path, "w", encoding="utf-8") as file:
+            file.write('{"class":"Client", "name":"Ubisoft Entertainment"}\n'
+                       '{"class":"Contract", "owner_id":"CL1000", "contractor_allocated_id": "", "speciality":"C++", '
+                       '"payment":1500.0, "completed":False}\n')
+        self.app.preload(preload_path)  # Into the memory storage of set up, so the next identifier number is 1002
+        ex_owners = [("CT1001", "CL1000")] * 3
+
+        # Act
+        ac_owners = []
+        try:
+            for engine, file_path in (("sqlite", os.path.join(directory, "store.db")), ("memory", None)):
+                self.app.use_storage(engine, file_path, reset=True)
+                self.app.preload(preload_path)
+                ac_owners.extend((contract.id, contract.owner.id) for contract in self.app.get_all_contracts())
+            self.app.use_storage("sqlite", os.path.join(directory, "store.db"))
+            ac_owners.extend((contract.id, contract.owner.id) for contract in self.app.get_all_contracts())
+        finally:
+            self.app.use_storage("memory")
+            shutil.rmtree(directory)
+
+        # Assert
+        self.assertEqual(ex_owners, ac_owners,
+                         "Test failed, expected contracts and owners: {0} got: {1}".format(ex_owners, ac_owners))
+
+    def test_recover_replays_snapshot_and_log(self):
+        """
+        Test case to check that recovering into empty storage from a snapshot and the log of the changes made after it
+        (allocations, completions, views, fee changes, removes and adds) gives back the same entities, identifiers,
+        views, revenue and billed revenue
+
+        :return: None
+        """
+        # Arrange
+        directory = tempfile.mkdtemp()
+        preload_path = os.path.join(directory, "preload.dat")
+        snapshot_path = os.path.join(directory, "store.snap")
+        log_path = os.path.join(directory, "store.wal")
+        with open(preload_path, "w", encoding="utf-8") as file:
+            file.write('{"class":"Client", "name":"Ubisoft Entertainment"}\n'
+                       '{"class":"Contractor", "name":"Jill Doe", "speciality":"C++"}\n'
+                       '{"class":"Contract", "owner_id":"CL1000", "contractor_allocated_id": "CR1001", '
+                       '"speciality":"C++", "payment":1500.0, "completed":False}\n'
+                       '{"class":"AdvertFeeContract", "owner_id":"CL1000", "contractor_allocated_id": "", '
+                       '"speciality":"C++", "payment":700.0, "completed":False}\n'
+                       '{"class":"FixedFeeContract", "owner_id":"CL1000", "contractor_allocated_id": "", '
+                       '"speciality":"Audio", "payment":280.0, "completed":False}\n')
+        fee_versions = FeeSchedule.versions()
+        try:
+            self.app.preload(preload_path)
+            self.app.save_snapshot(snapshot_path)
+            self.app.start_logging(log_path)
+            owner = self.app.get_client("CL1000")
+            advert = self.app.get_contract("CT1003")
+            self.app.allocate_contractor(advert, self.app.get_contractor("CR1001"))
+            for _ in range(3):
+                self.app.display_contract(advert)
+            self.app.complete_contract(advert)
+            self.app.complete_contract(self.app.get_contract("CT1002"))
+            self.app.set_fees(base_commission=20.0, advert_fee=250.0)
+            self.app.remove_contract("CT1004")
+            self.app.add_contract("fixed", owner, "Audio", 375.0)
+            self.app.add_client("Electronic Arts Inc")
+            self.app.stop_logging()
+            ex_state = self.__state(self.app)
+
+            # Act
+            self.app.use_storage("memory")
+            FeeSchedule.restore_versions(fee_versions)
+            app = MainApp("GDCMatcher", None)
+            ac_replayed = app.recover(snapshot_path, log_path)
+            app.stop_logging()
+            ac_state = self.__state(app)
+        finally:
+            FeeSchedule.restore_versions(fee_versions)
+            shutil.rmtree(directory)
+
+        # Assert
+        self.assertEqual(ex_state, ac_state, "Test failed, expected state: {0} got: {1}".format(ex_state, ac_state))
+        self.assertGreater(ac_replayed, 0, "Test failed, expected log records to be replayed")
+
+    @staticmethod
+    def __state(app):
+        """
+        Build the state compared before and after recovery, the identifiers of every entity, the owner, contractor,
+        completion, views and billed revenue of every contract, the revenue, revenue totals, fee schedule and next
+        identifier number
+
+        :param app: main application as MainApp instance
+        :return: state as tuple
+        """
+        contracts = [(contract.id, type(contract).__name__, contract.owner.id,
+                      contract.contractor_allocated.id if contract.contractor_allocated else None, contract.completed,
+                      getattr(contract, "times_viewed", None), contract.calculate_revenue())
+                     for contract in app.get_all_contracts()]
+
+        return ([client.id for client in app.get_all_clients()],
+                [contractor.id for contractor in app.get_all_contractors()], contracts, app.revenue,
+                app.calculate_revenue_totals(), FeeSchedule.versions(), IdentifiedEntity.id_allocator().peek())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+# File: test_main_app_storage.py
+# Description: Automated tests for elements of Game Developer Contract Matcher (GDCMatcher) case study prototype
+# Author: Chris Knowles
+
+
+# Imports
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from contextlib import closing
+from engine.main_app import MainApp
+from data_model.identified_entity import IdentifiedEntity
+from data_model.id_allocator import IdAllocator
+from data_model.fee_schedule import FeeSchedule
+
+
+# Consts
+# Globals
+
+
+# Classes
+class TestMainAppStorage(unittest.TestCase):
+    """
+    Test fixture to exercise the storage engines of the main application class, note - the containers, identifier
+    allocator and fee schedule are at class scope so each test case puts them back to in memory storage, a new
+    allocator and the fees it started with
+    """
+    def setUp(self):
+        """
+        Set up run before every test case
+
+        :return:
+        """
+        # The database has -wal and -shm files alongside it so each test case gets a directory of its own
+        IdentifiedEntity.use_id_allocator(IdAllocator(1000))
+        self.fee_versions = FeeSchedule.versions()
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, "store.db")
+        self.app = MainApp("GDCMatcher", None)
+
+    def tearDown(self):
+        """
+        Tear down run after every test case
+
+        :return:
+        """
+        self.app.use_storage("memory")  # Closes the database
+        FeeSchedule.restore_versions(self.fee_versions)
+        shutil.rmtree(self.directory)
+
+    def test_change_committed_before_returning(self):
+        """
+        Test case to check that a change is in the database as soon as the method making it returns, by reading the
+        database on a connection of its own while the store is still open, as it would be found after a crash
+
+        :return: None
+        """
+        # Arrange
+        self.app.use_storage("sqlite", self.file_path)
+        success, client = self.app.add_client("Crash Co")
+        ex_result = ("Crash Co", "1001")
+
+        # Act
+        with closing(sqlite3.connect(self.file_path)) as connection:
+            name = connection.execute("SELECT name FROM clients WHERE id = ?", (client.id,)).fetchone()
+            id_next = connection.execute("SELECT value FROM state WHERE key = 'id_next'").fetchone()
+        ac_result = (name[0] if name else None, id_next[0] if id_next else None)
+
+        # Assert
+        self.assertEqual(ex_result, ac_result,
+                         "Test failed, expected name and next identifier number: {0} got: {1}".
+                         format(ex_result, ac_result))
+
+    def test_switching_engines(self):
+        """
+        Test case to check that each storage engine starts with what it holds, nothing for memory storage and the
+        entities in the database for SQLite storage, and that the entities of the storage switched from are not carried
+        over
+
+        :return: None
+        """
+        # Arrange
+        self.app.use_storage("sqlite", self.file_path)
+        self.app.add_client("Ubisoft Entertainment")
+        ex_counts = [0, 1, 0]
+
+        # Act
+        ac_counts = []
+        for engine in ("memory", "sqlite", "memory"):
+            self.app.use_storage(engine, self.file_path)
+            ac_counts.append(len(self.app.get_all_clients()))
+
+        # Assert
+        self.assertEqual(ex_counts, ac_counts,
+                         "Test failed, expected clients: {0} got: {1}".format(ex_counts, ac_counts))
+
+    def test_reopened_database_carries_on(self):
+        """
+        Test case to check that opening an existing database again, as a new main application would, rebuilds the
+        revenue totals from its contracts and carries on with its revenue, fee schedule and identifier numbers
+
+        :return: None
+        """
+        # Arrange
+        self.app.use_storage("sqlite", self.file_path)
+        success, owner = self.app.add_client("Ubisoft Entertainment")
+        success, contractor = self.app.add_contractor("Jill Doe", "C++")
+        success, contract = self.app.add_contract("base", owner, "C++", 1500.0)
+        self.app.allocate_contractor(contract, contractor)
+        self.app.complete_contract(contract)
+        self.app.set_fees(base_commission=20.0)
+        self.app.add_contract("fixed", owner, "Audio", 375.0)
+        ex_state = (self.app.revenue, self.app.calculate_revenue_totals(),
+                    self.app.calculate_revenue_totals("speciality", "C++"), FeeSchedule.versions(), "CL1004")
+        self.app.use_storage("memory")
+        FeeSchedule.restore_versions(self.fee_versions)
+
+        # Act
+        app = MainApp("GDCMatcher", None)
+        app.use_storage("sqlite", self.file_path)
+        success, client = app.add_client("Electronic Arts Inc")
+        ac_state = (app.revenue, app.calculate_revenue_totals(), app.calculate_revenue_totals("speciality", "C++"),
+                    FeeSchedule.versions(), client.id)
+
+        # Assert
+        self.assertEqual(ex_state, ac_state, "Test failed, expected state: {0} got: {1}".format(ex_state, ac_state))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+# File: test_preload_reader.py
+# Description: Automated tests for elements of Game Developer Contract Matcher (GDCMatcher) case study prototype
+# Author: Chris Knowles
+
+
+# Imports
+import os
+import tempfile
+import unittest
+from engine.preload_reader import PreloadReader
+
+
+# Consts
+# Globals
+
+
+# Classes
+class TestPreloadReader(unittest.TestCase):
+    """
+    Test fixture to exercise the methods from the preload reader class
+    """
+    def setUp(self):
+        """
+        Set up run before every test case
+
+        :return:
+        """
+        # Write a preload data file with a comment, a blank line, a JSON line and a line in the original Python syntax
+        handle, self.file_path = tempfile.mkstemp(suffix=".dat")
+        with os.fdopen(handle, "w", encoding="utf-8") as data_file:
+            data_file.write("# Clients\n")
+            data_file.write("{\"class\": \"Client\", \"name\": \"Ubisoft Entertainment\"}\n")
+            data_file.write("\n")
+            data_file.write("{\"class\":\"Contract\", \"owner_id\":\"CL1000\", \"contractor_allocated_id\": \"\", "
+                            "\"speciality\":\"Audio\", \"payment\":850.0, \"completed\":False}\n")
+
+    def tearDown(self):
+        """
+        Tear down run after every test case
+
+        :return:
+        """
+        os.remove(self.file_path)
+
+    def test_read_with_compat_shim(self):
+        """
+        Test case to check that comments and blank lines are skipped and that the Python syntax line is read through
+        the compatibility shim with each backend
+
+        :return: None
+        """
+        for backend in PreloadReader.BACKENDS:
+            if backend == "orjson":
+                try:
+                    import orjson
+                except ImportError:
+                    continue  # orjson is optional
+
+            # Arrange
+            reader = PreloadReader(self.file_path, backend)
+            ex_records = [{"class": "Client", "name": "Ubisoft Entertainment"},
+                          {"class": "Contract", "owner_id": "CL1000", "contractor_allocated_id": "",
+                           "speciality": "Audio", "payment": 850.0, "completed": False}]
+            ex_compat_records = 1
+
+            # Act
+            ac_records = list(reader)
+
+            # Assert
+            self.assertEqual(ex_records, ac_records,
+                             "Test failed, expected records: {0} got records: {1}".format(ex_records, ac_records))
+            self.assertEqual(ex_compat_records, reader.compat_records,
+                             "Test failed, expected compat records: {0} got: {1}".format(ex_compat_records,
+                                                                                         reader.compat_records))
+
+    def test_strict_rejects_python_syntax(self):
+        """
+        Test case to check that a strict reader rejects a line that is not valid JSON
+
+        :return: None
+        """
+        # Arrange
+        reader = PreloadReader(self.file_path, "json", strict=True)
+
+        # Act and Assert
+        with self.assertRaises(ValueError):
+            list(reader)
+
+    def test_read_parallel_keeps_file_order(self):
+        """
+        Test case to check that the byte ranges cover the whole file without splitting lines and that reading them in
+        worker processes gives the same records in the same order as a sequential read
+
+        :return: None
+        """
+        # Arrange
+        reader = PreloadReader(self.file_path, "json")
+        ex_records = list(reader)
+        ex_end = os.path.getsize(self.file_path)
+
+        # Act
+        ranges = PreloadReader.chunk_ranges(self.file_path, 10)
+        ac_records = list(reader.read_parallel(workers=2, chunk_size=10))
+
+        # Assert
+        self.assertEqual(ex_end, ranges[-1][1], "Test failed, expected last range to end at byte: {0} got: {1}".
+                         format(ex_end, ranges[-1][1]))
+        self.assertEqual(ex_records, ac_records,
+                         "Test failed, expected records: {0} got records: {1}".format(ex_records, ac_records))
+
+    def test_line_separator_inside_string(self):
+        """
+        Test case to check that a JSON string holding a character that str.splitlines() splits at (U+2028) is read the
+        same way sequentially and in worker processes, as lines end only at a newline
+
+        :return: None
+        """
+        # Arrange
+        with open(self.file_path, "a", encoding="utf-8") as data_file:
+            data_file.write("{\"class\": \"Client\", \"name\": \"Line\u2028Separated\"}\n")
+        reader = PreloadReader(self.file_path, "json")
+        ex_name = "Line\u2028Separated"
+
+        # Act
+        ac_records = list(reader)
+        ac_parallel_records = list(reader.read_parallel(workers=2, chunk_size=10))
+
+        # Assert
+        self.assertEqual(ex_name, ac_records[-1]["name"],
+                         "Test failed, expected name: {0!r} got name: {1!r}".format(ex_name, ac_records[-1]["name"]))
+        self.assertEqual(ac_records, ac_parallel_records,
+                         "Test failed, expected records: {0} got records: {1}".format(ac_records, ac_parallel_records))
+
+
+if __name__ == "__main__":
+    unittest.main()
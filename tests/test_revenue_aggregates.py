@@ -0,0 +1,92 @@
+# File: test_revenue_aggregates.py
+# Description: Automated tests for elements of Game Developer Contract Matcher (GDCMatcher) case study prototype
+# Author: Chris Knowles
+
+
+# Imports
+import unittest
+from data_model.revenue_aggregates import RevenueAggregates
+from data_model.identified_entity import IdentifiedEntity
+from data_model.id_allocator import IdAllocator
+from data_model.client import Client
+from data_model.contractor import Contractor
+from data_model.contract import Contract
+from data_model.fixed_fee_contract import FixedFeeContract
+
+
+# Consts
+# Globals
+
+
+# Classes
+class TestRevenueAggregates(unittest.TestCase):
+    """
+    Test fixture to exercise the methods from the revenue aggregates class
+    """
+    def setUp(self):
+        """
+        Set up run before every test case
+
+        :return:
+        """
+        # Give every test case its own identifier allocator starting at 1000, needs to be done through the
+        # IdentifiedEntity class since the allocator is shared by all entity classes from the base class
+        IdentifiedEntity.use_id_allocator(IdAllocator(1000))
+
+        # Add 1 client (CL1000), 1 contractor (CR1001) and 2 contracts (CT1002, CT1003) to new aggregates
+        self.aggregates = RevenueAggregates()
+        self.owner = Client("Ubisoft Entertainment")
+        self.contractor = Contractor("Jill Doe", "C++")
+        self.contract_1 = Contract(self.owner, "C++", 1000.0)
+        self.contract_2 = FixedFeeContract(self.owner, "C++", 2000.0)
+        self.aggregates.contract_added(self.contract_1)
+        self.aggregates.contract_added(self.contract_2)
+
+    def test_allocate_and_complete_moves_totals(self):
+        """
+        Test case to check that allocating and completing a contract moves its revenue from potential to realised and
+        from the unallocated contracts to its contractor
+
+        :return: None
+        """
+        # Arrange
+        ex_realised = self.contract_1.calculate_revenue()
+        ex_potential = self.contract_2.calculate_revenue()
+
+        # Act
+        self.contract_1.contractor_allocated = self.contractor
+        self.contract_1.completed = True
+        ac_totals = self.aggregates.revenue_totals()
+        ac_contractor_totals = self.aggregates.revenue_totals("contractor", "CR1001")
+        ac_unallocated_totals = self.aggregates.revenue_totals("contractor", None)
+
+        # Assert
+        self.assertEqual((ex_realised, ex_potential), ac_totals,
+                         "Test failed, expected totals: {0} got totals: {1}".format((ex_realised, ex_potential),
+                                                                                     ac_totals))
+        self.assertEqual((ex_realised, 0.0), ac_contractor_totals,
+                         "Test failed, expected contractor totals: {0} got totals: {1}".
+                         format((ex_realised, 0.0), ac_contractor_totals))
+        self.assertEqual((0.0, ex_potential), ac_unallocated_totals,
+                         "Test failed, expected unallocated totals: {0} got totals: {1}".
+                         format((0.0, ex_potential), ac_unallocated_totals))
+
+    def test_breakdown_after_remove(self):
+        """
+        Test case to check the breakdown() method leaves out a key once all its contracts have been removed
+
+        :return: None
+        """
+        # Arrange
+        ex_keys = ["Contract"]
+
+        # Act
+        self.aggregates.contract_removed(self.contract_2)
+        ac_keys = list(self.aggregates.breakdown("contract_type"))
+
+        # Assert
+        self.assertEqual(ex_keys, ac_keys, "Test failed, expected keys: {0} got keys: {1}".format(ex_keys, ac_keys))
+
+
+if __name__ == "__main__":
+    unittest.main()
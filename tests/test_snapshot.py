@@ -0,0 +1,129 @@
+# File: test_snapshot.py
+# Description: Automated tests for elements of Game Developer Contract Matcher (GDCMatcher) case study prototype
+# Author: Chris Knowles
+
+
+# Imports
+import os
+import tempfile
+import unittest
+from engine.snapshot import Snapshot
+from data_model.identified_entity import IdentifiedEntity
+from data_model.id_allocator import IdAllocator
+from data_model.client import Client
+from data_model.contractor import Contractor
+from data_model.contract import Contract
+from data_model.fixed_fee_contract import FixedFeeContract
+from data_model.advert_fee_contract import AdvertFeeContract
+
+
+# Consts
+# Globals
+
+
+# Classes
+class TestSnapshot(unittest.TestCase):
+    """
+    Test fixture to exercise the methods from the snapshot class
+    """
+    def setUp(self):
+        """
+        Set up run before every test case
+
+        :return:
+        """
+        # Give every test case its own identifier allocator starting at 1000, needs to be done through the
+        # IdentifiedEntity class since the allocator is shared by all entity classes from the base class
+        IdentifiedEntity.use_id_allocator(IdAllocator(1000))
+
+        # Create 2 clients (CL1000, CL1001), 1 contractor (CR1002) and 3 contracts (advert CT1003, CT1004, CT1005), the
+        # advert fee contract has been viewed 3 times and is completed
+        self.clients = [Client("Ubisoft Entertainment"), Client("Electronic Arts Inc")]
+        self.contractors = [Contractor("Jill Doe", "C++")]
+        advert = AdvertFeeContract(self.clients[0], "C++", 700.0, self.contractors[0])
+        for _ in range(3):
+            advert.inc_times_viewed()
+        advert.completed = True
+        self.contracts = [Contract(self.clients[1], "Audio", 850.0), advert,
+                          FixedFeeContract(self.clients[0], "Python", 280.0)]
+
+        handle, self.file_path = tempfile.mkstemp(suffix=".snap")
+        os.close(handle)
+        Snapshot.write(self.file_path, self.clients, self.contractors, self.contracts, revenue=70.3,
+                       id_next=IdentifiedEntity.id_allocator().peek())
+
+    def tearDown(self):
+        """
+        Tear down run after every test case
+
+        :return:
+        """
+        os.remove(self.file_path)
+
+    def test_round_trip(self):
+        """
+        Test case to check that every contract read back from a snapshot matches the one written, including its class,
+        view count and revenue, and that the header values are read back
+
+        :return: None
+        """
+        # Arrange
+        ex_contracts = [(contract.id, type(contract), contract.owner.id, contract.speciality, contract.payment,
+                         contract.completed, contract.calculate_revenue()) for contract in self.contracts]
+        ex_header = (2, 1, 3, 1006, 70.3)
+
+        # Act
+        with Snapshot(self.file_path) as snapshot:
+            ac_contracts = [(contract.id, type(contract), contract.owner.id, contract.speciality, contract.payment,
+                             contract.completed, contract.calculate_revenue()) for contract in snapshot.contracts()]
+            ac_header = (snapshot.client_count, snapshot.contractor_count, snapshot.contract_count, snapshot.id_next,
+                         snapshot.revenue)
+
+        # Assert
+        self.assertEqual(ex_contracts, ac_contracts,
+                         "Test failed, expected contracts: {0} got contracts: {1}".format(ex_contracts, ac_contracts))
+        self.assertEqual(ex_header, ac_header,
+                         "Test failed, expected header: {0} got header: {1}".format(ex_header, ac_header))
+
+    def test_find_contract_materialises_lazily(self):
+        """
+        Test case to check that finding one contract materialises only that contract, its owner and its contractor,
+        and that the owner is shared with the owner's other contracts
+
+        :return: None
+        """
+        # Arrange
+        ex_times_viewed = 3
+        ex_contractor_id = "CR1002"
+
+        # Act
+        with Snapshot(self.file_path) as snapshot:
+            contract = snapshot.find_contract("CT1003")
+            owner_shared = snapshot.find_contract("CT1005").owner is contract.owner
+
+        # Assert
+        self.assertEqual(ex_times_viewed, contract.times_viewed,
+                         "Test failed, expected times viewed: {0} got: {1}".format(ex_times_viewed,
+                                                                                  contract.times_viewed))
+        self.assertEqual(ex_contractor_id, contract.contractor_allocated.id,
+                         "Test failed, expected contractor: {0} got: {1}".format(ex_contractor_id,
+                                                                                 contract.contractor_allocated.id))
+        self.assertTrue(owner_shared, "Test failed, expected contracts of the same owner to share the owner instance")
+
+    def test_rejects_other_files(self):
+        """
+        Test case to check that a file that is not a snapshot is rejected
+
+        :return: None
+        """
+        # Arrange
+        with open(self.file_path, "wb") as other_file:
+            other_file.write(b"{\"class\": \"Client\"}\n")
+
+        # Act and Assert
+        with self.assertRaises(ValueError):
+            Snapshot(self.file_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+# File: test_speciality_registry.py
+# Description: Automated tests for elements of Game Developer Contract Matcher (GDCMatcher) case study prototype
+# Author: Chris Knowles
+
+
+# Imports
+import unittest
+from data_model.speciality_registry import SpecialityRegistry
+from data_model.contractor import Contractor
+
+
+# Consts
+# Globals
+
+
+# Classes
+class TestSpecialityRegistry(unittest.TestCase):
+    """
+    Test fixture to exercise the methods from the speciality registry class, note - the registry is at class scope so
+    these test cases only rely on codes being stable rather than on particular code values
+    """
+    def test_intern_same_speciality_same_code(self):
+        """
+        Test case to check that interning the same speciality twice gives the same code and the code gives back the
+        speciality
+
+        :return: None
+        """
+        # Arrange
+        in_speciality = "Shader Programming"
+
+        # Act
+        ac_code_1 = SpecialityRegistry.intern(in_speciality)
+        ac_code_2 = SpecialityRegistry.intern("Shader " + "Programming")
+
+        # Assert
+        self.assertEqual(ac_code_1, ac_code_2,
+                         "Test failed, expected code: {0} got code: {1}".format(ac_code_1, ac_code_2))
+        self.assertEqual(in_speciality, SpecialityRegistry.name_of(ac_code_1),
+                         "Test failed, expected code to map back to speciality: {0}".format(in_speciality))
+
+    def test_find_code_unknown_speciality(self):
+        """
+        Test case to check that finding the code of an unknown speciality gives None and does not add it
+
+        :return: None
+        """
+        # Arrange
+        in_speciality = "Unknown Speciality 9999"
+        ex_count = SpecialityRegistry.count()
+
+        # Act
+        ac_code = SpecialityRegistry.find_code(in_speciality)
+        ac_count = SpecialityRegistry.count()
+
+        # Assert
+        self.assertIsNone(ac_code,
+                          "Test failed, expected code of None")
+        self.assertEqual(ex_count, ac_count,
+                         "Test failed, expected count: {0} got count: {1}".format(ex_count, ac_count))
+
+    def test_entity_holds_code(self):
+        """
+        Test case to check that an entity with a speciality holds the registry code for it
+
+        :return: None
+        """
+        # Arrange
+        in_speciality = "Level Design"
+
+        # Act
+        ac_contractor = Contractor("Jill Doe", in_speciality)
+
+        # Assert
+        self.assertEqual(SpecialityRegistry.intern(in_speciality), ac_contractor.speciality_code,
+                         "Test failed, expected contractor to hold the registry code")
+
+    def test_similar_codes_cpp_variants(self):
+        """
+        Test case to check that specialities written differently are found as similar and that a speciality that only
+        shares some characters is not
+
+        :return: None
+        """
+        # Arrange
+        in_specialities = ["C++", "c++", "Cpp", "C++ programming"]
+        ex_codes = {SpecialityRegistry.intern(speciality) for speciality in in_specialities}
+        ex_other_code = SpecialityRegistry.intern("C")
+
+        # Act
+        ac_codes = set(SpecialityRegistry.similar_codes("cpp", 0.8))
+
+        # Assert
+        self.assertTrue(ex_codes <= ac_codes,
+                        "Test failed, expected codes: {0} to be in codes: {1}".format(ex_codes, ac_codes))
+        self.assertNotIn(ex_other_code, ac_codes, "Test failed, expected C not to be similar to C++")
+
+
+if __name__ == "__main__":
+    unittest.main()
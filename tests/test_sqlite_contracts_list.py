@@ -0,0 +1,191 @@
+# File: test_sqlite_contracts_list.py
+# Description: Automated tests for elements of Game Developer Contract Matcher (GDCMatcher) case study prototype
+# Author: Chris Knowles
+
+
+# Imports
+import os
+import shutil
+import tempfile
+import unittest
+from data_model.sqlite_store import SqliteStore
+from data_model.sqlite_clients_list import SqliteClientsList
+from data_model.sqlite_contractors_list import SqliteContractorsList
+from data_model.sqlite_contracts_list import SqliteContractsList
+from data_model.identified_entity import IdentifiedEntity
+from data_model.id_allocator import IdAllocator
+from data_model.client import Client
+from data_model.contractor import Contractor
+from data_model.contract import Contract
+from data_model.advert_fee_contract import AdvertFeeContract
+
+
+# Consts
+# Globals
+
+
+# Classes
+class TestSqliteContractsList(unittest.TestCase):
+    """
+    Test fixture to exercise the methods from the SQLite contracts list class
+    """
+    def setUp(self):
+        """
+        Set up run before every test case
+
+        :return:
+        """
+        # Give every test case its own identifier allocator starting at 1000 and its own database
+        IdentifiedEntity.use_id_allocator(IdAllocator(1000))
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, "store.db")
+        self.open()
+
+        # Create 2 clients (CL1000, CL1001), 1 contractor (CR1002) and 3 contracts (CT1003, advert CT1004, CT1005)
+        self.clients = [Client("Ubisoft Entertainment"), Client("Electronic Arts Inc")]
+        self.contractor = Contractor("Jill Doe", "C++")
+        self.clients_list.add_many(self.clients)
+        self.contractors_list.add(self.contractor)
+        self.contracts_list.add_many([Contract(self.clients[0], "C++", 1500.0),
+                                      AdvertFeeContract(self.clients[1], "C++", 700.0),
+                                      Contract(self.clients[1], "Audio", 850.0)])
+
+    def tearDown(self):
+        """
+        Tear down run after every test case
+
+        :return:
+        """
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def open(self):
+        """
+        Open the database and the lists kept in it
+
+        :return: None
+        """
+        self.store = SqliteStore(self.file_path)
+        self.clients_list = SqliteClientsList(self.store)
+        self.contractors_list = SqliteContractorsList(self.store)
+        self.contracts_list = SqliteContractsList(self.store, self.clients_list, self.contractors_list)
+
+    def test_indexed_queries(self):
+        """
+        Test case to check the owner, speciality, unallocated and contractor queries, including through a query over
+        the list, follow an allocation made to a held contract
+
+        :return: None
+        """
+        # Arrange
+        contract = self.contracts_list.find_by_id("CT1004")
+        ex_owner_ids = ["CT1004", "CT1005"]
+        ex_unallocated_ids = ["CT1003", "CT1005"]
+        ex_query_ids = ["CT1003"]
+
+        # Act
+        contract.contractor_allocated = self.contractor
+        ac_owner_ids = [contract.id for contract in self.contracts_list.get_with_owner(self.clients[1])]
+        ac_unallocated_ids = [contract.id for contract in self.contracts_list.get_all_unallocated()]
+        ac_query_ids = [contract.id for contract in self.contracts_list.query().speciality("C++").unallocated()]
+        ac_allocated = self.contracts_list.get_with_contractor(self.contractor)
+
+        # Assert
+        self.assertEqual(ex_owner_ids, ac_owner_ids,
+                         "Test failed, expected owner contracts: {0} got: {1}".format(ex_owner_ids, ac_owner_ids))
+        self.assertEqual(ex_unallocated_ids, ac_unallocated_ids,
+                         "Test failed, expected unallocated contracts: {0} got: {1}".format(ex_unallocated_ids,
+                                                                                            ac_unallocated_ids))
+        self.assertEqual(ex_query_ids, ac_query_ids,
+                         "Test failed, expected query contracts: {0} got: {1}".format(ex_query_ids, ac_query_ids))
+        self.assertEqual([contract], ac_allocated, "Test failed, expected the held contract to be allocated")
+
+    def test_changes_written_back(self):
+        """
+        Test case to check that changes to held contracts are in the database when it is opened again and that the
+        owner and contractor of a contract read back are the instances held by the other lists
+
+        :return: None
+        """
+        # Arrange
+        advert = self.contracts_list.find_by_id("CT1004")
+        advert.contractor_allocated = self.contractor
+        advert.add_views(3)
+        advert.completed = True
+        self.contracts_list.remove_by_id("CT1005")
+        ex_contract = ("CT1004", AdvertFeeContract, "CL1001", "CR1002", True, 3, advert.calculate_revenue())
+        ex_count = 2
+
+        # Act
+        self.store.close()
+        self.open()
+        contract = self.contracts_list.find_by_id("CT1004")
+        ac_contract = (contract.id, type(contract), contract.owner.id, contract.contractor_allocated.id,
+                       contract.completed, contract.times_viewed, contract.calculate_revenue())
+        ac_count = self.contracts_list.count()
+
+        # Assert
+        self.assertEqual(ex_contract, ac_contract,
+                         "Test failed, expected contract: {0} got: {1}".format(ex_contract, ac_contract))
+        self.assertEqual(ex_count, ac_count, "Test failed, expected contracts: {0} got: {1}".format(ex_count, ac_count))
+        self.assertIs(self.clients_list.find_by_id("CL1001"), contract.owner,
+                      "Test failed, expected the owner to be the instance held by the clients list")
+
+    def test_unreferenced_contracts_dropped_from_cache(self):
+        """
+        Test case to check that with no recently used contracts kept only the contracts still referred to keep their
+        instance, a row changed directly in the database shows which contracts are read again, and that paging reads
+        every contract back in the order they were added
+
+        :return: None
+        """
+        # Arrange, the contracts added in set up are held in the cache but only CT1003 is referred to from elsewhere
+        kept = self.contracts_list.find_by_id("CT1003")
+        self.store.write("UPDATE contracts SET payment = 1.0")
+        self.contracts_list.cache_size = 0
+        ex_payments = (1500.0, 1.0)
+        ex_ids = ["CT1003", "CT1004", "CT1005"]
+
+        # Act
+        self.contracts_list.get_with_speciality("C++")  # Materialises contracts nothing goes on to refer to
+        ac_payments = (kept.payment, self.contracts_list.find_by_id("CT1005").payment)
+        page, token = self.contracts_list.page(2)
+        rest, last_token = self.contracts_list.page(2, token)
+        ac_ids = [contract.id for contract in page + rest]
+
+        # Assert
+        self.assertEqual(ex_payments, ac_payments,
+                         "Test failed, expected payments: {0} got: {1}".format(ex_payments, ac_payments))
+        self.assertIs(kept, self.contracts_list.find_by_id("CT1003"),
+                      "Test failed, expected a referenced contract to keep its instance")
+        self.assertEqual(ex_ids, ac_ids, "Test failed, expected contracts: {0} got: {1}".format(ex_ids, ac_ids))
+        self.assertIsNone(last_token, "Test failed, expected no token after the last page")
+
+    def test_recent_contracts_kept_and_indexed(self):
+        """
+        Test case to check that indexing reads the contract at each position, that the most recently used contract is
+        kept although nothing refers to it and that it is read again once another contract is used after it
+
+        :return: None
+        """
+        # Arrange, only CT1005 (the last added) is kept once the cache size is 1
+        self.contracts_list.cache_size = 1
+        self.store.write("UPDATE contracts SET payment = 1.0")
+        ex_payments = (850.0, 1.0, 1.0)
+        ex_ids = ["CT1003", "CT1004", "CT1005", "CT1003"]
+
+        # Act
+        ac_payments = (self.contracts_list[-1].payment, self.contracts_list[0].payment,
+                       self.contracts_list[2].payment)
+        ac_ids = [self.contracts_list[index].id for index in (0, 1, 2, -3)]
+
+        # Assert
+        self.assertEqual(ex_payments, ac_payments,
+                         "Test failed, expected payments: {0} got: {1}".format(ex_payments, ac_payments))
+        self.assertEqual(ex_ids, ac_ids, "Test failed, expected contracts: {0} got: {1}".format(ex_ids, ac_ids))
+        for index in (3, -4):
+            with self.assertRaises(IndexError, msg="Test failed, expected IndexError for index {0}".format(index)):
+                self.contracts_list[index]
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+# File: test_sqlite_store.py
+# Description: Automated tests for elements of Game Developer Contract Matcher (GDCMatcher) case study prototype
+# Author: Chris Knowles
+
+
+# Imports
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from data_model.sqlite_store import SqliteStore
+
+
+# Consts
+# Globals
+
+
+# Classes
+class TestSqliteStore(unittest.TestCase):
+    """
+    Test fixture to exercise the methods from the SQLite store class
+    """
+    def setUp(self):
+        """
+        Set up run before every test case
+
+        :return:
+        """
+        # The database has -wal and -shm files alongside it so each test case gets a directory of its own
+        self.directory = tempfile.mkdtemp()
+        self.store = SqliteStore(os.path.join(self.directory, "store.db"), pool_size=2, batch_size=10)
+
+    def tearDown(self):
+        """
+        Tear down run after every test case
+
+        :return:
+        """
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def test_writes_are_batched_and_read_before_commit(self):
+        """
+        Test case to check that changes are committed once per batch, that a change is read back before it is
+        committed and that the commit listener adds its changes to each batch
+
+        :return: None
+        """
+        # Arrange
+        self.store.commit_listener = lambda: self.store.set_state(committed=self.store.commit_count + 1)
+        ex_commit_count = 2
+        ex_count = 25
+
+        # Act
+        for number in range(ex_count):
+            self.store.write("INSERT INTO clients (id, name) VALUES (?, ?)",
+                             ("CL{0}".format(1000 + number), "Client {0}".format(number)))
+        ac_commit_count = self.store.commit_count
+        ac_count = self.store.read_one("SELECT COUNT(*) FROM clients")[0]
+        self.store.flush()
+        ac_committed = self.store.get_state("committed")
+
+        # Assert
+        self.assertEqual(ex_commit_count, ac_commit_count,
+                         "Test failed, expected commits: {0} got: {1}".format(ex_commit_count, ac_commit_count))
+        self.assertEqual(ex_count, ac_count,
+                         "Test failed, expected clients read: {0} got: {1}".format(ex_count, ac_count))
+        self.assertEqual(ex_commit_count + 1, ac_committed,
+                         "Test failed, expected state from commit: {0} got: {1}".format(ex_commit_count + 1,
+                                                                                        ac_committed))
+
+    def test_batch_rolls_back_on_error(self):
+        """
+        Test case to check that every change made in a batch is rolled back if an exception is raised in it and that
+        the reset listeners are called
+
+        :return: None
+        """
+        # Arrange
+        resets = []
+        self.store.add_reset_listener(lambda: resets.append(True))
+        self.store.write("INSERT INTO clients (id, name) VALUES (?, ?)", ("CL1000", "Ubisoft Entertainment"))
+        self.store.flush()
+        ex_ids = [("CL1000",)]
+
+        # Act
+        with self.assertRaises(RuntimeError):
+            with self.store.batch():
+                self.store.write("INSERT INTO clients (id, name) VALUES (?, ?)", ("CL1001", "Electronic Arts Inc"))
+                raise RuntimeError("Failed part way through the batch")
+        ac_ids = self.store.read("SELECT id FROM clients")
+
+        # Assert
+        self.assertEqual(ex_ids, ac_ids, "Test failed, expected clients: {0} got: {1}".format(ex_ids, ac_ids))
+        self.assertEqual([True], resets, "Test failed, expected the reset listener to be called once")
+
+    def test_pooled_readers_from_many_threads(self):
+        """
+        Test case to check that several threads can read committed changes through the pool at once
+
+        :return: None
+        """
+        # Arrange
+        self.store.write_many("INSERT INTO clients (id, name) VALUES (?, ?)",
+                              [("CL{0}".format(1000 + number), "Client {0}".format(number)) for number in range(50)])
+        self.store.flush()
+        counts = []
+
+        def read():
+            for _ in range(20):
+                counts.append(self.store.read_one("SELECT COUNT(*) FROM clients")[0])
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        ex_counts = [50] * 80
+
+        # Act
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        self.assertEqual(ex_counts, counts, "Test failed, expected every read to count 50 clients")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+# File: test_view_counter.py
+# Description: Automated tests for elements of Game Developer Contract Matcher (GDCMatcher) case study prototype
+# Author: Chris Knowles
+
+
+# Imports
+import threading
+import unittest
+from data_model.view_counter import ViewCounter
+from data_model.identified_entity import IdentifiedEntity
+from data_model.id_allocator import IdAllocator
+from data_model.client import Client
+from data_model.contract import Contract
+from data_model.advert_fee_contract import AdvertFeeContract
+
+
+# Consts
+# Globals
+
+
+# Classes
+class TestViewCounter(unittest.TestCase):
+    """
+    Test fixture to exercise the methods from the view counter class
+    """
+    def setUp(self):
+        """
+        Set up run before every test case
+
+        :return:
+        """
+        # Give every test case its own identifier allocator starting at 1000, needs to be done through the
+        # IdentifiedEntity class since the allocator is shared by all entity classes from the base class
+        IdentifiedEntity.use_id_allocator(IdAllocator(1000))
+
+        # Create 1 client (CL1000), 2 advert fee contracts (CT1001, CT1002) and 1 contract (CT1003)
+        owner = Client("Ubisoft Entertainment")
+        self.advert_1 = AdvertFeeContract(owner, "C++", 1000.0)
+        self.advert_2 = AdvertFeeContract(owner, "Python", 500.0)
+        self.contract = Contract(owner, "C#", 800.0)
+
+        self.view_counter = ViewCounter(fold_threshold=1000000)
+
+    def test_fold_from_many_threads(self):
+        """
+        Test case to check that views recorded from several threads are all folded into the contracts, and that none
+        are seen by the contracts until they are folded
+
+        :return: None
+        """
+        # Arrange
+        def view():
+            for _ in range(500):
+                self.view_counter.record(self.advert_1)
+            self.view_counter.record_many([self.advert_1, self.advert_2, self.contract], 2)
+
+        threads = [threading.Thread(target=view) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        ex_before = (0, 0)
+        ex_after = (2008, 8)
+
+        # Act
+        ac_before = (self.advert_1.times_viewed, self.advert_2.times_viewed)
+        self.view_counter.fold()
+        ac_after = (self.advert_1.times_viewed, self.advert_2.times_viewed)
+
+        # Assert
+        self.assertEqual(ex_before, ac_before,
+                         "Test failed, expected views before fold: {0} got: {1}".format(ex_before, ac_before))
+        self.assertEqual(ex_after, ac_after,
+                         "Test failed, expected views after fold: {0} got: {1}".format(ex_after, ac_after))
+
+    def test_flush_before_completion(self):
+        """
+        Test case to check that flush() folds in exactly the views of one contract, so the revenue it is completed
+        with includes them, and leaves the views of other contracts pending
+
+        :return: None
+        """
+        # Arrange
+        self.view_counter.record_many([self.advert_1, self.advert_2], 10)
+        ex_revenue = (Contract.base_commission / 100.0) * 1000.0 + 10 * AdvertFeeContract.fixed_fee
+        ex_pending = 10
+
+        # Act
+        self.view_counter.flush(self.advert_1)
+        self.advert_1.completed = True
+        ac_revenue = self.advert_1.calculate_revenue()
+        ac_pending = self.view_counter.pending(self.advert_2)
+
+        # Assert
+        self.assertAlmostEqual(ex_revenue, ac_revenue, msg="Test failed, expected revenue: {0} got revenue: {1}".
+                               format(ex_revenue, ac_revenue))
+        self.assertEqual(ex_pending, ac_pending,
+                         "Test failed, expected pending views: {0} got: {1}".format(ex_pending, ac_pending))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+# File: test_write_ahead_log.py
+# Description: Automated tests for elements of Game Developer Contract Matcher (GDCMatcher) case study prototype
+# Author: Chris Knowles
+
+
+# Imports
+import os
+import tempfile
+import threading
+import unittest
+from engine.write_ahead_log import WriteAheadLog
+
+
+# Consts
+# Globals
+
+
+# Classes
+class TestWriteAheadLog(unittest.TestCase):
+    """
+    Test fixture to exercise the methods from the write ahead log class
+    """
+    def setUp(self):
+        """
+        Set up run before every test case
+
+        :return:
+        """
+        handle, self.file_path = tempfile.mkstemp(suffix=".wal")
+        os.close(handle)
+
+    def tearDown(self):
+        """
+        Tear down run after every test case
+
+        :return:
+        """
+        os.remove(self.file_path)
+
+    def test_group_commit_from_many_threads(self):
+        """
+        Test case to check that records appended from several threads are all durable and read back in LSN order, and
+        that they share fsync() calls rather than needing one each
+
+        :return: None
+        """
+        # Arrange
+        log = WriteAheadLog(self.file_path, commit_interval=0.001)
+
+        def append():
+            for number in range(50):
+                log.append("add_client", name="Client {0}".format(number))
+
+        threads = [threading.Thread(target=append) for _ in range(4)]
+        ex_lsns = list(range(1, 201))
+
+        # Act
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        log.close()
+        ac_lsns = [record["lsn"] for record in WriteAheadLog.read(self.file_path)]
+
+        # Assert
+        self.assertEqual(ex_lsns, ac_lsns, "Test failed, expected LSNs 1 to 200 got: {0}".format(ac_lsns))
+        self.assertLess(log.commit_count, len(ex_lsns),
+                        "Test failed, expected fewer commits than records got: {0}".format(log.commit_count))
+
+    def test_part_written_record_is_cut_off(self):
+        """
+        Test case to check that a part written last record is ignored when reading and cut off when the log is opened
+        again, so the next record follows on from the last complete one
+
+        :return: None
+        """
+        # Arrange
+        log = WriteAheadLog(self.file_path)
+        log.append("add_client", id="CL1000", name="Ubisoft Entertainment")
+        log.close()
+        with open(self.file_path, "ab") as log_file:
+            log_file.write(b"{\"lsn\":2,\"op\":\"add_cl")  # Crash part way through writing the record
+        ex_ops = ["add_client", "remove_client"]
+        ex_lsns = [1, 2]
+
+        # Act
+        log = WriteAheadLog(self.file_path)
+        log.append("remove_client", id="CL1000")
+        log.close()
+        records = list(WriteAheadLog.read(self.file_path))
+        ac_ops = [record["op"] for record in records]
+        ac_lsns = [record["lsn"] for record in records]
+
+        # Assert
+        self.assertEqual(ex_ops, ac_ops, "Test failed, expected ops: {0} got ops: {1}".format(ex_ops, ac_ops))
+        self.assertEqual(ex_lsns, ac_lsns, "Test failed, expected LSNs: {0} got LSNs: {1}".format(ex_lsns, ac_lsns))
+
+    def test_truncate_keeps_lsns(self):
+        """
+        Test case to check that truncate() only empties the log up to the supplied LSN and that LSNs carry on after it
+
+        :return: None
+        """
+        # Arrange
+        log = WriteAheadLog(self.file_path)
+        log.append("add_client", id="CL1000", name="Ubisoft Entertainment")
+        lsn = log.append("add_client", id="CL1001", name="Electronic Arts Inc")
+        ex_lsns = [3]
+
+        # Act
+        stale = log.truncate(lsn - 1)
+        emptied = log.truncate(lsn)
+        log.append("remove_client", id="CL1000")
+        log.close()
+        ac_lsns = [record["lsn"] for record in WriteAheadLog.read(self.file_path)]
+
+        # Assert
+        self.assertFalse(stale, "Test failed, expected the log not to be emptied before its last record")
+        self.assertTrue(emptied, "Test failed, expected the log to be emptied at its last record")
+        self.assertEqual(ex_lsns, ac_lsns, "Test failed, expected LSNs: {0} got LSNs: {1}".format(ex_lsns, ac_lsns))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -90,7 +90,7 @@ class MenuUI:
                 MenuUI.display_contracts_menu()
 
                 # Get user menu choice
-                choice = MenuUI.get_menu_choice(1, 10)
+                choice = MenuUI.get_menu_choice(1, 12)
 
                 # Process user menu choice
                 self.process_contracts_menu_choice(choice)
@@ -165,8 +165,10 @@ class MenuUI:
         print(" 7. Display Contracts For Speciality")
         print(" 8. Display All Unallocated Contracts")
         print(" 9. Display Contracts Allocated To Contractor")
-        print("10. Return")
-        print("Please enter your choice (1 - 10): ", end="", flush=True)
+        print("10. Search Contracts")
+        print("11. Auto Allocate Contracts")
+        print("12. Return")
+        print("Please enter your choice (1 - 12): ", end="", flush=True)
         # Note: , end="", flush=True prevents newline after print()
 
     def process_main_menu_choice(self, choice):
@@ -284,7 +286,13 @@ class MenuUI:
         elif choice == 9:  # Action Display Contracts Allocated To Contractor function
             self.display_contracts_allocated_to_contractor()
 
-        else:  # Must be choice 10 so action switch to main menu
+        elif choice == 10:  # Action Search Contracts function
+            self.search_contracts()
+
+        elif choice == 11:  # Action Auto Allocate Contracts function
+            self.auto_allocate_contractors()
+
+        else:  # Must be choice 12 so action switch to main menu
             MenuUI.switch_to_menu(MenuUI.__MAIN_MENU_ID)
 
     @staticmethod
@@ -359,6 +367,11 @@ class MenuUI:
         print("\nCurrently accrued revenue is: £{0:.2f}".format(self.main_app.revenue))
         # In the format placeholder, ":.2f" means always show two decimals, for instance 1.2 would show as 1.20
 
+        # Show the realised and potential revenue of the contracts currently held for each contract type
+        for contract_type, totals in self.main_app.get_revenue_breakdown("contract_type").items():
+            print("{0}: realised £{1:.2f}, potential £{2:.2f}".format(contract_type, totals["realised"],
+                                                                       totals["potential"]))
+
     def add_client(self):
         """
         Delegate to the main application by calling its add client method, passing the name provided by the user
@@ -520,10 +533,14 @@ class MenuUI:
         print("\nEnter speciality to match with contractors: ", end="", flush=True)
         speciality = MenuUI.get_string_input()
 
+        # Ask user if contractors with a similar speciality (e.g. "Cpp" for "C++") should also be matched
+        print("Include similar specialities (y/n): ", end="", flush=True)
+        similar = MenuUI.get_string_input().strip().lower() == "y"
+
         # Delegate operation to the main application, the main application will return a list of all contractor
         # instances that match the user provided speciality, note this could be the empty list if there are no
         # contractor instances
-        contractors = self.main_app.get_contractors_with_speciality(speciality)
+        contractors = self.main_app.get_contractors_with_speciality(speciality, similar)
 
         if not contractors:
             print("\nThere are no contractors with Speciality: {0}".format(speciality))
@@ -657,7 +674,7 @@ class MenuUI:
             return
 
         # If the contractor does not have the same speciality as the contract then display an error message and abort
-        if not contractor.speciality == contract.speciality:
+        if not contractor.speciality_code == contract.speciality_code:
             print("\nError: contractor speciality and contract speciality differ so cannot allocate".format(ident))
             return
 
@@ -665,6 +682,32 @@ class MenuUI:
         self.main_app.allocate_contractor(contract, contractor)
         print("\nContractor with Id: {0} allocated to contract with Id: {1}".format(contractor.id, contract.id))
 
+    def auto_allocate_contractors(self):
+        """
+        Delegate to the main application by calling its auto allocate contractors method, passing the workload cap
+        provided by the user, and display each allocation made
+
+        :return: None
+        """
+        # Ask user for the most contracts not yet completed any contractor can have, left blank there is no cap
+        print("\nEnter most contracts any contractor can have (blank for no limit): ", end="", flush=True)
+        max_workload = MenuUI.get_string_input()
+        try:
+            max_workload = int(max_workload) if max_workload.strip() else None
+        except ValueError:
+            print("\nError: {0} is not a valid number of contracts".format(max_workload))
+            return
+
+        # Ask user if contracts can go to contractors with a similar speciality (e.g. "Cpp" for "C++")
+        print("Allow similar specialities (y/n): ", end="", flush=True)
+        similar = MenuUI.get_string_input().strip().lower() == "y"
+
+        # Allocate contractors to all the contracts that can be allocated and display a confirmation of each change
+        allocations = self.main_app.auto_allocate_contractors(max_workload, similar_specialities=similar)
+        for contract, contractor in allocations:
+            print("\nContractor with Id: {0} allocated to contract with Id: {1}".format(contractor.id, contract.id))
+        print("\n{0} contract(s) allocated".format(len(allocations)))
+
     def complete_contract(self):
         """
         Delegate to the main application by calling its complete contract method, passing the contract being completed
@@ -716,7 +759,7 @@ class MenuUI:
             print("\nNo contract with Id: {0}".format(ident))
         else:
             print("")
-            print(contract.make_displayable())  # Print found contract
+            print(self.main_app.display_contract(contract))  # Print found contract
 
     def display_contracts_for_owner(self):
         """
@@ -745,7 +788,7 @@ class MenuUI:
         else:
             for contract in contracts:  # Print each contract in turn
                 print("")
-                print(contract.make_displayable())
+                print(self.main_app.display_contract(contract))
 
     def display_contracts_for_speciality(self):
         """
@@ -767,7 +810,7 @@ class MenuUI:
         else:
             for contract in contracts:  # Print each contract in turn
                 print("")
-                print(contract.make_displayable())
+                print(self.main_app.display_contract(contract))
 
     def display_all_unallocated_contracts(self):
         """
@@ -785,7 +828,7 @@ class MenuUI:
         else:
             for contract in contracts:  # Print each contract in turn
                 print("")
-                print(contract.make_displayable())
+                print(self.main_app.display_contract(contract))
 
     def display_contracts_allocated_to_contractor(self):
         """
@@ -815,7 +858,61 @@ class MenuUI:
         else:
             for contract in contracts:  # Print each contract in turn
                 print("")
-                print(contract.make_displayable())
+                print(self.main_app.display_contract(contract))
+
+    def search_contracts(self):
+        """
+         Display list of all contract instances from main application that match every search criteria provided by the
+         user by building a query with its query contracts method, any criteria left blank by the user is not used
+
+        :return: None
+        """
+        # Start a query over all contracts, each criteria provided by the user narrows this down further
+        query = self.main_app.query_contracts()
+
+        # Ask user for owner identifier to match with contracts, if this does not exist then display an error message
+        # and abort
+        print("\nEnter identifier of owner to match (or leave blank for any): ", end="", flush=True)
+        ident = MenuUI.get_string_input()
+        if ident:
+            owner = self.main_app.get_client(ident)
+            if not owner:
+                print("\nError: no owner with Id: {0} so no contracts to display".format(ident))
+                return
+            query.owner(owner)
+
+        # Ask user for speciality to match with contracts
+        print("Enter speciality to match (or leave blank for any): ", end="", flush=True)
+        speciality = MenuUI.get_string_input()
+        if speciality:
+            query.speciality(speciality)
+
+        # Ask user whether to match only unallocated contracts
+        print("Only unallocated contracts, y/n (or leave blank for any): ", end="", flush=True)
+        if MenuUI.get_string_input().lower() == "y":
+            query.unallocated()
+
+        # Ask user for the payment range to match, if either limit is not a number then display an error message and
+        # abort
+        print("Enter lowest payment to match (or leave blank for any): ", end="", flush=True)
+        minimum = MenuUI.get_string_input()
+        print("Enter highest payment to match (or leave blank for any): ", end="", flush=True)
+        maximum = MenuUI.get_string_input()
+        try:
+            query.payment_between(float(minimum) if minimum else None, float(maximum) if maximum else None)
+        except ValueError:
+            print("\nError: payment limits must be numbers")
+            return
+
+        # Run the query, the matching contracts are produced one at a time as they are printed
+        found = False
+        for contract in query:  # Print each contract in turn
+            found = True
+            print("")
+            print(self.main_app.display_contract(contract))
+
+        if not found:
+            print("\nThere are no contracts matching the search")
 
     def action_exit_function(self):
         """
@@ -166,8 +166,8 @@ class PartialGUI:
         # disabled and is only enabled if there is a selected client
         if PartialGUI.__var_clients.get():
             PartialGUI.__lst_clients.select_set(0)  # Select the first entry in the clients list box
-            PartialGUI.__var_selected_client_data.set(self.main_app.get_all_clients()
-                                                 [PartialGUI.__lst_clients.curselection()[0]].make_displayable())
+            PartialGUI.__var_selected_client_data.set(self.main_app.get_client_at(
+                                                 PartialGUI.__lst_clients.curselection()[0]).make_displayable())
             PartialGUI.__btn_remove_client.config(state="normal")
 
         # -------------------------------------------------------------------------------------------------------------
@@ -223,8 +223,8 @@ class PartialGUI:
 
         if PartialGUI.__var_contractors.get():
             PartialGUI.__lst_contractors.select_set(0)
-            PartialGUI.__var_selected_contractor_data.set(self.main_app.get_all_contractors()
-                                                     [PartialGUI.__lst_contractors.curselection()[0]].
+            PartialGUI.__var_selected_contractor_data.set(self.main_app.get_contractor_at(
+                                                     PartialGUI.__lst_contractors.curselection()[0]).
                                                           make_displayable())
             PartialGUI.__btn_remove_contractor.config(state="normal")
 
@@ -281,8 +281,8 @@ class PartialGUI:
 
         if PartialGUI.__var_contracts.get():
             PartialGUI.__lst_contracts.select_set(0)
-            PartialGUI.__var_selected_contract_data.set(self.main_app.get_all_contracts()
-                                                   [PartialGUI.__lst_contracts.curselection()[0]].make_displayable())
+            PartialGUI.__var_selected_contract_data.set(self.__describe_contract(self.main_app.get_contract_at(
+                                                   PartialGUI.__lst_contracts.curselection()[0])))
             PartialGUI.__btn_remove_contract.config(state="normal")
 
         # -------------------------------------------------------------------------------------------------------------
@@ -299,7 +299,7 @@ class PartialGUI:
         """
         # Ensure there is a selected client, list of selected clients will be empty of none are currently selected
         if evt.widget.curselection():
-            PartialGUI.__var_selected_client_data.set(self.main_app.get_all_clients()[evt.widget.curselection()[0]].
+            PartialGUI.__var_selected_client_data.set(self.main_app.get_client_at(evt.widget.curselection()[0]).
                                                       make_displayable())
             PartialGUI.__btn_remove_client.config(state="normal")
         else:
@@ -410,9 +410,9 @@ class PartialGUI:
         # app clients list) in the clients list box, update the client data display and ensure the remove client button
         # is enabled
         PartialGUI.__lst_clients.selection_clear(0, tk.END)
-        PartialGUI.__lst_clients.select_set(len(self.main_app.get_all_clients()) - 1)
-        PartialGUI.__var_selected_client_data.set(self.main_app.get_all_clients()
-                                                  [PartialGUI.__lst_clients.curselection()[0]].make_displayable())
+        PartialGUI.__lst_clients.select_set(PartialGUI.__lst_clients.size() - 1)
+        PartialGUI.__var_selected_client_data.set(self.main_app.get_client_at(
+                                                  PartialGUI.__lst_clients.curselection()[0]).make_displayable())
         PartialGUI.__btn_remove_client.config(state="normal")
 
     def show_remove_client(self):
@@ -423,7 +423,7 @@ class PartialGUI:
         :return: None
         """
         # Get identifier of the selected client that is about to be removed
-        ident = self.main_app.get_all_clients()[PartialGUI.__lst_clients.curselection()[0]].id
+        ident = self.main_app.get_client_at(PartialGUI.__lst_clients.curselection()[0]).id
 
         # Use Yes/No message box to ask for confirmation of removal from the user
         if mb.askyesno(title="Are You Sure?", message="Do you really want to remove client with Id: {0}".
@@ -460,8 +460,8 @@ class PartialGUI:
         # display, otherwise disable the remove client button
         if PartialGUI.__var_clients.get():
             PartialGUI.__lst_clients.select_set(0)
-            PartialGUI.__var_selected_client_data.set(self.main_app.get_all_clients()
-                                                      [PartialGUI.__lst_clients.curselection()[0]].make_displayable())
+            PartialGUI.__var_selected_client_data.set(self.main_app.get_client_at(
+                                                      PartialGUI.__lst_clients.curselection()[0]).make_displayable())
         else:
             PartialGUI.__btn_remove_client.config(state="disabled")
 
@@ -475,8 +475,8 @@ class PartialGUI:
         # Ensure there is a selected contractor, list of selected contractors will be empty of none are currently
         # selected
         if evt.widget.curselection():
-            PartialGUI.__var_selected_contractor_data.set(self.main_app.get_all_contractors()
-                                                          [evt.widget.curselection()[0]].
+            PartialGUI.__var_selected_contractor_data.set(self.main_app.get_contractor_at(
+                                                          evt.widget.curselection()[0]).
                                                           make_displayable())
             PartialGUI.__btn_remove_contractor.config(state="normal")
         else:
@@ -605,9 +605,9 @@ class PartialGUI:
         # the main app contractors list) in the contractors list box, update the contractor data display and ensure the
         # remove client button is enabled
         PartialGUI.__lst_contractors.selection_clear(0, tk.END)
-        PartialGUI.__lst_contractors.select_set(len(self.main_app.get_all_contractors()) - 1)
-        PartialGUI.__var_selected_contractor_data.set(self.main_app.get_all_contractors()
-                                                      [PartialGUI.__lst_contractors.curselection()[0]].
+        PartialGUI.__lst_contractors.select_set(PartialGUI.__lst_contractors.size() - 1)
+        PartialGUI.__var_selected_contractor_data.set(self.main_app.get_contractor_at(
+                                                      PartialGUI.__lst_contractors.curselection()[0]).
                                                       make_displayable())
         PartialGUI.__btn_remove_contractor.config(state="normal")
 
@@ -619,7 +619,7 @@ class PartialGUI:
         :return: None
         """
         # Get identifier of the selected contractor that is about to be removed
-        ident = self.main_app.get_all_contractors()[PartialGUI.__lst_contractors.curselection()[0]].id
+        ident = self.main_app.get_contractor_at(PartialGUI.__lst_contractors.curselection()[0]).id
 
         # Use Yes/No message box to ask for confirmation of removal from the user
         if mb.askyesno(title="Are You Sure?", message="Do you really want to remove contractor with Id: {0}".
@@ -657,8 +657,8 @@ class PartialGUI:
         # contractor data display, otherwise disable the remove contractor button
         if PartialGUI.__var_contractors.get():
             PartialGUI.__lst_contractors.select_set(0)
-            PartialGUI.__var_selected_contractor_data.set(self.main_app.get_all_contractors()
-                                                          [PartialGUI.__lst_contractors.curselection()[0]].
+            PartialGUI.__var_selected_contractor_data.set(self.main_app.get_contractor_at(
+                                                          PartialGUI.__lst_contractors.curselection()[0]).
                                                           make_displayable())
         else:
             PartialGUI.__btn_remove_contractor.config(state="disabled")
@@ -673,12 +673,32 @@ class PartialGUI:
         # Ensure there is a selected contract, list of selected contracts will be empty if none are currently selected,
         # if none selected then disable the remove contract button, enable this button if there is a selected contract
         if evt.widget.curselection():
-            PartialGUI.__var_selected_contract_data.set(self.main_app.get_all_contracts()[evt.widget.curselection()[0]].
-                                                        make_displayable())
+            PartialGUI.__var_selected_contract_data.set(self.__describe_contract(self.main_app.get_contract_at(
+                                                                                 evt.widget.curselection()[0])))
             PartialGUI.__btn_remove_contract.config(state="normal")
         else:
             PartialGUI.__btn_remove_contract.config(state="disabled")
 
+    def __describe_contract(self, contract):
+        """
+        Build the text shown for the selected contract, this is its displayable form (from the main app, so the view of
+        an advert fee contract is counted as it is by the MenuUI version) followed, if it is not yet allocated, by the
+        contractors the main app recommends for it
+
+        :param contract: selected contract as Contract instance
+        :return: text to show as string
+        """
+        text = self.main_app.display_contract(contract)
+        if contract.contractor_allocated or contract.completed:
+            return text
+
+        recommendations = self.main_app.recommend_contractors(contract)
+        if not recommendations:
+            return text + "\nRecommended: none available"
+
+        return text + "\nRecommended:\n" + "\n".join("{0} {1} ({2:.2f})".format(contractor.id, contractor.name, score)
+                                                     for score, contractor in recommendations)
+
     def show_add_contract(self):
         """
         Shows a dialog for entering a new contract, is accepted and the add_contract() method called on the main
@@ -810,7 +830,7 @@ class PartialGUI:
         # variable, else disable to ok button and set owner id to None
         if evt.widget.curselection():
             PartialGUI.__btn_ok.config(state="normal")
-            PartialGUI.__var_owner_id.set(self.main_app.get_all_clients()[evt.widget.curselection()[0]].id)
+            PartialGUI.__var_owner_id.set(self.main_app.get_client_at(evt.widget.curselection()[0]).id)
         else:
             PartialGUI.__btn_ok.config(state="disabled")
             PartialGUI.__var_owner_id.set(None)
@@ -853,10 +873,9 @@ class PartialGUI:
         # main app contracts list) in the contracts list box, update the contract data display and ensure the remove
         # contract button is enabled
         PartialGUI.__lst_contracts.selection_clear(0, tk.END)
-        PartialGUI.__lst_contracts.select_set(len(self.main_app.get_all_contracts()) - 1)
-        PartialGUI.__var_selected_contract_data.set(self.main_app.get_all_contracts()
-                                                    [PartialGUI.__lst_contracts.curselection()[0]].
-                                                    make_displayable())
+        PartialGUI.__lst_contracts.select_set(PartialGUI.__lst_contracts.size() - 1)
+        selected = self.main_app.get_contract_at(PartialGUI.__lst_contracts.curselection()[0])
+        PartialGUI.__var_selected_contract_data.set(self.__describe_contract(selected))
         PartialGUI.__btn_remove_contract.config(state="normal")
 
     def show_remove_contract(self):
@@ -867,7 +886,7 @@ class PartialGUI:
         :return: None
         """
         # Get identifier of the selected contract that is about to be removed
-        ident = self.main_app.get_all_contracts()[PartialGUI.__lst_contracts.curselection()[0]].id
+        ident = self.main_app.get_contract_at(PartialGUI.__lst_contracts.curselection()[0]).id
 
         # Use Yes/No message box to ask for confirmation of removal from the user
         if mb.askyesno(title="Are You Sure?", message="Do you really want to remove contract with Id: {0}".
@@ -905,8 +924,7 @@ class PartialGUI:
         # data display, otherwise disable the remove contract button
         if PartialGUI.__var_contracts.get():
             PartialGUI.__lst_contracts.select_set(0)
-            PartialGUI.__var_selected_contract_data.set(self.main_app.get_all_contracts()
-                                                        [PartialGUI.__lst_contracts.curselection()[0]].
-                                                        make_displayable())
+            selected = self.main_app.get_contract_at(PartialGUI.__lst_contracts.curselection()[0])
+            PartialGUI.__var_selected_contract_data.set(self.__describe_contract(selected))
         else:
             PartialGUI.__btn_remove_contract.config(state="disabled")